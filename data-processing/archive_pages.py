@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Archive Film Forum series and film pages before they are culled.
+
+Film Forum removes film and series pages once their showtimes pass, so this
+fetches them while they still exist:
+
+- Series pages go to data/raw-html/{series}.html (read by parse_showtimes.py)
+- Film pages from movie-urls.txt go to data-processing/movie-pages/{slug}.html
+  (read by process_posters.py and extract_film_metadata.py)
+
+Requests run concurrently on asyncio under a per-host rate limit. Every
+response is kept in an on-disk HTTP cache with its ETag/Last-Modified
+validators, so re-runs send conditional requests, pages fetched recently
+are not re-requested at all (an interrupted run resumes where it stopped),
+and a page that has since disappeared (404/410) keeps its archived copy.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import ssl
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from atomic_write import atomic_write_bytes, write_if_changed
+from parse_showtimes import extract_slug_from_film_url
+
+# Get script directory for relative paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+
+BASE_URL = os.environ.get('FILMFORUM_BASE_URL', 'https://filmforum.org')
+URLS_FILE = os.environ.get('MOVIE_URLS_FILE', str(SCRIPT_DIR / 'movie-urls.txt'))
+SERIES_DIR = os.environ.get('RAW_HTML_DIR', str(PROJECT_ROOT / 'data' / 'raw-html'))
+HTML_DIR = os.environ.get('HTML_DIR', str(SCRIPT_DIR / 'movie-pages'))
+HTTP_CACHE_DIR = os.environ.get('HTTP_CACHE_DIR', str(SCRIPT_DIR / '.http-cache'))
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE = 2.0  # requests per second per host
+DEFAULT_RESUME_HOURS = 12.0
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+MAX_REDIRECTS = 5
+USER_AGENT = 'Mozilla/5.0 (compatible; filmforum-calendar page archiver)'
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+GONE_STATUSES = {404, 410}
+
+
+class Response(NamedTuple):
+    """Minimal HTTP response."""
+    status: int
+    headers: Dict[str, str]  # lower-cased names
+    body: bytes
+    url: str
+
+
+class ArchiveResult(NamedTuple):
+    """Outcome of archiving one page."""
+    url: str
+    path: str
+    status: str  # 'downloaded', 'not_modified', 'fresh', 'gone', 'failed'
+    bytes: int = 0
+    error: Optional[str] = None
+
+
+class HostRateLimiter:
+    """Spaces requests to each host at least 1/rate seconds apart."""
+
+    def __init__(self, rate: float) -> None:
+        """
+        Args:
+            rate: Maximum requests per second per host (0 disables the limit)
+        """
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def wait(self, host: str) -> None:
+        """Sleep until the next request slot for a host."""
+        if not self.interval:
+            return
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            start = max(now, self._next.get(host, now))
+            self._next[host] = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def defer(self, host: str, seconds: float) -> None:
+        """Push a host's next slot back (e.g. after 429 with Retry-After)."""
+        self._next[host] = max(self._next.get(host, 0.0), time.monotonic() + seconds)
+
+
+class HttpCache:
+    """On-disk cache of response bodies plus their validators, keyed by URL."""
+
+    def __init__(self, cache_dir: str = HTTP_CACHE_DIR) -> None:
+        """
+        Args:
+            cache_dir: Directory holding {sha256(url)}.json and .body files
+        """
+        self.cache_dir = Path(cache_dir)
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / f'{key}.json', self.cache_dir / f'{key}.body'
+
+    def get(self, url: str) -> Optional[Dict[str, object]]:
+        """
+        Return the cached entry for a URL.
+
+        Returns:
+            Dict with url, etag, last_modified, fetched_at (epoch seconds)
+            and body (bytes), or None if absent or unreadable
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            entry['body'] = body_path.read_bytes()
+        except (FileNotFoundError, ValueError):
+            return None
+        return entry
+
+    def put(self, url: str, response: Response) -> None:
+        """Store a 200 response (body first, then metadata, both atomic)."""
+        meta_path, body_path = self._paths(url)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(body_path, response.body)
+        self._write_meta(meta_path, {
+            'url': url,
+            'final_url': response.url,
+            'etag': response.headers.get('etag', ''),
+            'last_modified': response.headers.get('last-modified', ''),
+            'fetched_at': time.time(),
+        })
+
+    def touch(self, url: str) -> None:
+        """Mark a cached entry as revalidated now (after a 304)."""
+        meta_path, _ = self._paths(url)
+        entry = self.get(url)
+        if entry:
+            entry.pop('body')
+            entry['fetched_at'] = time.time()
+            self._write_meta(meta_path, entry)
+
+    def _write_meta(self, path: Path, meta: Dict[str, object]) -> None:
+        atomic_write_bytes(path, (json.dumps(meta, indent=2) + '\n').encode('utf-8'))
+
+
+async def http_get(url: str, headers: Dict[str, str], timeout: float = DEFAULT_TIMEOUT) -> Response:
+    """
+    Perform one HTTP/1.1 GET with asyncio streams, following redirects.
+
+    Args:
+        url: http(s) URL
+        headers: Extra request headers
+        timeout: Seconds allowed for the whole exchange
+
+    Returns:
+        Response with the final URL
+    """
+    for _ in range(MAX_REDIRECTS + 1):
+        response = await asyncio.wait_for(_get_once(url, headers), timeout)
+        location = response.headers.get('location')
+        if response.status in REDIRECT_STATUSES and location:
+            url = urljoin(url, location)
+            continue
+        return response
+    raise OSError(f'Too many redirects for {url}')
+
+
+async def _get_once(url: str, headers: Dict[str, str]) -> Response:
+    parts = urlsplit(url)
+    secure = parts.scheme == 'https'
+    port = parts.port or (443 if secure else 80)
+    reader, writer = await asyncio.open_connection(
+        parts.hostname, port, ssl=ssl.create_default_context() if secure else None
+    )
+    try:
+        path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        lines = [f'GET {path} HTTP/1.1', f'Host: {parts.netloc}', 'Connection: close',
+                 'Accept-Encoding: identity']
+        lines += [f'{name}: {value}' for name, value in headers.items()]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        await writer.drain()
+
+        head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1')
+        status_line, *header_lines = head.split('\r\n')
+        status = int(status_line.split()[1])
+        response_headers = {}
+        for line in header_lines:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                response_headers[name.strip().lower()] = value.strip()
+
+        if status in (204, 304) or 100 <= status < 200:
+            body = b''
+        elif response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            body = await _read_chunked(reader)
+        elif 'content-length' in response_headers:
+            body = await reader.readexactly(int(response_headers['content-length']))
+        else:
+            body = await reader.read()
+        return Response(status, response_headers, body, url)
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (OSError, ssl.SSLError):
+            pass
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    body = bytearray()
+    while True:
+        size_line = await reader.readuntil(b'\r\n')
+        size = int(size_line.split(b';')[0].strip(), 16)
+        if size == 0:
+            await reader.readuntil(b'\r\n')  # Trailer terminator (no trailers expected)
+            return bytes(body)
+        body += await reader.readexactly(size)
+        await reader.readexactly(2)
+
+
+class PageArchiver:
+    """Concurrent, rate-limited, cache-backed page fetcher."""
+
+    def __init__(self, cache: HttpCache, concurrency: int = DEFAULT_CONCURRENCY, rate: float = DEFAULT_RATE,
+                 resume_hours: float = DEFAULT_RESUME_HOURS, timeout: float = DEFAULT_TIMEOUT,
+                 retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF) -> None:
+        """
+        Args:
+            cache: On-disk HTTP cache
+            concurrency: Maximum requests in flight across all hosts
+            rate: Maximum requests per second per host
+            resume_hours: Pages fetched or revalidated this recently are not
+                requested again (0 always revalidates)
+            timeout: Seconds per request
+            retries: Extra attempts after a transient failure
+            backoff: Base delay in seconds, doubled after each failed attempt
+        """
+        self.cache = cache
+        self.concurrency = concurrency
+        self.limiter = HostRateLimiter(rate)
+        self.resume_seconds = resume_hours * 3600
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+    async def fetch(self, url: str, dest_path: str, semaphore: asyncio.Semaphore) -> ArchiveResult:
+        """
+        Bring one page's cache entry up to date and write it to dest_path.
+
+        Args:
+            url: Page URL
+            dest_path: File the page is written to
+            semaphore: Global concurrency limit
+
+        Returns:
+            ArchiveResult describing what happened
+        """
+        cached = self.cache.get(url)
+        if cached and time.time() - cached['fetched_at'] < self.resume_seconds:
+            return ArchiveResult(url, dest_path, 'fresh', _write_if_changed(dest_path, cached['body']))
+
+        headers = {'User-Agent': USER_AGENT}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        host = urlsplit(url).netloc
+        last_error = 'unknown error'
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(self.backoff * (2 ** (attempt - 1)))
+            async with semaphore:
+                await self.limiter.wait(host)
+                try:
+                    response = await http_get(url, headers, self.timeout)
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError,
+                        asyncio.LimitOverrunError, ValueError) as e:
+                    last_error = f'{type(e).__name__}: {e}'
+                    continue
+
+            if response.status == 304 and cached:
+                self.cache.touch(url)
+                return ArchiveResult(url, dest_path, 'not_modified', _write_if_changed(dest_path, cached['body']))
+            if response.status == 200:
+                self.cache.put(url, response)
+                _write_if_changed(dest_path, response.body)
+                return ArchiveResult(url, dest_path, 'downloaded', len(response.body))
+            if response.status in GONE_STATUSES:
+                # Culled upstream: whatever we archived before stays in place
+                if cached:
+                    _write_if_changed(dest_path, cached['body'])
+                return ArchiveResult(url, dest_path, 'gone', error=f'HTTP {response.status}')
+            if response.status in RETRY_STATUSES:
+                last_error = f'HTTP {response.status}'
+                retry_after = response.headers.get('retry-after', '')
+                if retry_after.isdigit():
+                    self.limiter.defer(host, float(retry_after))
+                continue
+            return ArchiveResult(url, dest_path, 'failed', error=f'HTTP {response.status}')
+
+        return ArchiveResult(url, dest_path, 'failed', error=last_error)
+
+    async def archive(self, jobs: List[Tuple[str, str]]) -> List[ArchiveResult]:
+        """Archive many (url, dest_path) pairs concurrently, in job order."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        return list(await asyncio.gather(*(self.fetch(url, path, semaphore) for url, path in jobs)))
+
+    def run(self, jobs: List[Tuple[str, str]]) -> List[ArchiveResult]:
+        """Synchronous wrapper around archive()."""
+        return asyncio.run(self.archive(jobs))
+
+
+def build_jobs(series_names: List[str], film_urls: List[str], base_url: str = BASE_URL,
+               series_dir: str = SERIES_DIR, html_dir: str = HTML_DIR,
+               slug_suffixes: Optional[List[str]] = None) -> List[Tuple[str, str]]:
+    """
+    Map series names and film URLs to (url, destination file) pairs.
+
+    Film pages are named by their slug with the series suffix removed,
+    matching the existing movie-pages/ files.
+
+    Args:
+        series_names: Series slugs (fetched from {base_url}/series/{slug})
+        film_urls: Absolute film page URLs
+        base_url: Site root for series pages
+        series_dir: Destination of series pages
+        html_dir: Destination of film pages
+        slug_suffixes: Series names stripped from film slugs (default: series_names)
+
+    Returns:
+        List of (url, dest_path)
+    """
+    jobs = [(f"{base_url.rstrip('/')}/series/{name}", os.path.join(series_dir, f'{name}.html'))
+            for name in series_names]
+    for url in film_urls:
+        segment = url.rstrip('/').split('/')[-1]
+        slug = segment
+        for name in (series_names if slug_suffixes is None else slug_suffixes):
+            slug = extract_slug_from_film_url(url, name)
+            if slug != segment:
+                break
+        jobs.append((url, os.path.join(html_dir, f'{slug}.html')))
+    return jobs
+
+
+def read_url_list(path: str) -> List[str]:
+    """Read one URL per line, skipping blanks and # comments."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+
+def _write_if_changed(path: str, data: bytes) -> int:
+    """Write data to path unless it already holds these bytes; return bytes written."""
+    return len(data) if write_if_changed(path, data) else 0
+
+
+def main():
+    """Main entry point for command-line execution."""
+    parser = argparse.ArgumentParser(
+        description='Archive Film Forum series and film pages into the local HTML directories',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # Archive the default series page and every URL in movie-urls.txt
+  %(prog)s
+
+  # Several series, gentler rate limit
+  %(prog)s --series tenement-stories noir-city --rate 1
+
+  # Revalidate everything now (conditional requests), ignoring the resume window
+  %(prog)s --resume-hours 0
+
+  # Only film pages
+  %(prog)s --series
+'''
+    )
+    parser.add_argument('--series', nargs='*', default=['tenement-stories'], help='Series slugs to archive (default: tenement-stories)')
+    parser.add_argument('--urls-file', default=URLS_FILE, help='Film page URLs, one per line (default: movie-urls.txt)')
+    parser.add_argument('--no-films', action='store_true', help='Skip film pages')
+    parser.add_argument('--base-url', default=BASE_URL, help='Site root for series pages (default: https://filmforum.org)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='Requests in flight (default: 8)')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help='Requests per second per host (default: 2)')
+    parser.add_argument('--resume-hours', type=float, default=DEFAULT_RESUME_HOURS,
+                        help='Skip pages fetched within this many hours (default: 12)')
+    parser.add_argument('--cache-dir', default=HTTP_CACHE_DIR, help='HTTP cache directory (default: .http-cache/)')
+
+    args = parser.parse_args()
+
+    film_urls = []
+    if not args.no_films:
+        try:
+            film_urls = read_url_list(args.urls_file)
+        except FileNotFoundError:
+            print(f"Error: URL list not found: {args.urls_file}")
+            sys.exit(1)
+
+    jobs = build_jobs(args.series, film_urls, args.base_url, slug_suffixes=args.series or ['tenement-stories'])
+    if not jobs:
+        print("Nothing to archive")
+        return
+
+    print(f"Archiving {len(jobs)} pages ({args.rate:g} req/s per host, {args.concurrency} in flight)...")
+    archiver = PageArchiver(HttpCache(args.cache_dir), args.concurrency, args.rate, args.resume_hours)
+    start = time.perf_counter()
+    results = archiver.run(jobs)
+
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+        if result.status == 'gone':
+            print(f"  ⚠ {result.url}: {result.error} (kept archived copy)" if os.path.exists(result.path)
+                  else f"  ⚠ {result.url}: {result.error}, never archived")
+        elif result.status == 'failed':
+            print(f"  ✗ {result.url}: {result.error}")
+
+    print(f"\n✓ Done in {time.perf_counter() - start:.1f}s at "
+          f"{datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}: "
+          + ', '.join(f"{counts[status]} {status}" for status in sorted(counts)))
+    if counts.get('failed'):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
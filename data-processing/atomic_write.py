@@ -0,0 +1,60 @@
+"""
+Atomic file writes shared by the publishing scripts.
+
+Published artifacts are read by the site while the pipeline rewrites them,
+so every writer goes through a temp file in the same directory and
+os.replace. write_if_changed additionally leaves a file alone when it
+already holds the new bytes, which keeps its mtime (and any caches or
+precompressed siblings keyed on it) intact across no-op runs.
+"""
+
+import os
+from typing import Union
+
+PathLike = Union[str, 'os.PathLike[str]']
+
+
+def atomic_write_bytes(path: PathLike, data: bytes) -> None:
+    """
+    Write data next to path and rename it into place.
+
+    Creates the parent directory if needed. The temp file is removed if the
+    write fails, and readers never see a partial file.
+
+    Args:
+        path: Destination file
+        data: File contents
+    """
+    path = os.fspath(path)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f'.{os.path.basename(path)}.{os.getpid()}.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def write_if_changed(path: PathLike, data: bytes) -> bool:
+    """
+    Atomically write data unless the file already holds exactly these bytes.
+
+    Args:
+        path: Destination file
+        data: File contents
+
+    Returns:
+        True if the file was (re)written
+    """
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    atomic_write_bytes(path, data)
+    return True
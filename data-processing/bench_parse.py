@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Benchmark the showtime parsing pipeline on synthetic series pages.
+
+Generates a Film Forum-shaped series page with thousands of films, several
+showtimes each and a share of malformed blocks (no "Buy Tickets" link),
+then times each stage of parse_showtimes.py and measures its tracemalloc
+peak. Results can be saved as a baseline; later runs compare against it and
+exit non-zero when throughput drops or peak memory grows beyond the
+configured thresholds.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from parse_showtimes import iter_parse_html, parse_html, process_matches, write_csv
+
+# Get script directory for relative paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+
+BASELINE_FILE = os.environ.get('BENCH_BASELINE', str(SCRIPT_DIR / 'bench-baseline.json'))
+
+DEFAULT_FILMS = 2000
+DEFAULT_SHOWTIMES = 8
+DEFAULT_MALFORMED_RATE = 0.02
+DEFAULT_REPEAT = 3
+DEFAULT_MAX_SLOWDOWN = 0.25
+DEFAULT_MAX_MEMORY_GROWTH = 0.25
+
+SCRAPE_TIMESTAMP = '2026-02-01T10:00:00'
+
+FILM_BLOCK = '''<div class="film-entry">
+    <div class="col far-left">
+      <h3 class="title style-c"><a class="blue-type" href="https://filmforum.org/film/{slug}-bench-series">{title}</a></h3>
+    </div><!--
+      --><div class="col far-middle--extend far-middle  "><!--
+      -->
+    <div class="details">
+      <p>{schedule}</p>
+    </div>
+    </div><!--
+      --><div class="col buttons far-right">
+    {ticket}
+    </div>
+  </div>
+</div>
+'''
+TICKET_LINK = '<a class="button small blue" href="https://my.filmforum.org/events/{slug}">Buy Tickets</a>'
+
+
+def generate_series_page(films: int = DEFAULT_FILMS, showtimes: int = DEFAULT_SHOWTIMES,
+                         malformed_rate: float = DEFAULT_MALFORMED_RATE, seed: int = 0) -> Tuple[str, Dict[str, int]]:
+    """
+    Build a synthetic series page shaped like the real Film Forum markup.
+
+    Args:
+        films: Number of film blocks
+        showtimes: Showtimes per film (spread over several dates)
+        malformed_rate: Fraction of blocks without a "Buy Tickets" link
+        seed: Random seed (same arguments always give the same page)
+
+    Returns:
+        Tuple of (html, expected) where expected has films, malformed and
+        showtimes (rows from well-formed blocks)
+    """
+    rng = random.Random(seed)
+    start = date(2026, 2, 2)
+    blocks = ['<html><head><title>Bench Series</title></head><body>\n']
+    malformed = 0
+
+    for index in range(films):
+        slug = f'film-{index:05d}'
+        title = f'FILM {index:05d} &amp; SONS'
+        lines = []
+        day = start + timedelta(days=rng.randrange(60))
+        for n in range(showtimes):
+            if n % 2 == 0:
+                if lines:
+                    lines.append('')
+                day += timedelta(days=rng.randrange(1, 4))
+                lines.append(f"{day.strftime('%A, %B')} {day.day}&nbsp;")
+            # Two showtimes per date: one in 1-4 o'clock, one in 6-9, so none repeat
+            hour = rng.randrange(1, 5) + (n % 2) * 5
+            lines.append(f'{hour}:{rng.choice(("00", "10", "30", "45"))}')
+        is_malformed = rng.random() < malformed_rate
+        malformed += is_malformed
+        blocks.append(FILM_BLOCK.format(
+            slug=slug,
+            title=title,
+            schedule='<br />\n'.join(lines),
+            ticket='' if is_malformed else TICKET_LINK.format(slug=slug),
+        ))
+
+    blocks.append('</body></html>\n')
+    expected = {'films': films, 'malformed': malformed, 'showtimes': (films - malformed) * showtimes}
+    return ''.join(blocks), expected
+
+
+def measure(func: Callable[[], Any], repeat: int = DEFAULT_REPEAT) -> Dict[str, float]:
+    """
+    Time a callable and measure its peak traced memory.
+
+    Timing runs are taken without tracemalloc (it slows allocation-heavy
+    code); one extra run measures the peak.
+
+    Args:
+        func: Zero-argument callable
+        repeat: Timed runs (the best is reported)
+
+    Returns:
+        Dict with seconds (best), median_seconds and peak_bytes
+    """
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'seconds': min(timings), 'median_seconds': statistics.median(timings), 'peak_bytes': peak}
+
+
+def run_benchmarks(films: int = DEFAULT_FILMS, showtimes: int = DEFAULT_SHOWTIMES,
+                   malformed_rate: float = DEFAULT_MALFORMED_RATE, repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    """
+    Benchmark every parsing stage on one synthetic page.
+
+    Stages: parse_regex, parse_stream (string and 64 KB chunks), process
+    (process_matches) and write (write_csv to a temp file).
+
+    Returns:
+        Dict with the workload description and per-stage results including
+        throughput (MB/s for parse stages, rows/s otherwise)
+    """
+    html, expected = generate_series_page(films, showtimes, malformed_rate)
+    size_mb = len(html.encode('utf-8')) / 1e6
+    chunks = [html[i:i + 65536] for i in range(0, len(html), 65536)]
+
+    matches = parse_html(html, 'stream')
+    rows, _ = process_matches(matches, SCRAPE_TIMESTAMP, 'bench-series')
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, 'bench.csv')
+        stages = {
+            'parse_regex': (lambda: parse_html(html, 'regex'), size_mb, 'MB/s'),
+            'parse_stream': (lambda: parse_html(html, 'stream'), size_mb, 'MB/s'),
+            'parse_stream_chunked': (lambda: sum(1 for _ in iter_parse_html(chunks)), size_mb, 'MB/s'),
+            'process': (lambda: process_matches(matches, SCRAPE_TIMESTAMP, 'bench-series'), len(rows), 'rows/s'),
+            'write': (lambda: write_csv(rows, csv_path), len(rows), 'rows/s'),
+        }
+        results = {}
+        for name, (func, volume, unit) in stages.items():
+            result = measure(func, repeat)
+            result['throughput'] = volume / result['seconds'] if result['seconds'] else float('inf')
+            result['unit'] = unit
+            results[name] = result
+
+    return {
+        'workload': {
+            'films': films,
+            'showtimes_per_film': showtimes,
+            'malformed_rate': malformed_rate,
+            'page_mb': round(size_mb, 3),
+            'rows': len(rows),
+            'expected_rows': expected['showtimes'],
+        },
+        'environment': {'python': platform.python_version(), 'machine': platform.machine()},
+        'stages': results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], max_slowdown: float = DEFAULT_MAX_SLOWDOWN,
+            max_memory_growth: float = DEFAULT_MAX_MEMORY_GROWTH) -> List[str]:
+    """
+    Find stages that regressed against a baseline.
+
+    Args:
+        current: run_benchmarks() result
+        baseline: Earlier run_benchmarks() result
+        max_slowdown: Allowed throughput drop as a fraction (0.25 = 25%)
+        max_memory_growth: Allowed peak memory increase as a fraction
+
+    Returns:
+        Human-readable regression messages (empty when within thresholds)
+    """
+    regressions = []
+    if current['workload'] != baseline.get('workload'):
+        regressions.append('Workload differs from baseline; re-run with the baseline settings or --save-baseline')
+        return regressions
+
+    for name, result in current['stages'].items():
+        base = baseline['stages'].get(name)
+        if base is None:
+            continue
+        if result['throughput'] < base['throughput'] * (1 - max_slowdown):
+            drop = 1 - result['throughput'] / base['throughput']
+            regressions.append(f"{name}: throughput {result['throughput']:.1f} {result['unit']} is "
+                               f"{drop:.0%} below baseline {base['throughput']:.1f}")
+        if result['peak_bytes'] > base['peak_bytes'] * (1 + max_memory_growth):
+            growth = result['peak_bytes'] / base['peak_bytes'] - 1
+            regressions.append(f"{name}: peak memory {result['peak_bytes'] / 1e6:.1f} MB is "
+                               f"{growth:.0%} above baseline {base['peak_bytes'] / 1e6:.1f} MB")
+    return regressions
+
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    """Print a per-stage table, with the change from the baseline when given."""
+    workload = report['workload']
+    print(f"Workload: {workload['films']} films x {workload['showtimes_per_film']} showtimes, "
+          f"{workload['malformed_rate']:.0%} malformed, {workload['page_mb']:.1f} MB page, {workload['rows']} rows\n")
+    print(f"  {'stage':<22}{'best':>10}{'throughput':>18}{'peak mem':>12}{'vs baseline':>14}")
+    for name, result in report['stages'].items():
+        delta = ''
+        if baseline and name in baseline.get('stages', {}):
+            delta = f"{result['throughput'] / baseline['stages'][name]['throughput'] - 1:+.0%}"
+        print(f"  {name:<22}{result['seconds'] * 1000:>8.1f}ms"
+              f"{result['throughput']:>12.1f} {result['unit']:<6}"
+              f"{result['peak_bytes'] / 1e6:>9.1f} MB{delta:>14}")
+
+
+def main():
+    """Main entry point for command-line execution."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark parse_showtimes.py stages on a synthetic series page',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # Run and compare against the saved baseline (if any)
+  %(prog)s
+
+  # Record a new baseline
+  %(prog)s --save-baseline
+
+  # Bigger page, stricter thresholds
+  %(prog)s --films 10000 --max-slowdown 0.1 --max-memory-growth 0.1
+
+  # Machine-readable output
+  %(prog)s --json-out bench.json
+'''
+    )
+    parser.add_argument('--films', type=int, default=DEFAULT_FILMS, help='Film blocks in the synthetic page (default: 2000)')
+    parser.add_argument('--showtimes', type=int, default=DEFAULT_SHOWTIMES, help='Showtimes per film (default: 8)')
+    parser.add_argument('--malformed-rate', type=float, default=DEFAULT_MALFORMED_RATE,
+                        help='Fraction of blocks without a ticket link (default: 0.02)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Timed runs per stage (default: 3)')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='Baseline file (default: bench-baseline.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the baseline')
+    parser.add_argument('--max-slowdown', type=float, default=DEFAULT_MAX_SLOWDOWN,
+                        help='Allowed throughput drop vs baseline (default: 0.25)')
+    parser.add_argument('--max-memory-growth', type=float, default=DEFAULT_MAX_MEMORY_GROWTH,
+                        help='Allowed peak memory growth vs baseline (default: 0.25)')
+    parser.add_argument('--json-out', help='Also write the results as JSON')
+
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.films, args.showtimes, args.malformed_rate, args.repeat)
+
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if report['workload']['rows'] != report['workload']['expected_rows']:
+        print(f"\n✗ Parsed {report['workload']['rows']} rows, expected {report['workload']['expected_rows']}")
+        sys.exit(1)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f"\n✓ Baseline saved to {args.baseline}")
+        return
+
+    if baseline is None:
+        print(f"\n⚠ No baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+
+    regressions = compare(report, baseline, args.max_slowdown, args.max_memory_growth)
+    if regressions:
+        print("\n✗ Performance regressions:")
+        for message in regressions:
+            print(f"  - {message}")
+        sys.exit(1)
+    print(f"\n✓ Within thresholds (throughput -{args.max_slowdown:.0%}, memory +{args.max_memory_growth:.0%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+"""
+Build the published showtime JSON from parse_showtimes.py CSV output.
+
+Resolves year-less dates ("Friday, February 6") to ISO datetimes using the
+ScrapedAt timestamp and day-of-week consistency, then joins each showtime
+to its film metadata (year, director, runtime, ...) by film_slug.
+"""
+
+import re
+import csv
+import json
+import os
+import sys
+import argparse
+from pathlib import Path
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from atomic_write import atomic_write_bytes
+
+# Get script directory for relative paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+
+# Per-film fields copied from metadata onto every showtime, in published key order
+FILM_FIELDS = ('country', 'year', 'director', 'actors', 'runtime', 'description')
+
+# Persistent film_url -> numeric ID registry shared by every scrape
+FILM_IDS_FILE = os.environ.get('FILM_IDS_FILE', str(SCRIPT_DIR / 'film-ids.json'))
+
+NORMALIZED_VERSION = 1
+SHOWTIME_COLUMNS = ['film_id', 'Datetime', 'Time', 'ticket_url']
+
+WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+MONTHS = ('January', 'February', 'March', 'April', 'May', 'June', 'July',
+          'August', 'September', 'October', 'November', 'December')
+
+DATE_PATTERN = re.compile(
+    r'^\s*(?:(?P<weekday>[A-Za-z]+),?\s+)?(?P<month>[A-Za-z]+)\.?\s+(?P<day>\d{1,2})'
+)
+TIME_PATTERN = re.compile(r'(\d{1,2}):(\d{2})\s*([AaPp]\.?[Mm]\.?)?')
+
+
+def resolve_date(date_str: str, scrape_dt: datetime) -> Tuple[date, bool]:
+    """
+    Resolve a year-less Film Forum date against the scrape timestamp.
+
+    Candidate years are the scrape year and its neighbours, so a January
+    screening scraped in December rolls over to the next year. Candidates
+    whose weekday matches the listed day win; among those the one closest
+    to the scrape date is chosen.
+
+    Args:
+        date_str: Date as listed (e.g., "Friday, February 6")
+        scrape_dt: When the page was scraped
+
+    Returns:
+        Tuple of (resolved date, weekday_matched). weekday_matched is False
+        when no candidate year agrees with the listed day of week.
+
+    Raises:
+        ValueError: If the month or day cannot be parsed
+
+    Examples:
+        >>> resolve_date('Friday, February 6', datetime(2026, 1, 20))
+        (datetime.date(2026, 2, 6), True)
+        >>> resolve_date('Friday, January 1', datetime(2026, 12, 10))
+        (datetime.date(2027, 1, 1), True)
+    """
+    match = DATE_PATTERN.match(date_str)
+    if not match:
+        raise ValueError(f"Unrecognized date: {date_str!r}")
+
+    month_name = match.group('month').capitalize()
+    month = next((i + 1 for i, m in enumerate(MONTHS) if m.startswith(month_name[:3])), None)
+    if month is None:
+        raise ValueError(f"Unrecognized month in date: {date_str!r}")
+    day = int(match.group('day'))
+
+    weekday_name = (match.group('weekday') or '').capitalize()
+    weekday = next((i for i, d in enumerate(WEEKDAYS) if weekday_name and d.startswith(weekday_name[:3])), None)
+
+    scrape_date = scrape_dt.date()
+    candidates = []
+    for year in (scrape_date.year - 1, scrape_date.year, scrape_date.year + 1):
+        try:
+            candidates.append(date(year, month, day))
+        except ValueError:
+            continue  # e.g. February 29 in a non-leap year
+    if not candidates:
+        raise ValueError(f"Invalid day of month in date: {date_str!r}")
+
+    def distance(d: date) -> Tuple[int, int]:
+        # Prefer the nearest date; on a tie prefer the future one
+        return abs((d - scrape_date).days), -d.toordinal()
+
+    if weekday is not None:
+        matching = [d for d in candidates if d.weekday() == weekday]
+        if matching:
+            return min(matching, key=distance), True
+        return min(candidates, key=distance), False
+
+    return min(candidates, key=distance), True
+
+
+def parse_time_to_minutes(time_str: str) -> int:
+    """
+    Parse a Film Forum showtime to minutes since midnight.
+
+    Mirrors parseTimeToMins in src/utils/movieUtils.ts: listings carry no
+    AM/PM, so "FF Jr" shows are mornings, 12:xx is noon and everything
+    else is PM. An explicit AM/PM suffix wins when present.
+
+    Args:
+        time_str: Time as listed (e.g., "6:10", "11:00 – FF Jr.", "7:00 PM")
+
+    Returns:
+        Minutes since midnight
+
+    Raises:
+        ValueError: If no H:MM time is found
+
+    Examples:
+        >>> parse_time_to_minutes('6:10')
+        1090
+        >>> parse_time_to_minutes('11:00 – FF Jr.')
+        660
+    """
+    match = TIME_PATTERN.search(time_str)
+    if not match:
+        raise ValueError(f"Unrecognized time: {time_str!r}")
+
+    hours = int(match.group(1))
+    minutes = int(match.group(2))
+    meridiem = (match.group(3) or '').replace('.', '').lower()
+
+    if meridiem:
+        hours = hours % 12 + (12 if meridiem == 'pm' else 0)
+    elif re.search(r'FF\s*Jr', time_str, re.IGNORECASE):
+        pass  # Morning kids' show
+    elif hours < 12:
+        hours += 12
+
+    return hours * 60 + minutes
+
+
+def resolve_datetime(date_str: str, time_str: str, scrape_dt: datetime) -> Tuple[datetime, bool]:
+    """
+    Combine a listed date and time into an absolute datetime.
+
+    Args:
+        date_str: Date as listed (e.g., "Friday, February 6")
+        time_str: Time as listed (e.g., "6:10")
+        scrape_dt: When the page was scraped
+
+    Returns:
+        Tuple of (datetime, weekday_matched)
+    """
+    day, weekday_matched = resolve_date(date_str, scrape_dt)
+    minutes = parse_time_to_minutes(time_str)
+    return datetime.combine(day, datetime.min.time()) + timedelta(minutes=minutes), weekday_matched
+
+
+def load_film_metadata(metadata_path: str) -> Dict[str, Dict[str, str]]:
+    """
+    Load film metadata into a hash index keyed by film_slug.
+
+    Accepts a JSON array or JSONL of film records. Records without a
+    film_slug get one derived from film_url/url, so a previously published
+    showtime JSON (one record per showtime) also works as a source; the
+    first record seen for each slug wins.
+
+    Args:
+        metadata_path: Path to a .json or .jsonl metadata file
+
+    Returns:
+        Dict mapping film_slug to its metadata record
+    """
+    with open(metadata_path, 'r', encoding='utf-8') as f:
+        if metadata_path.endswith('.jsonl'):
+            records = [json.loads(line) for line in f if line.strip()]
+        else:
+            records = json.load(f)
+
+    index: Dict[str, Dict[str, str]] = {}
+    for record in records:
+        slug = record.get('film_slug')
+        if not slug:
+            url = record.get('film_url') or record.get('url') or ''
+            slug = url.rstrip('/').split('/')[-1]
+        if slug and slug not in index:
+            index[slug] = record
+
+    return index
+
+
+def build_showtimes(rows: Iterable[Dict[str, str]], films: Dict[str, Dict[str, str]],
+                    scrape_timestamp: Optional[str] = None) -> Tuple[List[Dict[str, str]], List[str]]:
+    """
+    Resolve datetimes and join each showtime row to its film metadata.
+
+    Args:
+        rows: Showtime rows as dicts with parse_showtimes CSV columns
+        films: Metadata index from load_film_metadata
+        scrape_timestamp: ISO timestamp overriding each row's ScrapedAt
+
+    Returns:
+        Tuple of (movies sorted by Datetime, warnings)
+    """
+    movies = []
+    warnings = []
+    missing_slugs = set()
+
+    for row in rows:
+        title = row.get('Movie', '')
+        stamp = scrape_timestamp or row.get('ScrapedAt')
+        if not stamp:
+            warnings.append(f"Skipping {title} on {row.get('Date')}: no ScrapedAt timestamp")
+            continue
+
+        try:
+            when, weekday_matched = resolve_datetime(row['Date'], row['Time'], datetime.fromisoformat(stamp))
+        except (KeyError, ValueError) as e:
+            warnings.append(f"Skipping {title}: {e}")
+            continue
+        if not weekday_matched:
+            warnings.append(f"Warning: '{row['Date']}' does not fall on its weekday near {stamp[:10]}; using {when.date()}")
+
+        slug = row.get('film_slug', '')
+        film = films.get(slug)
+        if film is None and slug not in missing_slugs:
+            missing_slugs.add(slug)
+            warnings.append(f"Warning: No film metadata for '{title}' ({slug})")
+        film = film or {}
+
+        movie = {
+            'Movie': title,
+            'Date': row['Date'],
+            'Time': row['Time'],
+            'Datetime': when.isoformat(),
+        }
+        for field in FILM_FIELDS:
+            if film.get(field):
+                movie[field] = film[field]
+        movie['film_url'] = row.get('film_url') or film.get('film_url', '')
+        if film.get('poster_url'):
+            movie['poster_url'] = film['poster_url']
+        movie['film_slug'] = slug
+        movie['ticket_url'] = row.get('ticket_url', '')
+        movies.append(movie)
+
+    movies.sort(key=lambda m: m['Datetime'])
+    return movies, warnings
+
+
+def load_film_ids(ids_path: str) -> Dict[str, int]:
+    """
+    Load the persisted film_url (or film_slug) -> numeric ID registry.
+
+    Args:
+        ids_path: Path to the registry JSON
+
+    Returns:
+        Dict mapping film_url to its ID (empty if the file does not exist yet)
+    """
+    try:
+        with open(ids_path, 'r', encoding='utf-8') as f:
+            return {url: int(film_id) for url, film_id in json.load(f).items()}
+    except FileNotFoundError:
+        return {}
+
+
+def save_film_ids(film_ids: Dict[str, int], ids_path: str) -> None:
+    """
+    Write the film ID registry (atomic), ordered by ID so diffs stay readable.
+
+    Args:
+        film_ids: Dict mapping film_url to its ID
+        ids_path: Path to the registry JSON
+    """
+    data = json.dumps(dict(sorted(film_ids.items(), key=lambda item: item[1])), indent=2) + '\n'
+    atomic_write_bytes(ids_path, data.encode('utf-8'))
+
+
+def film_key(movie: Dict[str, str]) -> str:
+    """Registry key for a showtime's film: its film_url, or film_slug if missing."""
+    return movie.get('film_url') or movie['film_slug']
+
+
+def assign_film_ids(film_urls: Iterable[str], film_ids: Dict[str, int]) -> List[str]:
+    """
+    Give every unseen film_url the next sequential ID.
+
+    Existing IDs are never changed. New URLs are numbered in sorted order,
+    so the same scrape always produces the same IDs regardless of locale or
+    row order.
+
+    Args:
+        film_urls: film_url of every film in this build
+        film_ids: Registry to extend in place
+
+    Returns:
+        The newly assigned film_urls
+    """
+    next_id = max(film_ids.values(), default=-1) + 1
+    new_urls = sorted({url for url in film_urls if url and url not in film_ids})
+    for url in new_urls:
+        film_ids[url] = next_id
+        next_id += 1
+    return new_urls
+
+
+def register_films(movies: Iterable[Dict[str, str]], film_ids: Dict[str, int]) -> List[str]:
+    """
+    Make sure every film in movies has an ID in the registry.
+
+    A film seen without a film_url is registered under its film_slug. Once
+    its film_url appears, the URL is added with the slug's existing ID
+    instead of a new one. The slug entry is kept, so rows that still lack
+    the URL map to the same film. The same holds within one build when only
+    some of a film's rows carry the URL.
+
+    Args:
+        movies: Showtimes of this build
+        film_ids: Registry to extend in place
+
+    Returns:
+        Keys added to the registry, new films and aliases alike
+    """
+    movies = list(movies)
+    before = set(film_ids)
+    urls_by_slug = {m['film_slug']: m['film_url'] for m in movies if m.get('film_url') and m.get('film_slug')}
+
+    for slug, url in urls_by_slug.items():
+        if url not in film_ids and slug in film_ids:
+            film_ids[url] = film_ids[slug]
+    assign_film_ids((film_key(m) for m in movies if m.get('film_url') or m['film_slug'] not in urls_by_slug),
+                    film_ids)
+    for movie in movies:
+        slug = movie['film_slug']
+        if not movie.get('film_url') and slug in urls_by_slug and slug not in film_ids:
+            film_ids[slug] = film_ids[urls_by_slug[slug]]
+
+    return sorted(set(film_ids) - before)
+
+
+def normalize_showtimes(movies: List[Dict[str, str]], film_ids: Dict[str, int]) -> Dict[str, object]:
+    """
+    Split denormalized showtimes into a films table and a compact showtimes table.
+
+    Film fields are stored once per film under its numeric ID. Showtimes are
+    positional rows (see SHOWTIME_COLUMNS); ticket_url is null when it equals
+    the film's default ticket_url.
+
+    Args:
+        movies: Output of build_showtimes
+        film_ids: Registry covering every film_url in movies
+
+    Returns:
+        Dict with version, films (keyed by ID) and showtimes (columns + rows)
+    """
+    films: Dict[str, Dict[str, str]] = {}
+    rows = []
+
+    for movie in movies:
+        film_id = film_ids[film_key(movie)]
+        key = str(film_id)
+        if key not in films:
+            films[key] = {
+                field: value for field, value in movie.items()
+                if field not in ('Date', 'Time', 'Datetime')
+            }
+        ticket_url = movie.get('ticket_url', '')
+        rows.append([
+            film_id,
+            movie['Datetime'],
+            movie['Time'],
+            None if ticket_url == films[key].get('ticket_url') else ticket_url,
+        ])
+
+    return {
+        'version': NORMALIZED_VERSION,
+        'films': dict(sorted(films.items(), key=lambda item: int(item[0]))),
+        'showtimes': {'columns': SHOWTIME_COLUMNS, 'rows': rows},
+    }
+
+
+def expand_normalized(data: Dict[str, object]) -> List[Dict[str, str]]:
+    """
+    Rebuild one dict per showtime from normalize_showtimes output.
+
+    Args:
+        data: Normalized artifact
+
+    Returns:
+        List of showtime dicts with film fields merged in and numericId set
+    """
+    films = data['films']
+    columns = data['showtimes']['columns']
+    movies = []
+
+    for values in data['showtimes']['rows']:
+        showtime = dict(zip(columns, values))
+        film = films[str(showtime['film_id'])]
+        movie = dict(film)
+        movie['numericId'] = showtime['film_id']
+        movie['Datetime'] = showtime['Datetime']
+        movie['Time'] = showtime['Time']
+        if showtime['ticket_url'] is not None:
+            movie['ticket_url'] = showtime['ticket_url']
+        movies.append(movie)
+
+    return movies
+
+
+def main():
+    """Main entry point for command-line execution."""
+    parser = argparse.ArgumentParser(
+        description='Build published showtime JSON from parsed CSV and film metadata',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # Build tenement-stories JSON using the currently published file as metadata
+  %(prog)s --metadata ../public/tenement-stories-full.json
+
+  # Specify custom input/output files
+  %(prog)s --input my-series.csv --metadata films.jsonl --output my-series.json
+'''
+    )
+    parser.add_argument(
+        '--series',
+        default='tenement-stories',
+        help='Series name (default: tenement-stories). Used to determine default input/output files.'
+    )
+    parser.add_argument(
+        '--input',
+        help='Input CSV from parse_showtimes.py (overrides --series default)'
+    )
+    parser.add_argument(
+        '--metadata',
+        required=True,
+        help='Film metadata JSON/JSONL, keyed by film_slug (or film_url)'
+    )
+    parser.add_argument(
+        '--output',
+        help='Output JSON file path (overrides --series default)'
+    )
+    parser.add_argument(
+        '--normalized-output',
+        help='Also write a normalized films/showtimes JSON with stable numeric film IDs'
+    )
+    parser.add_argument(
+        '--ids-file',
+        default=FILM_IDS_FILE,
+        help='film_url -> numeric ID registry, persisted across scrapes (default: film-ids.json)'
+    )
+    parser.add_argument(
+        '--scraped-at',
+        help='ISO timestamp used to resolve dates (default: each row\'s ScrapedAt)'
+    )
+
+    args = parser.parse_args()
+
+    input_csv = args.input or os.environ.get('INPUT_CSV', str(PROJECT_ROOT / f'{args.series}.csv'))
+    output_json = args.output or os.environ.get('OUTPUT_JSON', str(PROJECT_ROOT / f'{args.series}-full.json'))
+
+    try:
+        films = load_film_metadata(args.metadata)
+    except FileNotFoundError:
+        print(f"Error: Metadata file not found: {args.metadata}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error reading metadata file: {e}")
+        sys.exit(1)
+
+    try:
+        with open(input_csv, 'r', newline='', encoding='utf-8') as f:
+            movies, warnings = build_showtimes(csv.DictReader(f), films, args.scraped_at)
+    except FileNotFoundError:
+        print(f"Error: Input file not found: {input_csv}")
+        sys.exit(1)
+
+    if warnings:
+        print("\n⚠ Build Warnings:")
+        for warning in warnings:
+            print(f"  {warning}")
+
+    try:
+        with open(output_json, 'w', encoding='utf-8') as f:
+            json.dump(movies, f, indent=2, ensure_ascii=False)
+    except Exception as e:
+        print(f"Error writing JSON file: {e}")
+        sys.exit(1)
+
+    if args.normalized_output:
+        film_ids = load_film_ids(args.ids_file)
+        new_keys = register_films(movies, film_ids)
+        try:
+            with open(args.normalized_output, 'w', encoding='utf-8') as f:
+                json.dump(normalize_showtimes(movies, film_ids), f, ensure_ascii=False, separators=(',', ':'))
+            save_film_ids(film_ids, args.ids_file)
+        except Exception as e:
+            print(f"Error writing normalized JSON: {e}")
+            sys.exit(1)
+        print(f"✓ Wrote normalized output to: {args.normalized_output} ({len(new_keys)} new film IDs)")
+
+    print(f"\n✓ Built {len(movies)} showtimes for {len(set(m['film_slug'] for m in movies))} films")
+    print(f"✓ Joined metadata for {len(films)} films from: {args.metadata}")
+    print(f"✓ Wrote output to: {output_json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Columnar, dictionary-encoded form of the published showtime JSON.
+
+{series}-full.json is an array of objects, so each row repeats every field
+name and long strings like ticket_url, film_url and description. This
+module writes the same rows as one array per field (struct-of-arrays):
+
+- Datetime is stored as a base minute plus the minute deltas between
+  consecutive rows, which are sorted by Datetime.
+- Every other field is dictionary-encoded: each distinct value appears
+  once in `values`, and `codes` holds one index per row, with -1 where the
+  row has no such field.
+
+decode_columnar() restores the rows exactly (same values and key order),
+and src/utils/columnar.ts decodes the file in the browser.
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+from atomic_write import write_if_changed
+
+# Get script directory for relative paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+
+COLUMNAR_VERSION = 1
+DATETIME_FIELD = 'Datetime'
+DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+EPOCH = datetime(1970, 1, 1)
+# Code of a field a row does not have
+ABSENT = -1
+
+
+def encode_columnar(movies: Sequence[Dict[str, Any]], series: str) -> Dict[str, Any]:
+    """
+    Encode showtime rows column-wise.
+
+    Args:
+        movies: Published showtime dicts
+        series: Series name recorded in the artifact
+
+    Returns:
+        Dict with version, series, count, fields (key order), the delta-encoded
+        Datetime column and one dictionary-encoded column per other field
+
+    Raises:
+        ValueError: If a Datetime is missing or not on a whole minute
+    """
+    rows = sorted(movies, key=lambda m: m[DATETIME_FIELD])
+    fields = list(dict.fromkeys(field for row in rows for field in row))
+
+    minutes = []
+    for row in rows:
+        when = datetime.strptime(row[DATETIME_FIELD], DATETIME_FORMAT)
+        if when.second:
+            raise ValueError(f"Datetime {row[DATETIME_FIELD]!r} is not on a whole minute")
+        minutes.append(int((when - EPOCH).total_seconds()) // 60)
+    deltas = [b - a for a, b in zip(minutes, minutes[1:])]
+
+    columns: Dict[str, Any] = {}
+    for field in fields:
+        if field == DATETIME_FIELD:
+            continue
+        index: Dict[str, int] = {}
+        values: List[Any] = []
+        codes: List[int] = []
+        for row in rows:
+            if field not in row:
+                codes.append(ABSENT)
+                continue
+            # Key by canonical JSON so lists/dicts (poster_variants) are deduplicated too
+            key = json.dumps(row[field], sort_keys=True, ensure_ascii=False)
+            code = index.get(key)
+            if code is None:
+                code = index[key] = len(values)
+                values.append(row[field])
+            codes.append(code)
+        columns[field] = {'values': values, 'codes': codes}
+
+    return {
+        'version': COLUMNAR_VERSION,
+        'series': series,
+        'count': len(rows),
+        'fields': fields,
+        'datetime': {
+            'base': rows[0][DATETIME_FIELD][:16] if rows else None,
+            'deltas': deltas,
+        },
+        'columns': columns,
+    }
+
+
+def decode_columnar(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Restore showtime rows from encode_columnar output.
+
+    Args:
+        data: Columnar artifact
+
+    Returns:
+        Showtime dicts sorted by Datetime, keys in the original order
+
+    Raises:
+        ValueError: On an unsupported version
+    """
+    if data.get('version') != COLUMNAR_VERSION:
+        raise ValueError(f"Unsupported columnar version: {data.get('version')}")
+
+    count = data['count']
+    datetimes: List[str] = []
+    if count:
+        current = datetime.strptime(data['datetime']['base'], '%Y-%m-%dT%H:%M')
+        datetimes.append(current.strftime(DATETIME_FORMAT))
+        for delta in data['datetime']['deltas']:
+            current += timedelta(minutes=delta)
+            datetimes.append(current.strftime(DATETIME_FORMAT))
+
+    rows: List[Dict[str, Any]] = [{} for _ in range(count)]
+    columns = data['columns']
+    for field in data['fields']:
+        if field == DATETIME_FIELD:
+            for row, value in zip(rows, datetimes):
+                row[field] = value
+            continue
+        values = columns[field]['values']
+        for row, code in zip(rows, columns[field]['codes']):
+            if code != ABSENT:
+                row[field] = values[code]
+    return rows
+
+
+def serialize_columnar(movies: Sequence[Dict[str, Any]], series: str) -> str:
+    """Encode rows and serialize them as compact JSON."""
+    return json.dumps(encode_columnar(movies, series), ensure_ascii=False, separators=(',', ':'))
+
+
+def write_columnar(movies: Sequence[Dict[str, Any]], output_path: str, series: str) -> bool:
+    """
+    Write the columnar artifact, leaving the file alone if it is unchanged.
+
+    Args:
+        movies: Published showtime dicts
+        output_path: Destination JSON file
+        series: Series name
+
+    Returns:
+        True if the file was (re)written
+    """
+    return write_if_changed(output_path, serialize_columnar(movies, series).encode('utf-8'))
+
+
+def main():
+    """Main entry point for command-line execution."""
+    parser = argparse.ArgumentParser(
+        description='Write the published showtime JSON in columnar, dictionary-encoded form',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # public/tenement-stories-full.json -> public/tenement-stories-columnar.json
+  %(prog)s
+
+  # Custom files
+  %(prog)s --series my-series --input merged.json --output merged-columnar.json
+'''
+    )
+    parser.add_argument(
+        '--series',
+        default='tenement-stories',
+        help='Series name (default: tenement-stories). Used to determine default input/output files.'
+    )
+    parser.add_argument(
+        '--input',
+        help='Published showtime JSON (default: public/{series}-full.json)'
+    )
+    parser.add_argument(
+        '--output',
+        help='Columnar JSON (default: public/{series}-columnar.json)'
+    )
+    args = parser.parse_args()
+
+    input_json = args.input or str(PROJECT_ROOT / 'public' / f'{args.series}-full.json')
+    output_json = args.output or str(PROJECT_ROOT / 'public' / f'{args.series}-columnar.json')
+
+    try:
+        with open(input_json, 'r', encoding='utf-8') as f:
+            movies = json.load(f)
+    except FileNotFoundError:
+        print(f"Error: Input file not found: {input_json}")
+        sys.exit(1)
+
+    try:
+        written = write_columnar(movies, output_json, args.series)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    before = os.path.getsize(input_json)
+    after = os.path.getsize(output_json)
+    print(f"✓ Encoded {len(movies)} showtimes: {before:,} -> {after:,} bytes ({after / before:.0%})")
+    print(f"✓ {'Wrote' if written else 'Unchanged:'} {output_json}")
+
+
+if __name__ == '__main__':
+    main()
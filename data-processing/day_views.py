@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Precompute per-day calendar layouts from published showtime JSON.
+
+The calendar places each screening on a timeline from its start time and
+runtime, splits overlapping screenings into columns and sizes each day to
+its earliest start and latest end. This module does that work at build
+time. Each day in {series}-days.json lists its time range, the number of
+columns it needs, its screenings with start/end minutes and an assigned
+column, and its films with their showtimes. Columns follow the calendar's
+two-column layout (calendarTime.ts) and come from one pass over the day's
+screenings in start order, so each day costs O(n log n) for the sort.
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+from atomic_write import write_if_changed
+
+# Get script directory for relative paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+
+DAY_VIEWS_VERSION = 2
+# Same fallback as the timeline in src/utils/calendarTime.ts
+DEFAULT_RUNTIME = 90
+
+RUNTIME_PATTERN = re.compile(r'\d+')
+
+
+def runtime_minutes(runtime: Any, default: int = DEFAULT_RUNTIME) -> int:
+    """
+    Parse a runtime like "92 min" to minutes.
+
+    Args:
+        runtime: Runtime as published (string, number or None)
+        default: Minutes used when the runtime is missing or unparseable
+
+    Returns:
+        Runtime in minutes
+    """
+    match = RUNTIME_PATTERN.search(str(runtime or ''))
+    return int(match.group()) if match else default
+
+
+def assign_columns(intervals: Sequence[Tuple[int, int]]) -> Tuple[List[int], List[bool]]:
+    """
+    Assign columns the way the calendar timeline does.
+
+    Mirrors assignOverlapColumns in src/utils/calendarTime.ts, a two-column
+    layout: in start order (ties keep their input order), a screening goes
+    to column 1 if any earlier screening is still running at its start, and
+    is flagged as overlapping together with the first such screening.
+    Otherwise it goes to column 0. Starts only grow, so an earlier screening
+    that has ended can never be the first running one again. A pointer past
+    those replaces the calendar's rescan of every earlier screening.
+
+    Args:
+        intervals: (start, end) minutes per screening; end is exclusive
+
+    Returns:
+        Tuple of (column per interval, 0 or 1, and overlap flag per
+        interval), both in input order
+    """
+    order = sorted(range(len(intervals)), key=lambda i: intervals[i][0])
+    columns = [0] * len(intervals)
+    overlaps = [False] * len(intervals)
+
+    first = 0  # position in order of the earliest screening that may still be running
+    for position, index in enumerate(order):
+        start = intervals[index][0]
+        while first < position and intervals[order[first]][1] <= start:
+            first += 1
+        if first < position:
+            columns[index] = 1
+            overlaps[index] = True
+            overlaps[order[first]] = True
+
+    return columns, overlaps
+
+
+def build_day_view(movies: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Lay out one day's screenings.
+
+    Args:
+        movies: Showtime dicts of a single day (published JSON rows)
+
+    Returns:
+        Dict with start, end, range (minutes since midnight), columns,
+        screenings (sorted by start) and films (grouped by title, in order
+        of first screening)
+    """
+    intervals = []
+    for movie in movies:
+        when = datetime.fromisoformat(movie['Datetime'])
+        start = when.hour * 60 + when.minute
+        intervals.append((start, start + runtime_minutes(movie.get('runtime'))))
+
+    columns, overlaps = assign_columns(intervals)
+
+    screenings = []
+    for movie, (start, end), column, overlap in zip(movies, intervals, columns, overlaps):
+        screenings.append({
+            'film_slug': movie.get('film_slug', ''),
+            'Movie': movie['Movie'],
+            'Time': movie['Time'],
+            'Datetime': movie['Datetime'],
+            'ticket_url': movie.get('ticket_url', ''),
+            'start': start,
+            'end': end,
+            'col': column,
+            'overlap': overlap,
+        })
+    screenings.sort(key=lambda s: (s['start'], s['Movie']))
+
+    films: Dict[str, Dict[str, Any]] = {}
+    for screening in screenings:
+        film = films.setdefault(screening['Movie'], {
+            'film_slug': screening['film_slug'],
+            'Movie': screening['Movie'],
+            'showtimes': [],
+        })
+        film['showtimes'].append({'time': screening['Time'], 'tickets': screening['ticket_url']})
+
+    start = min((s['start'] for s in screenings), default=0)
+    end = max((s['end'] for s in screenings), default=0)
+    return {
+        'start': start,
+        'end': end,
+        'range': end - start,
+        'columns': max(columns, default=-1) + 1,
+        'screenings': screenings,
+        'films': list(films.values()),
+    }
+
+
+def build_day_views(movies: Sequence[Dict[str, Any]], series: str) -> Dict[str, Any]:
+    """
+    Lay out every day of a schedule.
+
+    Args:
+        movies: Published showtime dicts (any order)
+        series: Series name recorded in the artifact
+
+    Returns:
+        Artifact dict with version, series, default_runtime, start/end dates
+        and days keyed by ISO date
+    """
+    by_day: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for movie in movies:
+        by_day[movie['Datetime'][:10]].append(movie)
+
+    dates = sorted(by_day)
+    return {
+        'version': DAY_VIEWS_VERSION,
+        'series': series,
+        'default_runtime': DEFAULT_RUNTIME,
+        'start': dates[0] if dates else None,
+        'end': dates[-1] if dates else None,
+        'days': {day: build_day_view(by_day[day]) for day in dates},
+    }
+
+
+def write_day_views(movies: Sequence[Dict[str, Any]], output_path: str, series: str) -> bool:
+    """
+    Write the day views artifact, leaving the file alone if it is unchanged.
+
+    Args:
+        movies: Published showtime dicts
+        output_path: Destination JSON file
+        series: Series name
+
+    Returns:
+        True if the file was (re)written
+    """
+    data = json.dumps(build_day_views(movies, series), ensure_ascii=False, separators=(',', ':'))
+    return write_if_changed(output_path, data.encode('utf-8'))
+
+
+def main():
+    """Main entry point for command-line execution."""
+    parser = argparse.ArgumentParser(
+        description='Precompute per-day calendar layouts (time ranges and overlap columns)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # Lay out public/tenement-stories-full.json into public/tenement-stories-days.json
+  %(prog)s
+
+  # Another series / custom files
+  %(prog)s --series my-series
+  %(prog)s --input merged.json --output merged-days.json
+'''
+    )
+    parser.add_argument(
+        '--series',
+        default='tenement-stories',
+        help='Series name (default: tenement-stories). Used to determine default input/output files.'
+    )
+    parser.add_argument(
+        '--input',
+        help='Published showtime JSON (default: public/{series}-full.json)'
+    )
+    parser.add_argument(
+        '--output',
+        help='Day views JSON (default: public/{series}-days.json)'
+    )
+    args = parser.parse_args()
+
+    input_json = args.input or str(PROJECT_ROOT / 'public' / f'{args.series}-full.json')
+    output_json = args.output or str(PROJECT_ROOT / 'public' / f'{args.series}-days.json')
+
+    try:
+        with open(input_json, 'r', encoding='utf-8') as f:
+            movies = json.load(f)
+    except FileNotFoundError:
+        print(f"Error: Input file not found: {input_json}")
+        sys.exit(1)
+
+    written = write_day_views(movies, output_json, args.series)
+    days = len({m['Datetime'][:10] for m in movies})
+    status = "Wrote" if written else "Unchanged:"
+    print(f"✓ Laid out {len(movies)} showtimes over {days} days")
+    print(f"✓ {status} {output_json}")
+
+
+if __name__ == '__main__':
+    main()
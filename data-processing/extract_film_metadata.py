@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Extract structured film metadata from cached Film Forum film pages.
+
+Reads each page in chunks and stops as soon as the credits paragraph has
+been seen, so only the <head> (og:image, canonical link) and the top of the
+body (title, credits, description) are scanned. Pages are
+processed across a process pool, and results are cached per file by
+mtime/size with a content-hash fallback, so re-indexing a large
+movie-pages/ directory only re-parses pages that actually changed.
+
+Emits one JSON record per film (JSONL) with: film_slug, title, film_url,
+og_image (the remote poster URL), country, year, director, actors, runtime,
+description.
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from atomic_write import atomic_write_bytes
+
+# Get script directory for relative paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+
+HTML_DIR = os.environ.get('HTML_DIR', str(SCRIPT_DIR / 'movie-pages'))
+METADATA_CACHE = os.environ.get('METADATA_CACHE', str(SCRIPT_DIR / '.metadata-cache.json'))
+
+# Bump when extraction logic changes to invalidate cached records
+EXTRACTOR_VERSION = '2'
+CHUNK_SIZE = 16 * 1024
+
+RECORD_FIELDS = ('film_slug', 'title', 'film_url', 'og_image', 'country', 'year',
+                 'director', 'actors', 'runtime', 'description')
+
+OG_IMAGE_PATTERN = re.compile(r'property="og:image"\s+content="([^"]+)"')
+OG_TITLE_PATTERN = re.compile(r'property="og:title"\s+content="([^"]+)"')
+CANONICAL_PATTERN = re.compile(r'<link rel="canonical" href="([^"]+)"')
+TITLE_PATTERN = re.compile(r'<h2 class="main-title">(.*?)</h2>', re.DOTALL)
+COPY_START = '<div class="copy">'
+COPY_END = '</p>'
+# Credits are the run of <strong> blocks opening the first paragraph
+CREDITS_PATTERN = re.compile(r'<p>\s*((?:<strong>.*?</strong>(?:\s|<br\s*/?>)*)+)(.*?)(?:</p>|$)', re.DOTALL)
+BREAK_PATTERN = re.compile(r'<br\s*/?>', re.IGNORECASE)
+# Collapsed inside description lines; &nbsp; between words is kept, as in the published data
+ASCII_WHITESPACE_PATTERN = re.compile(r'[ \t\r\n]+')
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+COUNTRY_YEAR_PATTERN = re.compile(r'^(?P<country>.+?),\s*(?P<year>\d{4})$')
+DIRECTOR_PATTERN = re.compile(r'\bDirected\b.*?\bby\s+(?P<names>.+)$', re.IGNORECASE)
+ACTORS_PATTERN = re.compile(r'^(?:Starring|With|Featuring)\s+(?P<names>.+)$')
+RUNTIME_PATTERN = re.compile(r'^Approx\.?\s*(?P<minutes>\d+)\s*min', re.IGNORECASE)
+
+
+def clean_text(fragment: str) -> str:
+    """Strip tags, decode entities and collapse whitespace (including &nbsp;)."""
+    text = html.unescape(TAG_PATTERN.sub('', fragment))
+    return ' '.join(text.split())
+
+
+def read_page_prefix(path: str) -> str:
+    """
+    Read a page only as far as the end of its credits block.
+
+    Args:
+        path: HTML file
+
+    Returns:
+        Decoded text from the start of the file through the first </p>
+        after <div class="copy">, which closes the credits and description
+        paragraph (or the whole file if there is none)
+    """
+    copy_start = COPY_START.encode('ascii')
+    copy_end = COPY_END.encode('ascii')
+    buffer = bytearray()
+    copy_at = -1
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            # Only search the new bytes (plus a marker-length overlap)
+            search_from = max(0, len(buffer) - len(copy_start))
+            buffer += chunk
+            if copy_at < 0:
+                copy_at = buffer.find(copy_start, search_from)
+                search_from = copy_at
+            if copy_at >= 0 and buffer.find(copy_end, max(search_from, copy_at)) >= 0:
+                break
+    return buffer.decode('utf-8', errors='replace')
+
+
+def parse_credits(credits_html: str) -> Dict[str, str]:
+    """
+    Parse the bold credits block ("U.S., 1931<br />Directed by ...").
+
+    Args:
+        credits_html: HTML of the <strong> credits element(s)
+
+    Returns:
+        Dict with any of country, year, director, actors, runtime
+    """
+    fields: Dict[str, str] = {}
+    lines = [clean_text(line) for line in BREAK_PATTERN.split(credits_html)]
+    for index, line in enumerate(line for line in lines if line):
+        if index == 0:
+            match = COUNTRY_YEAR_PATTERN.match(line)
+            if match:
+                fields['country'] = match.group('country')
+                fields['year'] = match.group('year')
+                continue
+        match = DIRECTOR_PATTERN.search(line)
+        if match and 'director' not in fields:
+            fields['director'] = match.group('names').strip(' ,')
+            continue
+        match = ACTORS_PATTERN.match(line)
+        if match and 'actors' not in fields:
+            fields['actors'] = match.group('names').strip(' ,')
+            continue
+        match = RUNTIME_PATTERN.match(line)
+        if match and 'runtime' not in fields:
+            fields['runtime'] = f"{match.group('minutes')} min"
+    return fields
+
+
+def parse_description(description_html: str) -> str:
+    """
+    Turn the rest of the credits paragraph into description text.
+
+    Args:
+        description_html: HTML after the first </strong> of the paragraph
+
+    Returns:
+        Every non-empty <br />-separated line, joined with blank lines
+    """
+    lines = (html.unescape(TAG_PATTERN.sub('', line)) for line in BREAK_PATTERN.split(description_html))
+    lines = (ASCII_WHITESPACE_PATTERN.sub(' ', line).strip() for line in lines)
+    return '\n\n'.join(line for line in lines if line)
+
+
+def extract_film_metadata(path: str) -> Dict[str, str]:
+    """
+    Extract one film's metadata from its cached page.
+
+    Args:
+        path: Film page HTML file (named {film_slug}.html)
+
+    Returns:
+        Record with the RECORD_FIELDS keys (empty strings when absent)
+    """
+    text = read_page_prefix(path)
+    head_end = text.find('</head>')
+    head = text if head_end < 0 else text[:head_end]
+    body = '' if head_end < 0 else text[head_end:]
+
+    record = {field: '' for field in RECORD_FIELDS}
+    record['film_slug'] = Path(path).stem
+
+    match = CANONICAL_PATTERN.search(head)
+    if match:
+        record['film_url'] = match.group(1)
+    match = OG_IMAGE_PATTERN.search(head)
+    if match:
+        record['og_image'] = match.group(1)
+
+    match = TITLE_PATTERN.search(body)
+    if match:
+        record['title'] = clean_text(match.group(1))
+    else:
+        match = OG_TITLE_PATTERN.search(head)
+        if match:
+            record['title'] = clean_text(match.group(1)).replace('Film Forum · ', '', 1)
+
+    copy_at = body.find(COPY_START)
+    if copy_at >= 0:
+        match = CREDITS_PATTERN.search(body, copy_at)
+        if match:
+            record.update(parse_credits(match.group(1)))
+            # The description starts after the first <strong> block; later blocks
+            # (awards, "Shown with" shorts) are part of it, as on the site
+            first_block_end = body.find('</strong>', match.start(1)) + len('</strong>')
+            record['description'] = parse_description(body[first_block_end:match.end(2)])
+
+    return record
+
+
+def _extract_safe(path: str) -> Tuple[Optional[Dict[str, str]], Optional[str]]:
+    try:
+        return extract_film_metadata(path), None
+    except Exception as e:
+        return None, f'{type(e).__name__}: {e}'
+
+
+def file_digest(path: str) -> str:
+    """Hex SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MetadataCache:
+    """Per-file extraction cache keyed by path, validated by mtime/size then hash."""
+
+    def __init__(self, cache_path: Optional[str] = METADATA_CACHE) -> None:
+        """
+        Args:
+            cache_path: JSON cache file (None: in-memory only)
+        """
+        self.cache_path = cache_path
+        self.entries: Dict[str, Dict[str, object]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, object]]:
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        if data.get('version') != EXTRACTOR_VERSION:
+            return {}
+        return data.get('files', {})
+
+    def lookup(self, path: str) -> Tuple[Optional[Dict[str, str]], bool]:
+        """
+        Return the cached record for a file if it is still valid.
+
+        Unchanged mtime and size are trusted without reading the file. When
+        they differ, the file is hashed and the record reused if the bytes
+        are unchanged (e.g. after a re-download or checkout).
+
+        Args:
+            path: HTML file
+
+        Returns:
+            Tuple of (record or None, whether the file had to be hashed)
+        """
+        entry = self.entries.get(path)
+        if entry is None:
+            return None, False
+        stat = os.stat(path)
+        if entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return entry['record'], False
+        if entry['size'] == stat.st_size and entry['sha256'] == file_digest(path):
+            entry['mtime_ns'] = stat.st_mtime_ns
+            return entry['record'], True
+        return None, True
+
+    def store(self, path: str, record: Dict[str, str]) -> None:
+        """Record a freshly extracted file."""
+        stat = os.stat(path)
+        self.entries[path] = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': file_digest(path),
+            'record': record,
+        }
+
+    def prune(self, keep: List[str]) -> int:
+        """Drop entries for files not in keep; return how many were dropped."""
+        stale = set(self.entries) - set(keep)
+        for path in stale:
+            del self.entries[path]
+        return len(stale)
+
+    def save(self) -> None:
+        """Write the cache (atomic)."""
+        if not self.cache_path:
+            return
+        data = json.dumps({'version': EXTRACTOR_VERSION, 'files': self.entries}, ensure_ascii=False)
+        atomic_write_bytes(self.cache_path, data.encode('utf-8'))
+
+
+def extract_all(paths: List[str], cache: Optional[MetadataCache] = None,
+                workers: Optional[int] = None) -> Tuple[List[Dict[str, str]], Dict[str, object]]:
+    """
+    Extract metadata for many pages, re-parsing only cache misses.
+
+    Args:
+        paths: HTML files
+        cache: Extraction cache (None: extract everything)
+        workers: Worker processes (default: CPU count). 1 runs inline.
+
+    Returns:
+        Tuple of (records in path order, stats dict with cached, extracted
+        and errors)
+    """
+    records: Dict[str, Dict[str, str]] = {}
+    misses = []
+    for path in paths:
+        record = cache.lookup(path)[0] if cache else None
+        if record is None:
+            misses.append(path)
+        else:
+            records[path] = record
+
+    if workers == 1 or len(misses) <= 1:
+        results = [_extract_safe(path) for path in misses]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(misses) // ((workers or os.cpu_count() or 1) * 4))
+            results = list(executor.map(_extract_safe, misses, chunksize=chunksize))
+
+    errors = []
+    for path, (record, error) in zip(misses, results):
+        if error:
+            errors.append((path, error))
+            continue
+        records[path] = record
+        if cache:
+            cache.store(path, record)
+
+    if cache:
+        cache.prune(paths)
+
+    stats = {'cached': len(paths) - len(misses), 'extracted': len(misses) - len(errors), 'errors': errors}
+    return [records[path] for path in paths if path in records], stats
+
+
+def write_jsonl(records: List[Dict[str, str]], output_path: str) -> None:
+    """Write one JSON record per line (atomic)."""
+    data = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+    atomic_write_bytes(output_path, data.encode('utf-8'))
+
+
+def main():
+    """Main entry point for command-line execution."""
+    parser = argparse.ArgumentParser(
+        description='Extract film metadata (year, director, runtime, ...) from cached film pages',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # Index movie-pages/ into film-metadata.jsonl
+  %(prog)s
+
+  # Custom directory and output, 16 worker processes
+  %(prog)s --html-dir ../data/film-pages --output films.jsonl --workers 16
+
+  # Ignore the cache and re-parse every page
+  %(prog)s --no-cache
+'''
+    )
+    parser.add_argument('--html-dir', default=HTML_DIR, help='Directory of cached film pages (default: movie-pages/)')
+    parser.add_argument('--output', default=str(SCRIPT_DIR / 'film-metadata.jsonl'), help='Output JSONL file')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true', help='Re-parse every page without reading or writing the cache')
+    parser.add_argument('--cache-file', default=METADATA_CACHE, help='Cache file (default: .metadata-cache.json)')
+
+    args = parser.parse_args()
+
+    paths = [str(path) for path in sorted(Path(args.html_dir).glob('*.html'))]
+    if not paths:
+        print(f"Error: No .html files in {args.html_dir}")
+        sys.exit(1)
+
+    cache = None if args.no_cache else MetadataCache(args.cache_file)
+    records, stats = extract_all(paths, cache, args.workers)
+    if cache:
+        cache.save()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    write_jsonl(records, args.output)
+
+    print(f"✓ {len(records)} film records written to {args.output}")
+    print(f"  {stats['extracted']} extracted, {stats['cached']} from cache")
+    incomplete = [r['film_slug'] for r in records if not (r['year'] and r['director'] and r['runtime'])]
+    if incomplete:
+        print(f"⚠ Missing year/director/runtime: {', '.join(incomplete)}")
+    for path, error in stats['errors']:
+        print(f"✗ {path}: {error}")
+    if stats['errors']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+Enrich films with OMDb scores and plots (see plans/omdb-integration.md).
+
+Writes public/omdb-data.json keyed by "title::year" (lower-cased Film Forum
+title, as the UI looks it up). Film Forum data is only read, never changed.
+
+The free OMDb tier allows 1,000 requests per day, so lookups are budgeted:
+
+- Every response, including "Movie not found!", is kept in a local cache;
+  a film with fresh cached data is never queried again
+- A per-day quota ledger spreads lookups over several runs, spending each
+  run's budget on films with the soonest upcoming showtimes first
+- Duplicate titles share one lookup, and concurrent requests for the same
+  query are coalesced into a single HTTP call
+"""
+
+import argparse
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from atomic_write import atomic_write_bytes
+
+# Get script directory for relative paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+
+OMDB_BASE_URL = os.environ.get('OMDB_BASE_URL', 'https://www.omdbapi.com/')
+OMDB_CACHE = os.environ.get('OMDB_CACHE', str(SCRIPT_DIR / '.omdb-cache.json'))
+OVERRIDES_FILE = os.environ.get('OMDB_OVERRIDES', str(SCRIPT_DIR / 'omdb-overrides.json'))
+
+DAILY_QUOTA = 1000
+DEFAULT_RATE = 1.0  # requests per second
+DEFAULT_WORKERS = 2
+DEFAULT_TTL_DAYS = 90
+DEFAULT_NEGATIVE_TTL_DAYS = 14
+DEFAULT_TIMEOUT = 15.0
+QUOTA_ERROR = 'Request limit reached!'
+
+
+class QuotaExhausted(Exception):
+    """Raised when today's request budget is spent (locally or by OMDb)."""
+
+
+def omdb_key(title: str, year: str) -> str:
+    """Build the omdb-data.json key for a film ("street scene::1931")."""
+    return f'{title.lower()}::{year}'
+
+
+def load_api_key(env_path: Path = PROJECT_ROOT / '.env') -> str:
+    """
+    Read OMDB_API_KEY from the environment, falling back to the project .env file.
+
+    Returns:
+        API key, or '' if not configured
+    """
+    if os.environ.get('OMDB_API_KEY'):
+        return os.environ['OMDB_API_KEY']
+    try:
+        with open(env_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                name, _, value = line.strip().partition('=')
+                if name.strip() == 'OMDB_API_KEY':
+                    return value.strip().strip('"\'')
+    except FileNotFoundError:
+        pass
+    return ''
+
+
+def to_entry(title: str, year: str, response: Dict[str, object]) -> Dict[str, Optional[str]]:
+    """
+    Transform an OMDb response into an OMDbEntry.
+
+    Args:
+        title: Film Forum title
+        year: Film Forum year
+        response: Successful OMDb JSON response
+
+    Returns:
+        Dict with title, year, imdb_id, imdb_rating, rotten_tomatoes,
+        metacritic and plot ("N/A" becomes None)
+    """
+    def value(raw: object) -> Optional[str]:
+        return None if raw in (None, '', 'N/A') else str(raw)
+
+    ratings = {rating.get('Source'): rating.get('Value') for rating in response.get('Ratings') or []}
+    metacritic = value(ratings.get('Metacritic') or response.get('Metascore'))
+    return {
+        'title': title.lower(),
+        'year': year,
+        'imdb_id': value(response.get('imdbID')),
+        'imdb_rating': value(response.get('imdbRating')),
+        'rotten_tomatoes': value(ratings.get('Rotten Tomatoes')),
+        'metacritic': metacritic.split('/')[0] if metacritic else None,
+        'plot': value(response.get('Plot')),
+    }
+
+
+class ResponseCache:
+    """Persistent OMDb responses keyed by query, plus the daily quota ledger."""
+
+    def __init__(self, cache_path: Optional[str] = OMDB_CACHE, ttl_days: float = DEFAULT_TTL_DAYS,
+                 negative_ttl_days: float = DEFAULT_NEGATIVE_TTL_DAYS) -> None:
+        """
+        Args:
+            cache_path: JSON cache file (None: in-memory only)
+            ttl_days: How long a found film stays fresh
+            negative_ttl_days: How long a "not found" stays fresh
+        """
+        self.cache_path = cache_path
+        self.ttl = ttl_days * 86400
+        self.negative_ttl = negative_ttl_days * 86400
+        self.lock = threading.Lock()
+        data = self._load()
+        self.responses: Dict[str, Dict[str, object]] = data.get('responses', {})
+        self.quota: Dict[str, object] = data.get('quota', {})
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def get(self, query: str, now: Optional[float] = None) -> Optional[Dict[str, object]]:
+        """Return the cached response for a query if it is still fresh."""
+        with self.lock:
+            entry = self.responses.get(query)
+        if entry is None:
+            return None
+        found = entry['response'].get('Response') == 'True'
+        age = (now or time.time()) - entry['fetched_at']
+        return entry['response'] if age < (self.ttl if found else self.negative_ttl) else None
+
+    def put(self, query: str, response: Dict[str, object]) -> None:
+        """Store a response (found or not found)."""
+        with self.lock:
+            self.responses[query] = {'fetched_at': time.time(), 'response': response}
+
+    def requests_used(self, day: str) -> int:
+        """Requests already spent on a UTC day ("YYYY-MM-DD")."""
+        with self.lock:
+            return self.quota.get('used', 0) if self.quota.get('day') == day else 0
+
+    def record_request(self, day: str) -> None:
+        """Count one request against a UTC day."""
+        with self.lock:
+            if self.quota.get('day') != day:
+                self.quota = {'day': day, 'used': 0}
+            self.quota['used'] += 1
+
+    def mark_exhausted(self, day: str, quota: int) -> None:
+        """Record that OMDb refused further requests today."""
+        with self.lock:
+            self.quota = {'day': day, 'used': max(quota, self.quota.get('used', 0))}
+
+    def save(self) -> None:
+        """Write the cache (atomic)."""
+        if not self.cache_path:
+            return
+        with self.lock:
+            data = {'quota': self.quota, 'responses': dict(sorted(self.responses.items()))}
+        atomic_write_bytes(self.cache_path, json.dumps(data, indent=1, ensure_ascii=False).encode('utf-8'))
+
+
+class OMDbClient:
+    """Rate-limited, quota-aware, coalescing OMDb client backed by a ResponseCache."""
+
+    def __init__(self, api_key: str, cache: ResponseCache, base_url: str = OMDB_BASE_URL,
+                 daily_quota: int = DAILY_QUOTA, max_requests: Optional[int] = None,
+                 rate: float = DEFAULT_RATE, timeout: float = DEFAULT_TIMEOUT) -> None:
+        """
+        Args:
+            api_key: OMDb API key
+            cache: Response cache and quota ledger
+            base_url: OMDb endpoint (point at a local fake server in tests)
+            daily_quota: Requests allowed per UTC day
+            max_requests: Further cap on requests made by this client
+            rate: Maximum requests per second
+            timeout: Socket timeout in seconds
+        """
+        self.api_key = api_key
+        self.cache = cache
+        self.base_url = base_url
+        self.daily_quota = daily_quota
+        self.max_requests = max_requests
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.timeout = timeout
+        self.requests_made = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._inflight: Dict[str, Future] = {}
+
+    @staticmethod
+    def today() -> str:
+        return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+    def remaining(self) -> int:
+        """Requests this client may still make."""
+        left = self.daily_quota - self.cache.requests_used(self.today())
+        if self.max_requests is not None:
+            left = min(left, self.max_requests - self.requests_made)
+        return max(0, left)
+
+    def query(self, params: Dict[str, str]) -> Dict[str, object]:
+        """
+        Return the OMDb response for a query, from cache when fresh.
+
+        Concurrent calls with the same parameters share one HTTP request.
+
+        Args:
+            params: Query parameters without apikey (e.g. {'t': ..., 'y': ...})
+
+        Returns:
+            OMDb JSON response
+
+        Raises:
+            QuotaExhausted: If the request budget is spent
+            OSError: On network or HTTP errors, or a truncated or non-JSON
+                response (not cached)
+        """
+        query = urllib.parse.urlencode(sorted(params.items()))
+        cached = self.cache.get(query)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            future = self._inflight.get(query)
+            owner = future is None
+            if owner:
+                future = self._inflight[query] = Future()
+            else:
+                self.coalesced += 1
+        if not owner:
+            return future.result()
+
+        try:
+            response = self._fetch(query)
+            self.cache.put(query, response)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[query]
+
+    def _fetch(self, query: str) -> Dict[str, object]:
+        with self._lock:
+            if self.remaining() <= 0:
+                raise QuotaExhausted(f'daily quota of {self.daily_quota} requests used')
+            self.requests_made += 1
+            self.cache.record_request(self.today())
+            now = time.monotonic()
+            start = max(now, self._next_slot)
+            self._next_slot = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+        separator = '&' if '?' in self.base_url else '?'
+        url = f"{self.base_url}{separator}apikey={urllib.parse.quote(self.api_key)}&{query}"
+        try:
+            with urllib.request.urlopen(url, timeout=self.timeout) as response:
+                body = response.read()
+        except urllib.error.HTTPError as e:
+            # OMDb reports an exhausted key as 401 with a JSON error body
+            try:
+                data = json.loads(e.read().decode('utf-8'))
+            except ValueError:
+                data = {}
+            if not isinstance(data, dict):
+                data = {}
+            if data.get('Error') == QUOTA_ERROR:
+                self.cache.mark_exhausted(self.today(), self.daily_quota)
+                raise QuotaExhausted(QUOTA_ERROR)
+            raise OSError(f'HTTP {e.code}: {data.get("Error", e.reason)}')
+        except http.client.HTTPException as e:
+            # e.g. IncompleteRead when the connection drops mid-body
+            raise OSError(f'Bad response: {e!r}') from e
+
+        # A truncated or non-JSON body fails this lookup, not the whole run
+        try:
+            data = json.loads(body.decode('utf-8'))
+        except ValueError as e:
+            raise OSError(f'Invalid JSON response: {e}') from e
+        if not isinstance(data, dict):
+            raise OSError(f'Invalid JSON response: expected an object, got {type(data).__name__}')
+
+        if data.get('Error') == QUOTA_ERROR:
+            self.cache.mark_exhausted(self.today(), self.daily_quota)
+            raise QuotaExhausted(QUOTA_ERROR)
+        return data
+
+
+def collect_films(movies: List[Dict[str, str]], now: datetime) -> List[Dict[str, object]]:
+    """
+    Reduce showtimes to unique films ordered by lookup priority.
+
+    Films with upcoming showtimes come first (soonest first), then films
+    whose showtimes have all passed.
+
+    Args:
+        movies: Published showtime rows (Movie, year, Datetime)
+        now: Current local time
+
+    Returns:
+        List of {key, title, year, next_showtime} dicts
+    """
+    films: Dict[str, Dict[str, object]] = {}
+    now_iso = now.strftime('%Y-%m-%dT%H:%M:%S')
+    for movie in movies:
+        title, year = movie.get('Movie', '').strip(), str(movie.get('year') or '').strip()
+        if not title:
+            continue
+        key = omdb_key(title, year)
+        film = films.setdefault(key, {'key': key, 'title': title, 'year': year, 'next_showtime': None})
+        showtime = movie.get('Datetime', '')
+        if showtime >= now_iso and (film['next_showtime'] is None or showtime < film['next_showtime']):
+            film['next_showtime'] = showtime
+
+    return sorted(films.values(), key=lambda f: (f['next_showtime'] is None, f['next_showtime'] or '', f['key']))
+
+
+def lookup_queries(film: Dict[str, object], overrides: Dict[str, str]) -> List[Dict[str, str]]:
+    """Queries to try for a film, in order: manual IMDb ID, title+year, title alone."""
+    if film['key'] in overrides:
+        return [{'i': overrides[film['key']]}]
+    queries = []
+    if film['year']:
+        queries.append({'t': film['title'], 'y': film['year']})
+    queries.append({'t': film['title']})
+    return queries
+
+
+def resolve_film(client: OMDbClient, film: Dict[str, object],
+                 overrides: Dict[str, str]) -> Optional[Dict[str, Optional[str]]]:
+    """
+    Look a film up, trying each query until one matches.
+
+    Returns:
+        OMDbEntry dict, or None if OMDb has no match
+
+    Raises:
+        QuotaExhausted: If a needed request does not fit in the budget
+    """
+    for params in lookup_queries(film, overrides):
+        response = client.query(params)
+        if response.get('Response') == 'True':
+            return to_entry(film['title'], film['year'], response)
+    return None
+
+
+def enrich(films: List[Dict[str, object]], client: OMDbClient, existing: Dict[str, Dict],
+           overrides: Optional[Dict[str, str]] = None, workers: int = DEFAULT_WORKERS) -> Dict[str, object]:
+    """
+    Resolve films in priority order until the request budget runs out.
+
+    Args:
+        films: Films from collect_films(), highest priority first
+        client: OMDb client
+        existing: Current omdb-data.json contents (kept for deferred films)
+        overrides: Manual "title::year" -> IMDb ID map
+        workers: Concurrent lookups
+
+    Returns:
+        Dict with data (new omdb-data.json contents), matched, unmatched,
+        deferred (films left for a later run) and failed ({key: error})
+    """
+    overrides = overrides or {}
+    data = dict(existing)
+    matched, unmatched, deferred = [], [], []
+    failed: Dict[str, str] = {}
+
+    def work(film):
+        try:
+            return film, resolve_film(client, film, overrides), None
+        except QuotaExhausted as e:
+            return film, None, e
+        except OSError as e:
+            return film, None, e
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for film, entry, error in executor.map(work, films):
+            key = film['key']
+            if isinstance(error, QuotaExhausted):
+                deferred.append(key)
+            elif error is not None:
+                failed[key] = str(error)
+            elif entry is None:
+                unmatched.append(key)
+                data.pop(key, None)
+            else:
+                matched.append(key)
+                data[key] = entry
+
+    return {
+        'data': dict(sorted(data.items())),
+        'matched': matched,
+        'unmatched': unmatched,
+        'deferred': deferred,
+        'failed': failed,
+    }
+
+
+def _load_json(path: str, default):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+
+def main():
+    """Main entry point for command-line execution."""
+    parser = argparse.ArgumentParser(
+        description='Fetch OMDb scores and plots into public/omdb-data.json within the daily quota',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # Enrich the default series (OMDB_API_KEY from the environment or .env)
+  %(prog)s
+
+  # Spend at most 100 requests this run
+  %(prog)s --max-requests 100
+
+  # Several series at once
+  %(prog)s --input ../public/tenement-stories-full.json ../public/other-full.json
+
+  # Against a local fake server
+  %(prog)s --base-url http://127.0.0.1:8000/ --api-key test
+'''
+    )
+    parser.add_argument('--input', nargs='+', default=[str(PROJECT_ROOT / 'public' / 'tenement-stories-full.json')],
+                        help='Published showtime JSON file(s) (read-only)')
+    parser.add_argument('--output', default=str(PROJECT_ROOT / 'public' / 'omdb-data.json'), help='omdb-data.json path')
+    parser.add_argument('--base-url', default=OMDB_BASE_URL, help='OMDb endpoint (default: https://www.omdbapi.com/)')
+    parser.add_argument('--api-key', help='OMDb API key (default: OMDB_API_KEY from the environment or .env)')
+    parser.add_argument('--daily-quota', type=int, default=DAILY_QUOTA, help='Requests allowed per UTC day (default: 1000)')
+    parser.add_argument('--max-requests', type=int, help='Cap on requests made by this run')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help='Requests per second (default: 1)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Concurrent lookups (default: 2)')
+    parser.add_argument('--ttl-days', type=float, default=DEFAULT_TTL_DAYS, help='Days a match stays fresh (default: 90)')
+    parser.add_argument('--negative-ttl-days', type=float, default=DEFAULT_NEGATIVE_TTL_DAYS,
+                        help='Days a "not found" stays fresh (default: 14)')
+    parser.add_argument('--cache-file', default=OMDB_CACHE, help='Response cache (default: .omdb-cache.json)')
+
+    args = parser.parse_args()
+
+    api_key = args.api_key or load_api_key()
+    if not api_key:
+        print("Error: OMDB_API_KEY is not set (environment or .env)")
+        sys.exit(1)
+
+    movies = []
+    for path in args.input:
+        try:
+            movies += _load_json(path, None) or []
+        except ValueError as e:
+            print(f"Error: Invalid JSON in {path}: {e}")
+            sys.exit(1)
+    films = collect_films(movies, datetime.now())
+    if not films:
+        print("Error: No films found in input")
+        sys.exit(1)
+
+    cache = ResponseCache(args.cache_file, args.ttl_days, args.negative_ttl_days)
+    client = OMDbClient(api_key, cache, args.base_url, args.daily_quota, args.max_requests, args.rate)
+    print(f"Resolving {len(films)} films ({client.remaining()} requests left today)...")
+
+    try:
+        result = enrich(films, client, _load_json(args.output, {}), _load_json(OVERRIDES_FILE, {}), args.workers)
+    finally:
+        cache.save()
+
+    data = json.dumps(result['data'], indent=2, ensure_ascii=False) + '\n'
+    atomic_write_bytes(args.output, data.encode('utf-8'))
+
+    print(f"\n✓ {len(result['data'])} films in {args.output}")
+    print(f"  {client.requests_made} requests made, {client.coalesced} coalesced, "
+          f"{len(films) - len(result['deferred']) - len(result['failed'])} films resolved")
+    if result['unmatched']:
+        print(f"⚠ No OMDb match (add to omdb-overrides.json): {', '.join(result['unmatched'])}")
+    if result['deferred']:
+        print(f"⚠ Quota reached: {len(result['deferred'])} films deferred to the next run")
+    for key, error in result['failed'].items():
+        print(f"✗ {key}: {error}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Publish static iCalendar feeds for a series.
+
+src/utils/icsGenerator.ts builds a one-event .ics file when a user clicks.
+This module writes subscribable feeds instead, into public/{series}-ics/:
+
+    all.ics                 every showtime of the series
+    films/{film_slug}.ics   one film's showtimes
+    days/{YYYY-MM-DD}.ics   one day's showtimes
+
+Every event's UID is derived from the film slug and its start time, so a
+calendar client that subscribed to a feed updates events in place instead
+of duplicating them. manifest.json records a hash of each film's showtimes.
+On the next run only the feeds of films whose hash changed (and the days
+those films play on, before and after) are rewritten. Feeds are streamed
+to disk one event at a time.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, TextIO
+from zoneinfo import ZoneInfo
+
+from atomic_write import atomic_write_bytes
+from day_views import runtime_minutes
+
+# Get script directory for relative paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+
+MANIFEST_NAME = 'manifest.json'
+FEEDS_VERSION = 1
+# Listings are New York wall-clock times; events are published in UTC
+THEATER_TZ = ZoneInfo('America/New_York')
+LOCATION = 'Film Forum, 209 W Houston St, New York, NY 10014'
+PRODID = '-//Film Forum Calendar//EN'
+UID_DOMAIN = 'filmforum-calendar'
+# Fields that end up in an event; a change to any of them regenerates the film's feeds
+EVENT_FIELDS = ('Movie', 'Datetime', 'runtime', 'director', 'year', 'description', 'ticket_url')
+
+
+def title_case(text: str) -> str:
+    """Title-case a film title the way icsGenerator.ts does."""
+    return ' '.join(word[:1].upper() + word[1:].lower() for word in text.split(' '))
+
+
+def escape_text(text: str) -> str:
+    """Escape an iCalendar TEXT value (RFC 5545 3.3.11)."""
+    return (text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def fold_line(line: str) -> str:
+    """
+    Fold a content line to at most 75 octets per physical line (RFC 5545 3.1).
+
+    Args:
+        line: Unfolded content line
+
+    Returns:
+        Folded line with CRLF line breaks, including the final CRLF
+    """
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+
+    parts = []
+    current = ''
+    size = 0
+    limit = 75
+    for char in line:
+        char_size = len(char.encode('utf-8'))
+        if size + char_size > limit:
+            parts.append(current)
+            # Continuation lines start with a space, which counts toward their 75 octets
+            current, size, limit = char, char_size, 74
+        else:
+            current += char
+            size += char_size
+    parts.append(current)
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def format_utc(when: datetime) -> str:
+    """Format an aware datetime as an iCalendar UTC DATE-TIME."""
+    return when.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def event_uid(movie: Dict[str, Any]) -> str:
+    """
+    Stable UID of a showtime: film slug plus local start time.
+
+    Args:
+        movie: Published showtime dict
+
+    Returns:
+        UID like "lonesome-20260206T1230@filmforum-calendar"
+    """
+    start = datetime.fromisoformat(movie['Datetime'])
+    slug = movie.get('film_slug') or movie['Movie'].lower().replace(' ', '-')
+    return f"{slug}-{start:%Y%m%dT%H%M}@{UID_DOMAIN}"
+
+
+def event_lines(movie: Dict[str, Any], stamp: str) -> List[str]:
+    """
+    Build the VEVENT of one showtime.
+
+    Args:
+        movie: Published showtime dict
+        stamp: DTSTAMP value (when the film's events last changed)
+
+    Returns:
+        Unfolded content lines from BEGIN:VEVENT to END:VEVENT
+    """
+    start = datetime.fromisoformat(movie['Datetime']).replace(tzinfo=THEATER_TZ)
+    end = start + timedelta(minutes=runtime_minutes(movie.get('runtime')))
+
+    description = movie.get('description') or ''
+    if len(description) > 200:
+        description = description[:200] + '...'
+    details = [
+        f"Director: {movie['director']}" if movie.get('director') else '',
+        f"Year: {movie['year']}" if movie.get('year') else '',
+        description,
+    ]
+
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:{event_uid(movie)}',
+        f'DTSTAMP:{stamp}',
+        f'DTSTART:{format_utc(start)}',
+        f'DTEND:{format_utc(end)}',
+        f"SUMMARY:{escape_text(title_case(movie['Movie']) + ' at Film Forum')}",
+        f'LOCATION:{escape_text(LOCATION)}',
+        f"DESCRIPTION:{escape_text(chr(10).join(d for d in details if d))}",
+    ]
+    if movie.get('ticket_url'):
+        lines.append(f"URL:{movie['ticket_url']}")
+    lines.append('END:VEVENT')
+    return lines
+
+
+def write_feed(path: Path, name: str, movies: Iterable[Dict[str, Any]], stamps: Dict[str, str]) -> None:
+    """
+    Stream a VCALENDAR with one event per showtime to path (atomically).
+
+    Args:
+        path: Output .ics file
+        name: Calendar name shown by clients (X-WR-CALNAME)
+        movies: Showtimes in the feed, in the order to write them
+        stamps: DTSTAMP per film_slug
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        _write_lines(f, ['BEGIN:VCALENDAR', 'VERSION:2.0', f'PRODID:{PRODID}', 'CALSCALE:GREGORIAN',
+                         'METHOD:PUBLISH', f'X-WR-CALNAME:{escape_text(name)}'])
+        for movie in movies:
+            _write_lines(f, event_lines(movie, stamps[movie.get('film_slug', '')]))
+        _write_lines(f, ['END:VCALENDAR'])
+    os.replace(tmp_path, path)
+
+
+def _write_lines(f: TextIO, lines: Iterable[str]) -> None:
+    for line in lines:
+        f.write(fold_line(line))
+
+
+def film_hash(movies: Sequence[Dict[str, Any]]) -> str:
+    """
+    Hash the event-relevant fields of a film's showtimes.
+
+    Args:
+        movies: One film's showtimes
+
+    Returns:
+        Hex SHA-256 digest, independent of row order
+    """
+    rows = sorted(json.dumps([m.get(field) for field in EVENT_FIELDS], ensure_ascii=False) for m in movies)
+    return hashlib.sha256('\n'.join(rows).encode('utf-8')).hexdigest()
+
+
+def load_manifest(output_dir: Path) -> Dict[str, Any]:
+    """Load the feed manifest, or an empty one if missing or from another version."""
+    try:
+        with open(output_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {'films': {}}
+    if manifest.get('version') != FEEDS_VERSION:
+        return {'films': {}}
+    return manifest
+
+
+def write_feeds(movies: Sequence[Dict[str, Any]], output_dir: str, series: str,
+                now: Optional[datetime] = None, force: bool = False) -> Dict[str, List[str]]:
+    """
+    Regenerate the series, film and day feeds whose showtimes changed.
+
+    Args:
+        movies: Published showtime dicts
+        output_dir: Feed directory (public/{series}-ics)
+        series: Series name
+        now: DTSTAMP for films that changed (default: current UTC time)
+        force: Rewrite every feed
+
+    Returns:
+        Dict with 'written' and 'removed' feed paths (relative to output_dir)
+        and 'changed' film slugs
+    """
+    root = Path(output_dir)
+    stamp = format_utc(now or datetime.now(timezone.utc))
+    previous = load_manifest(root)['films']
+
+    by_film: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    by_day: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    ordered = sorted(movies, key=lambda m: (m['Datetime'], m['Movie']))
+    for movie in ordered:
+        by_film[movie.get('film_slug', '')].append(movie)
+        by_day[movie['Datetime'][:10]].append(movie)
+
+    films: Dict[str, Dict[str, Any]] = {}
+    changed: List[str] = []
+    for slug, film_movies in by_film.items():
+        digest = film_hash(film_movies)
+        old = previous.get(slug)
+        if old and old['hash'] == digest:
+            films[slug] = old
+        else:
+            changed.append(slug)
+            films[slug] = {'hash': digest, 'updated': stamp}
+        films[slug]['dates'] = sorted({m['Datetime'][:10] for m in film_movies})
+    gone = sorted(set(previous) - set(by_film))
+
+    stale_days: Set[str] = set()
+    for slug in changed + gone:
+        stale_days.update((previous.get(slug) or {}).get('dates', []))
+        stale_days.update(films.get(slug, {}).get('dates', []))
+
+    stamps = {slug: film['updated'] for slug, film in films.items()}
+    written: List[str] = []
+    removed: List[str] = []
+
+    def write(relative: str, name: str, feed_movies: Iterable[Dict[str, Any]]) -> None:
+        write_feed(root / relative, name, feed_movies, stamps)
+        written.append(relative)
+
+    rewrite_all = force or not (root / 'all.ics').exists()
+    if rewrite_all or changed or gone:
+        write('all.ics', f'Film Forum: {series}', ordered)
+    for slug, film_movies in by_film.items():
+        relative = f'films/{slug}.ics'
+        if rewrite_all or slug in changed or not (root / relative).exists():
+            write(relative, f"Film Forum: {title_case(film_movies[0]['Movie'])}", film_movies)
+    for day, day_movies in sorted(by_day.items()):
+        relative = f'days/{day}.ics'
+        if rewrite_all or day in stale_days or not (root / relative).exists():
+            write(relative, f'Film Forum: {day}', day_movies)
+
+    for slug in gone:
+        removed.extend(_remove(root, f'films/{slug}.ics'))
+    for day in sorted(stale_days - set(by_day)):
+        removed.extend(_remove(root, f'days/{day}.ics'))
+
+    manifest = {'version': FEEDS_VERSION, 'series': series, 'films': dict(sorted(films.items()))}
+    atomic_write_bytes(root / MANIFEST_NAME,
+                       (json.dumps(manifest, indent=2, ensure_ascii=False) + '\n').encode('utf-8'))
+
+    return {'written': written, 'removed': removed, 'changed': sorted(changed + gone)}
+
+
+def _remove(root: Path, relative: str) -> List[str]:
+    path = root / relative
+    if path.exists():
+        path.unlink()
+        return [relative]
+    return []
+
+
+def main():
+    """Main entry point for command-line execution."""
+    parser = argparse.ArgumentParser(
+        description='Publish static iCalendar feeds (series, per film, per day)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # Feeds for public/tenement-stories-full.json in public/tenement-stories-ics/
+  %(prog)s
+
+  # Rewrite every feed, not just the changed films
+  %(prog)s --force
+
+  # Custom files
+  %(prog)s --series my-series --input merged.json --output-dir feeds/
+'''
+    )
+    parser.add_argument(
+        '--series',
+        default='tenement-stories',
+        help='Series name (default: tenement-stories). Used to determine default input/output paths.'
+    )
+    parser.add_argument(
+        '--input',
+        help='Published showtime JSON (default: public/{series}-full.json)'
+    )
+    parser.add_argument(
+        '--output-dir',
+        help='Feed directory (default: public/{series}-ics)'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Rewrite every feed even if its showtimes are unchanged'
+    )
+    args = parser.parse_args()
+
+    input_json = args.input or str(PROJECT_ROOT / 'public' / f'{args.series}-full.json')
+    output_dir = args.output_dir or str(PROJECT_ROOT / 'public' / f'{args.series}-ics')
+
+    try:
+        with open(input_json, 'r', encoding='utf-8') as f:
+            movies = json.load(f)
+    except FileNotFoundError:
+        print(f"Error: Input file not found: {input_json}")
+        sys.exit(1)
+
+    result = write_feeds(movies, output_dir, args.series, force=args.force)
+    print(f"✓ {len(result['changed'])} films changed")
+    print(f"✓ Wrote {len(result['written'])} feeds, removed {len(result['removed'])} in {output_dir}")
+
+
+if __name__ == '__main__':
+    main()
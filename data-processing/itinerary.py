@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Pick non-overlapping screenings of the films you want to see.
+
+Each screening runs from its Datetime for the film's runtime (90 minutes
+when unknown, as on the calendar), plus a travel buffer before the next
+one. The goal is the set of screenings with the highest total film weight,
+counting each film at most once.
+
+Plain weighted interval scheduling (sort by end, bisect each screening's
+last compatible predecessor, one DP pass, O(n log n)) would happily pick
+the same film twice. Adding "each film once" makes the problem hard in
+general, so there are two strategies:
+
+- Up to EXACT_MAX_FILMS wanted films: an exact DP over the subsets of films
+  seen. For each subset it keeps the earliest time at which a schedule
+  seeing exactly those films can end. Any continuation of a later-ending
+  schedule also fits after the earlier one, so the earliest end is enough.
+  The next screening of each film is found by bisection, so the cost is
+  O(n log n + 2^k * k * log n), independent of how many other showtimes
+  exist.
+- More films: weighted interval scheduling, repeated. Each round keeps
+  only the earliest chosen screening of every film the DP picked twice and
+  drops its other screenings, then runs the DP again. That is at most one
+  O(n log n) round per film. This is a heuristic and can miss the optimum.
+"""
+
+import argparse
+import json
+import sys
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from day_views import runtime_minutes
+
+# Get script directory for relative paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+
+DEFAULT_BUFFER = 15
+# Largest number of wanted films solved exactly (2^k subsets)
+EXACT_MAX_FILMS = 14
+EPOCH = datetime(1970, 1, 1)
+
+
+class Screening(NamedTuple):
+    """A showtime as an interval in minutes since the epoch."""
+    start: int
+    end: int
+    film: str
+    movie: Dict[str, Any]
+
+
+def to_screening(movie: Dict[str, Any]) -> Screening:
+    """
+    Convert a published showtime dict to a Screening.
+
+    Args:
+        movie: Showtime with Datetime, runtime and film_slug
+
+    Returns:
+        Screening keyed by film_slug (or title when the slug is missing)
+    """
+    # Listings are local wall-clock times; keep them naive so DST never shifts a screening
+    start = int((datetime.fromisoformat(movie['Datetime']) - EPOCH).total_seconds() // 60)
+    film = movie.get('film_slug') or movie['Movie']
+    return Screening(start, start + runtime_minutes(movie.get('runtime')), film, movie)
+
+
+def schedule(screenings: Sequence[Screening], weights: Dict[str, float],
+             buffer: int = DEFAULT_BUFFER) -> Tuple[float, List[Screening]]:
+    """
+    Weighted interval scheduling over screenings (a film may repeat).
+
+    Args:
+        screenings: Candidate screenings
+        weights: Weight per film (missing films weigh 1)
+        buffer: Minutes needed between one screening's end and the next start
+
+    Returns:
+        Tuple of (total weight, chosen screenings in time order)
+    """
+    ordered = sorted(screenings, key=lambda s: (s.end, s.start))
+    ends = [s.end for s in ordered]
+
+    # best[i]: best total using only the first i screenings
+    best = [0.0] * (len(ordered) + 1)
+    previous = [0] * len(ordered)
+    for i, screening in enumerate(ordered):
+        previous[i] = bisect_right(ends, screening.start - buffer, 0, i)
+        take = weights.get(screening.film, 1.0) + best[previous[i]]
+        best[i + 1] = max(best[i], take)
+
+    chosen = []
+    i = len(ordered)
+    while i > 0:
+        screening = ordered[i - 1]
+        if best[i] == best[i - 1]:
+            i -= 1
+        else:
+            chosen.append(screening)
+            i = previous[i - 1]
+    chosen.reverse()
+    return best[-1], chosen
+
+
+def plan_itinerary(screenings: Sequence[Screening], weights: Dict[str, float],
+                   buffer: int = DEFAULT_BUFFER) -> Tuple[float, List[Screening]]:
+    """
+    Choose non-conflicting screenings, seeing each film at most once.
+
+    Args:
+        screenings: Candidate screenings of the wanted films
+        weights: Weight per film (missing films weigh 1)
+        buffer: Minutes needed between screenings
+
+    Returns:
+        Tuple of (total weight, chosen screenings in time order)
+    """
+    if len({s.film for s in screenings}) <= EXACT_MAX_FILMS:
+        return plan_exact(screenings, weights, buffer)
+    return plan_repeated(screenings, weights, buffer)
+
+
+def plan_exact(screenings: Sequence[Screening], weights: Dict[str, float],
+               buffer: int = DEFAULT_BUFFER) -> Tuple[float, List[Screening]]:
+    """
+    Optimal itinerary by DP over subsets of films (see module docstring).
+
+    Args:
+        screenings: Candidate screenings
+        weights: Weight per film (missing films weigh 1)
+        buffer: Minutes needed between screenings
+
+    Returns:
+        Tuple of (total weight, chosen screenings in time order)
+    """
+    films = sorted({s.film for s in screenings})
+    by_film = [sorted((s for s in screenings if s.film == film), key=lambda s: s.start) for film in films]
+    starts = [[s.start for s in film_screenings] for film_screenings in by_film]
+    # Runtimes can differ between listings of a film, so keep the earliest-ending screening from each index on
+    earliest_end: List[List[Screening]] = []
+    for film_screenings in by_film:
+        suffix = list(film_screenings)
+        for i in range(len(suffix) - 2, -1, -1):
+            if suffix[i + 1].end < suffix[i].end:
+                suffix[i] = suffix[i + 1]
+        earliest_end.append(suffix)
+
+    size = 1 << len(films)
+    finish: List[Optional[int]] = [None] * size
+    parent: List[Optional[Tuple[int, Screening]]] = [None] * size
+    reachable = [False] * size
+    reachable[0] = True
+    # Supersets have larger numbers, so every subset is final before it is extended
+    for mask in range(size):
+        if not reachable[mask]:
+            continue
+        free = None if finish[mask] is None else finish[mask] + buffer
+        for j in range(len(films)):
+            if mask >> j & 1:
+                continue
+            index = 0 if free is None else bisect_left(starts[j], free)
+            if index == len(starts[j]):
+                continue
+            screening = earliest_end[j][index]
+            extended = mask | 1 << j
+            if not reachable[extended] or screening.end < finish[extended]:
+                reachable[extended] = True
+                finish[extended] = screening.end
+                parent[extended] = (mask, screening)
+
+    def score(mask: int) -> Tuple[float, int, int]:
+        total = sum(weights.get(films[j], 1.0) for j in range(len(films)) if mask >> j & 1)
+        return total, bin(mask).count('1'), -(finish[mask] or 0)
+
+    best = max((mask for mask in range(size) if reachable[mask]), key=score)
+    chosen = []
+    mask = best
+    while parent[mask] is not None:
+        mask, screening = parent[mask]
+        chosen.append(screening)
+    chosen.reverse()
+    return score(best)[0], chosen
+
+
+def plan_repeated(screenings: Sequence[Screening], weights: Dict[str, float],
+                  buffer: int = DEFAULT_BUFFER) -> Tuple[float, List[Screening]]:
+    """
+    Itinerary for many films by repeated interval scheduling (see module docstring).
+
+    Args:
+        screenings: Candidate screenings
+        weights: Weight per film (missing films weigh 1)
+        buffer: Minutes needed between screenings
+
+    Returns:
+        Tuple of (total weight, chosen screenings in time order)
+    """
+    pool = list(screenings)
+    while True:
+        total, chosen = schedule(pool, weights, buffer)
+        counts = Counter(s.film for s in chosen)
+        if all(count == 1 for count in counts.values()):
+            return total, chosen
+
+        keep: Dict[str, Screening] = {}
+        for screening in chosen:
+            if counts[screening.film] > 1:
+                keep.setdefault(screening.film, screening)
+        pool = [s for s in pool if s.film not in keep or s is keep[s.film]]
+
+
+def select_screenings(movies: Iterable[Dict[str, Any]], films: Sequence[str],
+                      start_date: Optional[str] = None, end_date: Optional[str] = None) -> Tuple[List[Screening], Dict[str, str], List[str]]:
+    """
+    Find the screenings of the wanted films.
+
+    Films match by film_slug or by title (case-insensitive).
+
+    Args:
+        movies: Published showtime dicts (any number of series)
+        films: Wanted film slugs or titles
+        start_date: First date to consider (YYYY-MM-DD, inclusive)
+        end_date: Last date to consider (YYYY-MM-DD, inclusive)
+
+    Returns:
+        Tuple of (screenings, film key -> requested name, requested names with no screening)
+    """
+    wanted = {name.lower(): name for name in films}
+    screenings = []
+    requested: Dict[str, str] = {}
+    for movie in movies:
+        day = movie['Datetime'][:10]
+        if (start_date and day < start_date) or (end_date and day > end_date):
+            continue
+        for name in (movie.get('film_slug', '').lower(), movie['Movie'].lower()):
+            if name in wanted:
+                screening = to_screening(movie)
+                screenings.append(screening)
+                requested[screening.film] = wanted[name]
+                break
+
+    found = set(requested.values())
+    return screenings, requested, [name for name in films if name not in found]
+
+
+def parse_weights(values: Sequence[str]) -> Dict[str, float]:
+    """
+    Parse NAME=WEIGHT pairs.
+
+    Args:
+        values: Strings like "taxi-driver=3"
+
+    Returns:
+        Dict of lowercased name -> weight
+
+    Raises:
+        ValueError: On a malformed pair
+    """
+    weights = {}
+    for value in values:
+        name, sep, weight = value.rpartition('=')
+        if not sep or not name:
+            raise ValueError(f"Expected NAME=WEIGHT, got {value!r}")
+        weights[name.lower()] = float(weight)
+    return weights
+
+
+def main():
+    """Main entry point for command-line execution."""
+    parser = argparse.ArgumentParser(
+        description='Pick a conflict-free set of screenings for the films you want to see',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # Fit as many of these films as possible (slugs or titles)
+  %(prog)s lonesome "taxi driver" dead-end
+
+  # Weight a must-see film, allow 30 minutes between screenings
+  %(prog)s lonesome dead-end el-super --weight el-super=3 --buffer 30
+
+  # Only next week, across several series
+  %(prog)s lonesome dead-end --from 2026-02-09 --to 2026-02-15 \\
+    --input ../public/tenement-stories-full.json ../public/other-full.json
+'''
+    )
+    parser.add_argument('films', nargs='+', help='Film slugs or titles to see')
+    parser.add_argument(
+        '--series',
+        default='tenement-stories',
+        help='Series name (default: tenement-stories). Used to determine the default input file.'
+    )
+    parser.add_argument(
+        '--input',
+        nargs='+',
+        help='Published showtime JSON files (default: public/{series}-full.json)'
+    )
+    parser.add_argument(
+        '--buffer',
+        type=int,
+        default=DEFAULT_BUFFER,
+        help=f'Minutes needed between screenings for travel (default: {DEFAULT_BUFFER})'
+    )
+    parser.add_argument(
+        '--weight',
+        action='append',
+        default=[],
+        metavar='FILM=WEIGHT',
+        help='Priority of a film (default weight: 1); repeatable'
+    )
+    parser.add_argument('--from', dest='start_date', help='First date to consider (YYYY-MM-DD)')
+    parser.add_argument('--to', dest='end_date', help='Last date to consider (YYYY-MM-DD)')
+    parser.add_argument('--json', action='store_true', help='Print the itinerary as JSON')
+    args = parser.parse_args()
+
+    movies = []
+    for path in args.input or [str(PROJECT_ROOT / 'public' / f'{args.series}-full.json')]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                movies.extend(json.load(f))
+        except FileNotFoundError:
+            print(f"Error: Input file not found: {path}")
+            sys.exit(1)
+
+    try:
+        named_weights = parse_weights(args.weight)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    screenings, requested, not_found = select_screenings(movies, args.films, args.start_date, args.end_date)
+    weights = {film: named_weights.get(name.lower(), 1.0) for film, name in requested.items()}
+    total, chosen = plan_itinerary(screenings, weights, args.buffer)
+    seen = {s.film for s in chosen}
+    unfit = sorted(requested[film] for film in set(requested) - seen)
+
+    if args.json:
+        print(json.dumps({
+            'weight': total,
+            'itinerary': [s.movie for s in chosen],
+            'unfit': unfit,
+            'not_found': not_found,
+        }, indent=2, ensure_ascii=False))
+        return
+
+    for screening in chosen:
+        when = datetime.fromisoformat(screening.movie['Datetime'])
+        print(f"  ✓ {when:%a %b %d %H:%M}  {screening.movie['Movie']}  ({screening.end - screening.start} min)")
+    print(f"\n✓ Fits {len(chosen)} of {len(requested)} films (weight {total:g})")
+    if unfit:
+        print(f"⚠ No conflict-free screening left for: {', '.join(unfit)}")
+    if not_found:
+        print(f"⚠ No screenings found for: {', '.join(not_found)}")
+
+
+if __name__ == '__main__':
+    main()
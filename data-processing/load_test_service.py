@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Load test for showtime_service.py.
+
+Runs worker threads that each hold one keep-alive connection and request a
+mix of query paths for a fixed duration, then reports requests per second
+and latency percentiles (p50/p90/p99/max). Paths default to a mix built
+from the service's own /dates and /films listings. --etag replays the last
+ETag of each path with If-None-Match to measure the 304 path.
+"""
+
+import argparse
+import http.client
+import json
+import math
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import quote, urlsplit
+
+from showtime_service import DEFAULT_HOST, DEFAULT_PORT
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        sorted_values: Samples in ascending order
+        fraction: Percentile as a fraction (0.99 for p99)
+
+    Returns:
+        Smallest sample with at least `fraction` of samples at or below it (0.0 if empty)
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def default_paths(host: str, port: int) -> List[str]:
+    """
+    Build a query mix from the service's listings.
+
+    Args:
+        host: Service host
+        port: Service port
+
+    Returns:
+        Paths covering /now, /health, every date, every film and a one-day range
+    """
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    try:
+        def get(path: str) -> Dict[str, Any]:
+            connection.request('GET', path)
+            response = connection.getresponse()
+            body = response.read()
+            if response.status != 200:
+                raise RuntimeError(f"GET {path} returned {response.status}")
+            return json.loads(body)
+
+        dates = get('/dates')['dates']
+        films = get('/films')['films']
+    finally:
+        connection.close()
+
+    paths = ['/now?limit=5', '/health']
+    paths += [f'/dates/{day}' for day in dates]
+    paths += [f"/films/{quote(film['film_slug'])}" for film in films]
+    if dates:
+        paths.append(f'/range?from={dates[0]}&to={dates[min(1, len(dates) - 1)]}T23:59')
+    return paths
+
+
+def run_load(host: str, port: int, paths: Sequence[str], duration: float = 10.0, concurrency: int = 8,
+             use_etag: bool = False) -> Dict[str, Any]:
+    """
+    Hammer the service and collect latencies.
+
+    Args:
+        host: Service host
+        port: Service port
+        paths: Request paths, cycled through by each worker
+        duration: Seconds to run
+        concurrency: Worker threads (one connection each)
+        use_etag: Send If-None-Match with the last ETag seen for each path
+
+    Returns:
+        Dict with requests, errors, status counts, elapsed seconds,
+        requests_per_second and latency_ms percentiles
+    """
+    latencies: List[List[float]] = [[] for _ in range(concurrency)]
+    statuses: List[Dict[int, int]] = [{} for _ in range(concurrency)]
+    errors = [0] * concurrency
+    deadline = time.perf_counter() + duration
+
+    def worker(slot: int) -> None:
+        connection: Optional[http.client.HTTPConnection] = None
+        etags: Dict[str, str] = {}
+        i = slot
+        while time.perf_counter() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            headers = {'If-None-Match': etags[path]} if use_etag and path in etags else {}
+            start = time.perf_counter()
+            try:
+                if connection is None:
+                    connection = http.client.HTTPConnection(host, port, timeout=10)
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                errors[slot] += 1
+                if connection is not None:
+                    connection.close()
+                connection = None
+                continue
+            latencies[slot].append(time.perf_counter() - start)
+            statuses[slot][response.status] = statuses[slot].get(response.status, 0) + 1
+            etag = response.getheader('ETag')
+            if etag:
+                etags[path] = etag
+        if connection is not None:
+            connection.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(slot,)) for slot in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    samples = sorted(latency * 1000 for worker_latencies in latencies for latency in worker_latencies)
+    status_counts: Dict[int, int] = {}
+    for worker_statuses in statuses:
+        for status, count in worker_statuses.items():
+            status_counts[status] = status_counts.get(status, 0) + count
+
+    return {
+        'requests': len(samples),
+        'errors': sum(errors),
+        'statuses': dict(sorted(status_counts.items())),
+        'elapsed': round(elapsed, 3),
+        'requests_per_second': round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        'latency_ms': {
+            'p50': round(percentile(samples, 0.50), 3),
+            'p90': round(percentile(samples, 0.90), 3),
+            'p99': round(percentile(samples, 0.99), 3),
+            'max': round(samples[-1], 3) if samples else 0.0,
+        },
+    }
+
+
+def main():
+    """Main entry point for command-line execution."""
+    parser = argparse.ArgumentParser(
+        description='Load-test showtime_service.py and report requests/s and p99 latency',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # 10 s, 8 connections, mix of every date/film query
+  %(prog)s
+
+  # Revalidation path (304s) against another port
+  %(prog)s --url http://127.0.0.1:9000 --etag
+
+  # One path, JSON result
+  %(prog)s --path '/now?limit=5' --duration 5 --json
+'''
+    )
+    parser.add_argument('--url', default=f'http://{DEFAULT_HOST}:{DEFAULT_PORT}',
+                        help=f'Service base URL (default: http://{DEFAULT_HOST}:{DEFAULT_PORT})')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds to run (default: 10)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Parallel connections (default: 8)')
+    parser.add_argument('--path', action='append', dest='paths',
+                        help='Request path; repeatable (default: mix built from /dates and /films)')
+    parser.add_argument('--etag', action='store_true', help='Revalidate with If-None-Match (measures 304s)')
+    parser.add_argument('--json', action='store_true', help='Print the result as JSON')
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    host, port = url.hostname or DEFAULT_HOST, url.port or 80
+    try:
+        paths = args.paths or default_paths(host, port)
+    except (OSError, RuntimeError) as e:
+        print(f"Error: Could not reach {args.url}: {e}")
+        sys.exit(1)
+
+    result = run_load(host, port, paths, args.duration, max(1, args.concurrency), args.etag)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    latency = result['latency_ms']
+    statuses = ', '.join(f'{status}: {count}' for status, count in result['statuses'].items())
+    print(f"✓ {result['requests']:,} requests over {len(paths)} paths in {result['elapsed']:.1f}s "
+          f"with {args.concurrency} connections")
+    print(f"  {result['requests_per_second']:,.1f} requests/s")
+    print(f"  latency ms: p50 {latency['p50']:.2f}  p90 {latency['p90']:.2f}  "
+          f"p99 {latency['p99']:.2f}  max {latency['max']:.2f}")
+    print(f"  statuses: {statuses or 'none'}")
+    if result['errors']:
+        print(f"⚠ {result['errors']} requests failed")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
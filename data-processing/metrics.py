@@ -0,0 +1,132 @@
+"""
+Stage timers and counters for the data-processing scripts.
+
+parse_showtimes.py and process_posters.py record how long each stage takes
+and how much data went through it, next to their emoji console summaries.
+With --metrics-out the numbers are written as one JSON document (.json) or
+appended as one line per run (.jsonl), so scrape duration and volume can be
+charted over time. A single stage can also be run under cProfile and its
+stats dumped for snakeviz/pstats.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional
+
+from atomic_write import atomic_write_bytes
+
+
+class Metrics:
+    """Accumulates per-stage wall time and named counters for one run."""
+
+    def __init__(self, script: str, profile_stage: Optional[str] = None,
+                 profile_path: Optional[str] = None) -> None:
+        """
+        Args:
+            script: Name recorded with the metrics (e.g. 'parse_showtimes')
+            profile_stage: Stage to run under cProfile (None disables profiling)
+            profile_path: Where to dump the cProfile stats of profile_stage
+        """
+        self.script = script
+        self.profile_stage = profile_stage
+        self.profile_path = profile_path
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.counters: Dict[str, Any] = {}
+        self.warnings: Counter = Counter()
+        self._profiler: Optional[cProfile.Profile] = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time a stage. Repeated stages of the same name add up.
+
+        Args:
+            name: Stage name (read, parse, process, write, download, ...)
+        """
+        profile = name == self.profile_stage
+        if profile:
+            self._profiler = self._profiler or cProfile.Profile()
+            self._profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+            if profile:
+                self._profiler.disable()
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Add value to a counter."""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name: str, value: Any) -> None:
+        """Set a counter (or any JSON-serializable gauge) to value."""
+        self.counters[name] = value
+
+    def warning(self, kind: str, value: int = 1) -> None:
+        """Count a warning of the given type."""
+        self.warnings[kind] += value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Snapshot of the run so far.
+
+        Returns:
+            Dict with script, started_at, total_seconds, stages, counters and warnings
+        """
+        return {
+            'script': self.script,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'total_seconds': round(time.perf_counter() - self._start, 6),
+            'stages': {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            'counters': dict(self.counters),
+            'warnings': dict(sorted(self.warnings.items())),
+        }
+
+    def write(self, path: str) -> None:
+        """
+        Write the metrics to path.
+
+        A .jsonl path gets one compact line appended per run; anything else
+        is replaced atomically with an indented JSON document.
+
+        Args:
+            path: Output file
+        """
+        record = self.to_dict()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if path.endswith('.jsonl'):
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, sort_keys=True) + '\n')
+            return
+
+        atomic_write_bytes(path, (json.dumps(record, indent=2, sort_keys=True) + '\n').encode('utf-8'))
+
+    def dump_profile(self, top: int = 15) -> Optional[str]:
+        """
+        Save the cProfile stats of the profiled stage.
+
+        Args:
+            top: Number of functions (by cumulative time) in the returned summary
+
+        Returns:
+            Printable summary of the hottest functions, or None if nothing was profiled
+        """
+        if self._profiler is None or not self.profile_path:
+            return None
+        self._profiler.dump_stats(self.profile_path)
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats('cumulative').print_stats(top)
+        return out.getvalue()
@@ -0,0 +1,151 @@
+"""
+On-disk cache of processed showtime rows, keyed by page content.
+
+parse_showtimes.py looks pages up by the SHA-256 of their HTML plus the
+parser version, parse mode and series name, so an unchanged cached page is
+never re-parsed. Entries are plain JSON files; the least recently used ones
+are evicted past a max entry count, and anything older than max age is
+dropped. The cache never fails a parse: an entry that cannot be read counts
+as a miss, and one that cannot be written only prints a warning.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from atomic_write import atomic_write_bytes
+
+# Get script directory for relative paths
+SCRIPT_DIR = Path(__file__).parent
+
+DEFAULT_CACHE_DIR = os.environ.get('PARSE_CACHE_DIR', str(SCRIPT_DIR / '.parse-cache'))
+DEFAULT_MAX_ENTRIES = 200
+DEFAULT_MAX_AGE_DAYS = 30
+
+
+class ParseCache:
+    """Content-addressed store of (rows, warnings) for parsed series pages."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_age_days: float = DEFAULT_MAX_AGE_DAYS) -> None:
+        """
+        Args:
+            cache_dir: Directory holding one JSON file per entry
+            max_entries: Keep at most this many entries (least recently used evicted first)
+            max_age_days: Drop entries not used for this many days
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_days * 86400
+
+    @staticmethod
+    def make_key(html: str, parser_version: str, mode: str, series_name: str) -> str:
+        """
+        Build the cache key for a page.
+
+        Args:
+            html: Page content
+            parser_version: Bumped whenever parsing/validation output changes
+            mode: Parse mode (regex/stream)
+            series_name: Series name (affects film_slug extraction)
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        digest = hashlib.sha256()
+        digest.update(f'{parser_version}\0{mode}\0{series_name}\0'.encode('utf-8'))
+        digest.update(html.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f'{key}.json'
+
+    def get(self, key: str) -> Optional[Tuple[List[List[str]], List[str]]]:
+        """
+        Look up a page's processed rows.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            Tuple of (rows, validation_warnings), or None on a miss or an
+            expired, corrupt or concurrently evicted entry
+        """
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.max_age_seconds:
+                path.unlink(missing_ok=True)
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            rows, warnings = entry['rows'], entry['warnings']
+            if not isinstance(rows, list) or not all(isinstance(row, list) for row in rows) \
+                    or not isinstance(warnings, list):
+                return None
+            # Touch so eviction is least-recently-used
+            os.utime(path)
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing, corrupt or wrongly shaped entry: a miss, so it gets rewritten
+            return None
+
+        return rows, warnings
+
+    def put(self, key: str, rows: List[List[str]], warnings: List[str]) -> bool:
+        """
+        Store a page's processed rows, then apply the eviction policy.
+
+        A cache that cannot be written (unwritable directory, full disk)
+        prints a warning to stderr instead of raising.
+
+        Args:
+            key: Key from make_key
+            rows: Processed CSV rows
+            warnings: Validation warnings
+
+        Returns:
+            True if the entry was stored
+        """
+        path = self._path(key)
+        data = json.dumps({'rows': rows, 'warnings': warnings}, ensure_ascii=False)
+        try:
+            atomic_write_bytes(path, data.encode('utf-8'))
+            self.evict()
+        except OSError as e:
+            print(f"⚠ Could not write parse cache entry {path}: {e}", file=sys.stderr)
+            return False
+        return True
+
+    def evict(self) -> int:
+        """
+        Remove expired entries and trim to max_entries.
+
+        Returns:
+            Number of entries removed
+        """
+        if not self.cache_dir.is_dir():
+            return 0
+
+        now = time.time()
+        entries = []
+        removed = 0
+        for path in self.cache_dir.glob('*.json'):
+            try:
+                mtime = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if now - mtime > self.max_age_seconds:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((mtime, path))
+
+        entries.sort(reverse=True)
+        for _, path in entries[self.max_entries:]:
+            path.unlink(missing_ok=True)
+            removed += 1
+
+        return removed
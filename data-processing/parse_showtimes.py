@@ -1,12 +1,25 @@
 import re
 import csv
+import codecs
+import gzip
+import hashlib
 import html as html_lib
+import io
+import mmap
 import os
 import sys
 import argparse
+import glob
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
 from pathlib import Path
 from datetime import datetime
-from typing import List, Tuple, Set
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Set, Union
+
+from parse_cache import ParseCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_ENTRIES, DEFAULT_MAX_AGE_DAYS
+from metrics import Metrics
+from showtime_history import ShowtimeHistory
 
 # NOTE: Film Forum removes individual film pages after their showtimes pass.
 # The series page used as input here also gets culled over time, so cache it early.
@@ -15,6 +28,56 @@ from typing import List, Tuple, Set
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 
+# Bump whenever parse_html/process_matches output changes, to invalidate the parse cache
+PARSER_VERSION = '2'
+
+CSV_HEADER = ['Movie', 'Date', 'Time', 'ticket_url', 'film_url', 'film_slug', 'ScrapedAt']
+# Batch output appends the series name so merged CSVs stay attributable
+BATCH_CSV_HEADER = CSV_HEADER + ['Series']
+
+# Stages of a single-page run that --profile can target ('stream' is the whole --stream pipeline)
+PROFILE_STAGES = ['read', 'parse', 'process', 'write', 'stream']
+
+# Bytes read per step in --stream mode
+STREAM_CHUNK_SIZE = 1 << 16
+# Characters of one unresolved film block --stream --parser regex holds before giving it up
+STREAM_BUFFER_LIMIT = 1 << 18
+
+# Longest tag the stream tokenizer waits for; a "<" that has not closed by then is fed as text
+MAX_TAG_LENGTH = 1 << 12
+
+# A "<" that html.parser treats as the start of markup
+MARKUP_OPEN_PATTERN = re.compile(r'<[a-zA-Z/!?]')
+# Complete tags, doctypes and processing instructions ("<" only inside quoted attribute values)
+COMPLETE_MARKUP_PATTERN = re.compile(
+    r'''<[a-zA-Z](?:[^<>"']|"[^"]*"|'[^']*')*>|</[a-zA-Z][^<>]*>|<!(?!--|\[)[^<>]*>|<\?[^<>]*>'''
+)
+
+# Captures film_url (from title link), title, schedule, and Buy Tickets URL
+SERIES_PAGE_PATTERN = re.compile(
+    r'<h3 class="title style-c"><a class="blue-type" href="([^"]+)"[^>]*>([^<]+)</a></h3>.*?<div class="details">\s*<p>([^<]*(?:<br />[^<]*)*)</p>.*?<a class="button small blue" href="([^"]+)">Buy Tickets</a>',
+    re.DOTALL,
+)
+# Every SERIES_PAGE_PATTERN match starts with this and ends with TICKET_MARKER
+TITLE_MARKER = '<h3 class="title style-c">'
+TICKET_MARKER = '">Buy Tickets</a>'
+FILM_TITLE_PATTERN = re.compile(r'<h3 class="title style-c"><a class="blue-type" href="([^"]+)"[^>]*>([^<]+)</a></h3>')
+
+WEEKDAY_PATTERN = re.compile(r'(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)')
+TIME_PATTERN = re.compile(r'\d{1,2}:\d{2}')
+URL_PATTERN = re.compile(r'^https?://')
+SCHEDULE_BREAK_PATTERN = re.compile(r'<br\s*/>')
+
+# Warning type for --metrics-out, matched against the messages process_matches emits
+WARNING_TYPES = [
+    ('empty_title', re.compile(r'^Skipping entry with empty title')),
+    ('missing_film_url', re.compile(r"^Warning: Movie '.*' has no film URL")),
+    ('invalid_film_url', re.compile(r'^Warning: Invalid film URL')),
+    ('missing_ticket_url', re.compile(r"^Warning: Movie '.*' has no ticket URL")),
+    ('invalid_ticket_url', re.compile(r'^Warning: Invalid ticket URL')),
+    ('duplicate', re.compile(r'^Skipping duplicate')),
+]
+
 
 def extract_slug_from_film_url(film_url: str, series_name: str = 'tenement-stories') -> str:
     """
@@ -45,115 +108,922 @@ def extract_slug_from_film_url(film_url: str, series_name: str = 'tenement-stori
     return path_segment
 
 
-def parse_html(html: str) -> List[Tuple[str, str, str, str]]:
+class _SeriesPageParser(HTMLParser):
+    """
+    Event-driven tokenizer for Film Forum series pages.
+
+    Tracks one film block at a time: a block opens at the
+    ``<h3 class="title style-c">`` title link, picks up the first
+    ``<div class="details"><p>`` schedule, and closes at its "Buy Tickets"
+    anchor. A new title also closes the previous block, so a film without a
+    ticket link is emitted with an empty ticket_url instead of swallowing the
+    next film. Completed records are queued on ``self.records``.
+    """
+
+    def __init__(self) -> None:
+        # Keep entities raw so schedule/title text matches the regex captures
+        super().__init__(convert_charrefs=False)
+        self.records: Deque[Tuple[str, str, str, str]] = deque()
+        self._film_url: Optional[str] = None
+        self._title: List[str] = []
+        self._schedule: List[str] = []
+        self._has_schedule = False
+        self._in_h3 = False
+        self._in_title = False
+        self._in_details = False
+        self._in_schedule = False
+        self._ticket_href: Optional[str] = None
+        self._ticket_text: List[str] = []
+
+    def _emit(self, ticket_url: str) -> None:
+        if self._film_url is not None:
+            self.records.append(
+                (self._film_url, ''.join(self._title), ''.join(self._schedule), ticket_url)
+            )
+        self._film_url = None
+        self._title = []
+        self._schedule = []
+        self._has_schedule = False
+
+    def handle_starttag(self, tag, attrs):
+        attr_map = dict(attrs)
+        if self._in_schedule:
+            if tag == 'br':
+                self._schedule.append(self.get_starttag_text())
+            return
+
+        if tag == 'h3' and attr_map.get('class') == 'title style-c':
+            self._in_h3 = True
+        elif tag == 'a' and self._in_h3 and attr_map.get('class') == 'blue-type':
+            # A new title closes any block still waiting for its ticket link
+            self._emit('')
+            self._film_url = attr_map.get('href') or ''
+            self._in_title = True
+        elif tag == 'div' and attr_map.get('class') == 'details':
+            self._in_details = self._film_url is not None and not self._has_schedule
+        elif tag == 'p' and self._in_details:
+            self._in_details = False
+            self._in_schedule = True
+            self._has_schedule = True
+        elif tag == 'a' and attr_map.get('class') == 'button small blue':
+            self._ticket_href = attr_map.get('href')
+            self._ticket_text = []
+        else:
+            self._in_details = False
+
+    def handle_startendtag(self, tag, attrs):
+        if self._in_schedule and tag == 'br':
+            self._schedule.append(self.get_starttag_text())
+
+    def handle_endtag(self, tag):
+        if tag == 'p' and self._in_schedule:
+            self._in_schedule = False
+        elif tag == 'h3':
+            self._in_h3 = False
+            self._in_title = False
+        elif tag == 'a':
+            self._in_title = False
+            if self._ticket_href is not None:
+                if ''.join(self._ticket_text).strip() == 'Buy Tickets' and self._film_url is not None:
+                    self._emit(self._ticket_href)
+                self._ticket_href = None
+
+    def handle_data(self, data):
+        if self._in_title:
+            self._title.append(data)
+        elif self._in_schedule:
+            self._schedule.append(data)
+        elif self._ticket_href is not None:
+            self._ticket_text.append(data)
+        elif self._in_details and data.strip():
+            self._in_details = False
+
+    def handle_entityref(self, name):
+        self.handle_data(f'&{name};')
+
+    def handle_charref(self, name):
+        self.handle_data(f'&#{name};')
+
+    def close(self) -> None:
+        super().close()
+        self._emit('')
+
+
+def _escape_open_markup(text: str, final: bool,
+                        max_tag_length: int = MAX_TAG_LENGTH) -> Tuple[str, str]:
+    """
+    Escape every "<" in text that does not open a complete tag or comment.
+
+    html.parser holds an unterminated tag open and rescans it from the start
+    on every call, so input like ``'<a' * 40000`` takes quadratic time. Each
+    "<" that cannot close within max_tag_length characters becomes ``&lt;``,
+    and so does any "<" inside a tag or comment that is passed through, so
+    the parser never sees markup it would wait on. Scanning stops at the next
+    "<", which keeps this pass linear.
+
+    Args:
+        text: HTML to check
+        final: True when no more input follows text
+        max_tag_length: Longest tag (attributes included) to wait for
+
+    Returns:
+        Tuple (checked text, tail to prepend to the next chunk). The tail is
+        empty when final is True.
+    """
+    pieces = []
+    pos = 0
+    # Position from which no "-->" is left in text, once a search has failed
+    no_comment_close = len(text) + 1
+    while True:
+        match = MARKUP_OPEN_PATTERN.search(text, pos)
+        if not match:
+            break
+        i = match.start()
+        if text.startswith('<!--', i):
+            end = text.find('-->', i + 4) if i + 4 < no_comment_close else -1
+            if end >= 0:
+                end += 3
+            elif not final and len(text) - i <= STREAM_BUFFER_LIMIT:
+                # The comment may still close in the next chunk
+                pieces.append(text[pos:i])
+                return ''.join(pieces), text[i:]
+            else:
+                no_comment_close = i + 4
+        else:
+            tag = COMPLETE_MARKUP_PATTERN.match(text, i, min(len(text), i + max_tag_length))
+            if tag:
+                end = tag.end()
+            elif not final and i + max_tag_length > len(text):
+                # The tag may still close in the next chunk
+                pieces.append(text[pos:i])
+                return ''.join(pieces), text[i:]
+            else:
+                end = -1
+
+        if end < 0:
+            pieces.append(text[pos:i] + '&lt;')
+            pos = i + 1
+        else:
+            pieces.append(text[pos:i + 1] + text[i + 1:end].replace('<', '&lt;'))
+            pos = end
+
+    pieces.append(text[pos:])
+    return ''.join(pieces), ''
+
+
+def iter_guarded_chunks(chunks: Iterable[str],
+                        max_tag_length: int = MAX_TAG_LENGTH) -> Iterator[str]:
+    """
+    Pass HTML chunks through ``_escape_open_markup``.
+
+    A tag or comment split across chunks is held back until it closes, for
+    at most max_tag_length characters (STREAM_BUFFER_LIMIT for comments).
+
+    Args:
+        chunks: HTML text chunks
+        max_tag_length: Longest tag to wait for
+
+    Yields:
+        Checked text, safe to feed to ``_SeriesPageParser``
+    """
+    pending = ''
+    for chunk in chunks:
+        text, pending = _escape_open_markup(pending + chunk, False, max_tag_length)
+        if text:
+            yield text
+    text, _ = _escape_open_markup(pending, True, max_tag_length)
+    if text:
+        yield text
+
+
+def iter_parse_html(source: Union[str, Iterable[str]]) -> Iterator[Tuple[str, str, str, str]]:
+    """
+    Stream movie records from series page HTML in a single pass.
+
+    Unlike the regex in ``parse_html``, a film block without a "Buy Tickets"
+    anchor never scans ahead past the next film, and unterminated tags are
+    escaped by ``iter_guarded_chunks`` before html.parser sees them, so the
+    cost stays linear in the size of the page.
+
+    Args:
+        source: HTML content, either as one string or as an iterable of chunks
+            (e.g. an open file)
+
+    Yields:
+        Tuples (film_url, title, schedule_html, ticket_url). ticket_url is
+        empty when the film block had no ticket link.
+    """
+    parser = _SeriesPageParser()
+    chunks = [source] if isinstance(source, str) else source
+
+    for chunk in iter_guarded_chunks(chunks):
+        parser.feed(chunk)
+        while parser.records:
+            yield parser.records.popleft()
+
+    parser.close()
+    while parser.records:
+        yield parser.records.popleft()
+
+
+PARSE_MODES = ('regex', 'stream')
+
+
+def parse_html(html: str, mode: str = 'regex') -> List[Tuple[str, str, str, str]]:
     """
     Parse HTML to extract movie information.
 
     Args:
         html: HTML content to parse
+        mode: 'regex' (default) or 'stream' to use the linear-time tokenizer
 
     Returns:
         List of tuples (film_url, title, schedule_html, ticket_url)
     """
-    # Pattern captures: film_url (from title link), title, schedule, and Buy Tickets URL
-    pattern = r'<h3 class="title style-c"><a class="blue-type" href="([^"]+)"[^>]*>([^<]+)</a></h3>.*?<div class="details">\s*<p>([^<]*(?:<br />[^<]*)*)</p>.*?<a class="button small blue" href="([^"]+)">Buy Tickets</a>'
+    if mode == 'stream':
+        return list(iter_parse_html(html))
+    if mode != 'regex':
+        raise ValueError(f"Unknown parse mode: {mode} (expected one of {', '.join(PARSE_MODES)})")
 
     try:
-        matches = re.findall(pattern, html, re.DOTALL)
-        return matches
+        return SERIES_PAGE_PATTERN.findall(html)
     except Exception as e:
         print(f"Error parsing HTML with regex: {e}")
         raise
 
 
-def process_matches(matches: List[Tuple[str, str, str, str]], scrape_timestamp: str, series_name: str = 'tenement-stories') -> Tuple[List[List[str]], List[str]]:
+def iter_regex_matches(chunks: Iterable[str],
+                       max_buffer: int = STREAM_BUFFER_LIMIT) -> Iterator[Tuple[str, str, str, str]]:
     """
-    Process regex matches into CSV rows with validation.
+    Find the same matches as ``parse_html(html, 'regex')`` in chunked input.
+
+    Text is buffered only until the film block at its start resolves. With
+    its lazy gaps, the pattern's first match from a title is the first
+    schedule after it followed by the first ticket link, so a match found
+    in the buffer is the one the whole page would give. Text before the
+    earliest title that has not matched yet can never start a match and is
+    dropped. Every match ends at a ticket link, so the buffer is only
+    searched again once a new link has arrived.
+
+    A film without a ticket link keeps its text buffered until a later link
+    completes it, exactly as the regex swallows the next film, but only up
+    to max_buffer characters. Past that the film is given up: it is yielded
+    with an empty ticket_url (which validation reports and skips, as in
+    stream mode) and scanning resumes at the next title. This is the only
+    way the output can differ from the whole-page regex.
 
     Args:
-        matches: List of (film_url, title, schedule_html, ticket_url) tuples
-        scrape_timestamp: ISO format timestamp for this scrape
-        series_name: Series name used for slug extraction (default: tenement-stories)
+        chunks: HTML text in pieces (e.g. from iter_input_chunks)
+        max_buffer: Characters an unresolved film block may hold
 
-    Returns:
-        Tuple of (rows, validation_warnings)
+    Yields:
+        Tuples (film_url, title, schedule_html, ticket_url)
     """
-    rows = []
-    seen_entries: Set[Tuple[str, str, str, str]] = set()
-    validation_warnings = []
+    buffer = ''
+    for chunk in chunks:
+        # A ticket link split across the chunk boundary starts in the old text
+        unsearched = max(0, len(buffer) - len(TICKET_MARKER) + 1)
+        buffer += chunk
+        position = 0
+        if buffer.find(TICKET_MARKER, unsearched) != -1:
+            for match in SERIES_PAGE_PATTERN.finditer(buffer):
+                yield match.groups()
+                position = match.end()
+        start = buffer.find(TITLE_MARKER, position)
+        if start == -1:
+            # Keep a marker that may be split across the chunk boundary
+            start = max(position, len(buffer) - len(TITLE_MARKER) + 1)
+        buffer = buffer[start:]
+
+        while len(buffer) > max_buffer:
+            title = FILM_TITLE_PATTERN.match(buffer)
+            if title:
+                yield title.group(1), title.group(2), '', ''
+            next_title = buffer.find(TITLE_MARKER, 1)
+            buffer = buffer[next_title:] if next_title != -1 else buffer[-(len(TITLE_MARKER) - 1):]
 
+
+def iter_input_chunks(input_path: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Read a page as text chunks without holding it in memory.
+
+    '-' reads stdin, a path ending in .gz is decompressed on the fly and any
+    other file is memory-mapped. Decoding matches ``open(path, encoding='utf-8')``,
+    including newline translation.
+
+    Args:
+        input_path: Page path, or '-' for stdin
+        chunk_size: Bytes read per step
+
+    Yields:
+        Decoded text chunks
+
+    Raises:
+        FileNotFoundError: If input_path does not exist
+    """
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True)
+    for block in _iter_input_bytes(input_path, chunk_size):
+        text = decoder.decode(block)
+        if text:
+            yield text
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
+
+
+def _iter_input_bytes(input_path: str, chunk_size: int) -> Iterator[bytes]:
+    if input_path == '-':
+        yield from iter(lambda: sys.stdin.buffer.read(chunk_size), b'')
+    elif input_path.endswith('.gz'):
+        with gzip.open(input_path, 'rb') as f:
+            yield from iter(lambda: f.read(chunk_size), b'')
+    else:
+        with open(input_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for offset in range(0, size, chunk_size):
+                    yield mapped[offset:offset + chunk_size]
+
+
+def iter_valid_matches(matches: Iterable[Tuple[str, str, str, str]], warn: Callable[[str], None],
+                       series_name: str = 'tenement-stories') -> Iterator[Tuple[str, str, str, str, str]]:
+    """
+    Validate parsed film blocks, reporting and dropping invalid ones.
+
+    Args:
+        matches: (film_url, title, schedule_html, ticket_url) tuples
+        warn: Called with each validation warning
+        series_name: Series name used for slug extraction
+
+    Yields:
+        Tuples (title, film_url, film_slug, schedule_html, ticket_url), cleaned
+    """
     for film_url, title, schedule_html, ticket_url in matches:
         # Decode HTML entities in title
         title = html_lib.unescape(title).strip()
 
         # Validate required fields
         if not title:
-            validation_warnings.append("Skipping entry with empty title")
+            warn("Skipping entry with empty title")
             continue
 
         if not film_url or not film_url.strip():
-            validation_warnings.append(f"Warning: Movie '{title}' has no film URL")
+            warn(f"Warning: Movie '{title}' has no film URL")
             continue
 
         # Validate film URL format
         film_url = film_url.strip()
-        if not re.match(r'^https?://', film_url):
-            validation_warnings.append(f"Warning: Invalid film URL for '{title}': {film_url}")
+        if not URL_PATTERN.match(film_url):
+            warn(f"Warning: Invalid film URL for '{title}': {film_url}")
             continue
 
         # Extract film slug from film URL
         film_slug = extract_slug_from_film_url(film_url, series_name)
 
         if not ticket_url or not ticket_url.strip():
-            validation_warnings.append(f"Warning: Movie '{title}' has no ticket URL")
+            warn(f"Warning: Movie '{title}' has no ticket URL")
             continue
 
         # Validate ticket URL format
         ticket_url = ticket_url.strip()
-        if not re.match(r'^https?://', ticket_url):
-            validation_warnings.append(f"Warning: Invalid ticket URL for '{title}': {ticket_url}")
+        if not URL_PATTERN.match(ticket_url):
+            warn(f"Warning: Invalid ticket URL for '{title}': {ticket_url}")
             continue
 
+        yield title, film_url, film_slug, schedule_html, ticket_url
+
+
+def iter_showtime_rows(films: Iterable[Tuple[str, str, str, str, str]], scrape_timestamp: str) -> Iterator[List[str]]:
+    """
+    Expand each film's schedule into CSV rows.
+
+    Args:
+        films: Output of iter_valid_matches
+        scrape_timestamp: ISO format timestamp for this scrape
+
+    Yields:
+        Rows [title, date, time, ticket_url, film_url, film_slug, timestamp]
+    """
+    for title, film_url, film_slug, schedule_html, ticket_url in films:
         # Clean up the schedule - split by <br />
-        lines = re.split(r'<br\s*/>', schedule_html)
-        lines = [l.strip() for l in lines if l.strip()]
+        lines = [l.strip() for l in SCHEDULE_BREAK_PATTERN.split(schedule_html) if l.strip()]
 
         # Parse date-time pairs
         current_date = None
         for line in lines:
             # Clean HTML entities
             line = html_lib.unescape(line).strip()
-            if re.match(r'(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)', line):
+            if WEEKDAY_PATTERN.match(line):
                 current_date = line
-            elif re.match(r'\d{1,2}:\d{2}', line) and current_date:
-                time = line
+            elif TIME_PATTERN.match(line) and current_date:
+                yield [title, current_date, line, ticket_url, film_url, film_slug, scrape_timestamp]
 
-                # Duplicate detection
-                entry_key = (title, current_date, time, ticket_url)
-                if entry_key in seen_entries:
-                    validation_warnings.append(f"Skipping duplicate: {title} on {current_date} at {time}")
-                    continue
-                seen_entries.add(entry_key)
 
-                rows.append([title, current_date, time, ticket_url, film_url, film_slug, scrape_timestamp])
+def iter_unique_rows(rows: Iterable[List[str]], warn: Callable[[str], None]) -> Iterator[List[str]]:
+    """
+    Drop repeated showtimes (same title, date, time and ticket URL).
+
+    Only a 16-byte digest is kept per showtime, so memory grows with the
+    number of distinct showtimes and not with the size of the page.
+
+    Args:
+        rows: Output of iter_showtime_rows
+        warn: Called with a warning for each duplicate
+
+    Yields:
+        First occurrence of each showtime
+    """
+    seen: Set[bytes] = set()
+    for row in rows:
+        title, date, time, ticket_url = row[:4]
+        key = hashlib.blake2b('\0'.join((title, date, time, ticket_url)).encode('utf-8'), digest_size=16).digest()
+        if key in seen:
+            warn(f"Skipping duplicate: {title} on {date} at {time}")
+            continue
+        seen.add(key)
+        yield row
+
 
+def process_matches(matches: List[Tuple[str, str, str, str]], scrape_timestamp: str, series_name: str = 'tenement-stories') -> Tuple[List[List[str]], List[str]]:
+    """
+    Process regex matches into CSV rows with validation.
+
+    Args:
+        matches: List of (film_url, title, schedule_html, ticket_url) tuples
+        scrape_timestamp: ISO format timestamp for this scrape
+        series_name: Series name used for slug extraction (default: tenement-stories)
+
+    Returns:
+        Tuple of (rows, validation_warnings)
+    """
+    validation_warnings: List[str] = []
+    films = iter_valid_matches(matches, validation_warnings.append, series_name)
+    rows = list(iter_unique_rows(iter_showtime_rows(films, scrape_timestamp), validation_warnings.append))
     return rows, validation_warnings
 
 
-def write_csv(rows: List[List[str]], output_path: str) -> None:
+def classify_warning(warning: str) -> str:
+    """
+    Map a process_matches warning message to a short type name.
+
+    Args:
+        warning: Validation warning text
+
+    Returns:
+        One of the WARNING_TYPES names, or 'other'
+    """
+    for kind, pattern in WARNING_TYPES:
+        if pattern.match(warning):
+            return kind
+    return 'other'
+
+
+def record_rows(metrics: Metrics, rows: List[List[str]], validation_warnings: List[str]) -> None:
+    """
+    Add row, film and warning counts to metrics.
+
+    Args:
+        metrics: Metrics of the current run
+        rows: Processed CSV rows (Movie first)
+        validation_warnings: Warnings from process_matches
+    """
+    metrics.count('rows', len(rows))
+    metrics.count('films', len({row[0] for row in rows}))
+    for warning in validation_warnings:
+        metrics.warning(classify_warning(warning))
+
+
+def parse_and_process(html: str, scrape_timestamp: str, series_name: str = 'tenement-stories',
+                      mode: str = 'regex', cache: Optional[ParseCache] = None,
+                      metrics: Optional[Metrics] = None) -> Tuple[List[List[str]], List[str], bool]:
+    """
+    Parse and process a page, reusing cached rows when its content is unchanged.
+
+    Args:
+        html: HTML content to parse
+        scrape_timestamp: ISO format timestamp for this scrape
+        series_name: Series name used for slug extraction
+        mode: Parse mode passed to parse_html
+        cache: Parse cache to consult and fill (None disables caching)
+        metrics: Records 'parse'/'process' timings and the match count (optional)
+
+    Returns:
+        Tuple of (rows, validation_warnings, cache_hit)
+    """
+    if metrics is None:
+        metrics = Metrics('parse_and_process')
+
+    key = None
+    if cache is not None:
+        with metrics.stage('cache_lookup'):
+            key = ParseCache.make_key(html, PARSER_VERSION, mode, series_name)
+            hit = cache.get(key)
+        if hit is not None:
+            rows, validation_warnings = hit
+            # Same content, fresh scrape: restamp the ScrapedAt column
+            return [row[:-1] + [scrape_timestamp] for row in rows], validation_warnings, True
+
+    with metrics.stage('parse'):
+        matches = parse_html(html, mode)
+    metrics.count('matches', len(matches))
+    with metrics.stage('process'):
+        rows, validation_warnings = process_matches(matches, scrape_timestamp, series_name)
+
+    if cache is not None:
+        cache.put(key, rows, validation_warnings)
+
+    return rows, validation_warnings, False
+
+
+def write_csv(rows: List[List[str]], output_path: str, header: Optional[List[str]] = None) -> None:
     """
     Write parsed showtime data to CSV file.
 
     Args:
         rows: List of row data [title, date, time, ticket_url, film_url, film_slug, timestamp]
         output_path: Path to output CSV file
+        header: Column names (default: CSV_HEADER)
     """
     with open(output_path, 'w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
-        writer.writerow(['Movie', 'Date', 'Time', 'ticket_url', 'film_url', 'film_slug', 'ScrapedAt'])
+        writer.writerow(header or CSV_HEADER)
         writer.writerows(rows)
 
 
+def parse_series_file(series_name: str, input_path: str, scrape_timestamp: str, mode: str = 'regex',
+                      cache: Optional[ParseCache] = None) -> Dict[str, Any]:
+    """
+    Read, parse and process one cached series page.
+
+    Runs inside a worker process during batch mode, so failures are returned
+    in the result instead of raised.
+
+    Args:
+        series_name: Series name (used for slug extraction and the Series column)
+        input_path: Path to the cached series HTML
+        scrape_timestamp: ISO format timestamp shared by the whole batch
+        mode: Parse mode passed to parse_html
+        cache: Parse cache (None disables caching)
+
+    Returns:
+        Dict with keys series, input, rows, warnings, cached, error, stages, matches
+    """
+    result: Dict[str, Any] = {
+        'series': series_name,
+        'input': input_path,
+        'rows': [],
+        'warnings': [],
+        'cached': False,
+        'error': None,
+        'stages': {},
+        'matches': 0,
+    }
+
+    metrics = Metrics('parse_showtimes')
+    try:
+        with metrics.stage('read'):
+            with open(input_path, 'r', encoding='utf-8') as f:
+                html = f.read()
+        rows, validation_warnings, cached = parse_and_process(
+            html, scrape_timestamp, series_name, mode, cache, metrics
+        )
+    except FileNotFoundError:
+        result['error'] = f"Input file not found: {input_path}"
+        return result
+    except Exception as e:
+        result['error'] = f"Error reading or parsing {input_path}: {e}"
+        return result
+
+    result['rows'] = [row + [series_name] for row in rows]
+    result['warnings'] = validation_warnings
+    result['cached'] = cached
+    result['stages'] = metrics.stages
+    result['matches'] = metrics.counters.get('matches', 0)
+    return result
+
+
+def run_batch(jobs: List[Tuple[str, str]], scrape_timestamp: str, mode: str = 'regex', workers: Optional[int] = None,
+              cache: Optional[ParseCache] = None) -> List[Dict[str, Any]]:
+    """
+    Parse many series pages across a process pool.
+
+    Args:
+        jobs: List of (series_name, input_path) pairs
+        scrape_timestamp: ISO format timestamp shared by the whole batch
+        mode: Parse mode passed to parse_html
+        workers: Number of worker processes (default: CPU count). 1 runs inline.
+        cache: Parse cache shared by all workers (None disables caching)
+
+    Returns:
+        List of parse_series_file results, in job order
+    """
+    if workers == 1 or len(jobs) <= 1:
+        return [parse_series_file(series, path, scrape_timestamp, mode, cache) for series, path in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(parse_series_file, series, path, scrape_timestamp, mode, cache)
+            for series, path in jobs
+        ]
+        return [future.result() for future in futures]
+
+
+def collect_batch_jobs(series_names: Optional[List[str]] = None, pattern: Optional[str] = None) -> List[Tuple[str, str]]:
+    """
+    Build (series_name, input_path) jobs from series names and/or a glob.
+
+    Series names resolve to PROJECT_ROOT/{series}.html like single mode; globbed
+    files take their series name from the file stem.
+
+    Args:
+        series_names: Series names to parse
+        pattern: Glob pattern matching cached series HTML files
+
+    Returns:
+        De-duplicated list of jobs in argument order
+    """
+    jobs: List[Tuple[str, str]] = []
+    seen: Set[str] = set()
+
+    for series in series_names or []:
+        path = str(PROJECT_ROOT / f'{series}.html')
+        if path not in seen:
+            seen.add(path)
+            jobs.append((series, path))
+
+    for path in sorted(glob.glob(pattern)) if pattern else []:
+        if path not in seen:
+            seen.add(path)
+            jobs.append((Path(path).stem, path))
+
+    return jobs
+
+
+def print_batch_summary(results: List[Dict[str, Any]]) -> None:
+    """
+    Print one summary block per series with its counts and warnings.
+
+    Args:
+        results: Results returned by run_batch
+    """
+    for result in results:
+        rows = result['rows']
+        print(f"\n── {result['series']} ({result['input']})")
+        if result['error']:
+            print(f"  ✗ {result['error']}")
+            continue
+        cached = " (cached)" if result['cached'] else ""
+        print(f"  ✓ {len(rows)} showtimes for {len(set(r[0] for r in rows))} movies{cached}")
+        if result['warnings']:
+            print(f"  ⚠ {len(result['warnings'])} validation warnings:")
+            for warning in result['warnings']:
+                print(f"    {warning}")
+
+
+def build_cache(args: argparse.Namespace) -> Optional[ParseCache]:
+    """
+    Create the parse cache from command-line arguments.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        ParseCache, or None when --no-cache is set
+    """
+    if args.no_cache:
+        return None
+    return ParseCache(args.cache_dir, args.cache_max_entries, args.cache_max_age_days)
+
+
+def record_history(db_path: str, rows: Iterable[List[str]], header: List[str],
+                   series_name: str = 'tenement-stories') -> None:
+    """
+    Record written CSV rows in the SQLite showtime history.
+
+    Args:
+        db_path: History database path
+        rows: CSV rows as written
+        header: Column names of rows (batch rows carry a Series column)
+        series_name: Series of rows without a Series column
+    """
+    with ShowtimeHistory(db_path) as history:
+        summaries, _ = history.ingest((dict(zip(header, row)) for row in rows), series_name)
+    for summary in summaries:
+        print(f"✓ Recorded {summary['series']} in {db_path}: "
+              f"+{summary['added']} / -{summary['removed']} showtimes since the previous scrape")
+
+
+def finish_metrics(metrics: Metrics, args: argparse.Namespace) -> None:
+    """
+    Write --metrics-out and the --profile dump, if requested.
+
+    Args:
+        metrics: Metrics of the current run
+        args: Parsed command-line arguments
+    """
+    if args.metrics_out:
+        metrics.write(args.metrics_out)
+        print(f"✓ Wrote metrics to: {args.metrics_out}")
+    summary = metrics.dump_profile()
+    if summary:
+        print(f"\n✓ Wrote cProfile stats for the {metrics.profile_stage} stage to: {metrics.profile_path}")
+        print(summary)
+
+
+def stream_showtimes(chunks: Iterable[str], output: TextIO, scrape_timestamp: str,
+                     series_name: str = 'tenement-stories', mode: str = 'regex',
+                     warn: Optional[Callable[[str], None]] = None,
+                     metrics: Optional[Metrics] = None) -> Dict[str, int]:
+    """
+    Parse, validate, dedupe and write showtimes one record at a time.
+
+    Nothing is collected: each CSV row is written (and flushed) as soon as
+    its film block has been parsed, and warnings go to ``warn`` as they
+    occur. The CSV is byte-identical to parse_and_process + write_csv with
+    the same mode.
+
+    Args:
+        chunks: HTML text in pieces (e.g. from iter_input_chunks)
+        output: Text stream opened with newline=''
+        scrape_timestamp: ISO format timestamp for this scrape
+        series_name: Series name used for slug extraction
+        mode: Parse mode, as in parse_html
+        warn: Called with each validation warning (default: discard)
+        metrics: Counts matches, rows and warnings by type (optional)
+
+    Returns:
+        Dict with matches, rows, films and warnings counts
+    """
+    if mode == 'stream':
+        matches = iter_parse_html(chunks)
+    elif mode == 'regex':
+        matches = iter_regex_matches(chunks)
+    else:
+        raise ValueError(f"Unknown parse mode: {mode} (expected one of {', '.join(PARSE_MODES)})")
+
+    counts = {'matches': 0, 'rows': 0, 'films': 0, 'warnings': 0}
+    titles: Set[str] = set()
+
+    def counted(items: Iterable[Tuple[str, str, str, str]]) -> Iterator[Tuple[str, str, str, str]]:
+        for item in items:
+            counts['matches'] += 1
+            yield item
+
+    def report(message: str) -> None:
+        counts['warnings'] += 1
+        if metrics is not None:
+            metrics.warning(classify_warning(message))
+        if warn is not None:
+            warn(message)
+
+    writer = csv.writer(output)
+    writer.writerow(CSV_HEADER)
+    films = iter_valid_matches(counted(matches), report, series_name)
+    for row in iter_unique_rows(iter_showtime_rows(films, scrape_timestamp), report):
+        writer.writerow(row)
+        output.flush()
+        counts['rows'] += 1
+        titles.add(row[0])
+    counts['films'] = len(titles)
+
+    if metrics is not None:
+        for name in ('matches', 'rows', 'films'):
+            metrics.count(name, counts[name])
+    return counts
+
+
+def main_stream(args: argparse.Namespace, input_html: str, output_csv: str) -> None:
+    """
+    Streaming entry point: constant-memory parse of one page.
+
+    Reads input_html ('-' for stdin, .gz decompressed, otherwise mmap) and
+    writes output_csv ('-' for stdout) as rows are produced. Warnings stream
+    to --warnings-out or stderr. The parse cache is not used.
+
+    Args:
+        args: Parsed command-line arguments
+        input_html: Input page path
+        output_csv: Output CSV path
+    """
+    # Keep stdout clean for the CSV when it is the output
+    status = sys.stderr if output_csv == '-' else sys.stdout
+    if args.history_db and output_csv == '-':
+        print("Error: --history-db needs an --output file in --stream mode", file=sys.stderr)
+        sys.exit(1)
+
+    metrics = Metrics('parse_showtimes', args.profile_stage if args.profile else None, args.profile)
+    scrape_timestamp = datetime.now().isoformat()
+    sink = open(args.warnings_out, 'w', encoding='utf-8') if args.warnings_out else sys.stderr
+    output = sys.stdout if output_csv == '-' else open(output_csv, 'w', newline='', encoding='utf-8')
+
+    def warn(message: str) -> None:
+        print(message, file=sink, flush=True)
+
+    try:
+        with metrics.stage('stream'):
+            counts = stream_showtimes(iter_input_chunks(input_html), output, scrape_timestamp,
+                                      args.series, args.parser, warn, metrics)
+    except FileNotFoundError:
+        print(f"Error: Input file not found: {input_html}", file=sys.stderr)
+        sys.exit(1)
+    except BrokenPipeError:
+        # Reader of stdout went away (e.g. piped into head); silence the flush at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error parsing {input_html}: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if sink is not sys.stderr:
+            sink.close()
+
+    if input_html != '-':
+        metrics.set('input_bytes', os.path.getsize(input_html))
+    print(f"\n✓ Extracted {counts['rows']} showtimes for {counts['films']} movies (streamed)", file=status)
+    print(f"✓ Scraped at: {scrape_timestamp}", file=status)
+    print(f"✓ Wrote output to: {output_csv}", file=status)
+    if counts['warnings']:
+        print(f"\n⚠ Total validation warnings: {counts['warnings']}"
+              f" (written to {args.warnings_out or 'stderr'})", file=status)
+
+    if args.history_db:
+        with metrics.stage('history'):
+            with open(output_csv, 'r', newline='', encoding='utf-8') as f:
+                reader = csv.reader(f)
+                next(reader)
+                record_history(args.history_db, reader, CSV_HEADER, args.series)
+
+    finish_metrics(metrics, args)
+
+
+def main_batch(args: argparse.Namespace) -> None:
+    """
+    Batch entry point: parse many series pages in parallel.
+
+    Args:
+        args: Parsed command-line arguments
+    """
+    jobs = collect_batch_jobs(args.batch, args.glob)
+    if not jobs:
+        print("Error: No series pages matched --batch/--glob")
+        sys.exit(1)
+    if args.profile:
+        print("⚠ --profile is ignored in batch mode (pages are parsed in worker processes)")
+
+    metrics = Metrics('parse_showtimes')
+    scrape_timestamp = datetime.now().isoformat()
+    with metrics.stage('batch'):
+        results = run_batch(jobs, scrape_timestamp, args.parser, args.workers, build_cache(args))
+    print_batch_summary(results)
+
+    # Worker stage times add up across processes, so they can exceed the batch wall time
+    for result in results:
+        for stage, seconds in result['stages'].items():
+            metrics.stages[stage] = metrics.stages.get(stage, 0.0) + seconds
+        metrics.count('matches', result['matches'])
+        record_rows(metrics, result['rows'], result['warnings'])
+    metrics.set('series', len(results))
+    metrics.set('series_failed', sum(1 for r in results if r['error']))
+    metrics.set('cache_hits', sum(1 for r in results if r['cached']))
+
+    try:
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+            for result in results:
+                if result['error']:
+                    continue
+                output_csv = os.path.join(args.output_dir, f"{result['series']}.csv")
+                with metrics.stage('write'):
+                    write_csv(result['rows'], output_csv, BATCH_CSV_HEADER)
+                print(f"✓ Wrote {result['series']} to: {output_csv}")
+        else:
+            output_csv = args.output or str(PROJECT_ROOT / 'showtimes-batch.csv')
+            merged = [row for result in results for row in result['rows']]
+            with metrics.stage('write'):
+                write_csv(merged, output_csv, BATCH_CSV_HEADER)
+            print(f"\n✓ Wrote {len(merged)} showtimes from {len(results)} series to: {output_csv}")
+    except Exception as e:
+        print(f"Error writing CSV file: {e}")
+        sys.exit(1)
+
+    print(f"✓ Scraped at: {scrape_timestamp}")
+
+    if args.history_db:
+        with metrics.stage('history'):
+            record_history(args.history_db, [row for r in results for row in r['rows']], BATCH_CSV_HEADER)
+
+    finish_metrics(metrics, args)
+
+    failed = [r for r in results if r['error']]
+    if failed:
+        print(f"\n⚠ {len(failed)} of {len(results)} series failed")
+        sys.exit(1)
+
+
 def main():
     """Main entry point for command-line execution."""
     # Parse command-line arguments
@@ -170,6 +1040,25 @@ Examples:
 
   # Specify custom input/output files
   %(prog)s --input my-file.html --output my-file.csv
+
+  # Use the linear-time streaming parser (for large or damaged pages)
+  %(prog)s --parser stream
+
+  # Batch: parse several series in parallel into one merged CSV
+  %(prog)s --batch tenement-stories my-series --output all.csv
+
+  # Batch: parse every cached page, one CSV per series
+  %(prog)s --glob 'cache/*.html' --output-dir csv/
+
+  # Append stage timings and counters to a history file
+  %(prog)s --metrics-out metrics/parse.jsonl
+
+  # Profile the parse stage
+  %(prog)s --parser stream --no-cache --profile parse.prof
+
+  # Stream a gzipped page (or stdin) in constant memory, warnings to a file
+  %(prog)s --stream --input page.html.gz --output out.csv --warnings-out warnings.txt
+  curl -s https://filmforum.org/series/... | %(prog)s --stream --input - --output - > out.csv
 '''
     )
     parser.add_argument(
@@ -185,8 +1074,89 @@ Examples:
         '--output',
         help='Output CSV file path (overrides --series default)'
     )
+    parser.add_argument(
+        '--parser',
+        choices=PARSE_MODES,
+        help='HTML parse mode (default: regex, or stream with --stream). "stream" uses a single-pass tokenizer.'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Constant-memory mode: read the input in chunks (mmap, .gz or "-" for stdin) and write '
+             'rows as they are parsed ("-" output for stdout). Skips the parse cache.'
+    )
+    parser.add_argument(
+        '--warnings-out',
+        help='Stream mode: write validation warnings to this file instead of stderr'
+    )
+    parser.add_argument(
+        '--batch',
+        nargs='+',
+        metavar='SERIES',
+        help='Parse several series in parallel (reads {series}.html from the project root)'
+    )
+    parser.add_argument(
+        '--glob',
+        help='Batch mode: glob of cached series HTML files (series name = file stem)'
+    )
+    parser.add_argument(
+        '--output-dir',
+        help='Batch mode: write one CSV per series into this directory instead of one merged CSV'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Batch mode: number of worker processes (default: CPU count)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always re-parse, ignoring and not updating the parse cache'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        default=DEFAULT_CACHE_DIR,
+        help='Parse cache directory (default: data-processing/.parse-cache, or PARSE_CACHE_DIR)'
+    )
+    parser.add_argument(
+        '--cache-max-entries',
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        help=f'Evict least recently used cache entries beyond this count (default: {DEFAULT_MAX_ENTRIES})'
+    )
+    parser.add_argument(
+        '--cache-max-age-days',
+        type=float,
+        default=DEFAULT_MAX_AGE_DAYS,
+        help=f'Evict cache entries unused for this many days (default: {DEFAULT_MAX_AGE_DAYS})'
+    )
+    parser.add_argument(
+        '--history-db',
+        help='Also record the scraped showtimes in this SQLite history (see showtime_history.py)'
+    )
+    parser.add_argument(
+        '--metrics-out',
+        help='Write stage timings and counters as JSON (a .jsonl path appends one line per run)'
+    )
+    parser.add_argument(
+        '--profile',
+        metavar='FILE',
+        help='Run the --profile-stage under cProfile and dump its stats to FILE'
+    )
+    parser.add_argument(
+        '--profile-stage',
+        choices=PROFILE_STAGES,
+        default='parse',
+        help='Stage to profile with --profile (default: parse)'
+    )
 
     args = parser.parse_args()
+    # The tokenizer holds no page text, so it is what keeps --stream flat on damaged pages
+    args.parser = args.parser or ('stream' if args.stream else 'regex')
+
+    if args.batch or args.glob:
+        main_batch(args)
+        return
 
     # Determine input and output files
     if args.input:
@@ -199,10 +1169,17 @@ Examples:
     else:
         output_csv = os.environ.get('OUTPUT_CSV', str(PROJECT_ROOT / f'{args.series}.csv'))
 
+    if args.stream:
+        main_stream(args, input_html, output_csv)
+        return
+
+    metrics = Metrics('parse_showtimes', args.profile_stage if args.profile else None, args.profile)
+
     # Read the HTML file
     try:
-        with open(input_html, 'r', encoding='utf-8') as f:
-            html = f.read()
+        with metrics.stage('read'):
+            with open(input_html, 'r', encoding='utf-8') as f:
+                html = f.read()
     except FileNotFoundError:
         print(f"Error: Input file not found: {input_html}")
         sys.exit(1)
@@ -210,15 +1187,18 @@ Examples:
         print(f"Error reading input file: {e}")
         sys.exit(1)
 
-    # Parse HTML
+    # Parse and process HTML (skipped on a cache hit)
+    scrape_timestamp = datetime.now().isoformat()
     try:
-        matches = parse_html(html)
-    except Exception:
+        rows, validation_warnings, cache_hit = parse_and_process(
+            html, scrape_timestamp, args.series, args.parser, build_cache(args), metrics
+        )
+    except Exception as e:
+        print(f"Error parsing {input_html}: {e}")
         sys.exit(1)
-
-    # Process matches
-    scrape_timestamp = datetime.now().isoformat()
-    rows, validation_warnings = process_matches(matches, scrape_timestamp, args.series)
+    metrics.set('input_bytes', len(html.encode('utf-8')))
+    metrics.set('cache_hit', cache_hit)
+    record_rows(metrics, rows, validation_warnings)
 
     # Report validation warnings
     if validation_warnings:
@@ -228,9 +1208,12 @@ Examples:
 
     # Write CSV
     try:
-        write_csv(rows, output_csv)
+        with metrics.stage('write'):
+            write_csv(rows, output_csv)
         print(f"\n✓ Extracted {len(rows)} showtimes for {len(set(r[0] for r in rows))} movies")
         print(f"✓ Scraped at: {scrape_timestamp}")
+        if cache_hit:
+            print("✓ Page unchanged since last run (parse cache hit)")
         print(f"✓ Wrote output to: {output_csv}")
 
         # Data quality summary
@@ -240,6 +1223,12 @@ Examples:
         print(f"Error writing CSV file: {e}")
         sys.exit(1)
 
+    if args.history_db:
+        with metrics.stage('history'):
+            record_history(args.history_db, rows, CSV_HEADER, args.series)
+
+    finish_metrics(metrics, args)
+
 
 if __name__ == '__main__':
     main()
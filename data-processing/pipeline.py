@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+"""
+Incremental orchestrator for the showtime data pipeline.
+
+Models the pipeline as a dependency graph of stages:
+
+    fetch -> parse -> enrich --+
+    metadata -------'          +--> publish --> compress
+    posters -------------------+
+
+Each stage declares its input and output files. A stage is skipped when a
+fingerprint of its inputs (file contents plus the stage's command) matches
+the one recorded after its last successful run and its outputs still exist.
+Stages whose dependencies are satisfied run in parallel.
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Set, Union
+
+from atomic_write import atomic_write_bytes
+
+# Get script directory for relative paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+
+BUILD_DIR = 'data-processing/build'
+STATE_FILE = os.environ.get('PIPELINE_STATE', str(SCRIPT_DIR / '.pipeline-state.json'))
+
+Action = Union[Sequence[str], Callable[[Path], None]]
+
+
+class Stage:
+    """One node of the pipeline graph."""
+
+    def __init__(self, name: str, action: Action, inputs: Sequence[str] = (), outputs: Sequence[str] = (),
+                 deps: Sequence[str] = (), env: Optional[Dict[str, str]] = None, always: bool = False) -> None:
+        """
+        Args:
+            name: Unique stage name
+            action: argv list run as a subprocess from the pipeline root, or a
+                callable taking the root directory
+            inputs: Files, directories or globs (relative to root) the stage reads
+            outputs: Files or directories (relative to root) the stage writes
+            deps: Names of stages that must finish first
+            env: Extra environment variables for subprocess actions
+            always: Run even when the fingerprint is unchanged (e.g. network fetches)
+        """
+        self.name = name
+        self.action = action
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.deps = list(deps)
+        self.env = dict(env or {})
+        self.always = always
+
+    def describe(self) -> str:
+        """Stable description of the action, folded into the fingerprint."""
+        if callable(self.action):
+            return f'{self.action.__module__}.{self.action.__qualname__}'
+        return json.dumps([list(self.action), sorted(self.env.items())])
+
+
+def local_modules(*scripts: str) -> List[str]:
+    """
+    List the data-processing modules scripts import, directly or through
+    other local modules, so a stage is re-run when any of them changes.
+
+    Imports inside functions count too (publish imports its writers
+    lazily). Modules that are not files in data-processing/ are ignored.
+
+    Args:
+        scripts: Module file names in data-processing/ (e.g. 'process_posters.py')
+
+    Returns:
+        Sorted project-relative paths, the scripts themselves included
+    """
+    seen: Set[str] = set()
+    pending = list(scripts)
+    while pending:
+        name = pending.pop()
+        path = SCRIPT_DIR / name
+        if name in seen or not path.is_file():
+            continue
+        seen.add(name)
+        for node in ast.walk(ast.parse(path.read_text(encoding='utf-8'), str(path))):
+            if isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+                modules = [node.module]
+            else:
+                continue
+            pending += [f"{module.split('.')[0]}.py" for module in modules]
+    return sorted(f'data-processing/{name}' for name in seen)
+
+
+def hash_inputs(root: Path, patterns: Sequence[str]) -> str:
+    """
+    Hash the contents of every file matched by the input patterns.
+
+    Args:
+        root: Directory patterns are relative to
+        patterns: File paths, directories (hashed recursively) or globs
+
+    Returns:
+        Hex SHA-256 over (path, contents) of all matched files; missing
+        inputs hash as a distinct marker
+    """
+    digest = hashlib.sha256()
+    for pattern in patterns:
+        if any(ch in pattern for ch in '*?['):
+            paths = sorted(root.glob(pattern))
+        else:
+            path = root / pattern
+            paths = sorted(p for p in path.rglob('*') if p.is_file()) if path.is_dir() else [path]
+
+        for path in paths:
+            digest.update(str(path.relative_to(root)).encode('utf-8') + b'\0')
+            if not path.is_file():
+                digest.update(b'<missing>\0')
+                continue
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 16), b''):
+                    digest.update(chunk)
+            digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class Pipeline:
+    """Runs a stage graph incrementally, in parallel where possible."""
+
+    def __init__(self, stages: List[Stage], root: Path = PROJECT_ROOT, state_path: str = STATE_FILE,
+                 jobs: Optional[int] = None) -> None:
+        """
+        Args:
+            stages: Stage graph
+            root: Directory stage paths and commands are relative to
+            state_path: JSON file holding fingerprints of the last successful runs
+            jobs: Maximum stages running at once (default: CPU count)
+
+        Raises:
+            ValueError: On duplicate names, unknown dependencies or cycles
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Duplicate stage names")
+        for stage in stages:
+            unknown = [dep for dep in stage.deps if dep not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stage(s): {', '.join(unknown)}")
+        self.order = self._topological_order()
+        self.root = Path(root)
+        self.state_path = state_path
+        self.jobs = jobs or os.cpu_count() or 1
+        self.state = self._load_state()
+
+    def _topological_order(self) -> List[str]:
+        order: List[str] = []
+        visiting = set()
+
+        def visit(name: str) -> None:
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through stage '{name}'")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def _load_state(self) -> Dict[str, Dict[str, str]]:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_state(self) -> None:
+        data = json.dumps(self.state, indent=2, sort_keys=True) + '\n'
+        atomic_write_bytes(self.state_path, data.encode('utf-8'))
+
+    def fingerprint(self, stage: Stage) -> str:
+        """Fingerprint a stage from its action and current input contents."""
+        return hashlib.sha256(
+            (stage.describe() + '\0' + hash_inputs(self.root, stage.inputs)).encode('utf-8')
+        ).hexdigest()
+
+    def is_fresh(self, stage: Stage) -> bool:
+        """True if the stage's inputs are unchanged since its last run and its outputs exist."""
+        if stage.always:
+            return False
+        recorded = self.state.get(stage.name, {}).get('fingerprint')
+        if recorded != self.fingerprint(stage):
+            return False
+        return all((self.root / output).exists() for output in stage.outputs)
+
+    def _execute(self, stage: Stage, force: bool) -> str:
+        if not force and self.is_fresh(stage):
+            return 'skipped'
+
+        for output in stage.outputs:
+            (self.root / output).parent.mkdir(parents=True, exist_ok=True)
+
+        if callable(stage.action):
+            stage.action(self.root)
+        else:
+            env = dict(os.environ, **stage.env)
+            completed = subprocess.run(list(stage.action), cwd=self.root, env=env,
+                                       capture_output=True, text=True)
+            if completed.returncode != 0:
+                output = (completed.stdout + completed.stderr).strip()
+                raise RuntimeError(f"exit code {completed.returncode}\n{output}")
+
+        missing = [output for output in stage.outputs if not (self.root / output).exists()]
+        if missing:
+            raise RuntimeError(f"did not produce: {', '.join(missing)}")
+        return 'ran'
+
+    def run(self, force: Sequence[str] = (), only: Optional[Sequence[str]] = None,
+            dry_run: bool = False) -> Dict[str, str]:
+        """
+        Run every stale stage, in dependency order and in parallel.
+
+        Args:
+            force: Stage names to run regardless of fingerprints ('all' for every stage)
+            only: Restrict the run to these stages and their dependencies
+            dry_run: Report what would run without running anything
+
+        Returns:
+            Dict mapping stage name to 'ran', 'skipped', 'failed', 'blocked'
+            or (dry run) 'stale'/'fresh'
+        """
+        selected = set(self.order)
+        if only:
+            selected = set()
+            pending = list(only)
+            while pending:
+                name = pending.pop()
+                if name not in self.stages:
+                    raise ValueError(f"Unknown stage: {name}")
+                if name not in selected:
+                    selected.add(name)
+                    pending.extend(self.stages[name].deps)
+
+        forced = set(self.order) if 'all' in force else set(force)
+        order = [name for name in self.order if name in selected]
+
+        if dry_run:
+            return {name: 'stale' if name in forced or not self.is_fresh(self.stages[name]) else 'fresh'
+                    for name in order}
+
+        results: Dict[str, str] = {}
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            while len(results) < len(order):
+                for name in order:
+                    if name in results or name in running.values():
+                        continue
+                    deps = [dep for dep in self.stages[name].deps if dep in selected]
+                    if any(results.get(dep) in ('failed', 'blocked') for dep in deps):
+                        results[name] = 'blocked'
+                        print(f"  ⊘ {name}: blocked by failed dependency")
+                    elif all(dep in results for dep in deps):
+                        print(f"  … {name}")
+                        future = executor.submit(self._timed_execute, self.stages[name], name in forced)
+                        running[future] = name
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        status, elapsed = future.result()
+                    except Exception as e:
+                        results[name] = 'failed'
+                        print(f"  ✗ {name}: {e}")
+                        continue
+                    results[name] = status
+                    if status == 'ran':
+                        # Record inputs as they are after the run
+                        self.state[name] = {
+                            'fingerprint': self.fingerprint(self.stages[name]),
+                            'finished': datetime.now().isoformat(),
+                        }
+                        self._save_state()
+                        print(f"  ✓ {name} ({elapsed:.1f}s)")
+                    else:
+                        print(f"  = {name}: up to date")
+
+        return results
+
+    def _timed_execute(self, stage: Stage, force: bool):
+        start = time.perf_counter()
+        status = self._execute(stage, force)
+        return status, time.perf_counter() - start
+
+
+def publish_series(series: str, shard_by: str = 'week') -> Callable[[Path], None]:
+    """
+    Build the publish action: join poster info and the last polled ticket
+    status into the enriched showtimes and write the public full and
+    normalized JSON files, date shards, per-day calendar layouts, iCalendar
+    feeds and the search index.
+
+    Args:
+        series: Series name
+        shard_by: Shard granularity, 'day' or 'week'
+
+    Returns:
+        Callable taking the pipeline root
+    """
+    def publish(root: Path) -> None:
+        from build_showtimes import load_film_ids, normalize_showtimes, register_films, save_film_ids
+        from columnar_showtimes import write_columnar
+        from day_views import write_day_views
+        from ics_feeds import write_feeds
+        from process_posters import apply_posters
+        from search_index import write_search_index
+        from shard_showtimes import write_shards
+        from ticket_poller import STATUS_FILE, apply_ticket_status, load_statuses
+
+        with open(root / BUILD_DIR / f'{series}-showtimes.json', 'r', encoding='utf-8') as f:
+            movies = json.load(f)
+        with open(root / BUILD_DIR / 'poster-map.json', 'r', encoding='utf-8') as f:
+            film_to_poster = json.load(f)
+        apply_posters(movies, film_to_poster)
+        apply_ticket_status(movies, load_statuses(STATUS_FILE))
+
+        ids_path = str(root / 'data-processing' / 'film-ids.json')
+        film_ids = load_film_ids(ids_path)
+        register_films(movies, film_ids)
+
+        _write_json(root / 'public' / f'{series}-full.json', movies, indent=2)
+        _write_json(root / 'public' / f'{series}-normalized.json', normalize_showtimes(movies, film_ids))
+        write_shards(movies, str(root / 'public' / f'{series}-shards'), shard_by, series)
+        write_day_views(movies, str(root / 'public' / f'{series}-days.json'), series)
+        write_columnar(movies, str(root / 'public' / f'{series}-columnar.json'), series)
+        write_feeds(movies, str(root / 'public' / f'{series}-ics'), series)
+        write_search_index(movies, str(root / 'public' / f'{series}-search.json'), series, film_ids,
+                           str(root / 'data-processing' / '.search-index-cache.json'))
+        save_film_ids(film_ids, ids_path)
+
+    publish.__qualname__ = f'publish_series[{series},{shard_by}]'
+    return publish
+
+
+def compress_public(root: Path) -> None:
+    """Write .gz/.br siblings of the changed published JSON files."""
+    from precompress import available_formats, format_report, precompress
+
+    result = precompress(str(root / 'public'), str(root / 'data-processing' / '.precompress-manifest.json'))
+    changed = set(result['compressed'])
+    files = {rel: entry for rel, entry in result['files'].items() if rel in changed}
+    if files:
+        print('\n'.join(format_report(files, available_formats())))
+
+
+def _write_json(path: Path, data: object, indent: Optional[int] = None) -> None:
+    """Write JSON atomically (temp file + rename)."""
+    if indent:
+        text = json.dumps(data, indent=indent, ensure_ascii=False)
+    else:
+        text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    atomic_write_bytes(path, text.encode('utf-8'))
+
+
+def build_stages(series: str, metadata: Optional[str] = None, fetch: bool = False,
+                 shard_by: str = 'week') -> List[Stage]:
+    """
+    Define the stage graph for one series.
+
+    Args:
+        series: Series name
+        metadata: Film metadata JSON/JSONL for the enrich stage (relative to the
+            project root). None extracts it from movie-pages/ in a metadata stage.
+        fetch: Include the network fetch of the series page
+        shard_by: Shard granularity of the published date shards
+
+    Returns:
+        List of stages
+    """
+    from precompress import DEFAULT_PATTERNS
+    from ticket_poller import STATUS_FILE
+
+    python = sys.executable
+    raw_html = f'data/raw-html/{series}.html'
+    csv_path = f'{BUILD_DIR}/{series}.csv'
+    showtimes_json = f'{BUILD_DIR}/{series}-showtimes.json'
+    poster_map = f'{BUILD_DIR}/poster-map.json'
+    # TICKET_STATUS_FILE may point anywhere; inputs are relative to the project root
+    ticket_status = os.path.relpath(STATUS_FILE, PROJECT_ROOT)
+
+    stages = []
+    if metadata is None:
+        metadata = f'{BUILD_DIR}/film-metadata.jsonl'
+        stages.append(Stage(
+            'metadata',
+            [python, 'data-processing/extract_film_metadata.py', '--html-dir', 'data-processing/movie-pages',
+             '--output', metadata],
+            inputs=['data-processing/movie-pages/*.html'] + local_modules('extract_film_metadata.py'),
+            outputs=[metadata],
+        ))
+    if fetch:
+        stages.append(Stage(
+            'fetch',
+            [python, 'data-processing/archive_pages.py', '--series', series, '--no-films', '--resume-hours', '0'],
+            inputs=local_modules('archive_pages.py'), outputs=[raw_html], always=True,
+        ))
+    stages += [
+        Stage(
+            'parse',
+            [python, 'data-processing/parse_showtimes.py', '--series', series,
+             '--input', raw_html, '--output', csv_path],
+            inputs=[raw_html] + local_modules('parse_showtimes.py'),
+            outputs=[csv_path],
+            deps=['fetch'] if fetch else [],
+        ),
+        Stage(
+            'enrich',
+            [python, 'data-processing/build_showtimes.py', '--series', series,
+             '--input', csv_path, '--metadata', metadata, '--output', showtimes_json],
+            inputs=[csv_path, metadata] + local_modules('build_showtimes.py'),
+            outputs=[showtimes_json],
+            deps=['parse'] + [stage.name for stage in stages if stage.name == 'metadata'],
+        ),
+        Stage(
+            'posters',
+            [python, 'data-processing/process_posters.py', '--no-json-update', '--map-out', poster_map],
+            inputs=['data-processing/movie-pages/*.html'] + local_modules('process_posters.py'),
+            outputs=[poster_map],
+            env={'HTML_DIR': 'data-processing/movie-pages', 'POSTERS_DIR': 'public/posters'},
+        ),
+        Stage(
+            'publish', publish_series(series, shard_by),
+            # publish_series lives in pipeline.py and imports every writer it calls
+            inputs=[showtimes_json, poster_map, 'data-processing/film-ids.json', ticket_status]
+            + local_modules('pipeline.py'),
+            outputs=[f'public/{series}-full.json', f'public/{series}-normalized.json',
+                     f'public/{series}-shards/manifest.json', f'public/{series}-days.json',
+                     f'public/{series}-ics/manifest.json', f'public/{series}-columnar.json',
+                     f'public/{series}-search.json'],
+            deps=['enrich', 'posters'],
+        ),
+        Stage(
+            'compress', compress_public,
+            inputs=[f'public/{pattern}' for pattern in DEFAULT_PATTERNS] + local_modules('precompress.py'),
+            outputs=[f'public/{series}-full.json.gz'],
+            deps=['publish'],
+        ),
+    ]
+    return stages
+
+
+def main():
+    """Main entry point for command-line execution."""
+    parser = argparse.ArgumentParser(
+        description='Run the showtime data pipeline, rebuilding only stale stages',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # Rebuild whatever changed
+  %(prog)s
+
+  # Re-fetch the series page first
+  %(prog)s --fetch
+
+  # Show which stages are stale without running them
+  %(prog)s --dry-run
+
+  # Force the poster stage, run only up to enrich
+  %(prog)s --force posters
+  %(prog)s --only enrich
+'''
+    )
+    parser.add_argument('--series', default='tenement-stories', help='Series name (default: tenement-stories)')
+    parser.add_argument(
+        '--metadata',
+        help='Film metadata JSON/JSONL for the enrich stage, relative to the project root '
+             '(default: extracted from movie-pages/ by the metadata stage)'
+    )
+    parser.add_argument('--shard-by', choices=('day', 'week'), default='week', help='Granularity of the published date shards (default: week)')
+    parser.add_argument('--fetch', action='store_true', help='Include the network fetch of the series page')
+    parser.add_argument('--force', nargs='+', default=[], metavar='STAGE', help="Run these stages even if fresh ('all' for every stage)")
+    parser.add_argument('--only', nargs='+', metavar='STAGE', help='Run only these stages and their dependencies')
+    parser.add_argument('--jobs', type=int, help='Maximum stages running in parallel (default: CPU count)')
+    parser.add_argument('--dry-run', action='store_true', help='List stale stages without running them')
+
+    args = parser.parse_args()
+
+    try:
+        pipeline = Pipeline(build_stages(args.series, args.metadata, args.fetch, args.shard_by), jobs=args.jobs)
+        start = time.perf_counter()
+        results = pipeline.run(args.force, args.only, args.dry_run)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.dry_run:
+        for name, status in results.items():
+            print(f"  {'●' if status == 'stale' else '○'} {name}: {status}")
+        return
+
+    ran = [name for name, status in results.items() if status == 'ran']
+    failed = [name for name, status in results.items() if status in ('failed', 'blocked')]
+    print(f"\n✓ Pipeline finished in {time.perf_counter() - start:.1f}s: "
+          f"{len(ran)} ran, {len(results) - len(ran) - len(failed)} up to date, {len(failed)} failed")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+"""
+Concurrent, conditional HTTP downloader for poster images.
+
+Used by process_posters.py. Each worker thread keeps one persistent
+connection per host, requests carry the ETag/Last-Modified validators from
+the previous run so unchanged posters come back as 304 Not Modified, and
+transient failures (connection errors, 429, 5xx) are retried with
+exponential backoff. Files are written to a temp file and renamed into
+place, so an interrupted run never leaves a truncated poster behind.
+"""
+
+import http.client
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from atomic_write import atomic_write_bytes
+
+DEFAULT_WORKERS = 8
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+MAX_REDIRECTS = 5
+USER_AGENT = 'Mozilla/5.0 (compatible; filmforum-calendar poster fetcher)'
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+
+class DownloadResult(NamedTuple):
+    """Outcome of fetching one URL."""
+    url: str
+    path: str
+    status: str  # 'downloaded', 'not_modified' or 'failed'
+    bytes: int = 0
+    error: Optional[str] = None
+
+
+class PosterDownloader:
+    """Thread-pooled downloader with per-host keep-alive and conditional GETs."""
+
+    def __init__(self, manifest_path: Optional[str] = None, workers: int = DEFAULT_WORKERS,
+                 timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF) -> None:
+        """
+        Args:
+            manifest_path: JSON file storing ETag/Last-Modified per URL (None: no validators)
+            workers: Maximum concurrent downloads
+            timeout: Socket timeout in seconds
+            retries: Extra attempts after a transient failure
+            backoff: Base delay in seconds, doubled after each failed attempt
+        """
+        self.manifest_path = manifest_path
+        self.workers = workers
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.manifest: Dict[str, Dict[str, str]] = self._load_manifest()
+        self._manifest_lock = threading.Lock()
+        self._local = threading.local()
+        self._all_connections: List[http.client.HTTPConnection] = []
+        self._connections_lock = threading.Lock()
+
+    def _load_manifest(self) -> Dict[str, Dict[str, str]]:
+        if not self.manifest_path:
+            return {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def save_manifest(self) -> None:
+        """Persist validators for the next run (atomic write)."""
+        if not self.manifest_path:
+            return
+        with self._manifest_lock:
+            data = dict(sorted(self.manifest.items()))
+        atomic_write_bytes(self.manifest_path, (json.dumps(data, indent=2) + '\n').encode('utf-8'))
+
+    def _connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        """Return this thread's persistent connection to a host, opening it if needed."""
+        pool = getattr(self._local, 'connections', None)
+        if pool is None:
+            pool = self._local.connections = {}
+        key = (scheme, netloc)
+        conn = pool.get(key)
+        if conn is None:
+            conn_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+            conn = conn_class(netloc, timeout=self.timeout)
+            pool[key] = conn
+            with self._connections_lock:
+                self._all_connections.append(conn)
+        return conn
+
+    def _drop_connection(self, scheme: str, netloc: str) -> None:
+        conn = getattr(self._local, 'connections', {}).pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        with self._connections_lock:
+            for conn in self._all_connections:
+                conn.close()
+            self._all_connections.clear()
+
+    def _request(self, url: str, headers: Dict[str, str]) -> Tuple[http.client.HTTPResponse, str]:
+        """
+        GET a URL on a pooled connection, following redirects.
+
+        Returns:
+            Tuple of (response, final_url). The caller must read the body.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            path = parts.path or '/'
+            if parts.query:
+                path += f'?{parts.query}'
+            conn = self._connection(parts.scheme, parts.netloc)
+            try:
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+            except (OSError, http.client.HTTPException):
+                # Stale keep-alive or network error: never reuse this socket
+                self._drop_connection(parts.scheme, parts.netloc)
+                raise
+
+            location = response.getheader('Location')
+            if response.status in REDIRECT_STATUSES and location:
+                response.read()
+                url = urljoin(url, location)
+                continue
+            return response, url
+
+        raise http.client.HTTPException(f'Too many redirects for {url}')
+
+    def fetch(self, url: str, dest_path: str, force: bool = False) -> DownloadResult:
+        """
+        Download one URL to dest_path, conditionally and with retries.
+
+        Args:
+            url: Remote URL
+            dest_path: Local file to (re)write
+            force: Ignore stored validators and always download
+
+        Returns:
+            DownloadResult describing what happened
+        """
+        headers = {'User-Agent': USER_AGENT, 'Accept-Encoding': 'identity'}
+        with self._manifest_lock:
+            cached = dict(self.manifest.get(url, {}))
+        if not force and os.path.exists(dest_path):
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        last_error = 'unknown error'
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * (2 ** (attempt - 1)))
+            try:
+                response, _ = self._request(url, headers)
+                body = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                last_error = f'{type(e).__name__}: {e}'
+                continue
+
+            if response.status == 304:
+                return DownloadResult(url, dest_path, 'not_modified')
+            if response.status in RETRY_STATUSES:
+                last_error = f'HTTP {response.status}'
+                continue
+            if response.status != 200:
+                return DownloadResult(url, dest_path, 'failed', error=f'HTTP {response.status}')
+
+            atomic_write_bytes(dest_path, body)
+            validators = {
+                'etag': response.getheader('ETag') or '',
+                'last_modified': response.getheader('Last-Modified') or '',
+            }
+            with self._manifest_lock:
+                self.manifest[url] = {k: v for k, v in validators.items() if v}
+            return DownloadResult(url, dest_path, 'downloaded', len(body))
+
+        return DownloadResult(url, dest_path, 'failed', error=last_error)
+
+    def download_all(self, jobs: List[Tuple[str, str]], force: bool = False) -> List[DownloadResult]:
+        """
+        Download many (url, dest_path) pairs across the worker pool.
+
+        Validators are saved to the manifest once all jobs finish.
+
+        Args:
+            jobs: List of (url, dest_path)
+            force: Ignore stored validators and always download
+
+        Returns:
+            List of DownloadResult, in job order
+        """
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(lambda job: self.fetch(job[0], job[1], force), jobs))
+        finally:
+            self.close()
+        self.save_manifest()
+        return results
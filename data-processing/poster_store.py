@@ -0,0 +1,139 @@
+"""
+Content-addressed poster storage.
+
+Posters are stored as {sha256[:16]}{ext}, so byte-identical artwork shared
+by several films (or series) is kept once and every filename is immutable:
+the files can be served with long-lived cache headers. A slug -> filename
+manifest records which poster each film uses. Films that leave the
+schedule are pruned from it, and files no manifest entry references are
+garbage-collected.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from atomic_write import atomic_write_bytes
+
+HASH_LENGTH = 16
+MANIFEST_NAME = 'manifest.json'
+
+# Originals ({hash}.png) and their derived variants ({hash}-640w.webp)
+STORED_FILE_PATTERN = re.compile(rf'^(?P<hash>[0-9a-f]{{{HASH_LENGTH}}})(?:-\d+w)?\.(?:png|jpe?g|webp)$')
+
+
+def content_hash(path: str) -> str:
+    """
+    Hash a file's bytes.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        First HASH_LENGTH hex digits of its SHA-256
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+class PosterStore:
+    """Directory of hash-named posters plus a slug -> filename manifest."""
+
+    def __init__(self, store_dir: str, manifest_path: Optional[str] = None) -> None:
+        """
+        Args:
+            store_dir: Public posters directory
+            manifest_path: Manifest JSON (default: {store_dir}/manifest.json)
+        """
+        self.store_dir = Path(store_dir)
+        self.manifest_path = Path(manifest_path) if manifest_path else self.store_dir / MANIFEST_NAME
+        self.manifest: Dict[str, str] = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, str]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def put(self, slug: str, source_path: str) -> str:
+        """
+        Store a poster under its content hash and point the slug at it.
+
+        Nothing is written when a file with the same hash already exists.
+
+        Args:
+            slug: Film slug
+            source_path: Downloaded poster file
+
+        Returns:
+            Stored filename (e.g., "3f2a9c0d1b4e5f67.png")
+        """
+        ext = os.path.splitext(source_path)[1].lower() or '.jpg'
+        filename = f'{content_hash(source_path)}{ext}'
+        target = self.store_dir / filename
+
+        if not target.exists():
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.store_dir / f'.{filename}.{os.getpid()}.tmp'
+            shutil.copyfile(source_path, tmp_path)
+            os.replace(tmp_path, target)
+
+        self.manifest[slug] = filename
+        return filename
+
+    def save(self) -> None:
+        """Write the manifest (sorted by slug, atomic)."""
+        data = json.dumps(dict(sorted(self.manifest.items())), indent=2) + '\n'
+        atomic_write_bytes(self.manifest_path, data.encode('utf-8'))
+
+    def prune(self, slugs: Iterable[str]) -> List[str]:
+        """
+        Drop manifest entries of films that are no longer listed.
+
+        Call before gc(), so the posters of removed films are collected.
+
+        Args:
+            slugs: Slugs of every film in the current poster map
+
+        Returns:
+            Removed slugs
+        """
+        current = set(slugs)
+        removed = sorted(slug for slug in self.manifest if slug not in current)
+        for slug in removed:
+            del self.manifest[slug]
+        return removed
+
+    def referenced_hashes(self) -> Set[str]:
+        """Return the content hashes referenced by the manifest."""
+        return {os.path.splitext(filename)[0] for filename in self.manifest.values()}
+
+    def gc(self) -> List[str]:
+        """
+        Delete stored originals and variants no manifest entry references.
+
+        Files not named like stored posters (the manifest, legacy
+        {slug}.png files) are never touched.
+
+        Returns:
+            Names of removed files
+        """
+        if not self.store_dir.is_dir():
+            return []
+
+        keep = self.referenced_hashes()
+        removed = []
+        for path in sorted(self.store_dir.iterdir()):
+            match = STORED_FILE_PATTERN.match(path.name)
+            if match and match.group('hash') not in keep:
+                path.unlink()
+                removed.append(path.name)
+        return removed
@@ -0,0 +1,140 @@
+"""
+Responsive poster variants and inline placeholders.
+
+For each downloaded poster this writes resized WebP copies next to the
+original ({slug}-{width}w.webp) and computes a tiny base64 WebP placeholder
+(LQIP) plus a dominant color, so the frontend can use srcset and paint a
+placeholder before any image request completes. Requires Pillow.
+"""
+
+import base64
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is only needed when variants are generated
+    Image = None
+
+VARIANT_WIDTHS = (320, 640, 1280)
+WEBP_QUALITY = 80
+LQIP_WIDTH = 16
+LQIP_QUALITY = 40
+
+
+def pillow_available() -> bool:
+    """Return True if Pillow is installed."""
+    return Image is not None
+
+
+def dominant_color(image: 'Image.Image') -> str:
+    """
+    Find the most common color of an image after reducing it to a small palette.
+
+    Args:
+        image: RGB image
+
+    Returns:
+        Hex color like "#1a2b3c"
+    """
+    small = image.resize((64, 64), Image.Resampling.BOX).quantize(colors=5)
+    palette = small.getpalette()
+    count, index = max(small.getcolors())
+    r, g, b = palette[index * 3:index * 3 + 3]
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+
+def lqip_data_uri(image: 'Image.Image') -> str:
+    """
+    Encode a tiny blurred-up-on-display preview as a data URI.
+
+    Args:
+        image: RGB image
+
+    Returns:
+        "data:image/webp;base64,..." string (a few hundred bytes)
+    """
+    height = max(1, round(image.height * LQIP_WIDTH / image.width))
+    tiny = image.resize((LQIP_WIDTH, height), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    tiny.save(buffer, 'WEBP', quality=LQIP_QUALITY)
+    return 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def generate_variants(source_path: str, url_prefix: str = '/posters',
+                      widths: Tuple[int, ...] = VARIANT_WIDTHS) -> Dict[str, Any]:
+    """
+    Write resized WebP variants of one poster and compute its placeholder.
+
+    Variants are written next to the source and skipped when already newer
+    than it. Widths larger than the original are not upscaled.
+
+    Args:
+        source_path: Downloaded poster file
+        url_prefix: Public URL directory of the poster files
+        widths: Target widths in pixels
+
+    Returns:
+        Dict with variants (list of {url, width, height}), lqip and color
+    """
+    directory, filename = os.path.split(source_path)
+    stem = os.path.splitext(filename)[0]
+    source_mtime = os.path.getmtime(source_path)
+
+    with Image.open(source_path) as original:
+        image = original.convert('RGB')
+
+    variants = []
+    for width in sorted(set(min(w, image.width) for w in widths)):
+        height = max(1, round(image.height * width / image.width))
+        variant_name = f'{stem}-{width}w.webp'
+        variant_path = os.path.join(directory, variant_name)
+
+        if not (os.path.exists(variant_path) and os.path.getmtime(variant_path) >= source_mtime):
+            resized = image if width == image.width else image.resize((width, height), Image.Resampling.LANCZOS)
+            tmp_path = f'{variant_path}.{os.getpid()}.tmp'
+            resized.save(tmp_path, 'WEBP', quality=WEBP_QUALITY, method=6)
+            os.replace(tmp_path, variant_path)
+
+        variants.append({'url': f'{url_prefix}/{variant_name}', 'width': width, 'height': height})
+
+    return {
+        'variants': variants,
+        'lqip': lqip_data_uri(image),
+        'color': dominant_color(image),
+    }
+
+
+def _generate_safe(source_path: str, url_prefix: str, widths: Tuple[int, ...]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    try:
+        return generate_variants(source_path, url_prefix, widths), None
+    except Exception as e:
+        return None, f'{type(e).__name__}: {e}'
+
+
+def generate_all_variants(source_paths: List[str], url_prefix: str = '/posters',
+                          widths: Tuple[int, ...] = VARIANT_WIDTHS,
+                          workers: Optional[int] = None) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Generate variants for many posters across a process pool.
+
+    Args:
+        source_paths: Poster files
+        url_prefix: Public URL directory of the poster files
+        widths: Target widths in pixels
+        workers: Worker processes (default: CPU count). 1 runs inline.
+
+    Returns:
+        List of (result, error) per source, in input order
+    """
+    if Image is None:
+        raise RuntimeError("Pillow is required for poster variants: pip install -r requirements.txt")
+
+    if workers == 1 or len(source_paths) <= 1:
+        return [_generate_safe(path, url_prefix, widths) for path in source_paths]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_generate_safe, path, url_prefix, widths) for path in source_paths]
+        return [future.result() for future in futures]
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Precompress published data artifacts for static serving.
+
+Writes .gz (and, when the brotli package is installed, .br) siblings next to
+the JSON files in public/ at maximum compression levels, so a static server
+(nginx gzip_static/brotli_static, Caddy precompressed, most CDNs) can send
+them as-is instead of compressing each response on the fly.
+
+A manifest records the SHA-256 of every compressed source. Only files whose
+contents changed (or whose siblings went missing) are compressed again, in a
+process pool. Siblings of sources that no longer exist are removed, whether
+or not the manifest knows them. Output is deterministic: gzip headers carry
+no timestamp or file name.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from atomic_write import atomic_write_bytes
+
+try:
+    import brotli
+except ImportError:  # .br siblings are skipped without the brotli package
+    brotli = None
+
+# Get script directory for relative paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+
+PUBLIC_DIR = os.environ.get('PUBLIC_DIR', str(PROJECT_ROOT / 'public'))
+MANIFEST_FILE = os.environ.get('PRECOMPRESS_MANIFEST', str(SCRIPT_DIR / '.precompress-manifest.json'))
+
+DEFAULT_PATTERNS = ('*.json', '*-shards/*.json', 'series-metadata/*.json')
+# Below this, headers and per-request overhead outweigh the savings
+MIN_SIZE = 256
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+BROTLI_WINDOW = 24
+
+
+def available_formats() -> List[str]:
+    """Return the sibling extensions this environment can write."""
+    return ['gz', 'br'] if brotli is not None else ['gz']
+
+
+def compress_bytes(data: bytes, fmt: str) -> bytes:
+    """
+    Compress data at the maximum level of a format.
+
+    Args:
+        data: Raw file contents
+        fmt: 'gz' or 'br'
+
+    Returns:
+        Compressed bytes (gzip without mtime or file name, so output is reproducible)
+    """
+    if fmt == 'gz':
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    if fmt == 'br':
+        return brotli.compress(data, mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY, lgwin=BROTLI_WINDOW)
+    raise ValueError(f"Unknown compression format: {fmt}")
+
+
+def file_sha256(path: str) -> str:
+    """Hex SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _remove(path: str) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def compress_file(path: str, formats: Sequence[str]) -> Dict[str, Any]:
+    """
+    Write the compressed siblings of one file.
+
+    A sibling that would not be smaller than the source is not written (and
+    an existing one is removed), so servers fall back to the plain file.
+
+    Args:
+        path: Source file
+        formats: Sibling extensions to write
+
+    Returns:
+        Manifest entry: sha256, size, formats and the size of each written
+        sibling (None where it was skipped)
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    entry: Dict[str, Any] = {
+        'sha256': hashlib.sha256(data).hexdigest(),
+        'size': len(data),
+        'formats': list(formats),
+    }
+    for fmt in formats:
+        sibling = f'{path}.{fmt}'
+        compressed = compress_bytes(data, fmt) if len(data) >= MIN_SIZE else None
+        if compressed is None or len(compressed) >= len(data):
+            _remove(sibling)
+            entry[fmt] = None
+            continue
+        atomic_write_bytes(sibling, compressed)
+        entry[fmt] = len(compressed)
+    return entry
+
+
+def find_sources(public_dir: str, patterns: Sequence[str] = DEFAULT_PATTERNS) -> List[str]:
+    """
+    List the files to precompress.
+
+    Args:
+        public_dir: Directory patterns are relative to
+        patterns: Glob patterns
+
+    Returns:
+        Sorted paths relative to public_dir
+    """
+    root = Path(public_dir)
+    found = set()
+    for pattern in patterns:
+        for path in root.glob(pattern):
+            if path.is_file():
+                found.add(path.relative_to(root).as_posix())
+    return sorted(found)
+
+
+def load_manifest(path: str) -> Dict[str, Dict[str, Any]]:
+    """Load the manifest; an empty dict if it is missing or unreadable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_manifest(manifest: Dict[str, Dict[str, Any]], path: str) -> None:
+    """Write the manifest atomically."""
+    atomic_write_bytes(path, (json.dumps(manifest, indent=2, sort_keys=True) + '\n').encode('utf-8'))
+
+
+def is_fresh(entry: Optional[Dict[str, Any]], source: str, formats: Sequence[str]) -> bool:
+    """
+    True if a manifest entry still describes the source and its siblings.
+
+    Args:
+        entry: Manifest entry, or None
+        source: Absolute source path
+        formats: Sibling extensions wanted now
+    """
+    if not entry or entry.get('formats') != list(formats):
+        return False
+    if any(entry.get(fmt) is not None and not os.path.exists(f'{source}.{fmt}') for fmt in formats):
+        return False
+    return entry.get('sha256') == file_sha256(source)
+
+
+def precompress(public_dir: str = PUBLIC_DIR, manifest_path: str = MANIFEST_FILE,
+                patterns: Sequence[str] = DEFAULT_PATTERNS, formats: Optional[Sequence[str]] = None,
+                workers: Optional[int] = None, force: bool = False) -> Dict[str, Any]:
+    """
+    Bring every matched file's compressed siblings up to date.
+
+    Args:
+        public_dir: Directory holding the published files
+        manifest_path: JSON manifest of source hashes and sibling sizes
+        patterns: Glob patterns (relative to public_dir) of files to compress
+        formats: Sibling extensions (default: gz, plus br if brotli is installed)
+        workers: Worker processes (default: CPU count). 1 runs inline.
+        force: Recompress every file regardless of the manifest
+
+    Returns:
+        Dict with 'files' (relative path -> manifest entry), 'compressed'
+        (paths recompressed this run) and 'removed' (stale siblings deleted)
+    """
+    formats = list(formats or available_formats())
+    manifest = load_manifest(manifest_path)
+    sources = find_sources(public_dir, patterns)
+
+    stale = [rel for rel in sources
+             if force or not is_fresh(manifest.get(rel), os.path.join(public_dir, rel), formats)]
+
+    paths = [os.path.join(public_dir, rel) for rel in stale]
+    if workers == 1 or len(paths) <= 1:
+        entries = [compress_file(path, formats) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            entries = list(executor.map(compress_file, paths, [formats] * len(paths)))
+    manifest.update(zip(stale, entries))
+
+    known = set(sources)
+    orphans = set(manifest) - known
+    # The manifest is not committed, so also sweep siblings on disk whose
+    # source was deleted before this checkout or this manifest existed
+    sibling_patterns = [f'{pattern}.{fmt}' for pattern in patterns for fmt in ('gz', 'br')]
+    for rel in find_sources(public_dir, sibling_patterns):
+        source = rel.rsplit('.', 1)[0]
+        if source not in known:
+            orphans.add(source)
+
+    removed = []
+    for rel in sorted(orphans):
+        for fmt in ('gz', 'br'):
+            sibling = os.path.join(public_dir, f'{rel}.{fmt}')
+            if _remove(sibling):
+                removed.append(f'{rel}.{fmt}')
+        manifest.pop(rel, None)
+
+    save_manifest(manifest, manifest_path)
+    return {
+        'files': {rel: manifest[rel] for rel in sources},
+        'compressed': stale,
+        'removed': removed,
+    }
+
+
+def format_report(files: Dict[str, Dict[str, Any]], formats: Sequence[str]) -> List[str]:
+    """
+    Format a size table, one row per file plus a total.
+
+    Args:
+        files: Relative path -> manifest entry
+        formats: Sibling extensions shown as columns
+
+    Returns:
+        Report lines
+    """
+    def cell(size: Optional[int], original: int) -> str:
+        if size is None:
+            return f"{'-':>17}"
+        return f"{size:>9,} ({size / original:>4.0%})" if original else f"{size:>17,}"
+
+    width = max([len(rel) for rel in files] + [5])
+    header = f"{'File':<{width}}  {'Original':>9}" + ''.join(f"  {'.' + fmt:>17}" for fmt in formats)
+    lines = [header]
+    totals: Dict[str, int] = {fmt: 0 for fmt in formats}
+    total_original = 0
+    for rel, entry in files.items():
+        original = entry['size']
+        total_original += original
+        row = f"{rel:<{width}}  {original:>9,}"
+        for fmt in formats:
+            size = entry.get(fmt)
+            # Files served uncompressed count at full size
+            totals[fmt] += original if size is None else size
+            row += '  ' + cell(size, original)
+        lines.append(row)
+    lines.append(f"{'Total':<{width}}  {total_original:>9,}"
+                 + ''.join('  ' + cell(totals[fmt], total_original) for fmt in formats))
+    return lines
+
+
+def main():
+    """Main entry point for command-line execution."""
+    parser = argparse.ArgumentParser(
+        description='Write .gz/.br siblings of the published JSON at maximum compression',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # Compress changed files in public/ and print sizes
+  %(prog)s
+
+  # Recompress everything, also the iCalendar feeds
+  %(prog)s --force --pattern '*.json' --pattern '*-shards/*.json' --pattern '*-ics/**/*.ics'
+
+  # gzip only, single process
+  %(prog)s --format gz --workers 1
+'''
+    )
+    parser.add_argument('--public-dir', default=PUBLIC_DIR, help='Directory of published files (default: public/)')
+    parser.add_argument('--manifest', default=MANIFEST_FILE,
+                        help='Hash manifest (default: data-processing/.precompress-manifest.json)')
+    parser.add_argument('--pattern', action='append', dest='patterns',
+                        help=f"Glob relative to --public-dir; repeatable (default: {' '.join(DEFAULT_PATTERNS)})")
+    parser.add_argument('--format', action='append', dest='formats', choices=['gz', 'br'],
+                        help='Sibling format; repeatable (default: gz, plus br if brotli is installed)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Recompress every file')
+    args = parser.parse_args()
+
+    if args.formats and 'br' in args.formats and brotli is None:
+        print("Error: brotli is not installed (pip install brotli)")
+        sys.exit(1)
+    if not os.path.isdir(args.public_dir):
+        print(f"Error: Directory not found: {args.public_dir}")
+        sys.exit(1)
+    if brotli is None and not args.formats:
+        print("⚠ brotli not installed, writing .gz only (pip install brotli)")
+
+    formats = args.formats or available_formats()
+    result = precompress(args.public_dir, args.manifest, args.patterns or DEFAULT_PATTERNS,
+                         formats, args.workers, args.force)
+
+    for line in format_report(result['files'], formats):
+        print(line)
+    print(f"\n✓ Compressed {len(result['compressed'])} of {len(result['files'])} files"
+          f" ({len(result['files']) - len(result['compressed'])} unchanged)")
+    if result['removed']:
+        print(f"✓ Removed {len(result['removed'])} stale siblings")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,9 +2,16 @@
 
 import os
 import re
+import sys
 import json
-import urllib.request
+import argparse
 from pathlib import Path
+from typing import Dict, List, Optional
+
+from poster_downloader import PosterDownloader, DEFAULT_WORKERS
+from poster_variants import generate_all_variants, pillow_available
+from poster_store import PosterStore
+from metrics import Metrics
 
 # Get script directory for relative paths
 SCRIPT_DIR = Path(__file__).parent
@@ -14,9 +21,12 @@ PROJECT_ROOT = SCRIPT_DIR.parent
 HTML_DIR = os.environ.get('HTML_DIR', str(PROJECT_ROOT / 'movie-pages'))
 POSTERS_DIR = os.environ.get('POSTERS_DIR', str(PROJECT_ROOT / 'public/posters'))
 JSON_FILE = os.environ.get('JSON_FILE', str(PROJECT_ROOT / 'tenement-stories-evenings.json'))
-
-# Create posters directory if it doesn't exist
-os.makedirs(POSTERS_DIR, exist_ok=True)
+# ETag/Last-Modified of each downloaded poster, for conditional re-downloads
+DOWNLOAD_MANIFEST = os.environ.get('DOWNLOAD_MANIFEST', str(SCRIPT_DIR / '.poster-downloads.json'))
+# Download staging area used when posters are stored content-addressed
+STAGING_DIR = os.environ.get('POSTER_STAGING_DIR', str(SCRIPT_DIR / '.poster-downloads'))
+# Stages that --profile can target
+PROFILE_STAGES = ['extract', 'download', 'store', 'variants', 'update_json']
 
 
 def validate_poster_url(poster_url: str, movie_title: str) -> None:
@@ -67,96 +77,396 @@ def validate_poster_url(poster_url: str, movie_title: str) -> None:
             f"Contains dangerous characters ({poster_url})"
         )
 
-# Dictionary to map film URLs to poster URLs
-film_to_poster = {}
 
-print("=" * 80)
-print("TASK 1: Extracting poster URLs from HTML files")
-print("=" * 80)
+def extract_poster_urls(html_dir: str) -> Dict[str, Dict[str, str]]:
+    """
+    Extract og:image poster URLs from cached film pages.
+
+    Args:
+        html_dir: Directory of cached film page HTML files
+
+    Returns:
+        Dict mapping film URL (canonical link) to {'poster_url', 'slug'}
+    """
+    film_to_poster = {}
 
-# Process each HTML file
-for html_file in sorted(Path(HTML_DIR).glob("*.html")):
-    with open(html_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+    # Process each HTML file
+    for html_file in sorted(Path(html_dir).glob("*.html")):
+        with open(html_file, 'r', encoding='utf-8') as f:
+            content = f.read()
 
-    # Extract poster URL from og:image meta tag
-    poster_match = re.search(r'property="og:image"\s+content="([^"]+)"', content)
-    # Extract film URL from canonical link
-    film_url_match = re.search(r'<link rel="canonical" href="([^"]+)"', content)
+        # Extract poster URL from og:image meta tag
+        poster_match = re.search(r'property="og:image"\s+content="([^"]+)"', content)
+        # Extract film URL from canonical link
+        film_url_match = re.search(r'<link rel="canonical" href="([^"]+)"', content)
 
-    if poster_match and film_url_match:
-        poster_url = poster_match.group(1)
-        film_url = film_url_match.group(1)
+        if poster_match and film_url_match:
+            poster_url = poster_match.group(1)
+            film_url = film_url_match.group(1)
 
-        # Get the slug from the HTML filename
-        slug = html_file.stem
+            # Get the slug from the HTML filename
+            slug = html_file.stem
 
-        film_to_poster[film_url] = {
-            'poster_url': poster_url,
-            'slug': slug
-        }
+            film_to_poster[film_url] = {
+                'poster_url': poster_url,
+                'slug': slug
+            }
 
-        print(f"  ✓ {slug}: {poster_url}")
+            print(f"  ✓ {slug}: {poster_url}")
 
-print(f"\nExtracted {len(film_to_poster)} poster URLs")
+    return film_to_poster
 
-print("\n" + "=" * 80)
-print("TASK 2: Downloading poster images")
-print("=" * 80)
 
-downloaded_count = 0
-for film_url, data in film_to_poster.items():
-    poster_url = data['poster_url']
-    slug = data['slug']
+def download_posters(film_to_poster: Dict[str, Dict[str, str]], posters_dir: str,
+                     downloader: PosterDownloader, force: bool = False) -> Dict[str, int]:
+    """
+    Download posters concurrently and record their local paths.
 
-    # Determine file extension from URL
-    ext = '.png' if poster_url.endswith('.png') else '.jpg'
-    local_path = os.path.join(POSTERS_DIR, f"{slug}{ext}")
+    Sets 'local_path' on every entry whose poster is present locally:
+    freshly downloaded, unchanged since the last run, or kept from an
+    earlier run when this download failed (stale).
 
-    try:
-        print(f"  Downloading {slug}{ext}...", end=" ")
-        urllib.request.urlretrieve(poster_url, local_path)
-        print("✓")
-        downloaded_count += 1
+    Args:
+        film_to_poster: Output of extract_poster_urls (updated in place)
+        posters_dir: Directory to save posters into
+        downloader: Configured PosterDownloader
+        force: Ignore stored ETag/Last-Modified and re-download everything
+
+    Returns:
+        Counts per result ('downloaded', 'not_modified', 'stale', 'failed') plus
+        'bytes'; 'failed' only counts posters with no local file at all
+    """
+    os.makedirs(posters_dir, exist_ok=True)
+
+    jobs = []
+    film_urls = []
+    for film_url, data in film_to_poster.items():
+        # Determine file extension from URL
+        ext = '.png' if data['poster_url'].endswith('.png') else '.jpg'
+        data['filename'] = f"{data['slug']}{ext}"
+        jobs.append((data['poster_url'], os.path.join(posters_dir, data['filename'])))
+        film_urls.append(film_url)
+
+    counts = {'downloaded': 0, 'not_modified': 0, 'stale': 0, 'failed': 0, 'bytes': 0}
+    for film_url, result in zip(film_urls, downloader.download_all(jobs, force)):
+        data = film_to_poster[film_url]
+        counts['bytes'] += result.bytes
+
+        if result.status == 'failed':
+            if not os.path.exists(result.path):
+                counts['failed'] += 1
+                print(f"  ✗ {data['filename']}: {result.error}")
+                continue
+            # Keep the poster from an earlier run rather than dropping it
+            counts['stale'] += 1
+            print(f"  ⚠ {data['filename']}: {result.error} (keeping stale local copy)")
+        else:
+            counts[result.status] += 1
+            label = "✓" if result.status == 'downloaded' else "= unchanged"
+            print(f"  {label} {data['filename']}")
         # Update the local path in our mapping
-        local_poster_path = f"/posters/{slug}{ext}"
-        validate_poster_url(local_poster_path, slug)
-        film_to_poster[film_url]['local_path'] = local_poster_path
-    except Exception as e:
-        print(f"✗ Error: {e}")
-
-print(f"\nDownloaded {downloaded_count} posters to {POSTERS_DIR}")
-
-print("\n" + "=" * 80)
-print("TASK 3: Updating JSON file with poster URLs")
-print("=" * 80)
-
-# Read the JSON file
-with open(JSON_FILE, 'r', encoding='utf-8') as f:
-    movies = json.load(f)
-
-# Update each movie with poster_url
-updated_count = 0
-for movie in movies:
-    film_url = movie.get('film_url')
-    if film_url in film_to_poster:
-        local_path = film_to_poster[film_url].get('local_path')
-        if local_path:
-            validate_poster_url(local_path, movie['Movie'])
-            movie['poster_url'] = local_path
-            updated_count += 1
-            print(f"  ✓ {movie['Movie']}: {local_path}")
-
-# Write the updated JSON back to file
-with open(JSON_FILE, 'w', encoding='utf-8') as f:
-    json.dump(movies, f, indent=2, ensure_ascii=False)
-
-print(f"\nUpdated {updated_count} entries in {JSON_FILE}")
-
-print("\n" + "=" * 80)
-print("SUMMARY")
-print("=" * 80)
-print(f"  Extracted poster URLs: {len(film_to_poster)}")
-print(f"  Downloaded posters: {downloaded_count}")
-print(f"  Updated JSON entries: {updated_count}")
-print("=" * 80)
+        local_poster_path = f"/posters/{data['filename']}"
+        validate_poster_url(local_poster_path, data['slug'])
+        data['local_path'] = local_poster_path
+
+    return counts
+
+
+def store_posters(film_to_poster: Dict[str, Dict[str, str]], staging_dir: str, store: PosterStore) -> int:
+    """
+    Move downloaded posters into content-addressed storage.
+
+    Rewrites 'filename' and 'local_path' of each available poster to its
+    hash-named file, drops manifest entries of films no longer in the map and
+    saves the slug -> filename manifest (validating every entry). Files no
+    film references anymore are left for PosterStore.gc().
+
+    Args:
+        film_to_poster: Mapping with 'local_path' set by download_posters (updated in place)
+        staging_dir: Directory download_posters wrote into
+        store: Target PosterStore
+
+    Returns:
+        Number of distinct stored files referenced
+    """
+    for data in film_to_poster.values():
+        if not data.get('local_path'):
+            continue
+        filename = store.put(data['slug'], os.path.join(staging_dir, data['filename']))
+        data['filename'] = filename
+        data['local_path'] = f"/posters/{filename}"
+        print(f"  ✓ {data['slug']} -> {filename}")
+
+    for slug in store.prune(data['slug'] for data in film_to_poster.values()):
+        print(f"  - {slug} (no longer scheduled)")
+
+    for slug, filename in store.manifest.items():
+        validate_poster_url(f"/posters/{filename}", slug)
+    store.save()
+
+    return len(set(store.manifest.values()))
+
+
+def add_poster_variants(film_to_poster: Dict[str, Dict[str, str]], posters_dir: str,
+                        workers: Optional[int] = None) -> int:
+    """
+    Generate responsive WebP variants and placeholders for available posters.
+
+    Sets 'variants', 'lqip' and 'color' on each entry that has a local_path.
+
+    Args:
+        film_to_poster: Mapping with 'local_path' set by download_posters (updated in place)
+        posters_dir: Directory holding the downloaded posters
+        workers: Worker processes (default: CPU count)
+
+    Returns:
+        Number of posters with variants
+    """
+    entries = [data for data in film_to_poster.values() if data.get('local_path')]
+    # Content-addressed posters can be shared by several films; process each file once
+    sources = sorted({os.path.join(posters_dir, data['filename']) for data in entries})
+    results = dict(zip(sources, generate_all_variants(sources, workers=workers)))
+
+    generated = 0
+    for data in entries:
+        result, error = results[os.path.join(posters_dir, data['filename'])]
+        if error:
+            print(f"  ✗ {data['filename']}: {error}")
+            continue
+        for variant in result['variants']:
+            validate_poster_url(variant['url'], data['slug'])
+        data.update(result)
+        generated += 1
+        widths = ', '.join(str(v['width']) for v in result['variants'])
+        print(f"  ✓ {data['slug']}: {widths}w {result['color']}")
+
+    return generated
+
+
+def update_json_posters(json_file: str, film_to_poster: Dict[str, Dict[str, str]]) -> int:
+    """
+    Set poster_url on every showtime in the JSON file whose poster is available.
+
+    Args:
+        json_file: Showtime JSON to update in place
+        film_to_poster: Mapping with 'local_path' set by download_posters
+
+    Returns:
+        Number of entries updated
+    """
+    # Read the JSON file
+    with open(json_file, 'r', encoding='utf-8') as f:
+        movies = json.load(f)
+
+    updated_count = apply_posters(movies, film_to_poster)
+
+    # Write the updated JSON back to file
+    with open(json_file, 'w', encoding='utf-8') as f:
+        json.dump(movies, f, indent=2, ensure_ascii=False)
+
+    return updated_count
+
+
+def apply_posters(movies: List[Dict[str, object]], film_to_poster: Dict[str, Dict[str, str]]) -> int:
+    """
+    Set poster_url (and variant fields) on showtimes whose poster is available.
+
+    Args:
+        movies: Showtime dicts, updated in place
+        film_to_poster: Mapping with 'local_path' set by download_posters
+
+    Returns:
+        Number of entries updated
+    """
+    # Update each movie with poster_url
+    updated_count = 0
+    for movie in movies:
+        film_url = movie.get('film_url')
+        if film_url in film_to_poster:
+            local_path = film_to_poster[film_url].get('local_path')
+            if local_path:
+                validate_poster_url(local_path, movie['Movie'])
+                movie['poster_url'] = local_path
+                data = film_to_poster[film_url]
+                if data.get('variants'):
+                    movie['poster_variants'] = data['variants']
+                    movie['poster_lqip'] = data['lqip']
+                    movie['poster_color'] = data['color']
+                updated_count += 1
+                print(f"  ✓ {movie['Movie']}: {local_path}")
+
+    return updated_count
+
+
+def main():
+    """Main entry point for command-line execution."""
+    parser = argparse.ArgumentParser(
+        description='Download Film Forum posters and link them into the showtime JSON'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Concurrent downloads (default: {DEFAULT_WORKERS})'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Re-download every poster, ignoring stored ETag/Last-Modified'
+    )
+    parser.add_argument(
+        '--max-missing',
+        type=int,
+        default=0,
+        help='Exit with status 1, before writing the mapping or JSON, if more than this many '
+             'posters failed to download and have no local copy (default: 0)'
+    )
+    parser.add_argument(
+        '--no-variants',
+        action='store_true',
+        help='Skip generating resized WebP variants and placeholders'
+    )
+    parser.add_argument(
+        '--content-addressed',
+        action='store_true',
+        help='Store posters as {hash}.ext with a slug manifest, deduplicated and garbage-collected'
+    )
+    parser.add_argument(
+        '--map-out',
+        help='Write the film_url -> poster mapping (local_path, variants, ...) to this JSON file'
+    )
+    parser.add_argument(
+        '--no-json-update',
+        action='store_true',
+        help='Skip TASK 3 (leave JSON_FILE untouched); useful with --map-out'
+    )
+    parser.add_argument(
+        '--metrics-out',
+        help='Write stage timings and counters as JSON (a .jsonl path appends one line per run)'
+    )
+    parser.add_argument(
+        '--profile',
+        metavar='FILE',
+        help='Run the --profile-stage under cProfile and dump its stats to FILE'
+    )
+    parser.add_argument(
+        '--profile-stage',
+        choices=PROFILE_STAGES,
+        default='download',
+        help='Stage to profile with --profile (default: download)'
+    )
+    args = parser.parse_args()
+
+    metrics = Metrics('process_posters', args.profile_stage if args.profile else None, args.profile)
+
+    print("=" * 80)
+    print("TASK 1: Extracting poster URLs from HTML files")
+    print("=" * 80)
+
+    with metrics.stage('extract'):
+        film_to_poster = extract_poster_urls(HTML_DIR)
+    metrics.set('posters', len(film_to_poster))
+
+    print(f"\nExtracted {len(film_to_poster)} poster URLs")
+
+    print("\n" + "=" * 80)
+    print("TASK 2: Downloading poster images")
+    print("=" * 80)
+
+    download_dir = STAGING_DIR if args.content_addressed else POSTERS_DIR
+    downloader = PosterDownloader(DOWNLOAD_MANIFEST, workers=args.workers)
+    with metrics.stage('download'):
+        counts = download_posters(film_to_poster, download_dir, downloader, args.force)
+    metrics.set('downloaded', counts['downloaded'])
+    metrics.set('not_modified', counts['not_modified'])
+    metrics.set('stale', counts['stale'])
+    metrics.set('download_failed', counts['failed'])
+    metrics.set('bytes_downloaded', counts['bytes'])
+
+    print(f"\nDownloaded {counts['downloaded']} posters ({counts['bytes']:,} bytes), "
+          f"{counts['not_modified']} unchanged, {counts['stale']} stale, {counts['failed']} failed -> {download_dir}")
+
+    if counts['failed'] > args.max_missing:
+        # Publishing now would drop these films' posters from the site
+        print(f"\n✗ {counts['failed']} posters failed to download and have no local copy "
+              f"(--max-missing {args.max_missing}); not writing the poster mapping or JSON")
+        if args.metrics_out:
+            metrics.write(args.metrics_out)
+        sys.exit(1)
+
+    if args.content_addressed:
+        print("\n" + "=" * 80)
+        print("TASK 2a: Storing posters by content hash")
+        print("=" * 80)
+
+        store = PosterStore(POSTERS_DIR)
+        with metrics.stage('store'):
+            stored_count = store_posters(film_to_poster, STAGING_DIR, store)
+        metrics.set('stored_files', stored_count)
+        print(f"\nStored {stored_count} distinct posters for {len(store.manifest)} films in {POSTERS_DIR}")
+
+    variant_count = 0
+    if not args.no_variants:
+        print("\n" + "=" * 80)
+        print("TASK 2b: Generating responsive variants and placeholders")
+        print("=" * 80)
+
+        if pillow_available():
+            with metrics.stage('variants'):
+                variant_count = add_poster_variants(film_to_poster, POSTERS_DIR)
+            print(f"\nGenerated variants for {variant_count} posters")
+        else:
+            print("  ⚠ Pillow not installed, skipping (pip install -r requirements.txt)")
+
+    if args.content_addressed:
+        # After variants, so stale variants of replaced posters are collected too
+        with metrics.stage('gc'):
+            removed = store.gc()
+        metrics.set('gc_removed', len(removed))
+        print(f"\nGarbage-collected {len(removed)} unreferenced poster files")
+
+    if args.map_out:
+        with open(args.map_out, 'w', encoding='utf-8') as f:
+            json.dump(film_to_poster, f, indent=2, ensure_ascii=False, sort_keys=True)
+        print(f"\nWrote poster mapping to {args.map_out}")
+
+    updated_count = 0
+    if not args.no_json_update:
+        print("\n" + "=" * 80)
+        print("TASK 3: Updating JSON file with poster URLs")
+        print("=" * 80)
+
+        try:
+            with metrics.stage('update_json'):
+                updated_count = update_json_posters(JSON_FILE, film_to_poster)
+        except FileNotFoundError:
+            print(f"Error: JSON file not found: {JSON_FILE}")
+            sys.exit(1)
+
+        print(f"\nUpdated {updated_count} entries in {JSON_FILE}")
+
+    print("\n" + "=" * 80)
+    print("SUMMARY")
+    print("=" * 80)
+    print(f"  Extracted poster URLs: {len(film_to_poster)}")
+    print(f"  Downloaded posters: {counts['downloaded']}")
+    print(f"  Unchanged posters: {counts['not_modified']}")
+    print(f"  Stale posters (download failed, local copy kept): {counts['stale']}")
+    print(f"  Failed downloads: {counts['failed']}")
+    print(f"  Posters with variants: {variant_count}")
+    print(f"  Updated JSON entries: {updated_count}")
+    print("=" * 80)
+
+    metrics.set('variants', variant_count)
+    metrics.set('json_entries_updated', updated_count)
+    if args.metrics_out:
+        metrics.write(args.metrics_out)
+        print(f"\nWrote metrics to {args.metrics_out}")
+    summary = metrics.dump_profile()
+    if summary:
+        print(f"\nWrote cProfile stats for the {args.profile_stage} stage to {args.profile}")
+        print(summary)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Prebuilt full-text search index over the films of a series.
+
+Writes public/{series}-search.json so the client can search film titles,
+directors, actors and descriptions by looking terms up, without scanning
+showtime rows:
+
+- terms: sorted normalized tokens (accents folded, lowercase, stopwords
+  dropped), with a parallel postings list of flat [film_id, score, ...]
+  pairs. Scores are field weights times term frequency, so a title hit
+  outranks a description hit. Sorted terms allow prefix lookups by binary
+  search while the user is still typing.
+- title_words / trigrams: every distinct title token and, per trigram of
+  the padded token ("$word$"), the indices of the title words that contain
+  it. A misspelled query word is matched against title words by trigram
+  overlap (typo tolerance).
+- films: numeric film ID (film-ids.json) -> title and film_slug.
+- stopwords: dropped from queries as they were from the index.
+
+Tokens are cached per film, keyed by a hash of its indexed fields, so a
+rebuild only tokenizes films whose metadata changed. src/utils/searchIndex.ts
+runs queries against the artifact.
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import re
+import sys
+import unicodedata
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from atomic_write import atomic_write_bytes, write_if_changed
+from build_showtimes import FILM_IDS_FILE, film_key, load_film_ids, register_films, save_film_ids
+
+# Get script directory for relative paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+
+SEARCH_CACHE_FILE = os.environ.get('SEARCH_CACHE_FILE', str(SCRIPT_DIR / '.search-index-cache.json'))
+
+SEARCH_INDEX_VERSION = 1
+# Showtime field -> index field and weight
+FIELDS = (
+    ('Movie', 'title', 10),
+    ('director', 'director', 5),
+    ('actors', 'actors', 3),
+    ('description', 'description', 1),
+)
+# Repeats beyond this do not raise a term's score (long descriptions)
+TF_CAP = 3
+MIN_TOKEN_LENGTH = 2
+# Prefix hits score this fraction of an exact hit
+PREFIX_FACTOR = 0.5
+# Minimum trigram Jaccard similarity for a fuzzy title match
+FUZZY_THRESHOLD = 0.4
+FUZZY_MIN_LENGTH = 3
+
+STOPWORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'he', 'her', 'his', 'in',
+    'is', 'it', 'its', 'of', 'on', 'or', 'she', 'that', 'the', 'their', 'this', 'to', 'was', 'with',
+))
+
+APOSTROPHE_PATTERN = re.compile(r"['’]")
+SEPARATOR_PATTERN = re.compile(r'[\W_]+')
+
+
+def normalize_text(text: str) -> str:
+    """
+    Fold accents and case and collapse punctuation to single spaces.
+
+    "Hell's Kitchen — Ñandú" becomes "hells kitchen nandu".
+
+    Args:
+        text: Raw field value
+
+    Returns:
+        Normalized text
+    """
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    stripped = APOSTROPHE_PATTERN.sub('', stripped.lower())
+    return SEPARATOR_PATTERN.sub(' ', stripped).strip()
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into index tokens.
+
+    Args:
+        text: Raw field value
+
+    Returns:
+        Normalized tokens in order, without stopwords and one-character tokens
+    """
+    return [token for token in normalize_text(text).split()
+            if len(token) >= MIN_TOKEN_LENGTH and token not in STOPWORDS]
+
+
+def trigrams(word: str) -> List[str]:
+    """Distinct trigrams of a word padded with '$' on both sides."""
+    padded = f'${word}$'
+    return sorted({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+def film_document(movie: Dict[str, Any]) -> Dict[str, str]:
+    """Indexed fields of a film, keyed by index field name."""
+    return {name: str(movie.get(source) or '') for source, name, _ in FIELDS}
+
+
+def document_hash(document: Dict[str, str]) -> str:
+    """Stable hash of a film's indexed fields and the index settings."""
+    payload = json.dumps([SEARCH_INDEX_VERSION, FIELDS, TF_CAP, sorted(STOPWORDS), document], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def score_document(document: Dict[str, str]) -> Tuple[Dict[str, int], List[str]]:
+    """
+    Score every token of one film.
+
+    Args:
+        document: Output of film_document
+
+    Returns:
+        Tuple of (token -> weighted score, distinct title tokens)
+    """
+    scores: Dict[str, int] = defaultdict(int)
+    for _, name, weight in FIELDS:
+        for token, count in Counter(tokenize(document[name])).items():
+            scores[token] += weight * min(count, TF_CAP)
+    return dict(sorted(scores.items())), sorted(set(tokenize(document['title'])))
+
+
+def load_cache(path: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    """Load the per-film token cache; empty if missing, unreadable or from another version."""
+    if not path:
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return data.get('films', {}) if data.get('version') == SEARCH_INDEX_VERSION else {}
+
+
+def save_cache(films: Dict[str, Dict[str, Any]], path: Optional[str]) -> None:
+    """Write the per-film token cache (atomic)."""
+    if not path:
+        return
+    data = json.dumps({'version': SEARCH_INDEX_VERSION, 'films': films}, ensure_ascii=False, separators=(',', ':'))
+    atomic_write_bytes(path, data.encode('utf-8'))
+
+
+def build_search_index(movies: Sequence[Dict[str, Any]], film_ids: Dict[str, int], series: str,
+                       cache: Optional[Dict[str, Dict[str, Any]]] = None) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """
+    Build the search index for the films of a schedule.
+
+    Args:
+        movies: Published showtime dicts (film fields repeat per showtime)
+        film_ids: Registry covering every film in movies
+        series: Series name recorded in the artifact
+        cache: Per-film token cache to reuse and update in place (entries
+            of films no longer listed are removed)
+
+    Returns:
+        Tuple of (index artifact, stats with 'films', 'tokenized' and 'cached')
+    """
+    cache = {} if cache is None else cache
+    films: Dict[int, Dict[str, str]] = {}
+    documents: Dict[int, Dict[str, Any]] = {}
+    tokenized = 0
+    for movie in movies:
+        film_id = film_ids[film_key(movie)]
+        if film_id in films:
+            continue
+        films[film_id] = {'title': movie['Movie'], 'film_slug': movie.get('film_slug', '')}
+        document = film_document(movie)
+        digest = document_hash(document)
+        entry = cache.get(str(film_id))
+        if not entry or entry['hash'] != digest:
+            scores, title_words = score_document(document)
+            entry = cache[str(film_id)] = {'hash': digest, 'scores': scores, 'title_words': title_words}
+            tokenized += 1
+        documents[film_id] = entry
+    for key in set(cache) - {str(film_id) for film_id in films}:
+        del cache[key]
+
+    postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+    title_words = set()
+    for film_id in sorted(documents):
+        for token, score in documents[film_id]['scores'].items():
+            postings[token].append((film_id, score))
+        title_words.update(documents[film_id]['title_words'])
+
+    terms = sorted(postings)
+    words = sorted(title_words)
+    grams: Dict[str, List[int]] = defaultdict(list)
+    for index, word in enumerate(words):
+        for gram in trigrams(word):
+            grams[gram].append(index)
+
+    index = {
+        'version': SEARCH_INDEX_VERSION,
+        'series': series,
+        'weights': {name: weight for _, name, weight in FIELDS},
+        'stopwords': sorted(STOPWORDS),
+        'films': {str(film_id): films[film_id] for film_id in sorted(films)},
+        'terms': terms,
+        'postings': [[value for pair in postings[term] for value in pair] for term in terms],
+        'title_words': words,
+        'trigrams': dict(sorted(grams.items())),
+    }
+    stats = {'films': len(films), 'tokenized': tokenized, 'cached': len(films) - tokenized}
+    return index, stats
+
+
+def _term_scores(index: Dict[str, Any], position: int, factor: float, scores: Dict[int, float]) -> None:
+    flat = index['postings'][position]
+    for i in range(0, len(flat), 2):
+        film_id, score = flat[i], flat[i + 1] * factor
+        if score > scores.get(film_id, 0):
+            scores[film_id] = score
+
+
+def match_token(index: Dict[str, Any], token: str) -> Dict[int, float]:
+    """
+    Score films for one normalized query token.
+
+    Exact term hits score in full and terms that start with the token score
+    PREFIX_FACTOR of theirs. Only if neither exists is the token matched
+    against title words by trigram similarity, scored as title weight times
+    the similarity.
+
+    Args:
+        index: Search index artifact
+        token: Normalized query token
+
+    Returns:
+        Dict of film ID -> best score for the token
+    """
+    terms = index['terms']
+    scores: Dict[int, float] = {}
+    position = bisect.bisect_left(terms, token)
+    while position < len(terms) and terms[position].startswith(token):
+        _term_scores(index, position, 1.0 if terms[position] == token else PREFIX_FACTOR, scores)
+        position += 1
+    if scores or len(token) < FUZZY_MIN_LENGTH:
+        return scores
+
+    query_grams = trigrams(token)
+    shared: Counter = Counter()
+    for gram in query_grams:
+        shared.update(index['trigrams'].get(gram, ()))
+    title_weight = index['weights']['title']
+    for word_index, count in shared.items():
+        word = index['title_words'][word_index]
+        similarity = count / (len(query_grams) + len(trigrams(word)) - count)
+        if similarity >= FUZZY_THRESHOLD:
+            position = bisect.bisect_left(terms, word)
+            flat = index['postings'][position]
+            for film_id in flat[::2]:
+                scores[film_id] = max(scores.get(film_id, 0), title_weight * similarity)
+    return scores
+
+
+def search(index: Dict[str, Any], query: str) -> List[Tuple[int, float]]:
+    """
+    Find the films matching every word of a query.
+
+    Args:
+        index: Search index artifact
+        query: Free text as typed
+
+    Returns:
+        (film ID, score) pairs, best first (ties by ID)
+    """
+    totals: Optional[Dict[int, float]] = None
+    for token in tokenize(query):
+        scores = match_token(index, token)
+        if totals is None:
+            totals = scores
+        else:
+            totals = {film_id: totals[film_id] + score for film_id, score in scores.items() if film_id in totals}
+        if not totals:
+            return []
+    return sorted((totals or {}).items(), key=lambda item: (-item[1], item[0]))
+
+
+def write_search_index(movies: Sequence[Dict[str, Any]], output_path: str, series: str,
+                       film_ids: Dict[str, int], cache_path: Optional[str] = SEARCH_CACHE_FILE) -> Dict[str, Any]:
+    """
+    Build the index and write it, leaving the file alone if it is unchanged.
+
+    Args:
+        movies: Published showtime dicts
+        output_path: Destination JSON file
+        series: Series name
+        film_ids: Registry covering every film in movies
+        cache_path: Per-film token cache (None: tokenize every film)
+
+    Returns:
+        Stats from build_search_index plus 'written' (bool)
+    """
+    cache = load_cache(cache_path)
+    index, stats = build_search_index(movies, film_ids, series, cache)
+    save_cache(cache, cache_path)
+
+    data = json.dumps(index, ensure_ascii=False, separators=(',', ':'))
+    stats['written'] = write_if_changed(output_path, data.encode('utf-8'))
+    return stats
+
+
+def main():
+    """Main entry point for command-line execution."""
+    parser = argparse.ArgumentParser(
+        description='Build the film search index (tokens, trigrams, field weights)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # public/tenement-stories-full.json -> public/tenement-stories-search.json
+  %(prog)s
+
+  # Try a query against the built index
+  %(prog)s --query "lonsome fejos"
+
+  # Ignore the token cache
+  %(prog)s --no-cache
+'''
+    )
+    parser.add_argument(
+        '--series',
+        default='tenement-stories',
+        help='Series name (default: tenement-stories). Used to determine default input/output files.'
+    )
+    parser.add_argument('--input', help='Published showtime JSON (default: public/{series}-full.json)')
+    parser.add_argument('--output', help='Search index JSON (default: public/{series}-search.json)')
+    parser.add_argument('--ids-file', default=FILM_IDS_FILE, help='Film ID registry (default: film-ids.json)')
+    parser.add_argument('--no-cache', action='store_true', help='Tokenize every film instead of using the cache')
+    parser.add_argument('--query', help='Search the index after building it and print the matches')
+    args = parser.parse_args()
+
+    input_json = args.input or str(PROJECT_ROOT / 'public' / f'{args.series}-full.json')
+    output_json = args.output or str(PROJECT_ROOT / 'public' / f'{args.series}-search.json')
+
+    try:
+        with open(input_json, 'r', encoding='utf-8') as f:
+            movies = json.load(f)
+    except FileNotFoundError:
+        print(f"Error: Input file not found: {input_json}")
+        sys.exit(1)
+
+    film_ids = load_film_ids(args.ids_file)
+    new_keys = register_films(movies, film_ids)
+    stats = write_search_index(movies, output_json, args.series, film_ids,
+                               None if args.no_cache else SEARCH_CACHE_FILE)
+    if new_keys:
+        save_film_ids(film_ids, args.ids_file)
+
+    print(f"✓ Indexed {stats['films']} films ({stats['tokenized']} tokenized, {stats['cached']} cached)")
+    print(f"✓ {'Wrote' if stats['written'] else 'Unchanged:'} {output_json} ({os.path.getsize(output_json):,} bytes)")
+
+    if args.query is not None:
+        with open(output_json, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        matches = search(index, args.query)
+        print(f"\n{len(matches)} match(es) for {args.query!r}:")
+        for film_id, score in matches:
+            print(f"  {score:6.1f}  {index['films'][str(film_id)]['title']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Split published showtime JSON into date shards plus a manifest.
+
+Each shard holds the showtimes of one day or one ISO week, in the same
+row format as {series}-full.json. manifest.json lists every shard's date
+range, content hash and counts, so the calendar can fetch only the weeks in
+view. Shards whose content did not change are not rewritten, so a one-day
+schedule change touches one shard and the manifest.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from atomic_write import write_if_changed
+
+# Get script directory for relative paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+GRANULARITIES = ('day', 'week')
+HASH_LENGTH = 16
+
+# Shard files this module owns: 2026-02-06.json (day) or 2026-W06.json (week)
+SHARD_FILE_PATTERN = re.compile(r'^\d{4}-(?:\d{2}-\d{2}|W\d{2})\.json$')
+
+
+def shard_range(day: date, granularity: str) -> Tuple[str, date, date]:
+    """
+    Find the shard a date belongs to.
+
+    Args:
+        day: Showtime date
+        granularity: 'day' or 'week' (ISO weeks, Monday to Sunday)
+
+    Returns:
+        Tuple of (key, first_date, last_date)
+
+    Raises:
+        ValueError: On an unknown granularity
+    """
+    if granularity == 'day':
+        return day.isoformat(), day, day
+    if granularity == 'week':
+        year, week, weekday = day.isocalendar()
+        start = day - timedelta(days=weekday - 1)
+        return f'{year}-W{week:02d}', start, start + timedelta(days=6)
+    raise ValueError(f"Unknown shard granularity '{granularity}' (expected one of: {', '.join(GRANULARITIES)})")
+
+
+def shard_movies(movies: List[Dict[str, str]], granularity: str = 'week') -> Dict[str, Dict[str, object]]:
+    """
+    Group showtimes into shards by their Datetime.
+
+    Args:
+        movies: Published showtime rows (must have Datetime)
+        granularity: 'day' or 'week'
+
+    Returns:
+        Dict mapping shard key to {start, end, movies}, in key order
+    """
+    shards: Dict[str, Dict[str, object]] = {}
+    for movie in movies:
+        key, start, end = shard_range(date.fromisoformat(movie['Datetime'][:10]), granularity)
+        shard = shards.setdefault(key, {'start': start.isoformat(), 'end': end.isoformat(), 'movies': []})
+        shard['movies'].append(movie)
+
+    for shard in shards.values():
+        shard['movies'].sort(key=lambda m: m['Datetime'])
+    return dict(sorted(shards.items()))
+
+
+def serialize_shard(movies: List[Dict[str, str]]) -> bytes:
+    """Encode one shard deterministically (compact JSON, UTF-8)."""
+    return json.dumps(movies, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _film_count(movies: List[Dict[str, str]]) -> int:
+    return len({m.get('film_url') or m.get('film_slug') or m.get('Movie') for m in movies})
+
+
+def write_shards(movies: List[Dict[str, str]], output_dir: str, granularity: str = 'week',
+                 series: str = '') -> Tuple[Dict[str, object], List[str], List[str]]:
+    """
+    Write shard files and the manifest, touching only shards that changed.
+
+    Shard files left over from earlier runs (dates no longer listed, or the
+    other granularity) are removed.
+
+    Args:
+        movies: Published showtime rows
+        output_dir: Shard directory (e.g. public/tenement-stories-shards)
+        granularity: 'day' or 'week'
+        series: Series name recorded in the manifest
+
+    Returns:
+        Tuple of (manifest, rewritten shard files, removed shard files)
+    """
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    entries = []
+    written = []
+    for key, shard in shard_movies(movies, granularity).items():
+        filename = f'{key}.json'
+        data = serialize_shard(shard['movies'])
+        if write_if_changed(out / filename, data):
+            written.append(filename)
+        entries.append({
+            'key': key,
+            'file': filename,
+            'start': shard['start'],
+            'end': shard['end'],
+            'hash': hashlib.sha256(data).hexdigest()[:HASH_LENGTH],
+            'bytes': len(data),
+            'showtimes': len(shard['movies']),
+            'films': _film_count(shard['movies']),
+        })
+
+    current = {entry['file'] for entry in entries}
+    removed = []
+    for path in sorted(out.iterdir()):
+        if SHARD_FILE_PATTERN.match(path.name) and path.name not in current:
+            path.unlink()
+            removed.append(path.name)
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'series': series,
+        'granularity': granularity,
+        'start': entries[0]['start'] if entries else None,
+        'end': entries[-1]['end'] if entries else None,
+        'showtimes': len(movies),
+        'films': _film_count(movies),
+        'shards': entries,
+    }
+    write_if_changed(out / MANIFEST_NAME, (json.dumps(manifest, indent=2) + '\n').encode('utf-8'))
+    return manifest, written, removed
+
+
+def main():
+    """Main entry point for command-line execution."""
+    parser = argparse.ArgumentParser(
+        description='Split published showtime JSON into per-day or per-week shards with a manifest',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # Weekly shards of the default series
+  %(prog)s
+
+  # Daily shards
+  %(prog)s --by day
+
+  # Custom input and output directory
+  %(prog)s --input ../public/other-full.json --output-dir ../public/other-shards
+'''
+    )
+    parser.add_argument('--series', default='tenement-stories', help='Series name (default: tenement-stories)')
+    parser.add_argument('--input', help='Published JSON (default: PROJECT_ROOT/public/{series}-full.json)')
+    parser.add_argument('--output-dir', help='Shard directory (default: PROJECT_ROOT/public/{series}-shards)')
+    parser.add_argument('--by', choices=GRANULARITIES, default='week', help='Shard granularity (default: week)')
+
+    args = parser.parse_args()
+    input_path = args.input or str(PROJECT_ROOT / 'public' / f'{args.series}-full.json')
+    output_dir = args.output_dir or str(PROJECT_ROOT / 'public' / f'{args.series}-shards')
+
+    try:
+        with open(input_path, 'r', encoding='utf-8') as f:
+            movies = json.load(f)
+    except FileNotFoundError:
+        print(f"Error: Input file not found: {input_path}")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: Invalid JSON in {input_path}: {e}")
+        sys.exit(1)
+
+    manifest, written, removed = write_shards(movies, output_dir, args.by, args.series)
+
+    print(f"✓ {len(manifest['shards'])} {args.by} shards for {manifest['showtimes']} showtimes in {output_dir}")
+    print(f"  {len(written)} rewritten, {len(manifest['shards']) - len(written)} unchanged, {len(removed)} removed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+SQLite history of every scraped showtime, across series and scrapes.
+
+parse_showtimes.py overwrites its CSV with a full snapshot on each run, so
+ScrapedAt is the only history the CSVs keep. This store keeps films and
+showtimes from every scrape. Showtimes are upserted on
+(film_url, date, time), where date is the resolved ISO date. Each scrape
+records which showtimes it listed. Two scrapes of a series can then be
+diffed without loading any CSVs:
+
+    python showtime_history.py ingest ../tenement-stories.csv
+    python showtime_history.py diff --since 2026-02-14
+"""
+
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from build_showtimes import resolve_datetime
+
+# Get script directory for relative paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+
+DEFAULT_DB = os.environ.get('SHOWTIME_DB', str(SCRIPT_DIR / 'showtimes.db'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrapes (
+    id INTEGER PRIMARY KEY,
+    series TEXT NOT NULL,
+    scraped_at TEXT NOT NULL,
+    showtimes INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (series, scraped_at)
+);
+CREATE TABLE IF NOT EXISTS films (
+    film_url TEXT PRIMARY KEY,
+    film_slug TEXT NOT NULL,
+    title TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS showtimes (
+    id INTEGER PRIMARY KEY,
+    film_url TEXT NOT NULL REFERENCES films (film_url),
+    date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    datetime TEXT NOT NULL,
+    listed_date TEXT NOT NULL,
+    series TEXT NOT NULL,
+    ticket_url TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    UNIQUE (film_url, date, time)
+);
+CREATE TABLE IF NOT EXISTS scrape_showtimes (
+    scrape_id INTEGER NOT NULL REFERENCES scrapes (id) ON DELETE CASCADE,
+    showtime_id INTEGER NOT NULL REFERENCES showtimes (id),
+    PRIMARY KEY (scrape_id, showtime_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_films_slug ON films (film_slug);
+CREATE INDEX IF NOT EXISTS idx_showtimes_datetime ON showtimes (datetime);
+CREATE INDEX IF NOT EXISTS idx_showtimes_series ON showtimes (series, datetime);
+CREATE INDEX IF NOT EXISTS idx_scrapes_series ON scrapes (series, scraped_at);
+"""
+
+UPSERT_FILM = """
+INSERT INTO films (film_url, film_slug, title, first_seen, last_seen)
+VALUES (:film_url, :film_slug, :title, :scraped_at, :scraped_at)
+ON CONFLICT (film_url) DO UPDATE SET
+    film_slug = excluded.film_slug,
+    title = excluded.title,
+    first_seen = min(first_seen, excluded.first_seen),
+    last_seen = max(last_seen, excluded.last_seen)
+"""
+
+UPSERT_SHOWTIME = """
+INSERT INTO showtimes (film_url, date, time, datetime, listed_date, series, ticket_url, first_seen, last_seen)
+VALUES (:film_url, :date, :time, :datetime, :listed_date, :series, :ticket_url, :scraped_at, :scraped_at)
+ON CONFLICT (film_url, date, time) DO UPDATE SET
+    datetime = excluded.datetime,
+    listed_date = excluded.listed_date,
+    series = excluded.series,
+    ticket_url = excluded.ticket_url,
+    first_seen = min(first_seen, excluded.first_seen),
+    last_seen = max(last_seen, excluded.last_seen)
+"""
+
+LINK_SHOWTIME = """
+INSERT OR IGNORE INTO scrape_showtimes (scrape_id, showtime_id)
+SELECT ?, id FROM showtimes WHERE film_url = ? AND date = ? AND time = ?
+"""
+
+# Showtimes listed by one scrape but not the other
+DIFF_QUERY = """
+SELECT f.title, f.film_slug, s.film_url, s.date, s.time, s.datetime, s.ticket_url
+FROM showtimes s JOIN films f ON f.film_url = s.film_url
+WHERE s.id IN (
+    SELECT showtime_id FROM scrape_showtimes WHERE scrape_id = ?
+    EXCEPT
+    SELECT showtime_id FROM scrape_showtimes WHERE scrape_id = ?
+)
+ORDER BY s.datetime, f.title
+"""
+
+
+class ShowtimeHistory:
+    """SQLite store of films, showtimes and the scrapes that listed them."""
+
+    def __init__(self, db_path: str = DEFAULT_DB) -> None:
+        """
+        Args:
+            db_path: SQLite database file (created on first use)
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self) -> 'ShowtimeHistory':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def record_scrape(self, rows: Iterable[Dict[str, str]], series: str,
+                      scraped_at: str) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+        """
+        Upsert one scrape's showtimes and record which ones it listed.
+
+        Recording the same (series, scraped_at) twice is a no-op, so CSVs
+        can be re-ingested safely.
+
+        Args:
+            rows: Showtime rows with parse_showtimes CSV columns
+            series: Series the scrape belongs to
+            scraped_at: ISO timestamp of the scrape
+
+        Returns:
+            Tuple of (summary, warnings). The summary has scrape_id, series,
+            scraped_at, showtimes, added and removed (both relative to the
+            previous scrape of the series). It is None if the scrape was
+            already recorded.
+        """
+        existing = self.conn.execute(
+            'SELECT id FROM scrapes WHERE series = ? AND scraped_at = ?', (series, scraped_at)
+        ).fetchone()
+        if existing:
+            return None, []
+
+        scrape_dt = datetime.fromisoformat(scraped_at)
+        records = []
+        warnings = []
+        for row in rows:
+            title = row.get('Movie', '')
+            film_url = (row.get('film_url') or '').strip()
+            if not film_url:
+                warnings.append(f"Skipping {title} on {row.get('Date')}: no film_url")
+                continue
+            try:
+                when, _ = resolve_datetime(row['Date'], row['Time'], scrape_dt)
+            except (KeyError, ValueError) as e:
+                warnings.append(f"Skipping {title}: {e}")
+                continue
+            records.append({
+                'film_url': film_url,
+                'film_slug': row.get('film_slug') or film_url.rstrip('/').split('/')[-1],
+                'title': title,
+                'date': when.date().isoformat(),
+                'time': row['Time'],
+                'datetime': when.isoformat(),
+                'listed_date': row['Date'],
+                'series': series,
+                'ticket_url': row.get('ticket_url', ''),
+                'scraped_at': scraped_at,
+            })
+
+        previous = self.previous_scrape(series, scraped_at)
+        with self.conn:
+            cursor = self.conn.execute(
+                'INSERT INTO scrapes (series, scraped_at) VALUES (?, ?)', (series, scraped_at)
+            )
+            scrape_id = cursor.lastrowid
+            self.conn.executemany(UPSERT_FILM, records)
+            self.conn.executemany(UPSERT_SHOWTIME, records)
+            self.conn.executemany(
+                LINK_SHOWTIME, ((scrape_id, r['film_url'], r['date'], r['time']) for r in records)
+            )
+            self.conn.execute(
+                'UPDATE scrapes SET showtimes = '
+                '(SELECT count(*) FROM scrape_showtimes WHERE scrape_id = ?) WHERE id = ?',
+                (scrape_id, scrape_id),
+            )
+
+        summary = self.scrape(scrape_id)
+        if previous is None:
+            summary['added'], summary['removed'] = summary['showtimes'], 0
+        else:
+            changes = self.diff(previous, scrape_id)
+            summary['added'], summary['removed'] = len(changes['added']), len(changes['removed'])
+        return summary, warnings
+
+    def ingest(self, rows: Iterable[Dict[str, str]], default_series: str) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Record CSV rows, split into scrapes by (Series, ScrapedAt).
+
+        Batch CSVs carry a Series column; other rows use default_series.
+
+        Args:
+            rows: Showtime rows with parse_showtimes CSV columns
+            default_series: Series for rows without a Series column
+
+        Returns:
+            Tuple of (summaries of newly recorded scrapes in time order, warnings)
+        """
+        groups: Dict[Tuple[str, str], List[Dict[str, str]]] = defaultdict(list)
+        warnings = []
+        for row in rows:
+            scraped_at = row.get('ScrapedAt')
+            if not scraped_at:
+                warnings.append(f"Skipping {row.get('Movie', '')} on {row.get('Date')}: no ScrapedAt timestamp")
+                continue
+            groups[(row.get('Series') or default_series, scraped_at)].append(row)
+
+        summaries = []
+        for (series, scraped_at), group in sorted(groups.items(), key=lambda item: item[0][1]):
+            summary, scrape_warnings = self.record_scrape(group, series, scraped_at)
+            warnings.extend(scrape_warnings)
+            if summary:
+                summaries.append(summary)
+        return summaries, warnings
+
+    def scrape(self, scrape_id: int) -> Dict[str, Any]:
+        """
+        Look up a recorded scrape.
+
+        Args:
+            scrape_id: Scrape ID
+
+        Returns:
+            Dict with scrape_id, series, scraped_at and showtimes
+
+        Raises:
+            KeyError: If no such scrape exists
+        """
+        row = self.conn.execute(
+            'SELECT id AS scrape_id, series, scraped_at, showtimes FROM scrapes WHERE id = ?', (scrape_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"No scrape with ID {scrape_id}")
+        return dict(row)
+
+    def scrapes(self, series: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List recorded scrapes in time order.
+
+        Args:
+            series: Only this series (default: all)
+
+        Returns:
+            List of scrape dicts as returned by scrape()
+        """
+        query = 'SELECT id AS scrape_id, series, scraped_at, showtimes FROM scrapes'
+        params: Tuple[str, ...] = ()
+        if series:
+            query += ' WHERE series = ?'
+            params = (series,)
+        return [dict(row) for row in self.conn.execute(query + ' ORDER BY scraped_at, id', params)]
+
+    def latest_scrape(self, series: str, at_or_before: Optional[str] = None) -> Optional[int]:
+        """
+        Find the latest scrape of a series, optionally as of a point in time.
+
+        Args:
+            series: Series name
+            at_or_before: ISO date or timestamp; a bare date includes the whole day
+
+        Returns:
+            Scrape ID, or None if there is none
+        """
+        if at_or_before is None:
+            row = self.conn.execute(
+                'SELECT id FROM scrapes WHERE series = ? ORDER BY scraped_at DESC, id DESC LIMIT 1', (series,)
+            ).fetchone()
+        else:
+            # ISO strings compare chronologically; "2026-02-14" + "~" sorts after any time that day
+            bound = at_or_before + ('~' if len(at_or_before) == 10 else '')
+            row = self.conn.execute(
+                'SELECT id FROM scrapes WHERE series = ? AND scraped_at <= ? '
+                'ORDER BY scraped_at DESC, id DESC LIMIT 1',
+                (series, bound),
+            ).fetchone()
+        return row['id'] if row else None
+
+    def previous_scrape(self, series: str, scraped_at: str) -> Optional[int]:
+        """
+        Find the scrape of a series that precedes a timestamp.
+
+        Args:
+            series: Series name
+            scraped_at: ISO timestamp
+
+        Returns:
+            Scrape ID, or None if there is none
+        """
+        row = self.conn.execute(
+            'SELECT id FROM scrapes WHERE series = ? AND scraped_at < ? '
+            'ORDER BY scraped_at DESC, id DESC LIMIT 1',
+            (series, scraped_at),
+        ).fetchone()
+        return row['id'] if row else None
+
+    def diff(self, old_id: int, new_id: int) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Compare the showtimes listed by two scrapes.
+
+        Args:
+            old_id: Earlier scrape ID
+            new_id: Later scrape ID
+
+        Returns:
+            Dict with 'added' (listed only by new_id) and 'removed' (listed
+            only by old_id) showtimes, each sorted by datetime
+        """
+        return {
+            'added': [dict(row) for row in self.conn.execute(DIFF_QUERY, (new_id, old_id))],
+            'removed': [dict(row) for row in self.conn.execute(DIFF_QUERY, (old_id, new_id))],
+        }
+
+
+def read_csv_rows(paths: List[str]) -> List[Dict[str, str]]:
+    """
+    Read parse_showtimes CSV rows from several files.
+
+    Args:
+        paths: CSV files (single-series or batch output)
+
+    Returns:
+        All rows as dicts
+    """
+    rows = []
+    for path in paths:
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            rows.extend(csv.DictReader(f))
+    return rows
+
+
+def print_changes(changes: Dict[str, List[Dict[str, str]]]) -> None:
+    """Print added and removed showtimes."""
+    for label, marker in (('added', '+'), ('removed', '-')):
+        for showtime in changes[label]:
+            print(f"  {marker} {showtime['datetime'][:16].replace('T', ' ')}  {showtime['title']}")
+
+
+def main_ingest(args: argparse.Namespace, history: ShowtimeHistory) -> None:
+    """Record CSV files in the history database."""
+    try:
+        rows = read_csv_rows(args.csv)
+    except FileNotFoundError as e:
+        print(f"Error: Input file not found: {e.filename}")
+        sys.exit(1)
+
+    summaries, warnings = history.ingest(rows, args.series)
+    if warnings:
+        print("\n⚠ Ingest Warnings:")
+        for warning in warnings:
+            print(f"  {warning}")
+
+    if not summaries:
+        print("✓ Nothing new to record (scrapes already in the history)")
+        return
+    for summary in summaries:
+        print(f"✓ Recorded scrape {summary['scrape_id']} of {summary['series']} at {summary['scraped_at']}: "
+              f"{summary['showtimes']} showtimes (+{summary['added']} / -{summary['removed']})")
+
+
+def main_diff(args: argparse.Namespace, history: ShowtimeHistory) -> None:
+    """Print the showtimes that appeared or disappeared between two scrapes."""
+    try:
+        new_id = args.to or history.latest_scrape(args.series)
+        if new_id is None:
+            print(f"Error: No scrapes recorded for {args.series}")
+            sys.exit(1)
+        new = history.scrape(new_id)
+
+        if args.from_id:
+            old_id = args.from_id
+        elif args.since:
+            old_id = history.latest_scrape(args.series, args.since)
+        else:
+            old_id = history.previous_scrape(new['series'], new['scraped_at'])
+        if old_id is None:
+            print(f"Error: No earlier scrape of {args.series} to compare with")
+            sys.exit(1)
+        old = history.scrape(old_id)
+    except KeyError as e:
+        print(f"Error: {e.args[0]}")
+        sys.exit(1)
+
+    changes = history.diff(old_id, new_id)
+    print(f"Scrape {old_id} ({old['scraped_at']}) -> {new_id} ({new['scraped_at']})")
+    print_changes(changes)
+    print(f"\n✓ {len(changes['added'])} added, {len(changes['removed'])} removed")
+
+
+def main_scrapes(args: argparse.Namespace, history: ShowtimeHistory) -> None:
+    """List recorded scrapes."""
+    for scrape in history.scrapes(args.series):
+        print(f"  {scrape['scrape_id']:>5}  {scrape['scraped_at']}  {scrape['series']}  {scrape['showtimes']} showtimes")
+
+
+def main():
+    """Main entry point for command-line execution."""
+    parser = argparse.ArgumentParser(
+        description='Keep a SQLite history of scraped showtimes and diff scrapes',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # Record a parse_showtimes.py CSV (re-ingesting the same scrape is a no-op)
+  %(prog)s ingest ../tenement-stories.csv
+
+  # Record a batch CSV (series taken from its Series column)
+  %(prog)s ingest ../showtimes-batch.csv
+
+  # What changed between the last two scrapes / since yesterday
+  %(prog)s diff
+  %(prog)s diff --since 2026-02-14
+
+  # List recorded scrapes
+  %(prog)s scrapes
+'''
+    )
+    parser.add_argument(
+        '--db',
+        default=DEFAULT_DB,
+        help='SQLite database (default: data-processing/showtimes.db, or SHOWTIME_DB)'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest = subparsers.add_parser('ingest', help='Record parse_showtimes.py CSV files')
+    ingest.add_argument('csv', nargs='+', help='CSV files to record')
+    ingest.add_argument(
+        '--series',
+        default='tenement-stories',
+        help='Series of rows without a Series column (default: tenement-stories)'
+    )
+
+    diff = subparsers.add_parser('diff', help='Show showtimes added/removed between two scrapes')
+    diff.add_argument('--series', default='tenement-stories', help='Series to compare (default: tenement-stories)')
+    diff.add_argument('--from', dest='from_id', type=int, help='Earlier scrape ID')
+    diff.add_argument('--since', help='Compare against the latest scrape on or before this ISO date/timestamp')
+    diff.add_argument('--to', type=int, help='Later scrape ID (default: latest)')
+
+    scrapes = subparsers.add_parser('scrapes', help='List recorded scrapes')
+    scrapes.add_argument('--series', help='Only this series')
+
+    args = parser.parse_args()
+    commands = {'ingest': main_ingest, 'diff': main_diff, 'scrapes': main_scrapes}
+    with ShowtimeHistory(args.db) as history:
+        commands[args.command](args, history)
+
+
+if __name__ == '__main__':
+    main()
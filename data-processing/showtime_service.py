@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+Local HTTP query service over the published showtimes.
+
+Loads public/{series}-full.json once into an in-memory index and answers
+queries from it, so consumers stop re-reading and re-parsing the files:
+
+    GET /now?at=YYYY-MM-DDTHH:MM&limit=N   playing now and the next N showtimes
+    GET /dates                             dates with showtimes
+    GET /dates/{YYYY-MM-DD}                showtimes on a date
+    GET /films                             film slugs and titles
+    GET /films/{film_slug}                 showtimes of a film
+    GET /range?from=...&to=...             showtimes starting in [from, to)
+    GET /health                            snapshot version, row count, load time
+
+Showtimes are kept sorted by Datetime (New York wall-clock time, so ISO
+strings sort chronologically) and looked up with bisect; film and date maps
+point into the sorted array. Responses carry an ETag derived from the index
+version and the request, and If-None-Match answers 304 without building a
+body. A watcher thread reloads the file when the pipeline replaces it and
+swaps in the new index with one assignment, so every request sees a single
+consistent snapshot.
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+from zoneinfo import ZoneInfo
+
+from day_views import runtime_minutes
+
+# Get script directory for relative paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = int(os.environ.get('SHOWTIME_SERVICE_PORT', '8765'))
+THEATER_TZ = ZoneInfo('America/New_York')
+DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 500
+# Serialized responses kept per index snapshot
+RESPONSE_CACHE_SIZE = 1024
+
+
+class QueryError(ValueError):
+    """Invalid query parameters (answered with 400)."""
+
+
+def parse_when(value: str) -> str:
+    """
+    Normalize a query datetime to the Datetime format of the rows.
+
+    Args:
+        value: 'YYYY-MM-DD', 'YYYY-MM-DDTHH:MM' or 'YYYY-MM-DDTHH:MM:SS'
+
+    Returns:
+        'YYYY-MM-DDTHH:MM:SS'
+
+    Raises:
+        QueryError: If the value is not one of those forms
+    """
+    try:
+        return datetime.fromisoformat(value).strftime(DATETIME_FORMAT)
+    except ValueError:
+        raise QueryError(f"Invalid datetime: {value!r}") from None
+
+
+class ShowtimeIndex:
+    """Immutable, query-ready snapshot of one published showtime file."""
+
+    def __init__(self, movies: Sequence[Dict[str, Any]], version: str, source: str = '') -> None:
+        """
+        Args:
+            movies: Published showtime dicts
+            version: Content hash identifying this snapshot (used in ETags)
+            source: File the rows came from
+        """
+        self.rows = sorted(movies, key=lambda m: (m['Datetime'], m['Movie']))
+        self.datetimes = [row['Datetime'] for row in self.rows]
+        self.ends = [
+            (datetime.strptime(row['Datetime'], DATETIME_FORMAT)
+             + timedelta(minutes=runtime_minutes(row.get('runtime')))).strftime(DATETIME_FORMAT)
+            for row in self.rows
+        ]
+        self.max_runtime = max((runtime_minutes(row.get('runtime')) for row in self.rows), default=0)
+
+        self.by_slug: Dict[str, List[int]] = {}
+        self.by_date: Dict[str, Tuple[int, int]] = {}
+        self.titles: Dict[str, str] = {}
+        for position, row in enumerate(self.rows):
+            slug = row.get('film_slug', '')
+            self.by_slug.setdefault(slug, []).append(position)
+            self.titles.setdefault(slug, row['Movie'])
+            day = row['Datetime'][:10]
+            first, _ = self.by_date.get(day, (position, position))
+            self.by_date[day] = (first, position + 1)
+
+        self.version = version
+        self.source = source
+        self.loaded_at = datetime.now().isoformat(timespec='seconds')
+        self._responses: 'OrderedDict[str, Tuple[str, bytes]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> 'ShowtimeIndex':
+        """
+        Build an index from a published JSON file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If it is not a JSON array of showtimes
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        movies = json.loads(data)
+        if not isinstance(movies, list):
+            raise ValueError(f"{path} is not a JSON array")
+        return cls(movies, hashlib.sha256(data).hexdigest()[:16], path)
+
+    def between(self, start: str, end: str) -> List[Dict[str, Any]]:
+        """Showtimes starting in [start, end)."""
+        return self.rows[bisect.bisect_left(self.datetimes, start):bisect.bisect_left(self.datetimes, end)]
+
+    def playing(self, at: str) -> List[Dict[str, Any]]:
+        """Showtimes that started at or before `at` and have not ended."""
+        earliest = (datetime.strptime(at, DATETIME_FORMAT)
+                    - timedelta(minutes=self.max_runtime)).strftime(DATETIME_FORMAT)
+        lo = bisect.bisect_left(self.datetimes, earliest)
+        hi = bisect.bisect_right(self.datetimes, at)
+        return [self.rows[i] for i in range(lo, hi) if self.ends[i] > at]
+
+    def upcoming(self, at: str, limit: int) -> List[Dict[str, Any]]:
+        """The next `limit` showtimes starting after `at`."""
+        start = bisect.bisect_right(self.datetimes, at)
+        return self.rows[start:start + limit]
+
+    def on_date(self, day: str) -> List[Dict[str, Any]]:
+        """Showtimes on a date (YYYY-MM-DD)."""
+        first, end = self.by_date.get(day, (0, 0))
+        return self.rows[first:end]
+
+    def for_film(self, slug: str) -> Optional[List[Dict[str, Any]]]:
+        """Showtimes of a film, or None for an unknown slug."""
+        positions = self.by_slug.get(slug)
+        return None if positions is None else [self.rows[i] for i in positions]
+
+    def query(self, path: str, params: Dict[str, str], now: Optional[str] = None) -> Tuple[int, Any]:
+        """
+        Answer one request path.
+
+        Args:
+            path: URL path, e.g. '/films/dead-end'
+            params: Query parameters (last value of each)
+            now: Current theater time for /now without ?at= (default: clock)
+
+        Returns:
+            Tuple of (HTTP status, JSON-serializable body)
+
+        Raises:
+            QueryError: On invalid parameters
+        """
+        parts = [unquote(part) for part in path.strip('/').split('/') if part]
+        if parts == ['now']:
+            at = parse_when(params['at']) if 'at' in params else (
+                now or datetime.now(THEATER_TZ).strftime(DATETIME_FORMAT))
+            limit = parse_limit(params.get('limit'))
+            return 200, {'at': at, 'now': self.playing(at), 'next': self.upcoming(at, limit)}
+        if parts == ['dates']:
+            return 200, {'dates': list(self.by_date)}
+        if len(parts) == 2 and parts[0] == 'dates':
+            return 200, {'date': parts[1], 'showtimes': self.on_date(parts[1])}
+        if parts == ['films']:
+            return 200, {'films': [{'film_slug': slug, 'Movie': title} for slug, title in sorted(self.titles.items())]}
+        if len(parts) == 2 and parts[0] == 'films':
+            showtimes = self.for_film(parts[1])
+            if showtimes is None:
+                return 404, {'error': f"Unknown film: {parts[1]}"}
+            return 200, {'film_slug': parts[1], 'showtimes': showtimes}
+        if parts == ['range']:
+            if 'from' not in params or 'to' not in params:
+                raise QueryError("range needs from and to")
+            start, end = parse_when(params['from']), parse_when(params['to'])
+            return 200, {'from': start, 'to': end, 'showtimes': self.between(start, end)}
+        if parts == ['health']:
+            return 200, {'version': self.version, 'source': self.source, 'showtimes': len(self.rows),
+                         'films': len(self.by_slug), 'loaded_at': self.loaded_at}
+        return 404, {'error': f"Not found: {path}"}
+
+    def cached_response(self, key: str) -> Optional[Tuple[str, bytes]]:
+        """Return a stored (etag, body) for a request key, if any."""
+        with self._lock:
+            hit = self._responses.get(key)
+            if hit is not None:
+                self._responses.move_to_end(key)
+            return hit
+
+    def store_response(self, key: str, etag: str, body: bytes) -> None:
+        """Remember a serialized response, evicting the least recently used beyond RESPONSE_CACHE_SIZE."""
+        with self._lock:
+            self._responses[key] = (etag, body)
+            if len(self._responses) > RESPONSE_CACHE_SIZE:
+                self._responses.popitem(last=False)
+
+    def etag(self, key: str) -> str:
+        """ETag of a deterministic response: snapshot version plus request key."""
+        return f'"{self.version}-{hashlib.blake2b(key.encode("utf-8"), digest_size=6).hexdigest()}"'
+
+
+def parse_limit(value: Optional[str]) -> int:
+    """Parse ?limit=, defaulting to DEFAULT_LIMIT and capped at MAX_LIMIT."""
+    if value is None:
+        return DEFAULT_LIMIT
+    try:
+        limit = int(value)
+    except ValueError:
+        raise QueryError(f"Invalid limit: {value!r}") from None
+    if limit < 0:
+        raise QueryError(f"Invalid limit: {value!r}")
+    return min(limit, MAX_LIMIT)
+
+
+def encode(body: Any) -> bytes:
+    """Serialize a response body as compact UTF-8 JSON."""
+    return json.dumps(body, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class ShowtimeRequestHandler(BaseHTTPRequestHandler):
+    """Answers GET requests from the server's current index."""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'ShowtimeService/1'
+    # Headers and body go out in separate writes; without this, keep-alive clients wait on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        # One snapshot for the whole request, even if a reload swaps it meanwhile
+        index: ShowtimeIndex = self.server.index
+        url = urlsplit(self.path)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        # /now without ?at= depends on the clock, so it is neither cached nor tagged by URL
+        time_dependent = url.path.rstrip('/') == '/now' and 'at' not in params
+        key = f'{url.path}?{url.query}'
+
+        if not time_dependent:
+            etag = index.etag(key)
+            if etag in self._if_none_match():
+                self._send(304, b'', etag)
+                return
+            hit = index.cached_response(key)
+            if hit is not None:
+                self._send(200, hit[1], hit[0])
+                return
+
+        try:
+            status, body = index.query(url.path, params)
+        except QueryError as e:
+            self._send(400, encode({'error': str(e)}))
+            return
+
+        data = encode(body)
+        if status != 200:
+            self._send(status, data)
+        elif time_dependent:
+            etag = f'"{hashlib.blake2b(data, digest_size=8).hexdigest()}"'
+            self._send(304 if etag in self._if_none_match() else 200, data, etag, cache=False)
+        else:
+            index.store_response(key, etag, data)
+            self._send(200, data, etag)
+
+    def _if_none_match(self) -> List[str]:
+        header = self.headers.get('If-None-Match', '')
+        return [tag.strip() for tag in header.split(',') if tag.strip()]
+
+    def _send(self, status: int, data: bytes, etag: Optional[str] = None, cache: bool = True) -> None:
+        if status == 304:
+            data = b''
+        self.send_response(status)
+        if status != 304:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache' if cache else 'no-store')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ShowtimeServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the current index and reloading it on change."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], source: str, reload_interval: float = 1.0,
+                 verbose: bool = False) -> None:
+        """
+        Args:
+            address: (host, port); port 0 picks a free port
+            source: Published showtime JSON to serve
+            reload_interval: Seconds between checks for a replaced file (0 disables the watcher)
+            verbose: Log every request to stderr
+
+        Raises:
+            FileNotFoundError, ValueError: If the initial load fails
+        """
+        self.source = source
+        self.verbose = verbose
+        self.reload_interval = reload_interval
+        self._stamp = self._file_stamp()
+        self.index = ShowtimeIndex.load(source)
+        self._stop = threading.Event()
+        super().__init__(address, ShowtimeRequestHandler)
+        if reload_interval > 0:
+            threading.Thread(target=self._watch, name='showtime-reload', daemon=True).start()
+
+    def _file_stamp(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.source)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def check_reload(self) -> bool:
+        """
+        Reload the index if the source file changed since the last load.
+
+        The new index is built completely before it replaces the old one. A
+        file that is missing or does not parse keeps the current index.
+
+        Returns:
+            True if a new index was swapped in
+        """
+        stamp = self._file_stamp()
+        if stamp is None or stamp == self._stamp:
+            return False
+        # Remember the stamp even on failure, so a bad file is reported once, not on every check
+        self._stamp = stamp
+        try:
+            index = ShowtimeIndex.load(self.source)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠ Reload of {self.source} failed, keeping version {self.index.version}: {e}", file=sys.stderr)
+            return False
+        changed = index.version != self.index.version
+        if changed:
+            self.index = index
+            print(f"✓ Reloaded {len(index.rows)} showtimes (version {index.version})", file=sys.stderr)
+        return changed
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.reload_interval):
+            self.check_reload()
+
+    def server_close(self) -> None:
+        self._stop.set()
+        super().server_close()
+
+
+def main():
+    """Main entry point for command-line execution."""
+    parser = argparse.ArgumentParser(
+        description='Serve showtime queries (now/next, date, film, range) from an in-memory index',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # Serve public/tenement-stories-full.json on 127.0.0.1:8765
+  %(prog)s
+
+  # Query it
+  curl 'http://127.0.0.1:8765/now?limit=3'
+  curl 'http://127.0.0.1:8765/films/dead-end'
+  curl 'http://127.0.0.1:8765/range?from=2026-02-17&to=2026-02-18'
+
+  # Load-test it
+  python load_test_service.py --duration 10 --concurrency 8
+'''
+    )
+    parser.add_argument(
+        '--series',
+        default='tenement-stories',
+        help='Series name (default: tenement-stories). Used to determine the default input file.'
+    )
+    parser.add_argument('--input', help='Published showtime JSON (default: public/{series}-full.json)')
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'Bind address (default: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help=f'Port (default: {DEFAULT_PORT}, or SHOWTIME_SERVICE_PORT)')
+    parser.add_argument('--reload-interval', type=float, default=1.0,
+                        help='Seconds between checks for a new input file; 0 disables hot reload (default: 1)')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args()
+
+    input_json = args.input or str(PROJECT_ROOT / 'public' / f'{args.series}-full.json')
+    try:
+        server = ShowtimeServer((args.host, args.port), input_json, args.reload_interval, args.verbose)
+    except FileNotFoundError:
+        print(f"Error: Input file not found: {input_json}")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: Could not load {input_json}: {e}")
+        sys.exit(1)
+
+    host, port = server.server_address[:2]
+    print(f"✓ Loaded {len(server.index.rows)} showtimes for {len(server.index.by_slug)} films "
+          f"(version {server.index.version})")
+    print(f"✓ Serving on http://{host}:{port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+"""Unit tests for archive_pages.py"""
+
+import threading
+import time
+
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from archive_pages import HttpCache, PageArchiver, build_jobs, read_url_list
+
+PAGE_BYTES = b'<html><head><title>film</title></head><body>page</body></html>'
+
+
+class FakeSiteHandler(BaseHTTPRequestHandler):
+    """Stand-in for filmforum.org: ETag pages, a culled page, a flaky page, chunked bodies."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, dict(self.headers), time.monotonic()))
+
+        if self.path in server.gone:
+            self._send(404, b'not found')
+            return
+        if self.path == '/flaky':
+            with server.lock:
+                server.flaky_calls += 1
+                fail = server.flaky_calls <= 1
+            if fail:
+                self._send(503, b'busy')
+                return
+        if self.path == '/moved':
+            self.send_response(302)
+            self.send_header('Location', '/film/moved-target')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path == '/chunked':
+            self.send_response(200)
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for piece in (PAGE_BYTES[:10], PAGE_BYTES[10:]):
+                self.wfile.write(f'{len(piece):x}\r\n'.encode() + piece + b'\r\n')
+            self.wfile.write(b'0\r\n\r\n')
+            return
+
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self._send(200, PAGE_BYTES + self.path.encode(), {'ETag': '"v1"'})
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeSiteHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.flaky_calls = 0
+    server.gone = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+
+
+def make_archiver(tmp_path, **kwargs):
+    options = {'rate': 0, 'resume_hours': 0, 'backoff': 0.01}
+    options.update(kwargs)
+    return PageArchiver(HttpCache(str(tmp_path / 'cache')), **options)
+
+
+class TestBuildJobs:
+    """Tests for mapping URLs to the directories the parsers read"""
+
+    def test_destinations(self, tmp_path):
+        """Test that series pages go to raw-html and film slugs drop the series suffix"""
+        jobs = build_jobs(
+            ['tenement-stories'],
+            ['https://filmforum.org/film/street-scene-tenement-stories', 'https://filmforum.org/film/other'],
+            base_url='https://filmforum.org', series_dir='raw', html_dir='pages',
+        )
+
+        assert jobs == [
+            ('https://filmforum.org/series/tenement-stories', 'raw/tenement-stories.html'),
+            ('https://filmforum.org/film/street-scene-tenement-stories', 'pages/street-scene.html'),
+            ('https://filmforum.org/film/other', 'pages/other.html'),
+        ]
+
+    def test_read_url_list(self, tmp_path):
+        """Test that blank lines and comments are skipped"""
+        path = tmp_path / 'urls.txt'
+        path.write_text('# films\nhttps://a/film/x\n\n  https://a/film/y  \n')
+
+        assert read_url_list(str(path)) == ['https://a/film/x', 'https://a/film/y']
+
+
+class TestPageArchiver:
+    """Tests against a local stand-in server"""
+
+    def test_downloads_and_revalidates(self, site, tmp_path):
+        """Test that a second run sends If-None-Match and gets 304"""
+        server, base = site
+        dest = tmp_path / 'pages' / 'film.html'
+        archiver = make_archiver(tmp_path)
+
+        first = archiver.run([(f'{base}/film/a', str(dest))])
+        second = archiver.run([(f'{base}/film/a', str(dest))])
+
+        assert first[0].status == 'downloaded'
+        assert second[0].status == 'not_modified'
+        assert dest.read_bytes() == PAGE_BYTES + b'/film/a'
+        assert server.requests[1][1].get('If-None-Match') == '"v1"'
+
+    def test_resume_skips_recent_pages(self, site, tmp_path):
+        """Test that pages fetched within the resume window are not requested again"""
+        server, base = site
+        jobs = [(f'{base}/film/{n}', str(tmp_path / f'{n}.html')) for n in 'abc']
+        make_archiver(tmp_path).run(jobs[:2])
+
+        # Simulates rerunning an interrupted run: only the missing page is fetched
+        results = make_archiver(tmp_path, resume_hours=12).run(jobs)
+
+        assert [r.status for r in results] == ['fresh', 'fresh', 'downloaded']
+        assert len(server.requests) == 3
+
+    def test_resume_restores_deleted_output(self, site, tmp_path):
+        """Test that a fresh cache entry rewrites a missing destination file"""
+        _, base = site
+        dest = tmp_path / 'a.html'
+        make_archiver(tmp_path).run([(f'{base}/film/a', str(dest))])
+        dest.unlink()
+
+        make_archiver(tmp_path, resume_hours=12).run([(f'{base}/film/a', str(dest))])
+
+        assert dest.exists()
+
+    def test_culled_page_keeps_archived_copy(self, site, tmp_path):
+        """Test that a 404 after a successful archive keeps (or restores) the archived page"""
+        server, base = site
+        dest = tmp_path / 'film.html'
+        archiver = make_archiver(tmp_path)
+        archiver.run([(f'{base}/film/a', str(dest))])
+
+        server.gone.add('/film/a')
+        dest.unlink()
+        results = archiver.run([(f'{base}/film/a', str(dest))])
+
+        assert results[0].status == 'gone'
+        assert dest.read_bytes() == PAGE_BYTES + b'/film/a'
+
+    def test_never_archived_gone_page(self, site, tmp_path):
+        """Test that a page culled before its first archive writes nothing"""
+        server, base = site
+        server.gone.add('/film/b')
+
+        results = make_archiver(tmp_path).run([(f'{base}/film/b', str(tmp_path / 'b.html'))])
+
+        assert results[0].status == 'gone'
+        assert not (tmp_path / 'b.html').exists()
+
+    def test_retries_transient_errors(self, site, tmp_path):
+        """Test that a 503 is retried"""
+        server, base = site
+        results = make_archiver(tmp_path).run([(f'{base}/flaky', str(tmp_path / 'flaky.html'))])
+
+        assert results[0].status == 'downloaded'
+        assert server.flaky_calls == 2
+
+    def test_redirects_and_chunked_bodies(self, site, tmp_path):
+        """Test redirect following and chunked transfer decoding"""
+        _, base = site
+        results = make_archiver(tmp_path).run([
+            (f'{base}/moved', str(tmp_path / 'moved.html')),
+            (f'{base}/chunked', str(tmp_path / 'chunked.html')),
+        ])
+
+        assert [r.status for r in results] == ['downloaded', 'downloaded']
+        assert (tmp_path / 'moved.html').read_bytes() == PAGE_BYTES + b'/film/moved-target'
+        assert (tmp_path / 'chunked.html').read_bytes() == PAGE_BYTES
+
+    def test_per_host_rate_limit(self, site, tmp_path):
+        """Test that requests to one host are spaced by 1/rate seconds"""
+        server, base = site
+        jobs = [(f'{base}/film/{n}', str(tmp_path / f'{n}.html')) for n in range(4)]
+
+        make_archiver(tmp_path, rate=20, concurrency=4).run(jobs)
+
+        times = sorted(t for _, _, t in server.requests)
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        assert min(gaps) >= 0.04
+
+    def test_unreachable_host_fails(self, tmp_path):
+        """Test that connection errors end as 'failed' after retries"""
+        results = make_archiver(tmp_path, retries=1).run([('http://127.0.0.1:9/x', str(tmp_path / 'x.html'))])
+
+        assert results[0].status == 'failed'
+        assert not (tmp_path / 'x.html').exists()
@@ -0,0 +1,48 @@
+"""Unit tests for atomic_write.py"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from atomic_write import atomic_write_bytes, write_if_changed
+
+
+class TestAtomicWriteBytes:
+    """Tests for temp-file-and-rename writes"""
+
+    def test_creates_parent_directories(self, tmp_path):
+        """Test that missing directories are created and the bytes land in place"""
+        path = tmp_path / 'a' / 'b' / 'data.json'
+        atomic_write_bytes(path, b'{}')
+
+        assert path.read_bytes() == b'{}'
+        assert os.listdir(path.parent) == ['data.json']
+
+    def test_failed_write_keeps_old_file(self, tmp_path):
+        """Test that a failed rename leaves the old contents and no temp file"""
+        path = tmp_path / 'data.json'
+        path.write_bytes(b'old')
+
+        with patch('atomic_write.os.replace', side_effect=OSError('disk full')):
+            with pytest.raises(OSError):
+                atomic_write_bytes(path, b'new')
+
+        assert path.read_bytes() == b'old'
+        assert os.listdir(tmp_path) == ['data.json']
+
+
+class TestWriteIfChanged:
+    """Tests for skipping unchanged writes"""
+
+    def test_unchanged_file_not_rewritten(self, tmp_path):
+        """Test that identical bytes leave the file and its mtime alone"""
+        path = tmp_path / 'data.json'
+        assert write_if_changed(str(path), b'{"a":1}') is True
+        past = 1_000_000_000
+        os.utime(path, (past, past))
+
+        assert write_if_changed(str(path), b'{"a":1}') is False
+        assert path.stat().st_mtime == past
+        assert write_if_changed(str(path), b'{"a":2}') is True
+        assert path.read_bytes() == b'{"a":2}'
@@ -0,0 +1,71 @@
+"""Unit tests for bench_parse.py"""
+
+from bench_parse import compare, generate_series_page, run_benchmarks
+from parse_showtimes import parse_html, process_matches
+
+
+def make_report(throughput=100.0, peak=1000, films=10):
+    return {
+        'workload': {'films': films},
+        'stages': {'parse_stream': {'throughput': throughput, 'peak_bytes': peak, 'unit': 'MB/s'}},
+    }
+
+
+class TestGenerator:
+    """Tests for the synthetic series page"""
+
+    def test_page_is_deterministic(self):
+        """Test that the same arguments give the same page"""
+        assert generate_series_page(50, 4, 0.1, seed=3) == generate_series_page(50, 4, 0.1, seed=3)
+
+    def test_expected_counts_match_parser(self):
+        """Test that the stream parser finds every film and the expected rows"""
+        html, expected = generate_series_page(200, 6, 0.1)
+        matches = parse_html(html, 'stream')
+        rows, warnings = process_matches(matches, '2026-02-01T10:00:00', 'bench-series')
+
+        assert expected['malformed'] > 0
+        assert len(matches) == expected['films']
+        assert len(rows) == expected['showtimes']
+        assert sum('no ticket URL' in w for w in warnings) == expected['malformed']
+
+
+class TestCompare:
+    """Tests for regression detection"""
+
+    def test_within_thresholds(self):
+        """Test that small changes pass"""
+        assert compare(make_report(90.0, 1100), make_report(), 0.25, 0.25) == []
+
+    def test_throughput_drop(self):
+        """Test that a throughput drop beyond the threshold is reported"""
+        regressions = compare(make_report(50.0), make_report(), 0.25, 0.25)
+
+        assert len(regressions) == 1
+        assert 'parse_stream: throughput' in regressions[0]
+
+    def test_memory_growth(self):
+        """Test that peak memory growth beyond the threshold is reported"""
+        regressions = compare(make_report(peak=2000), make_report(), 0.25, 0.25)
+
+        assert len(regressions) == 1
+        assert 'peak memory' in regressions[0]
+
+    def test_workload_mismatch(self):
+        """Test that baselines from another workload are not compared"""
+        assert 'Workload differs' in compare(make_report(films=20), make_report(), 0.25, 0.25)[0]
+
+
+class TestRunBenchmarks:
+    """Smoke test for the full benchmark run"""
+
+    def test_small_run(self):
+        """Test that every stage reports time, throughput and peak memory"""
+        report = run_benchmarks(films=20, showtimes=2, malformed_rate=0.0, repeat=1)
+
+        assert report['workload']['rows'] == report['workload']['expected_rows'] == 40
+        assert set(report['stages']) == {'parse_regex', 'parse_stream', 'parse_stream_chunked', 'process', 'write'}
+        for result in report['stages'].values():
+            assert result['seconds'] > 0
+            assert result['throughput'] > 0
+            assert result['peak_bytes'] > 0
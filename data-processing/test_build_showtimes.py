@@ -0,0 +1,202 @@
+"""Unit tests for build_showtimes.py"""
+
+import json
+import pytest
+from datetime import date, datetime
+
+from build_showtimes import (
+    resolve_date,
+    parse_time_to_minutes,
+    load_film_metadata,
+    build_showtimes,
+    load_film_ids,
+    save_film_ids,
+    assign_film_ids,
+    register_films,
+    normalize_showtimes,
+    expand_normalized,
+)
+
+FILMS = {
+    'street-scene': {
+        'film_slug': 'street-scene',
+        'year': '1931',
+        'director': 'King Vidor',
+        'runtime': '80 minutes',
+        'poster_url': '/posters/street-scene.png',
+    },
+}
+
+
+def make_row(**overrides):
+    row = {
+        'Movie': 'STREET SCENE',
+        'Date': 'Friday, February 6',
+        'Time': '6:10',
+        'ticket_url': 'https://my.filmforum.org/events/street-scene',
+        'film_url': 'https://filmforum.org/film/street-scene-tenement-stories',
+        'film_slug': 'street-scene',
+        'ScrapedAt': '2026-02-01T10:00:00',
+    }
+    row.update(overrides)
+    return row
+
+
+class TestDateResolution:
+    """Tests for year-less date resolution"""
+
+    def test_same_year(self):
+        """Test that a date near the scrape resolves to the scrape year"""
+        assert resolve_date('Friday, February 6', datetime(2026, 2, 1)) == (date(2026, 2, 6), True)
+
+    def test_december_to_january_rollover(self):
+        """Test that January listings scraped in December land in the next year"""
+        assert resolve_date('Friday, January 1', datetime(2026, 12, 15)) == (date(2027, 1, 1), True)
+
+    def test_weekday_disambiguates_year(self):
+        """Test that the weekday picks the year when the date alone is ambiguous"""
+        # Wednesday, July 1 is 2026; 2025's July 1 is a Tuesday
+        assert resolve_date('Wednesday, July 1', datetime(2026, 1, 1)) == (date(2026, 7, 1), True)
+
+    def test_weekday_mismatch_is_flagged(self):
+        """Test that a weekday matching no nearby year is reported"""
+        resolved, matched = resolve_date('Monday, February 6', datetime(2026, 2, 1))
+
+        assert resolved == date(2026, 2, 6)
+        assert matched is False
+
+    def test_unparseable_date_raises(self):
+        """Test that garbage dates raise ValueError"""
+        with pytest.raises(ValueError):
+            resolve_date('TBA', datetime(2026, 2, 1))
+
+
+class TestTimeParsing:
+    """Tests for AM/PM inference matching the frontend"""
+
+    @pytest.mark.parametrize("time_str,expected", [
+        ('6:10', 18 * 60 + 10),
+        ('12:15', 12 * 60 + 15),
+        ('11:00 – FF Jr.', 11 * 60),
+        ('10:00 FF Jr', 10 * 60),
+        ('7:00 PM', 19 * 60),
+        ('11:30 AM', 11 * 60 + 30),
+    ])
+    def test_parse_time(self, time_str, expected):
+        """Test that listed times convert to minutes since midnight"""
+        assert parse_time_to_minutes(time_str) == expected
+
+
+class TestBuildShowtimes:
+    """Tests for the metadata join and JSON shape"""
+
+    def test_join_and_datetime(self):
+        """Test that rows get an ISO Datetime and their film's metadata"""
+        movies, warnings = build_showtimes([make_row()], FILMS)
+
+        assert warnings == []
+        assert movies[0]['Datetime'] == '2026-02-06T18:10:00'
+        assert movies[0]['director'] == 'King Vidor'
+        assert movies[0]['poster_url'] == '/posters/street-scene.png'
+
+    def test_missing_metadata_warns_once(self):
+        """Test that an unknown film is kept and warned about once"""
+        rows = [make_row(film_slug='unknown'), make_row(film_slug='unknown', Date='Saturday, February 7')]
+        movies, warnings = build_showtimes(rows, FILMS)
+
+        assert len(movies) == 2
+        assert len([w for w in warnings if 'No film metadata' in w]) == 1
+
+    def test_sorted_by_datetime(self):
+        """Test that output is sorted chronologically"""
+        rows = [make_row(Date='Saturday, February 7'), make_row(Time='1:00')]
+        movies, _ = build_showtimes(rows, FILMS)
+
+        assert [m['Datetime'] for m in movies] == ['2026-02-06T13:00:00', '2026-02-07T18:10:00']
+
+    def test_bad_time_skipped_with_warning(self):
+        """Test that rows with unparseable times are skipped"""
+        movies, warnings = build_showtimes([make_row(Time='TBA')], FILMS)
+
+        assert movies == []
+        assert any('Unrecognized time' in w for w in warnings)
+
+    def test_load_metadata_from_published_json(self, tmp_path):
+        """Test that a per-showtime JSON is indexed by slug derived from film_url"""
+        path = tmp_path / 'published.json'
+        path.write_text(json.dumps([
+            {'Movie': 'TAXI!', 'film_url': 'https://filmforum.org/film/taxi', 'year': '1932'},
+            {'Movie': 'TAXI!', 'film_url': 'https://filmforum.org/film/taxi', 'year': '1932'},
+        ]), encoding='utf-8')
+
+        films = load_film_metadata(str(path))
+
+        assert list(films) == ['taxi']
+        assert films['taxi']['year'] == '1932'
+
+
+class TestNormalizedOutput:
+    """Tests for the films/showtimes artifact and numeric film IDs"""
+
+    def test_ids_are_stable_across_scrapes(self, tmp_path):
+        """Test that known films keep their ID and new films append"""
+        ids_path = str(tmp_path / 'film-ids.json')
+        ids = load_film_ids(ids_path)
+        assign_film_ids(['https://ff.org/film/b', 'https://ff.org/film/a'], ids)
+        save_film_ids(ids, ids_path)
+
+        ids = load_film_ids(ids_path)
+        new = assign_film_ids(['https://ff.org/film/c', 'https://ff.org/film/a', 'https://ff.org/film/0'], ids)
+
+        assert ids['https://ff.org/film/a'] == 0
+        assert ids['https://ff.org/film/b'] == 1
+        assert new == ['https://ff.org/film/0', 'https://ff.org/film/c']
+        assert ids['https://ff.org/film/0'] == 2
+        assert ids['https://ff.org/film/c'] == 3
+
+    def test_film_keeps_id_when_url_appears(self):
+        """Test that a film registered by slug keeps its ID once its film_url is known"""
+        ids = {'https://ff.org/film/a': 0}
+        register_films([{'film_url': '', 'film_slug': 'b'}], ids)
+        new = register_films([{'film_url': 'https://ff.org/film/b', 'film_slug': 'b'},
+                              {'film_url': '', 'film_slug': 'b'},
+                              {'film_url': '', 'film_slug': 'c'}], ids)
+
+        assert ids == {'https://ff.org/film/a': 0, 'b': 1, 'https://ff.org/film/b': 1, 'c': 2}
+        assert new == ['c', 'https://ff.org/film/b']
+
+    def test_rows_without_url_share_the_url_id(self):
+        """Test that a new film whose rows only sometimes carry film_url gets one ID"""
+        ids = {}
+        movies = [{'film_url': '', 'film_slug': 'b'}, {'film_url': 'https://ff.org/film/b', 'film_slug': 'b'}]
+        register_films(movies, ids)
+
+        assert ids == {'https://ff.org/film/b': 0, 'b': 0}
+
+    def test_films_stored_once(self):
+        """Test that film fields are not repeated per showtime"""
+        movies, _ = build_showtimes([make_row(), make_row(Time='8:30')], FILMS)
+        ids = {}
+        assign_film_ids([m['film_url'] for m in movies], ids)
+
+        data = normalize_showtimes(movies, ids)
+
+        assert list(data['films']) == ['0']
+        assert data['films']['0']['director'] == 'King Vidor'
+        assert [row[0] for row in data['showtimes']['rows']] == [0, 0]
+        # Ticket URL matches the film default, so it is elided
+        assert all(row[3] is None for row in data['showtimes']['rows'])
+
+    def test_round_trip(self):
+        """Test that expanding the artifact restores every showtime"""
+        rows = [make_row(), make_row(Time='8:30', ticket_url='https://my.filmforum.org/events/other')]
+        movies, _ = build_showtimes(rows, FILMS)
+        ids = {}
+        assign_film_ids([m['film_url'] for m in movies], ids)
+
+        expanded = expand_normalized(normalize_showtimes(movies, ids))
+
+        for original, restored in zip(movies, expanded):
+            assert restored['numericId'] == 0
+            assert {k: v for k, v in restored.items() if k != 'numericId'} == \
+                {k: v for k, v in original.items() if k != 'Date'}
@@ -0,0 +1,80 @@
+"""Unit tests for columnar_showtimes.py"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from columnar_showtimes import decode_columnar, encode_columnar, serialize_columnar, write_columnar
+
+MOVIES = [
+    {'Movie': 'DEAD END', 'Time': '8:00', 'Datetime': '2026-03-08T20:00:00', 'runtime': '93 min',
+     'ticket_url': 'https://my.filmforum.org/events/dead-end'},
+    {'Movie': 'LONESOME', 'Time': '12:30', 'Datetime': '2026-03-07T12:30:00', 'runtime': '70 min',
+     'poster_url': '/posters/lonesome.png', 'ticket_url': 'https://my.filmforum.org/events/lonesome',
+     'poster_variants': [{'url': '/posters/lonesome-320w.webp', 'width': 320, 'height': 480}]},
+    {'Movie': 'LONESOME', 'Time': '2:10', 'Datetime': '2026-03-08T14:10:00', 'runtime': '70 min',
+     'poster_url': '/posters/lonesome.png', 'ticket_url': 'https://my.filmforum.org/events/lonesome',
+     'poster_variants': [{'url': '/posters/lonesome-320w.webp', 'width': 320, 'height': 480}]},
+]
+
+
+class TestEncode:
+    """Tests for the columnar encoding"""
+
+    def test_datetimes_are_delta_encoded(self):
+        """Test the base minute and minute deltas of sorted rows"""
+        data = encode_columnar(MOVIES, 'test')
+
+        assert data['count'] == 3
+        assert data['datetime'] == {'base': '2026-03-07T12:30', 'deltas': [1540, 350]}
+
+    def test_repeated_values_stored_once(self):
+        """Test dictionary encoding, including list values and absent fields"""
+        columns = encode_columnar(MOVIES, 'test')['columns']
+
+        assert columns['Movie'] == {'values': ['LONESOME', 'DEAD END'], 'codes': [0, 0, 1]}
+        assert columns['poster_url']['codes'] == [0, 0, -1]
+        assert len(columns['poster_variants']['values']) == 1
+
+    def test_rejects_seconds(self):
+        """Test that a Datetime with seconds cannot be minute-encoded"""
+        with pytest.raises(ValueError):
+            encode_columnar([dict(MOVIES[0], Datetime='2026-03-08T20:00:30')], 'test')
+
+
+class TestRoundTrip:
+    """Tests for decode_columnar"""
+
+    def test_round_trip(self):
+        """Test that decoding restores the sorted rows with their key order"""
+        decoded = decode_columnar(json.loads(serialize_columnar(MOVIES, 'test')))
+        expected = sorted(MOVIES, key=lambda m: m['Datetime'])
+
+        assert decoded == expected
+        assert [list(row) for row in decoded] == [list(row) for row in expected]
+
+    def test_dst_transition(self):
+        """Test that deltas across the DST change decode to the listed wall-clock times"""
+        movies = [dict(MOVIES[0], Datetime=dt) for dt in ('2026-03-08T01:30:00', '2026-03-08T03:30:00')]
+
+        assert [m['Datetime'] for m in decode_columnar(encode_columnar(movies, 'test'))] == [
+            '2026-03-08T01:30:00', '2026-03-08T03:30:00',
+        ]
+
+    def test_empty(self):
+        """Test an empty schedule"""
+        assert decode_columnar(encode_columnar([], 'test')) == []
+
+    def test_published_file_round_trips_and_shrinks(self, tmp_path):
+        """Test the committed series JSON round-trips and gets smaller"""
+        published = Path(__file__).parent.parent / 'public' / 'tenement-stories-full.json'
+        with open(published, 'r', encoding='utf-8') as f:
+            movies = json.load(f)
+        output = tmp_path / 'columnar.json'
+
+        assert write_columnar(movies, str(output), 'tenement-stories') is True
+        assert write_columnar(movies, str(output), 'tenement-stories') is False
+        assert decode_columnar(json.loads(output.read_text(encoding='utf-8'))) == movies
+        minified = json.dumps(movies, ensure_ascii=False, separators=(',', ':'))
+        assert output.stat().st_size < len(minified.encode('utf-8')) / 2
@@ -0,0 +1,130 @@
+"""Unit tests for day_views.py"""
+
+import json
+import random
+
+from day_views import assign_columns, build_day_view, build_day_views, runtime_minutes, write_day_views
+
+
+def movie(title, datetime, runtime='90 min', time=None):
+    return {
+        'Movie': title,
+        'Time': time or datetime[11:16].lstrip('0'),
+        'Datetime': datetime,
+        'runtime': runtime,
+        'film_slug': title.lower().replace(' ', '-'),
+        'ticket_url': f'https://tickets.example.com/{title}',
+    }
+
+
+def calendar_columns(intervals):
+    """Reference: assignOverlapColumns in src/utils/calendarTime.ts, line for line"""
+    order = sorted(range(len(intervals)), key=lambda i: intervals[i][0])
+    columns = [0] * len(intervals)
+    overlaps = [False] * len(intervals)
+    for i, index in enumerate(order):
+        for prev in order[:i]:
+            if intervals[prev][1] > intervals[index][0]:
+                columns[index] = 1
+                overlaps[prev] = True
+                overlaps[index] = True
+                break
+    return columns, overlaps
+
+
+class TestRuntime:
+    """Tests for runtime parsing"""
+
+    def test_formats(self):
+        """Test published runtime strings and fallbacks"""
+        assert runtime_minutes('92 min') == 92
+        assert runtime_minutes(105) == 105
+        assert runtime_minutes(None) == 90
+        assert runtime_minutes('TBA') == 90
+
+
+class TestAssignColumns:
+    """Tests for the interval sweep"""
+
+    def test_back_to_back_share_a_column(self):
+        """Test that a screening starting as another ends reuses its column"""
+        columns, overlaps = assign_columns([(600, 700), (700, 800)])
+
+        assert columns == [0, 0]
+        assert overlaps == [False, False]
+
+    def test_overlaps_use_two_columns(self):
+        """Test that three concurrent screenings get columns 0/1/1, as on the calendar"""
+        columns, overlaps = assign_columns([(600, 800), (650, 700), (660, 760), (900, 1000)])
+
+        assert columns == [0, 1, 1, 0]
+        assert overlaps == [True, True, True, False]
+
+    def test_later_screening_overlapping_column_one(self):
+        """Test that a screening overlapping only a column-1 screening also goes to column 1"""
+        columns, overlaps = assign_columns([(600, 700), (650, 800), (750, 850)])
+
+        assert columns == [0, 1, 1]
+        assert overlaps == [True, True, True]
+
+    def test_matches_calendar_reference(self):
+        """Test that columns and overlap flags match the calendar's loop, ties included"""
+        rng = random.Random(7)
+        for _ in range(200):
+            intervals = []
+            for _ in range(rng.randint(1, 40)):
+                start = rng.randrange(600, 1400, 15)
+                intervals.append((start, start + rng.choice([30, 60, 90, 120, 200])))
+            assert assign_columns(intervals) == calendar_columns(intervals)
+
+
+class TestDayViews:
+    """Tests for the per-day layout artifact"""
+
+    def test_day_view(self):
+        """Test range, columns, screenings and grouped films of one day"""
+        view = build_day_view([
+            movie('Taxi Driver', '2026-02-13T21:00:00', '113 min'),
+            movie('The Kid', '2026-02-13T11:00:00', '68 min', time='11:00 – FF Jr.'),
+            movie('Taxi Driver', '2026-02-13T18:30:00', '113 min'),
+            movie('Lonesome', '2026-02-13T19:00:00', '70 min'),
+        ])
+
+        assert (view['start'], view['end'], view['range']) == (660, 1373, 713)
+        assert view['columns'] == 2
+        assert [(s['Movie'], s['start'], s['col'], s['overlap']) for s in view['screenings']] == [
+            ('The Kid', 660, 0, False),
+            ('Taxi Driver', 1110, 0, True),
+            ('Lonesome', 1140, 1, True),
+            ('Taxi Driver', 1260, 0, False),
+        ]
+        assert [(f['Movie'], [s['time'] for s in f['showtimes']]) for f in view['films']] == [
+            ('The Kid', ['11:00 – FF Jr.']),
+            ('Taxi Driver', ['18:30', '21:00']),
+            ('Lonesome', ['19:00']),
+        ]
+
+    def test_days_are_grouped(self):
+        """Test that screenings are split by date"""
+        views = build_day_views([
+            movie('A', '2026-02-14T19:00:00'),
+            movie('B', '2026-02-13T19:00:00'),
+            movie('C', '2026-02-14T20:00:00'),
+        ], 'test')
+
+        assert (views['start'], views['end']) == ('2026-02-13', '2026-02-14')
+        assert list(views['days']) == ['2026-02-13', '2026-02-14']
+        assert views['days']['2026-02-14']['columns'] == 2
+
+    def test_empty_schedule(self):
+        """Test that an empty schedule yields no days"""
+        assert build_day_views([], 'test')['days'] == {}
+
+    def test_unchanged_file_not_rewritten(self, tmp_path):
+        """Test that identical output leaves the file untouched"""
+        output = tmp_path / 'days.json'
+        movies = [movie('A', '2026-02-14T19:00:00')]
+
+        assert write_day_views(movies, str(output), 'test') is True
+        assert write_day_views(movies, str(output), 'test') is False
+        assert json.loads(output.read_text())['days']['2026-02-14']['screenings'][0]['end'] == 19 * 60 + 90
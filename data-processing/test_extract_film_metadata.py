@@ -0,0 +1,214 @@
+"""Unit tests for extract_film_metadata.py"""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+import extract_film_metadata
+from extract_film_metadata import (
+    MetadataCache,
+    extract_all,
+    extract_film_metadata as extract,
+    parse_credits,
+    parse_description,
+    read_page_prefix,
+)
+
+PAGE = '''<html><head>
+<meta property="og:title" content="Film Forum · STREET SCENE" />
+<meta property="og:image" content="https://filmforum.org/uploads/STREET_SCENE.png" />
+<link rel="canonical" href="https://filmforum.org/film/street-scene-tenement-stories" />
+</head><body>
+<h2 class="main-title">STREET SCENE </h2>
+<div class="copy">
+  <p><strong>U.S., 1931<br />
+Directed by King Vidor<br />
+Starring Sylvia Sidney,&nbsp;Beulah Bondi<br />
+Approx. 80 min. 35mm.</strong><br />
+<br />
+&ldquo;A working-class apartment building.&rdquo; &ndash; <em>The New Yorker</em><br />
+<br />
+<em>35mm print courtesy of UCLA.</em></p>
+</div>
+{padding}
+</body></html>'''
+
+
+@pytest.fixture
+def page_dir(tmp_path):
+    (tmp_path / 'street-scene.html').write_text(PAGE.format(padding=''), encoding='utf-8')
+    (tmp_path / 'taxi.html').write_text(
+        PAGE.format(padding='').replace('STREET SCENE', 'TAXI!').replace('street-scene', 'taxi'),
+        encoding='utf-8',
+    )
+    return tmp_path
+
+
+class TestCreditsParsing:
+    """Tests for the bold credits block"""
+
+    def test_standard_credits(self):
+        """Test country/year, director, actors and runtime lines"""
+        fields = parse_credits('Italy/U.S., 1984<br />\nDirected by Sergio Leone<br />\n'
+                               'Starring Robert De Niro, James Woods &nbsp;<br />\nApprox. 229 min.&nbsp;')
+
+        assert fields == {
+            'country': 'Italy/U.S.',
+            'year': '1984',
+            'director': 'Sergio Leone',
+            'actors': 'Robert De Niro, James Woods',
+            'runtime': '229 min',
+        }
+
+    @pytest.mark.parametrize("line,director", [
+        ('Written and Directed by Preston Sturges', 'Preston Sturges'),
+        ('Directed, Written, and Produced by Charlie Chaplin', 'Charlie Chaplin'),
+        ('Directed by Robert Wise and&nbsp;Jerome Robbins', 'Robert Wise and Jerome Robbins'),
+    ])
+    def test_director_variants(self, line, director):
+        """Test the different ways pages credit the director"""
+        assert parse_credits(f'U.S., 1940<br />{line}')['director'] == director
+
+    def test_actor_and_runtime_variants(self):
+        """Test 'With'/'Featuring' cast lines and runtimes without a period"""
+        assert parse_credits('U.S., 1928<br />With Eleanor Boardman')['actors'] == 'Eleanor Boardman'
+        assert parse_credits('U.S., 1974<br />Featuring Catherine Scorsese')['actors'] == 'Catherine Scorsese'
+        assert parse_credits('U.S., 1984<br />Approx 98 min.')['runtime'] == '98 min'
+
+
+class TestExtraction:
+    """Tests for whole-page extraction"""
+
+    def test_record(self, page_dir):
+        """Test that a page yields a complete record"""
+        record = extract(str(page_dir / 'street-scene.html'))
+
+        assert record['film_slug'] == 'street-scene'
+        assert record['title'] == 'STREET SCENE'
+        assert record['film_url'] == 'https://filmforum.org/film/street-scene-tenement-stories'
+        assert record['og_image'] == 'https://filmforum.org/uploads/STREET_SCENE.png'
+        assert (record['year'], record['director'], record['runtime']) == ('1931', 'King Vidor', '80 min')
+        assert record['actors'] == 'Sylvia Sidney, Beulah Bondi'
+        assert record['description'] == ('“A working-class apartment building.” – The New Yorker\n\n'
+                                         '35mm print courtesy of UCLA.')
+
+    def test_credits_split_across_strong_blocks(self, tmp_path):
+        """Test that runtime in a second <strong> block is found, and that block opens the description"""
+        page = PAGE.format(padding='').replace(
+            'Starring Sylvia Sidney,&nbsp;Beulah Bondi<br />\nApprox. 80 min. 35mm.</strong>',
+            'Starring Sylvia Sidney</strong><br />\n<strong>WINNER Academy Award<br />\nApprox. 128 min.</strong>',
+        )
+        (tmp_path / 'a.html').write_text(page, encoding='utf-8')
+
+        record = extract(str(tmp_path / 'a.html'))
+
+        assert record['runtime'] == '128 min'
+        assert record['description'].startswith('WINNER Academy Award\n\nApprox. 128 min.\n\n“A working-class')
+
+    def test_stops_reading_after_credits(self, tmp_path, monkeypatch):
+        """Test that the trailing bulk of a page is never read"""
+        monkeypatch.setattr(extract_film_metadata, 'CHUNK_SIZE', 256)
+        path = tmp_path / 'big.html'
+        path.write_text(PAGE.format(padding='x' * 100000), encoding='utf-8')
+
+        prefix = read_page_prefix(str(path))
+
+        assert '</p>' in prefix
+        assert len(prefix) < 2000
+
+    def test_page_without_credits(self, tmp_path):
+        """Test that pages missing the credits block give empty fields"""
+        (tmp_path / 'odd.html').write_text('<html><head></head><body>nothing</body></html>')
+
+        record = extract(str(tmp_path / 'odd.html'))
+
+        assert record['film_slug'] == 'odd'
+        assert record['year'] == '' and record['description'] == ''
+
+
+class TestPublishedData:
+    """Tests against the cached pages and the published showtimes they fill"""
+
+    PAGES_DIR = Path(__file__).parent / 'movie-pages'
+    FULL_JSON = Path(__file__).parent.parent / 'public' / 'tenement-stories-full.json'
+
+    @pytest.mark.parametrize('slug', ['lonesome', 'the-naked-city', 'uncle-moses', 'heavy-traffic'])
+    def test_matches_published_record(self, slug):
+        """Test that real pages reproduce the published credits, runtime and full description"""
+        movies = json.loads(self.FULL_JSON.read_text(encoding='utf-8'))
+        published = next(m for m in movies if m['film_slug'] == slug)
+
+        record = extract(str(self.PAGES_DIR / f'{slug}.html'))
+
+        for field in ('country', 'year', 'director', 'actors', 'runtime', 'description'):
+            assert record[field] == published[field], field
+
+    def test_description_lines(self):
+        """Test that <br /> lines become paragraphs and &nbsp; inside a line is kept"""
+        description = parse_description('<br />\n<br />\nNew York,&nbsp;1928.<br />\n<br />\n'
+                                        '<em>Restoration courtesy MoMA</em> &nbsp;<br />\n&nbsp;')
+
+        assert description == 'New York,\xa01928.\n\nRestoration courtesy MoMA'
+
+
+class TestMetadataCache:
+    """Tests for per-file caching"""
+
+    def test_second_run_uses_cache(self, page_dir, tmp_path):
+        """Test that unchanged files are served from the cache"""
+        paths = sorted(str(p) for p in page_dir.glob('*.html'))
+        cache_path = str(tmp_path / 'cache.json')
+
+        cache = MetadataCache(cache_path)
+        first, stats = extract_all(paths, cache, workers=1)
+        cache.save()
+        assert stats['extracted'] == 2
+        assert [r['film_slug'] for r in first] == ['street-scene', 'taxi']
+
+        second, stats = extract_all(paths, MetadataCache(cache_path), workers=1)
+        assert (stats['cached'], stats['extracted']) == (2, 0)
+        assert second == first
+
+    def test_touched_but_unchanged_file_is_reused(self, page_dir, tmp_path):
+        """Test that a new mtime with identical bytes falls back to the hash"""
+        path = str(page_dir / 'taxi.html')
+        cache = MetadataCache(str(tmp_path / 'cache.json'))
+        extract_all([path], cache, workers=1)
+
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        record, hashed = cache.lookup(path)
+
+        assert record is not None
+        assert hashed is True
+
+    def test_changed_file_is_reextracted(self, page_dir, tmp_path):
+        """Test that edited pages miss the cache"""
+        path = page_dir / 'taxi.html'
+        cache = MetadataCache(str(tmp_path / 'cache.json'))
+        extract_all([str(path)], cache, workers=1)
+
+        path.write_text(path.read_text().replace('1931', '1932'), encoding='utf-8')
+        records, stats = extract_all([str(path)], cache, workers=1)
+
+        assert stats['extracted'] == 1
+        assert records[0]['year'] == '1932'
+
+    def test_version_change_invalidates(self, page_dir, tmp_path, monkeypatch):
+        """Test that bumping EXTRACTOR_VERSION discards cached records"""
+        cache_path = str(tmp_path / 'cache.json')
+        cache = MetadataCache(cache_path)
+        extract_all([str(page_dir / 'taxi.html')], cache, workers=1)
+        cache.save()
+
+        monkeypatch.setattr(extract_film_metadata, 'EXTRACTOR_VERSION', '999')
+
+        assert MetadataCache(cache_path).entries == {}
+
+    def test_process_pool_matches_inline(self, page_dir):
+        """Test that pooled extraction returns the same records in order"""
+        paths = sorted(str(p) for p in page_dir.glob('*.html'))
+
+        assert extract_all(paths, workers=2)[0] == extract_all(paths, workers=1)[0]
@@ -0,0 +1,269 @@
+"""Unit tests for fetch_omdb.py"""
+
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from fetch_omdb import (
+    OMDbClient,
+    QuotaExhausted,
+    ResponseCache,
+    collect_films,
+    enrich,
+    omdb_key,
+    to_entry,
+)
+
+STREET_SCENE = {
+    'Title': 'Street Scene',
+    'Year': '1931',
+    'imdbID': 'tt0022448',
+    'imdbRating': '7.2',
+    'Ratings': [
+        {'Source': 'Internet Movie Database', 'Value': '7.2/10'},
+        {'Source': 'Rotten Tomatoes', 'Value': '88%'},
+        {'Source': 'Metacritic', 'Value': '70/100'},
+    ],
+    'Plot': 'A symphony of life on a single street.',
+    'Response': 'True',
+}
+NOT_FOUND = {'Response': 'False', 'Error': 'Movie not found!'}
+
+
+class FakeOMDbHandler(BaseHTTPRequestHandler):
+    """Knows STREET SCENE (1931) and TAXI! (only without a year); can run out of quota."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        params = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+        with server.lock:
+            server.requests.append(params)
+            exhausted = len(server.requests) > server.quota
+        time.sleep(server.delay)
+
+        if params.get('apikey') != 'test-key':
+            self._send(401, {'Response': 'False', 'Error': 'Invalid API key!'})
+        elif exhausted:
+            self._send(401, {'Response': 'False', 'Error': 'Request limit reached!'})
+        elif params.get('t', '').lower() == 'street scene' and params.get('y') in (None, '1931'):
+            self._send(200, STREET_SCENE)
+        elif params.get('t', '').lower() == 'taxi!' and 'y' not in params:
+            self._send(200, dict(STREET_SCENE, Title='Taxi!', imdbID='tt0023563', Ratings=[]))
+        elif params.get('t', '').lower() == 'garbled':
+            self._send_raw(200, b'<html>Bad Gateway</html>')
+        elif params.get('t', '').lower() == 'truncated':
+            self._send_raw(200, json.dumps(STREET_SCENE).encode()[:40], length=400)
+        elif params.get('i') == 'tt0019769':
+            self._send(200, dict(STREET_SCENE, Title='The Crowd', imdbID='tt0019769'))
+        else:
+            self._send(200, NOT_FOUND)
+
+    def _send(self, status, data):
+        self._send_raw(status, json.dumps(data).encode())
+
+    def _send_raw(self, status, body, length=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body) if length is None else length))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def omdb_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeOMDbHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.quota = 1000
+    server.delay = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f'http://127.0.0.1:{server.server_address[1]}/'
+    server.shutdown()
+
+
+def make_client(base_url, cache=None, **kwargs):
+    return OMDbClient('test-key', cache or ResponseCache(None), base_url, rate=0, **kwargs)
+
+
+def make_movie(title, year, datetime_str):
+    return {'Movie': title, 'year': year, 'Datetime': datetime_str}
+
+
+class TestTransform:
+    """Tests for OMDb response mapping"""
+
+    def test_to_entry(self):
+        """Test that scores are extracted in the OMDbEntry shape"""
+        assert to_entry('STREET SCENE', '1931', STREET_SCENE) == {
+            'title': 'street scene',
+            'year': '1931',
+            'imdb_id': 'tt0022448',
+            'imdb_rating': '7.2',
+            'rotten_tomatoes': '88%',
+            'metacritic': '70',
+            'plot': 'A symphony of life on a single street.',
+        }
+
+    def test_missing_values_are_null(self):
+        """Test that N/A and absent ratings become None"""
+        entry = to_entry('X', '1900', {'imdbID': 'tt1', 'imdbRating': 'N/A', 'Ratings': [], 'Response': 'True'})
+
+        assert entry['imdb_rating'] is None
+        assert entry['rotten_tomatoes'] is None
+        assert entry['metacritic'] is None
+
+    def test_key_matches_ui_lookup(self):
+        """Test the title::year key format used by the UI"""
+        assert omdb_key('STREET SCENE', '1931') == 'street scene::1931'
+
+
+class TestCollectFilms:
+    """Tests for film deduplication and prioritization"""
+
+    def test_dedup_and_upcoming_first(self):
+        """Test that showtimes collapse per film and the soonest upcoming film leads"""
+        movies = [
+            make_movie('PAST FILM', '1950', '2026-01-01T12:00:00'),
+            make_movie('LATER', '1960', '2026-03-01T12:00:00'),
+            make_movie('SOON', '1970', '2026-02-10T12:00:00'),
+            make_movie('LATER', '1960', '2026-02-20T12:00:00'),
+        ]
+
+        films = collect_films(movies, datetime(2026, 2, 5))
+
+        assert [f['key'] for f in films] == ['soon::1970', 'later::1960', 'past film::1950']
+        assert films[1]['next_showtime'] == '2026-02-20T12:00:00'
+        assert films[2]['next_showtime'] is None
+
+
+class TestOMDbClient:
+    """Tests against a local fake OMDb server"""
+
+    def test_cache_prevents_requery(self, omdb_server, tmp_path):
+        """Test that fresh cached responses (found or not) are not requested again"""
+        server, base = omdb_server
+        cache_path = str(tmp_path / 'cache.json')
+        cache = ResponseCache(cache_path)
+        client = make_client(base, cache)
+        client.query({'t': 'STREET SCENE', 'y': '1931'})
+        client.query({'t': 'UNKNOWN', 'y': '1900'})
+        cache.save()
+
+        again = make_client(base, ResponseCache(cache_path))
+        assert again.query({'t': 'STREET SCENE', 'y': '1931'})['imdbID'] == 'tt0022448'
+        assert again.query({'t': 'UNKNOWN', 'y': '1900'})['Response'] == 'False'
+        assert len(server.requests) == 2
+
+    def test_negative_cache_expires_sooner(self, tmp_path):
+        """Test that misses use the shorter negative TTL"""
+        cache = ResponseCache(None, ttl_days=90, negative_ttl_days=1)
+        cache.put('found', STREET_SCENE)
+        cache.put('missing', NOT_FOUND)
+        in_two_days = time.time() + 2 * 86400
+
+        assert cache.get('found', now=in_two_days) is not None
+        assert cache.get('missing', now=in_two_days) is None
+
+    def test_concurrent_duplicates_coalesce(self, omdb_server):
+        """Test that simultaneous identical queries make one HTTP request"""
+        server, base = omdb_server
+        server.delay = 0.2
+        client = make_client(base)
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(client.query({'t': 'STREET SCENE', 'y': '1931'})))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(server.requests) == 1
+        assert client.coalesced == 4
+        assert len(results) == 5
+
+    def test_daily_quota_is_persisted(self, omdb_server, tmp_path):
+        """Test that requests count against the day across runs"""
+        _, base = omdb_server
+        cache = ResponseCache(str(tmp_path / 'cache.json'))
+        make_client(base, cache, daily_quota=2).query({'t': 'A'})
+        cache.save()
+
+        client = make_client(base, ResponseCache(str(tmp_path / 'cache.json')), daily_quota=2)
+        assert client.remaining() == 1
+        client.query({'t': 'B'})
+        with pytest.raises(QuotaExhausted):
+            client.query({'t': 'C'})
+
+    def test_server_side_quota_error(self, omdb_server):
+        """Test that OMDb's 'Request limit reached!' stops the run"""
+        server, base = omdb_server
+        server.quota = 0
+        client = make_client(base)
+
+        with pytest.raises(QuotaExhausted):
+            client.query({'t': 'STREET SCENE'})
+        assert client.remaining() == 0
+
+
+class TestEnrich:
+    """Tests for the scheduled enrichment run"""
+
+    def test_matching_strategy(self, omdb_server):
+        """Test title+year, title-only fallback, overrides and unmatched films"""
+        _, base = omdb_server
+        films = collect_films([
+            make_movie('STREET SCENE', '1931', '2026-02-06T18:10:00'),
+            make_movie('TAXI!', '1932', '2026-02-07T18:10:00'),
+            make_movie('THE CROWD', '1928', '2026-02-08T18:10:00'),
+            make_movie('NOBODY KNOWS', '1999', '2026-02-09T18:10:00'),
+        ], datetime(2026, 2, 1))
+
+        result = enrich(films, make_client(base), {}, {'the crowd::1928': 'tt0019769'}, workers=1)
+
+        assert result['matched'] == ['street scene::1931', 'taxi!::1932', 'the crowd::1928']
+        assert result['unmatched'] == ['nobody knows::1999']
+        assert result['data']['taxi!::1932']['imdb_id'] == 'tt0023563'
+        assert result['data']['the crowd::1928']['imdb_id'] == 'tt0019769'
+
+    def test_malformed_responses_fail_one_film(self, omdb_server):
+        """Test that non-JSON and truncated bodies count as failed lookups, not a crashed run"""
+        _, base = omdb_server
+        films = collect_films([
+            make_movie('GARBLED', '1950', '2026-02-06T18:10:00'),
+            make_movie('TRUNCATED', '1950', '2026-02-07T18:10:00'),
+            make_movie('STREET SCENE', '1931', '2026-02-08T18:10:00'),
+        ], datetime(2026, 2, 1))
+        cache = ResponseCache(None)
+
+        result = enrich(films, make_client(base, cache), {}, workers=2)
+
+        assert result['matched'] == ['street scene::1931']
+        assert sorted(result['failed']) == ['garbled::1950', 'truncated::1950']
+        assert 'Invalid JSON' in result['failed']['garbled::1950']
+        assert len(cache.responses) == 1
+
+    def test_budget_spent_on_upcoming_films_first(self, omdb_server):
+        """Test that a small budget resolves the soonest films and defers the rest"""
+        server, base = omdb_server
+        films = collect_films([
+            make_movie('OLD', '1900', '2026-01-01T12:00:00'),
+            make_movie('STREET SCENE', '1931', '2026-02-06T18:10:00'),
+        ], datetime(2026, 2, 1))
+        existing = {'old::1900': {'title': 'old', 'year': '1900'}}
+
+        result = enrich(films, make_client(base, max_requests=1), existing, workers=1)
+
+        assert result['matched'] == ['street scene::1931']
+        assert result['deferred'] == ['old::1900']
+        assert 'old::1900' in result['data']
+        assert [r['t'] for r in server.requests] == ['STREET SCENE']
@@ -0,0 +1,121 @@
+"""Unit tests for ics_feeds.py"""
+
+from datetime import datetime, timezone
+
+from ics_feeds import event_lines, event_uid, fold_line, write_feeds
+
+FIRST_RUN = datetime(2026, 2, 1, 12, 0, tzinfo=timezone.utc)
+SECOND_RUN = datetime(2026, 2, 2, 12, 0, tzinfo=timezone.utc)
+
+
+def movie(title, slug, datetime_str, **extra):
+    return {
+        'Movie': title,
+        'film_slug': slug,
+        'Datetime': datetime_str,
+        'Time': datetime_str[11:16],
+        'runtime': '70 min',
+        'ticket_url': f'https://my.filmforum.org/events/{slug}',
+        **extra,
+    }
+
+
+MOVIES = [
+    movie('LONESOME', 'lonesome', '2026-02-06T12:30:00', director='Paul Fejos', year='1928'),
+    movie('LONESOME', 'lonesome', '2026-02-07T18:00:00'),
+    movie('DEAD END', 'dead-end', '2026-02-07T20:00:00'),
+]
+
+
+def unfold(text):
+    return text.replace('\r\n ', '')
+
+
+def read(path):
+    # read_text() would translate the CRLF line endings
+    return path.read_bytes().decode('utf-8')
+
+
+class TestEvents:
+    """Tests for VEVENT content"""
+
+    def test_event_fields(self):
+        """Test UID, UTC times, escaping and the ticket URL"""
+        lines = event_lines(MOVIES[0], '20260201T120000Z')
+
+        assert 'UID:lonesome-20260206T1230@filmforum-calendar' in lines
+        # 12:30 in New York (EST) is 17:30 UTC; 70 minute runtime
+        assert 'DTSTART:20260206T173000Z' in lines
+        assert 'DTEND:20260206T184000Z' in lines
+        assert 'SUMMARY:Lonesome at Film Forum' in lines
+        assert 'LOCATION:Film Forum\\, 209 W Houston St\\, New York\\, NY 10014' in lines
+        assert 'DESCRIPTION:Director: Paul Fejos\\nYear: 1928' in lines
+        assert 'URL:https://my.filmforum.org/events/lonesome' in lines
+
+    def test_daylight_saving_time(self):
+        """Test that summer showtimes use the EDT offset"""
+        lines = event_lines(movie('X', 'x', '2026-07-01T19:00:00'), '20260201T120000Z')
+
+        assert 'DTSTART:20260701T230000Z' in lines
+
+    def test_uid_is_stable(self):
+        """Test that the UID only depends on the film and start time"""
+        changed = dict(MOVIES[0], ticket_url='https://elsewhere.example.com', runtime='99 min')
+
+        assert event_uid(changed) == event_uid(MOVIES[0])
+
+    def test_fold_long_lines(self):
+        """Test folding at 75 octets without splitting multi-byte characters"""
+        line = 'DESCRIPTION:' + '“quoted” ' * 30
+        folded = fold_line(line)
+
+        assert folded.endswith('\r\n')
+        assert all(len(part.encode('utf-8')) <= 75 for part in folded[:-2].split('\r\n'))
+        assert unfold(folded)[:-2] == line
+
+
+class TestWriteFeeds:
+    """Tests for the series/film/day feeds and incremental regeneration"""
+
+    def test_first_run_writes_everything(self, tmp_path):
+        """Test that every feed is written on the first run"""
+        result = write_feeds(MOVIES, str(tmp_path), 'test', now=FIRST_RUN)
+
+        assert sorted(result['written']) == [
+            'all.ics', 'days/2026-02-06.ics', 'days/2026-02-07.ics', 'films/dead-end.ics', 'films/lonesome.ics',
+        ]
+        all_feed = read(tmp_path / 'all.ics')
+        assert all_feed.startswith('BEGIN:VCALENDAR\r\nVERSION:2.0\r\n')
+        assert all_feed.count('BEGIN:VEVENT') == 3
+        assert read(tmp_path / 'days' / '2026-02-07.ics').count('BEGIN:VEVENT') == 2
+
+    def test_unchanged_run_writes_nothing(self, tmp_path):
+        """Test that a rerun with the same showtimes leaves every feed alone"""
+        write_feeds(MOVIES, str(tmp_path), 'test', now=FIRST_RUN)
+        result = write_feeds(MOVIES, str(tmp_path), 'test', now=SECOND_RUN)
+
+        assert result == {'written': [], 'removed': [], 'changed': []}
+
+    def test_only_changed_film_and_its_days(self, tmp_path):
+        """Test that a changed film rewrites its feed, its days and the series feed"""
+        write_feeds(MOVIES, str(tmp_path), 'test', now=FIRST_RUN)
+        moved = MOVIES[:2] + [movie('DEAD END', 'dead-end', '2026-02-08T20:00:00')]
+        result = write_feeds(moved, str(tmp_path), 'test', now=SECOND_RUN)
+
+        assert result['changed'] == ['dead-end']
+        assert sorted(result['written']) == [
+            'all.ics', 'days/2026-02-07.ics', 'days/2026-02-08.ics', 'films/dead-end.ics',
+        ]
+        # Unchanged films keep their DTSTAMP, so their events are byte-identical
+        all_feed = unfold(read(tmp_path / 'all.ics'))
+        assert all_feed.count('DTSTAMP:20260201T120000Z') == 2
+        assert all_feed.count('DTSTAMP:20260202T120000Z') == 1
+
+    def test_removed_film_and_empty_day(self, tmp_path):
+        """Test that feeds of films and days no longer listed are deleted"""
+        write_feeds(MOVIES, str(tmp_path), 'test', now=FIRST_RUN)
+        result = write_feeds(MOVIES[1:2], str(tmp_path), 'test', now=SECOND_RUN)
+
+        assert sorted(result['removed']) == ['days/2026-02-06.ics', 'films/dead-end.ics']
+        assert not (tmp_path / 'films' / 'dead-end.ics').exists()
+        assert read(tmp_path / 'films' / 'lonesome.ics').count('BEGIN:VEVENT') == 1
@@ -0,0 +1,130 @@
+"""Unit tests for itinerary.py"""
+
+import itertools
+import random
+
+import pytest
+
+from itinerary import (
+    Screening,
+    parse_weights,
+    plan_itinerary,
+    plan_repeated,
+    schedule,
+    select_screenings,
+    to_screening,
+)
+
+
+def screening(film, start, runtime=90):
+    return Screening(start, start + runtime, film, {})
+
+
+def brute_force(screenings, weights, buffer):
+    best = 0
+    for size in range(len(screenings) + 1):
+        for combo in itertools.combinations(screenings, size):
+            films = [s.film for s in combo]
+            if len(set(films)) < len(films):
+                continue
+            ordered = sorted(combo)
+            if all(b.start >= a.end + buffer for a, b in zip(ordered, ordered[1:])):
+                best = max(best, sum(weights.get(f, 1) for f in films))
+    return best
+
+
+class TestSchedule:
+    """Tests for plain weighted interval scheduling"""
+
+    def test_prefers_heavier_screening(self):
+        """Test that one heavy screening beats two light ones it overlaps"""
+        total, chosen = schedule([screening('a', 0), screening('b', 100), screening('c', 50, 200)],
+                                 {'c': 3}, buffer=0)
+
+        assert total == 3
+        assert [s.film for s in chosen] == ['c']
+
+    def test_buffer(self):
+        """Test that the travel buffer separates back-to-back screenings"""
+        back_to_back = [screening('a', 0), screening('b', 100)]
+
+        assert len(schedule(back_to_back, {}, buffer=10)[1]) == 2
+        assert len(schedule(back_to_back, {}, buffer=11)[1]) == 1
+
+
+class TestPlanItinerary:
+    """Tests for the once-per-film itinerary"""
+
+    def test_each_film_once(self):
+        """Test that a film with many screenings is only scheduled once"""
+        screenings = [screening('a', start) for start in (0, 200, 400, 600)] + [screening('b', 210)]
+        total, chosen = plan_itinerary(screenings, {}, buffer=15)
+
+        assert total == 2
+        assert sorted(s.film for s in chosen) == ['a', 'b']
+
+    def test_matches_brute_force(self):
+        """Test optimality against exhaustive search on small schedules"""
+        rng = random.Random(3)
+        for _ in range(150):
+            films = [f'f{i}' for i in range(rng.randint(2, 5))]
+            screenings = []
+            for film in films:
+                runtime = rng.choice([60, 90, 120])
+                for _ in range(rng.randint(1, 3)):
+                    screenings.append(screening(film, rng.randrange(0, 600, 10), runtime))
+            weights = {film: rng.choice([1, 2, 3]) for film in films}
+
+            total, chosen = plan_itinerary(screenings, weights, 15)
+
+            assert total == brute_force(screenings, weights, 15)
+            assert total == sum(weights[s.film] for s in chosen)
+            assert all(b.start >= a.end + 15 for a, b in zip(chosen, chosen[1:]))
+
+    def test_many_films_use_repeated_scheduling(self):
+        """Test the large-set fallback returns a valid once-per-film itinerary"""
+        rng = random.Random(5)
+        screenings = [screening(f'f{rng.randrange(40)}', rng.randrange(0, 30 * 1440, 5), 100)
+                      for _ in range(20000)]
+
+        total, chosen = plan_itinerary(screenings, {}, 15)
+
+        assert total == len(chosen) == 40
+        assert len({s.film for s in chosen}) == 40
+        assert all(b.start >= a.end + 15 for a, b in zip(chosen, chosen[1:]))
+        assert plan_repeated(screenings, {}, 15)[0] == total
+
+
+class TestSelectScreenings:
+    """Tests for matching wanted films in published JSON"""
+
+    MOVIES = [
+        {'Movie': 'LONESOME', 'film_slug': 'lonesome', 'Datetime': '2026-02-06T12:30:00', 'runtime': '70 min'},
+        {'Movie': 'DEAD END', 'film_slug': 'dead-end', 'Datetime': '2026-02-08T18:00:00', 'runtime': '93 min'},
+        {'Movie': 'DEAD END', 'film_slug': 'dead-end', 'Datetime': '2026-02-20T18:00:00'},
+    ]
+
+    def test_match_by_slug_or_title(self):
+        """Test slug and case-insensitive title matching, plus unknown films"""
+        screenings, requested, not_found = select_screenings(self.MOVIES, ['lonesome', 'Dead End', 'nope'])
+
+        assert len(screenings) == 3
+        assert requested == {'lonesome': 'lonesome', 'dead-end': 'Dead End'}
+        assert not_found == ['nope']
+
+    def test_date_window(self):
+        """Test that --from/--to limit the screenings"""
+        screenings, _, _ = select_screenings(self.MOVIES, ['dead-end'], '2026-02-10', '2026-02-28')
+
+        assert [s.movie['Datetime'] for s in screenings] == ['2026-02-20T18:00:00']
+
+    def test_runtime_and_fallback(self):
+        """Test end times from runtime and the 90-minute fallback"""
+        assert to_screening(self.MOVIES[1]).end - to_screening(self.MOVIES[1]).start == 93
+        assert to_screening(self.MOVIES[2]).end - to_screening(self.MOVIES[2]).start == 90
+
+    def test_parse_weights(self):
+        """Test NAME=WEIGHT parsing"""
+        assert parse_weights(['Dead-End=3', 'a=b=0.5']) == {'dead-end': 3.0, 'a=b': 0.5}
+        with pytest.raises(ValueError):
+            parse_weights(['dead-end'])
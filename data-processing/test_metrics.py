@@ -0,0 +1,155 @@
+"""Unit tests for metrics.py and the --metrics-out/--profile options"""
+
+import json
+import pstats
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from metrics import Metrics
+import parse_showtimes
+from parse_showtimes import classify_warning, process_matches
+
+PAGE_HTML = """
+<h3 class="title style-c"><a class="blue-type" href="https://filmforum.org/film/godfather-tenement-stories">The Godfather</a></h3>
+<div class="details">
+    <p>Monday, February 17<br />7:00<br />7:00<br />9:45</p>
+</div>
+<a class="button small blue" href="https://tickets.example.com/godfather">Buy Tickets</a>
+<h3 class="title style-c"><a class="blue-type" href="https://filmforum.org/film/taxi-driver-tenement-stories">Taxi Driver</a></h3>
+<div class="details">
+    <p>Tuesday, February 18<br />8:00</p>
+</div>
+<a class="button small blue" href="/relative">Buy Tickets</a>
+"""
+
+
+class TestMetrics:
+    """Tests for the Metrics recorder"""
+
+    def test_stages_accumulate(self):
+        """Test that a repeated stage adds up its time"""
+        metrics = Metrics('test')
+        with metrics.stage('parse'):
+            pass
+        first = metrics.stages['parse']
+        with metrics.stage('parse'):
+            sum(range(10000))
+
+        assert metrics.stages['parse'] > first
+
+    def test_stage_recorded_on_error(self):
+        """Test that a failing stage is still timed"""
+        metrics = Metrics('test')
+        with pytest.raises(ValueError):
+            with metrics.stage('read'):
+                raise ValueError('boom')
+
+        assert 'read' in metrics.stages
+
+    def test_counters_and_warnings(self):
+        """Test counters, gauges and warnings by type in the snapshot"""
+        metrics = Metrics('test')
+        metrics.count('rows', 3)
+        metrics.count('rows')
+        metrics.set('cache_hit', True)
+        metrics.warning('duplicate')
+        metrics.warning('duplicate')
+
+        record = metrics.to_dict()
+        assert record['script'] == 'test'
+        assert record['counters'] == {'rows': 4, 'cache_hit': True}
+        assert record['warnings'] == {'duplicate': 2}
+
+    def test_json_output_is_replaced(self, tmp_path):
+        """Test that a .json path holds only the latest run"""
+        path = tmp_path / 'metrics.json'
+        Metrics('first').write(str(path))
+        Metrics('second').write(str(path))
+
+        assert json.loads(path.read_text())['script'] == 'second'
+
+    def test_jsonl_output_appends(self, tmp_path):
+        """Test that a .jsonl path gets one line per run"""
+        path = tmp_path / 'history' / 'metrics.jsonl'
+        Metrics('first').write(str(path))
+        Metrics('second').write(str(path))
+
+        lines = path.read_text().splitlines()
+        assert [json.loads(line)['script'] for line in lines] == ['first', 'second']
+
+    def test_profile_only_the_chosen_stage(self, tmp_path):
+        """Test that the cProfile dump covers the profiled stage"""
+        path = tmp_path / 'parse.prof'
+        metrics = Metrics('test', 'parse', str(path))
+        with metrics.stage('read'):
+            pass
+        with metrics.stage('parse'):
+            sorted(range(1000), reverse=True)
+
+        summary = metrics.dump_profile()
+        assert 'sorted' in summary
+        assert pstats.Stats(str(path)).total_calls > 0
+
+    def test_no_profile_without_stage(self):
+        """Test that nothing is dumped when profiling is off"""
+        metrics = Metrics('test')
+        with metrics.stage('parse'):
+            pass
+
+        assert metrics.dump_profile() is None
+
+
+class TestWarningTypes:
+    """Tests for classifying validation warnings"""
+
+    def test_known_warnings(self):
+        """Test that process_matches warnings map to their types"""
+        _, warnings = process_matches(parse_showtimes.parse_html(PAGE_HTML), '2026-02-01T10:00:00')
+
+        assert [classify_warning(w) for w in warnings] == ['duplicate', 'invalid_ticket_url']
+
+    def test_unknown_warning(self):
+        """Test the fallback type"""
+        assert classify_warning('Something else') == 'other'
+
+
+class TestMetricsOut:
+    """Tests for parse_showtimes --metrics-out"""
+
+    def test_single_page_metrics(self, tmp_path):
+        """Test stage timings and counters of a single-page run"""
+        input_html = tmp_path / 'page.html'
+        input_html.write_text(PAGE_HTML, encoding='utf-8')
+        metrics_path = tmp_path / 'metrics.json'
+        argv = ['parse_showtimes.py', '--input', str(input_html), '--output', str(tmp_path / 'out.csv'),
+                '--no-cache', '--metrics-out', str(metrics_path)]
+
+        with patch.object(sys, 'argv', argv):
+            parse_showtimes.main()
+
+        record = json.loads(metrics_path.read_text())
+        assert set(record['stages']) == {'read', 'parse', 'process', 'write'}
+        assert record['counters']['matches'] == 2
+        assert record['counters']['rows'] == 2
+        assert record['counters']['films'] == 1
+        assert record['counters']['cache_hit'] is False
+        assert record['warnings'] == {'duplicate': 1, 'invalid_ticket_url': 1}
+
+    def test_batch_metrics(self, tmp_path):
+        """Test that batch runs aggregate worker stages and counts"""
+        for name in ('a-series', 'b-series'):
+            (tmp_path / f'{name}.html').write_text(PAGE_HTML, encoding='utf-8')
+        metrics_path = tmp_path / 'metrics.jsonl'
+        argv = ['parse_showtimes.py', '--glob', str(tmp_path / '*.html'), '--output', str(tmp_path / 'all.csv'),
+                '--workers', '1', '--no-cache', '--metrics-out', str(metrics_path)]
+
+        with patch.object(sys, 'argv', argv):
+            parse_showtimes.main()
+
+        record = json.loads(metrics_path.read_text())
+        assert {'batch', 'read', 'parse', 'process', 'write'} <= set(record['stages'])
+        assert record['counters']['series'] == 2
+        assert record['counters']['rows'] == 4
+        assert record['warnings']['duplicate'] == 2
@@ -0,0 +1,139 @@
+"""Unit tests for parse_cache.py"""
+
+import os
+import time
+from unittest.mock import patch
+
+from parse_cache import ParseCache
+from parse_showtimes import parse_and_process, PARSER_VERSION
+
+PAGE_HTML = """
+<h3 class="title style-c"><a class="blue-type" href="https://filmforum.org/film/taxi-tenement-stories">TAXI!</a></h3>
+<div class="details">
+    <p>Friday, February 6<br />2:10</p>
+</div>
+<a class="button small blue" href="https://my.filmforum.org/events/taxi">Buy Tickets</a>
+"""
+
+
+class TestCacheKey:
+    """Tests for cache key derivation"""
+
+    def test_key_is_stable(self):
+        """Test that identical inputs produce identical keys"""
+        assert ParseCache.make_key(PAGE_HTML, '1', 'regex', 's') == ParseCache.make_key(PAGE_HTML, '1', 'regex', 's')
+
+    def test_key_changes_with_content_version_mode_and_series(self):
+        """Test that every input that affects the output changes the key"""
+        base = ParseCache.make_key(PAGE_HTML, '1', 'regex', 's')
+
+        assert ParseCache.make_key(PAGE_HTML + ' ', '1', 'regex', 's') != base
+        assert ParseCache.make_key(PAGE_HTML, '2', 'regex', 's') != base
+        assert ParseCache.make_key(PAGE_HTML, '1', 'stream', 's') != base
+        assert ParseCache.make_key(PAGE_HTML, '1', 'regex', 't') != base
+
+
+class TestCacheStorage:
+    """Tests for get/put and eviction"""
+
+    def test_round_trip(self, tmp_path):
+        """Test that stored rows and warnings come back unchanged"""
+        cache = ParseCache(str(tmp_path))
+        cache.put('abc', [['TAXI!', 'Friday, February 6']], ['a warning'])
+
+        assert cache.get('abc') == ([['TAXI!', 'Friday, February 6']], ['a warning'])
+        assert cache.get('missing') is None
+
+    def test_max_entries_evicts_least_recently_used(self, tmp_path):
+        """Test that the oldest-used entries are dropped past max_entries"""
+        cache = ParseCache(str(tmp_path), max_entries=2)
+        cache.put('a', [], [])
+        cache.put('b', [], [])
+        past = time.time() - 100
+        os.utime(tmp_path / 'a.json', (past, past))
+        os.utime(tmp_path / 'b.json', (past + 1, past + 1))
+        cache.get('a')  # refresh a, leaving b as least recently used
+        cache.put('c', [], [])
+
+        assert cache.get('a') is not None
+        assert cache.get('b') is None
+        assert cache.get('c') is not None
+
+    def test_max_age_expires_entries(self, tmp_path):
+        """Test that entries older than max age are misses and removed"""
+        cache = ParseCache(str(tmp_path), max_age_days=1)
+        cache.put('old', [], [])
+        past = time.time() - 2 * 86400
+        os.utime(tmp_path / 'old.json', (past, past))
+
+        assert cache.get('old') is None
+        assert not (tmp_path / 'old.json').exists()
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        """Test that an unreadable entry does not crash the lookup"""
+        (tmp_path / 'bad.json').write_text('{not json', encoding='utf-8')
+
+        assert ParseCache(str(tmp_path)).get('bad') is None
+
+    def test_wrong_shape_is_a_miss(self, tmp_path):
+        """Test that valid JSON without rows/warnings lists is a miss, not a KeyError"""
+        cache = ParseCache(str(tmp_path))
+        for key, text in [('list', '[]'), ('no-rows', '{"warnings": []}'),
+                          ('flat', '{"rows": ["a"], "warnings": []}'), ('str', '{"rows": [], "warnings": "x"}')]:
+            (tmp_path / f'{key}.json').write_text(text, encoding='utf-8')
+            assert cache.get(key) is None
+
+    def test_entry_evicted_during_lookup_is_a_miss(self, tmp_path):
+        """Test that an entry removed by another process between read and touch is a miss"""
+        cache = ParseCache(str(tmp_path))
+        cache.put('gone', [], [])
+
+        with patch('parse_cache.os.utime', side_effect=FileNotFoundError):
+            assert cache.get('gone') is None
+
+    def test_unwritable_cache_warns(self, tmp_path, capsys):
+        """Test that a cache directory that cannot be created warns instead of raising"""
+        blocker = tmp_path / 'not-a-dir'
+        blocker.write_text('', encoding='utf-8')
+        cache = ParseCache(str(blocker / 'cache'))
+
+        assert cache.put('abc', [], []) is False
+        assert 'Could not write parse cache entry' in capsys.readouterr().err
+        rows, _, hit = parse_and_process(PAGE_HTML, '2026-02-01T00:00:00', cache=cache)
+        assert len(rows) == 1 and hit is False
+
+
+class TestParseAndProcess:
+    """Tests for cache integration in parse_showtimes"""
+
+    def test_hit_skips_parsing_and_restamps(self, tmp_path):
+        """Test that an unchanged page is served from cache with the new timestamp"""
+        cache = ParseCache(str(tmp_path))
+        rows, _, hit = parse_and_process(PAGE_HTML, '2026-02-01T00:00:00', 'tenement-stories', cache=cache)
+        assert hit is False
+
+        with patch('parse_showtimes.parse_html') as parse_mock:
+            cached_rows, warnings, hit = parse_and_process(PAGE_HTML, '2026-02-02T00:00:00', 'tenement-stories', cache=cache)
+
+        parse_mock.assert_not_called()
+        assert hit is True
+        assert warnings == []
+        assert [r[:-1] for r in cached_rows] == [r[:-1] for r in rows]
+        assert all(r[-1] == '2026-02-02T00:00:00' for r in cached_rows)
+
+    def test_changed_page_misses(self, tmp_path):
+        """Test that any content change re-parses"""
+        cache = ParseCache(str(tmp_path))
+        parse_and_process(PAGE_HTML, '2026-02-01T00:00:00', cache=cache)
+
+        _, _, hit = parse_and_process(PAGE_HTML.replace('2:10', '4:10'), '2026-02-01T00:00:00', cache=cache)
+
+        assert hit is False
+        assert len(list(tmp_path.glob('*.json'))) == 2
+
+    def test_no_cache_always_parses(self):
+        """Test that passing no cache disables lookups"""
+        _, _, hit = parse_and_process(PAGE_HTML, '2026-02-01T00:00:00', cache=None)
+
+        assert hit is False
+        assert PARSER_VERSION
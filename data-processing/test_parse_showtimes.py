@@ -8,9 +8,25 @@ from datetime import datetime
 from unittest.mock import patch, mock_open
 import sys
 import os
+import time
+import gzip
+import io
+import subprocess
+import tracemalloc
 
 # Import the actual production functions
-from parse_showtimes import parse_html, process_matches, write_csv
+from parse_showtimes import (
+    parse_html,
+    iter_parse_html,
+    process_matches,
+    write_csv,
+    run_batch,
+    collect_batch_jobs,
+    iter_input_chunks,
+    iter_regex_matches,
+    stream_showtimes,
+    BATCH_CSV_HEADER,
+)
 
 # Sample HTML fixtures for testing
 VALID_HTML = """
@@ -114,6 +130,230 @@ class TestHTMLParsing:
         assert rows[0][0] == "Film & Director"
 
 
+class TestStreamingParser:
+    """Tests for the single-pass tokenizer parse mode"""
+
+    @pytest.mark.parametrize("html", [
+        VALID_HTML,
+        MULTIPLE_MOVIES_HTML,
+        DUPLICATE_ENTRIES_HTML,
+        EMPTY_TITLE_HTML,
+        INVALID_URL_HTML,
+        HTML_ENTITIES_HTML,
+    ])
+    def test_matches_regex_on_fixtures(self, html):
+        """Test that stream mode returns the same records as the regex"""
+        assert parse_html(html, mode='stream') == parse_html(html)
+
+    def test_chunked_input_matches_whole_string(self):
+        """Test that feeding the page in small chunks gives identical results"""
+        chunks = [MULTIPLE_MOVIES_HTML[i:i + 7] for i in range(0, len(MULTIPLE_MOVIES_HTML), 7)]
+
+        assert list(iter_parse_html(chunks)) == parse_html(MULTIPLE_MOVIES_HTML, mode='stream')
+
+    def test_missing_ticket_link_does_not_swallow_next_film(self):
+        """Test that a film without Buy Tickets is closed by the next title"""
+        html = """
+<h3 class="title style-c"><a class="blue-type" href="https://filmforum.org/film/sold-out">Sold Out</a></h3>
+<div class="details">
+    <p>Monday, February 17<br />7:00</p>
+</div>
+""" + MULTIPLE_MOVIES_HTML
+        matches = parse_html(html, mode='stream')
+
+        assert [m[1] for m in matches] == ["Sold Out", "The Godfather", "Taxi Driver"]
+        assert matches[0][3] == ""
+        assert matches[1][3] == "https://tickets.example.com/godfather"
+
+        rows, warnings = process_matches(matches, datetime.now().isoformat())
+        assert any("Sold Out" in w and "no ticket URL" in w for w in warnings)
+
+    def test_title_with_inline_markup(self):
+        """Test that titles containing <em>/<br> are still picked up"""
+        html = """
+<h3 class="title style-c"><a class="blue-type" href="https://filmforum.org/film/double"><em>Orchard Street</em> <br>and <em>Loisaida</em></a></h3>
+<div class="details">
+    <p>Tuesday, February 17<br />6:00</p>
+</div>
+<a class="button small blue" href="https://tickets.example.com/double">Buy Tickets</a>
+"""
+        matches = parse_html(html, mode='stream')
+
+        assert len(matches) == 1
+        assert matches[0][1] == "Orchard Street and Loisaida"
+
+    def test_adversarial_input_finishes_in_bounded_time(self):
+        """Test that megabytes of ticketless film blocks parse in linear time"""
+        block = ('<h3 class="title style-c"><a class="blue-type" href="https://filmforum.org/film/x">X</a></h3>'
+                 '<div class="details"><p>Monday, February 17<br />7:00</p></div>' + ' ' * 100)
+        html = block * (4_000_000 // len(block))
+
+        start = time.perf_counter()
+        matches = parse_html(html, mode='stream')
+        elapsed = time.perf_counter() - start
+
+        assert len(matches) == html.count('title style-c')
+        assert elapsed < 15
+
+    @pytest.mark.parametrize("unit", ['<a', '</', '<!--', '<a x="', '<!', '<?', '<!['])
+    @pytest.mark.parametrize("chunked", [False, True])
+    def test_unterminated_markup_finishes_in_bounded_time(self, unit, chunked):
+        """Test that tags that never close do not make html.parser rescan its buffer"""
+        # '<a' * 40000 alone used to take over 10 s; 400 KB would not finish
+        html = VALID_HTML + unit * (400_000 // len(unit)) + VALID_HTML
+        source = [html[i:i + 65536] for i in range(0, len(html), 65536)] if chunked else html
+
+        start = time.perf_counter()
+        matches = list(iter_parse_html(source))
+        elapsed = time.perf_counter() - start
+
+        assert matches[0] == parse_html(VALID_HTML)[0]
+        assert elapsed < 5
+
+    def test_unterminated_tag_does_not_hide_later_films(self):
+        """Test that a stray '<' is treated as text and the following film still parses"""
+        html = '<p>Doors open <a</p><div <' + MULTIPLE_MOVIES_HTML
+
+        assert parse_html(html, mode='stream') == parse_html(MULTIPLE_MOVIES_HTML)
+
+    def test_markup_inside_attributes_and_comments(self):
+        """Test that '<' in quoted attributes is kept and commented-out films are skipped"""
+        html = ('<img alt="<em>Orchard Street</em> <br>and more">'
+                '<!-- <h3 class="title style-c"><a class="blue-type" href="#">Old</a></h3> -->'
+                + VALID_HTML)
+        chunks = [html[i:i + 5] for i in range(0, len(html), 5)]
+
+        assert list(iter_parse_html(chunks)) == parse_html(VALID_HTML)
+
+    def test_unknown_mode_raises(self):
+        """Test that an unknown parse mode is rejected"""
+        with pytest.raises(ValueError):
+            parse_html(VALID_HTML, mode='xpath')
+
+
+def synthetic_page(films, padding):
+    """A valid series page with the given number of film blocks and filler bytes per block"""
+    blocks = []
+    for i in range(films):
+        blocks.append(
+            f'<h3 class="title style-c"><a class="blue-type" href="https://filmforum.org/film/f{i % 50}">FILM {i % 50}</a></h3>'
+            f'<div class="details"><p>Monday, February {i % 28 + 1}<br />{i % 12 + 1}:{i % 60:02d}</p></div>'
+            f'<p>{"x" * padding}</p><a class="button small blue" href="https://t.example.com/f{i % 50}">Buy Tickets</a>\n'
+        )
+    return ''.join(blocks)
+
+
+# Valid films with duplicates across blocks, plus one film per validation warning
+MIXED_HTML = (DUPLICATE_ENTRIES_HTML + VALID_HTML).replace('href="#"', 'href="https://filmforum.org/film/godfather"') + \
+    EMPTY_TITLE_HTML + INVALID_URL_HTML + HTML_ENTITIES_HTML
+
+
+class TestStreamingMode:
+    """Tests for --stream: chunked input and the parse -> validate -> dedupe -> write chain"""
+
+    @pytest.mark.parametrize("html", [
+        MULTIPLE_MOVIES_HTML,
+        MIXED_HTML,
+        # A film without Buy Tickets: the regex match runs on into the next film's link
+        VALID_HTML.replace('Buy Tickets', 'Sold Out') + MULTIPLE_MOVIES_HTML,
+    ])
+    def test_chunked_regex_matches_whole_page(self, html):
+        """Test that the buffered regex scan finds exactly the matches of the whole-string regex"""
+        for size in (1, 7, 64, len(html)):
+            chunks = [html[i:i + size] for i in range(0, len(html), size)]
+            assert list(iter_regex_matches(chunks)) == parse_html(html)
+
+    def test_damaged_page_keeps_buffer_bounded(self):
+        """Test that films with no ticket link are given up at max_buffer instead of piling up"""
+        damaged = synthetic_page(2000, 100).replace('Buy Tickets', 'Sold Out')
+        page = synthetic_page(1, 10) + damaged + synthetic_page(3, 10)
+        chunks = (page[i:i + 1000] for i in range(0, len(page), 1000))
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        matches = iter_regex_matches(chunks, max_buffer=8000)
+        given_up = valid = 0
+        for match in matches:
+            if match[3]:
+                valid += 1
+            else:
+                given_up += 1
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        assert len(page) > 600000
+        # 8000 characters of buffer plus one chunk (4 bytes per character at worst)
+        assert peak < 4 * (8000 + 1000) + 20000
+        assert elapsed < 2
+        # The first film and the last three resolve; the damaged ones are reported as having no link
+        assert valid == 4
+        assert given_up > 1900
+
+    def test_input_sources_decode_like_open(self, tmp_path):
+        """Test that plain (mmap), gzip and empty inputs read as open(..., encoding='utf-8') would"""
+        text = MIXED_HTML.replace('\n', '\r\n') + 'Café — ü'
+        plain = tmp_path / 'page.html'
+        plain.write_bytes(text.encode('utf-8'))
+        packed = tmp_path / 'page.html.gz'
+        packed.write_bytes(gzip.compress(text.encode('utf-8')))
+        empty = tmp_path / 'empty.html'
+        empty.write_bytes(b'')
+        with open(plain, 'r', encoding='utf-8') as f:
+            expected = f.read()
+
+        assert ''.join(iter_input_chunks(str(plain), chunk_size=5)) == expected
+        assert ''.join(iter_input_chunks(str(packed), chunk_size=5)) == expected
+        assert list(iter_input_chunks(str(empty))) == []
+
+    @pytest.mark.parametrize("mode", ['regex', 'stream'])
+    def test_output_byte_identical(self, tmp_path, mode):
+        """Test that streamed CSV and warnings equal the buffered path's"""
+        timestamp = '2026-02-17T10:00:00'
+        rows, warnings = process_matches(parse_html(MIXED_HTML, mode), timestamp)
+        write_csv(rows, str(tmp_path / 'buffered.csv'))
+
+        streamed = []
+        with open(tmp_path / 'streamed.csv', 'w', newline='', encoding='utf-8') as f:
+            counts = stream_showtimes([MIXED_HTML], f, timestamp, mode=mode, warn=streamed.append)
+
+        assert (tmp_path / 'streamed.csv').read_bytes() == (tmp_path / 'buffered.csv').read_bytes()
+        assert streamed == warnings
+        assert counts['rows'] == len(rows)
+
+    def test_peak_memory_flat_in_input_size(self, tmp_path):
+        """Test that a page 8x larger does not raise peak memory noticeably"""
+        peaks = []
+        for padding in (1000, 8000):
+            path = tmp_path / f'page-{padding}.html'
+            path.write_text(synthetic_page(500, padding), encoding='utf-8')
+            tracemalloc.start()
+            with open(os.devnull, 'w', newline='') as out:
+                stream_showtimes(iter_input_chunks(str(path)), out, 'T')
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        assert peaks[1] < peaks[0] * 1.5
+        assert peaks[1] < path.stat().st_size / 4
+
+    def test_cli_stdin_to_stdout(self, tmp_path):
+        """Test --stream with '-' input and output, warnings written to a file"""
+        script = Path(__file__).parent / 'parse_showtimes.py'
+        warnings_path = tmp_path / 'warnings.txt'
+        completed = subprocess.run(
+            [sys.executable, str(script), '--stream', '--input', '-', '--output', '-',
+             '--warnings-out', str(warnings_path)],
+            input=MIXED_HTML.encode('utf-8'), capture_output=True, check=True,
+        )
+
+        lines = completed.stdout.decode('utf-8').splitlines()
+        assert lines[0] == 'Movie,Date,Time,ticket_url,film_url,film_slug,ScrapedAt'
+        # --stream defaults to the tokenizer
+        assert len(lines) == 1 + len(process_matches(parse_html(MIXED_HTML, 'stream'), 'T')[0])
+        assert 'Skipping duplicate' in warnings_path.read_text(encoding='utf-8')
+        assert 'Extracted' in completed.stderr.decode('utf-8')
+
+
 class TestValidation:
     """Tests for data validation logic"""
 
@@ -338,6 +578,69 @@ class TestFileHandling:
         assert matches == []
 
 
+SERIES_HTML = """
+<h3 class="title style-c"><a class="blue-type" href="https://filmforum.org/film/street-scene-{series}">Street Scene</a></h3>
+<div class="details">
+    <p>Friday, February 6<br />6:10<br />8:00</p>
+</div>
+<a class="button small blue" href="https://my.filmforum.org/events/street-scene">Buy Tickets</a>
+"""
+
+
+class TestBatchMode:
+    """Tests for multi-series batch parsing"""
+
+    def _write_series(self, directory, series):
+        path = directory / f"{series}.html"
+        path.write_text(SERIES_HTML.format(series=series), encoding='utf-8')
+        return str(path)
+
+    def test_batch_rows_carry_series(self, tmp_path):
+        """Test that each row ends with its series name, across worker processes"""
+        jobs = [(name, self._write_series(tmp_path, name)) for name in ('alpha', 'beta')]
+        results = run_batch(jobs, datetime.now().isoformat(), workers=2)
+
+        assert [r['series'] for r in results] == ['alpha', 'beta']
+        for result in results:
+            assert result['error'] is None
+            assert len(result['rows']) == 2
+            assert all(row[-1] == result['series'] for row in result['rows'])
+            # Slug is extracted using each row's own series suffix
+            assert all(row[5] == 'street-scene' for row in result['rows'])
+
+    def test_batch_missing_file_reported_per_series(self, tmp_path):
+        """Test that one unreadable page does not fail the other series"""
+        jobs = [
+            ('alpha', self._write_series(tmp_path, 'alpha')),
+            ('missing', str(tmp_path / 'missing.html')),
+        ]
+        results = run_batch(jobs, datetime.now().isoformat(), workers=1)
+
+        assert results[0]['error'] is None
+        assert 'not found' in results[1]['error']
+        assert results[1]['rows'] == []
+
+    def test_collect_jobs_from_glob(self, tmp_path):
+        """Test that globbed files use their stem as the series name"""
+        self._write_series(tmp_path, 'beta')
+        self._write_series(tmp_path, 'alpha')
+        jobs = collect_batch_jobs(pattern=str(tmp_path / '*.html'))
+
+        assert [series for series, _ in jobs] == ['alpha', 'beta']
+
+    def test_merged_csv_has_series_column(self, tmp_path):
+        """Test that the merged batch CSV includes the Series column"""
+        jobs = [(name, self._write_series(tmp_path, name)) for name in ('alpha', 'beta')]
+        results = run_batch(jobs, datetime.now().isoformat(), workers=1)
+        output = tmp_path / 'merged.csv'
+        write_csv([row for r in results for row in r['rows']], str(output), BATCH_CSV_HEADER)
+
+        with open(output, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            assert next(reader) == BATCH_CSV_HEADER
+            assert [row[-1] for row in reader] == ['alpha', 'alpha', 'beta', 'beta']
+
+
 class TestIntegration:
     """Integration tests for the complete parsing flow"""
 
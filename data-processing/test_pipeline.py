@@ -0,0 +1,215 @@
+"""Unit tests for pipeline.py"""
+
+import sys
+import threading
+
+import pytest
+
+from pipeline import PROJECT_ROOT, Pipeline, Stage, build_stages, hash_inputs, local_modules
+
+
+def copy_upper(src, dest):
+    """Build a callable action that upper-cases src into dest."""
+    def action(root):
+        action.calls += 1
+        (root / dest).write_text((root / src).read_text().upper())
+    action.calls = 0
+    return action
+
+
+def make_pipeline(tmp_path, stages, **kwargs):
+    return Pipeline(stages, root=tmp_path, state_path=str(tmp_path / 'state.json'), **kwargs)
+
+
+class TestHashInputs:
+    """Tests for input fingerprinting"""
+
+    def test_content_change_changes_hash(self, tmp_path):
+        """Test that editing an input changes the hash"""
+        (tmp_path / 'a.txt').write_text('one')
+        before = hash_inputs(tmp_path, ['a.txt'])
+        (tmp_path / 'a.txt').write_text('two')
+
+        assert hash_inputs(tmp_path, ['a.txt']) != before
+
+    def test_globs_and_missing_files(self, tmp_path):
+        """Test that globs pick up new files and missing inputs hash distinctly"""
+        (tmp_path / 'a.html').write_text('x')
+        before = hash_inputs(tmp_path, ['*.html'])
+        (tmp_path / 'b.html').write_text('y')
+
+        assert hash_inputs(tmp_path, ['*.html']) != before
+        assert hash_inputs(tmp_path, ['missing.txt']) != hash_inputs(tmp_path, [])
+
+
+class TestPipeline:
+    """Tests for incremental, parallel stage execution"""
+
+    def test_unchanged_inputs_are_skipped(self, tmp_path):
+        """Test that a second run with unchanged inputs skips every stage"""
+        (tmp_path / 'in.txt').write_text('hello')
+        first = copy_upper('in.txt', 'mid.txt')
+        second = copy_upper('mid.txt', 'out.txt')
+        stages = [
+            Stage('first', first, inputs=['in.txt'], outputs=['mid.txt']),
+            Stage('second', second, inputs=['mid.txt'], outputs=['out.txt'], deps=['first']),
+        ]
+
+        assert make_pipeline(tmp_path, stages).run() == {'first': 'ran', 'second': 'ran'}
+        assert make_pipeline(tmp_path, stages).run() == {'first': 'skipped', 'second': 'skipped'}
+        assert (tmp_path / 'out.txt').read_text() == 'HELLO'
+        assert (first.calls, second.calls) == (1, 1)
+
+    def test_changed_input_reruns_downstream(self, tmp_path):
+        """Test that editing an input reruns its stage and the stages fed by it"""
+        (tmp_path / 'in.txt').write_text('hello')
+        stages = [
+            Stage('first', copy_upper('in.txt', 'mid.txt'), inputs=['in.txt'], outputs=['mid.txt']),
+            Stage('second', copy_upper('mid.txt', 'out.txt'), inputs=['mid.txt'], outputs=['out.txt'], deps=['first']),
+        ]
+        make_pipeline(tmp_path, stages).run()
+
+        (tmp_path / 'in.txt').write_text('world')
+        assert make_pipeline(tmp_path, stages).run() == {'first': 'ran', 'second': 'ran'}
+        assert (tmp_path / 'out.txt').read_text() == 'WORLD'
+
+    def test_identical_intermediate_output_stops_propagation(self, tmp_path):
+        """Test that a stage rerun producing the same output does not rerun dependents"""
+        (tmp_path / 'in.txt').write_text('hello')
+        stages = [
+            Stage('first', copy_upper('in.txt', 'mid.txt'), inputs=['in.txt'], outputs=['mid.txt']),
+            Stage('second', copy_upper('mid.txt', 'out.txt'), inputs=['mid.txt'], outputs=['out.txt'], deps=['first']),
+        ]
+        make_pipeline(tmp_path, stages).run()
+
+        (tmp_path / 'in.txt').write_text('HELLO')
+        assert make_pipeline(tmp_path, stages).run() == {'first': 'ran', 'second': 'skipped'}
+
+    def test_missing_output_reruns(self, tmp_path):
+        """Test that a deleted output makes its stage stale"""
+        (tmp_path / 'in.txt').write_text('hello')
+        stages = [Stage('only', copy_upper('in.txt', 'out.txt'), inputs=['in.txt'], outputs=['out.txt'])]
+        make_pipeline(tmp_path, stages).run()
+
+        (tmp_path / 'out.txt').unlink()
+        assert make_pipeline(tmp_path, stages).run() == {'only': 'ran'}
+
+    def test_force_and_dry_run(self, tmp_path):
+        """Test that forced stages run and dry runs report without running"""
+        (tmp_path / 'in.txt').write_text('hello')
+        action = copy_upper('in.txt', 'out.txt')
+        stages = [Stage('only', action, inputs=['in.txt'], outputs=['out.txt'])]
+
+        assert make_pipeline(tmp_path, stages).run(dry_run=True) == {'only': 'stale'}
+        assert action.calls == 0
+        make_pipeline(tmp_path, stages).run()
+        assert make_pipeline(tmp_path, stages).run(dry_run=True) == {'only': 'fresh'}
+        assert make_pipeline(tmp_path, stages).run(force=['all']) == {'only': 'ran'}
+        assert action.calls == 2
+
+    def test_independent_stages_run_in_parallel(self, tmp_path):
+        """Test that stages without dependencies between them overlap"""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def rendezvous(name):
+            def action(root):
+                barrier.wait()
+                (root / name).write_text(name)
+            return action
+
+        stages = [
+            Stage('a', rendezvous('a.txt'), outputs=['a.txt']),
+            Stage('b', rendezvous('b.txt'), outputs=['b.txt']),
+        ]
+        assert make_pipeline(tmp_path, stages, jobs=2).run() == {'a': 'ran', 'b': 'ran'}
+
+    def test_failure_blocks_dependents(self, tmp_path):
+        """Test that a failing stage blocks its dependents but not unrelated stages"""
+        def boom(root):
+            raise RuntimeError('boom')
+
+        stages = [
+            Stage('bad', boom, outputs=['bad.txt']),
+            Stage('after', copy_upper('bad.txt', 'after.txt'), outputs=['after.txt'], deps=['bad']),
+            Stage('other', lambda root: (root / 'other.txt').write_text('ok'), outputs=['other.txt']),
+        ]
+        results = make_pipeline(tmp_path, stages).run()
+
+        assert results == {'bad': 'failed', 'after': 'blocked', 'other': 'ran'}
+
+    def test_subprocess_stage(self, tmp_path):
+        """Test that argv actions run from the pipeline root and nonzero exits fail"""
+        ok = Stage('ok', [sys.executable, '-c', "open('out.txt', 'w').write('ok')"], outputs=['out.txt'])
+        bad = Stage('bad', [sys.executable, '-c', 'import sys; sys.exit(3)'])
+        results = make_pipeline(tmp_path, [ok, bad]).run()
+
+        assert results == {'ok': 'ran', 'bad': 'failed'}
+        assert (tmp_path / 'out.txt').read_text() == 'ok'
+
+    def test_only_selects_dependencies(self, tmp_path):
+        """Test that --only runs the named stage and what it depends on"""
+        (tmp_path / 'in.txt').write_text('hello')
+        stages = [
+            Stage('first', copy_upper('in.txt', 'mid.txt'), inputs=['in.txt'], outputs=['mid.txt']),
+            Stage('second', copy_upper('mid.txt', 'out.txt'), inputs=['mid.txt'], outputs=['out.txt'], deps=['first']),
+            Stage('unrelated', copy_upper('in.txt', 'x.txt'), inputs=['in.txt'], outputs=['x.txt']),
+        ]
+
+        assert make_pipeline(tmp_path, stages).run(only=['second']) == {'first': 'ran', 'second': 'ran'}
+
+    def test_invalid_graphs_raise(self, tmp_path):
+        """Test that unknown dependencies and cycles are rejected"""
+        with pytest.raises(ValueError):
+            make_pipeline(tmp_path, [Stage('a', [], deps=['missing'])])
+        with pytest.raises(ValueError):
+            make_pipeline(tmp_path, [Stage('a', [], deps=['b']), Stage('b', [], deps=['a'])])
+
+
+class TestBuildStages:
+    """Tests for the default stage graph"""
+
+    def test_graph_shape(self):
+        """Test that posters is independent of parsing, publish joins both branches and compress follows publish"""
+        stages = {stage.name: stage for stage in build_stages('tenement-stories', 'meta.json')}
+
+        assert set(stages) == {'parse', 'enrich', 'posters', 'publish', 'compress'}
+        assert stages['posters'].deps == []
+        assert set(stages['publish'].deps) == {'enrich', 'posters'}
+        assert stages['compress'].deps == ['publish']
+
+    def test_ticket_statuses_republish(self):
+        """Test that new ticket statuses from the poller re-run publish (and so compress)"""
+        stages = {stage.name: stage for stage in build_stages('tenement-stories', 'meta.json')}
+
+        assert 'data-processing/.ticket-status.json' in stages['publish'].inputs
+
+    def test_stage_inputs_cover_imported_modules(self):
+        """Test that editing any local module a stage imports invalidates that stage"""
+        stages = {stage.name: stage for stage in build_stages('tenement-stories', 'meta.json')}
+
+        assert {'data-processing/poster_store.py', 'data-processing/atomic_write.py'} <= set(stages['posters'].inputs)
+        assert {'data-processing/atomic_write.py', 'data-processing/precompress.py',
+                'data-processing/search_index.py'} <= set(stages['publish'].inputs)
+        assert 'data-processing/parse_cache.py' in stages['parse'].inputs
+
+    def test_ticket_status_file_override(self, monkeypatch):
+        """Test that publish watches the status file TICKET_STATUS_FILE points at"""
+        import ticket_poller
+        monkeypatch.setattr(ticket_poller, 'STATUS_FILE', str(PROJECT_ROOT / 'state' / 'tickets.json'))
+        stages = {stage.name: stage for stage in build_stages('tenement-stories', 'meta.json')}
+
+        assert 'state/tickets.json' in stages['publish'].inputs
+
+    def test_fetch_is_optional(self):
+        """Test that --fetch adds an always-run fetch stage ahead of parse"""
+        stages = {stage.name: stage for stage in build_stages('tenement-stories', 'meta.json', fetch=True)}
+
+        assert stages['fetch'].always
+        assert stages['parse'].deps == ['fetch']
+
+    def test_metadata_stage_by_default(self):
+        """Test that without --metadata, enrich waits for the extracted metadata"""
+        stages = {stage.name: stage for stage in build_stages('tenement-stories')}
+
+        assert stages['metadata'].outputs == ['data-processing/build/film-metadata.jsonl']
+        assert set(stages['enrich'].deps) == {'parse', 'metadata'}
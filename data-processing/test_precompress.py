@@ -0,0 +1,123 @@
+"""Unit tests for precompress.py"""
+
+import gzip
+import json
+
+import pytest
+
+import precompress
+from precompress import compress_bytes, find_sources, format_report
+
+
+@pytest.fixture
+def public(tmp_path):
+    """A public/ directory with a large and a tiny JSON file and one shard"""
+    public_dir = tmp_path / 'public'
+    (public_dir / 'test-shards').mkdir(parents=True)
+    (public_dir / 'test-full.json').write_text(json.dumps([{'Movie': 'LONESOME', 'Time': '2:10'}] * 50))
+    (public_dir / 'temp.json').write_text('[]')
+    (public_dir / 'test-shards' / '2026-W06.json').write_text(json.dumps([{'Movie': 'DEAD END'}] * 40))
+    (public_dir / 'poster.png').write_bytes(b'\x89PNG' * 100)
+    return public_dir
+
+
+def run(public_dir, **kwargs):
+    """Run precompress inline with gzip only and a manifest next to public/"""
+    return precompress.precompress(str(public_dir), str(public_dir.parent / 'manifest.json'),
+                                   formats=['gz'], workers=1, **kwargs)
+
+
+class TestCompressBytes:
+    """Tests for compress_bytes"""
+
+    def test_gzip_is_reproducible(self):
+        """Test that gzip output has no timestamp and decompresses back"""
+        data = b'{"Movie": "LONESOME"}' * 20
+
+        assert compress_bytes(data, 'gz') == compress_bytes(data, 'gz')
+        assert gzip.decompress(compress_bytes(data, 'gz')) == data
+
+    def test_unknown_format(self):
+        """Test that an unknown format is rejected"""
+        with pytest.raises(ValueError):
+            compress_bytes(b'data', 'zst')
+
+
+class TestPrecompress:
+    """Tests for the incremental precompress run"""
+
+    def test_writes_siblings(self, public):
+        """Test that matched files get .gz siblings and tiny files are skipped"""
+        result = run(public)
+
+        assert find_sources(str(public)) == ['temp.json', 'test-full.json', 'test-shards/2026-W06.json']
+        full = public / 'test-full.json'
+        assert gzip.decompress((public / 'test-full.json.gz').read_bytes()) == full.read_bytes()
+        assert result['files']['test-full.json']['gz'] == (public / 'test-full.json.gz').stat().st_size
+        assert result['files']['temp.json']['gz'] is None
+        assert not (public / 'temp.json.gz').exists()
+        assert not (public / 'poster.png.gz').exists()
+
+    def test_only_changed_files_recompressed(self, public):
+        """Test that a second run compresses only the file that changed"""
+        run(public)
+        assert run(public)['compressed'] == []
+
+        (public / 'test-full.json').write_text(json.dumps([{'Movie': 'LONESOME', 'Time': '4:20'}] * 50))
+        result = run(public)
+
+        assert result['compressed'] == ['test-full.json']
+        assert b'4:20' in gzip.decompress((public / 'test-full.json.gz').read_bytes())
+
+    def test_missing_sibling_recompressed(self, public):
+        """Test that a deleted sibling is written again even though the source is unchanged"""
+        run(public)
+        (public / 'test-shards' / '2026-W06.json.gz').unlink()
+
+        assert run(public)['compressed'] == ['test-shards/2026-W06.json']
+        assert (public / 'test-shards' / '2026-W06.json.gz').exists()
+
+    def test_stale_siblings_removed(self, public):
+        """Test that siblings of deleted sources are removed"""
+        run(public)
+        (public / 'test-shards' / '2026-W06.json').unlink()
+        result = run(public)
+
+        assert result['removed'] == ['test-shards/2026-W06.json.gz']
+        assert not (public / 'test-shards' / '2026-W06.json.gz').exists()
+
+    def test_orphan_siblings_removed_without_manifest(self, public):
+        """Test that siblings left from an earlier checkout go even when the manifest is missing"""
+        run(public)
+        (public.parent / 'manifest.json').unlink()
+        (public / 'test-shards' / '2026-W06.json').unlink()
+        (public / 'test-shards' / '2026-W05.json.br').write_bytes(b'stale')
+        result = run(public)
+
+        assert result['removed'] == ['test-shards/2026-W05.json.br', 'test-shards/2026-W06.json.gz']
+        assert sorted(p.name for p in (public / 'test-shards').iterdir()) == []
+        assert (public / 'test-full.json.gz').exists()
+
+    def test_parallel_matches_inline(self, public, tmp_path):
+        """Test that the process pool writes the same siblings as an inline run"""
+        inline = run(public, force=True)['files']
+        parallel = precompress.precompress(str(public), str(tmp_path / 'parallel.json'), formats=['gz'],
+                                           workers=2, force=True)['files']
+
+        assert parallel == inline
+
+
+class TestFormatReport:
+    """Tests for format_report"""
+
+    def test_report_rows_and_total(self):
+        """Test per-file ratios and a total that counts skipped files at full size"""
+        lines = format_report({
+            'a.json': {'size': 1000, 'gz': 250},
+            'b.json': {'size': 100, 'gz': None},
+        }, ['gz'])
+
+        assert len(lines) == 4
+        assert '250 ( 25%)' in lines[1]
+        assert lines[2].rstrip().endswith('-')
+        assert lines[3].startswith('Total') and '350 ( 32%)' in lines[3]
@@ -0,0 +1,439 @@
+"""Unit tests for process_posters.py and poster_downloader.py"""
+
+import json
+import sys
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from poster_downloader import PosterDownloader
+from poster_variants import generate_variants, generate_all_variants
+from poster_store import PosterStore, content_hash
+import process_posters
+from process_posters import (
+    validate_poster_url,
+    extract_poster_urls,
+    download_posters,
+    store_posters,
+    add_poster_variants,
+    update_json_posters,
+)
+
+POSTER_BYTES = b'\x89PNG fake poster bytes'
+
+
+class FakePosterHandler(BaseHTTPRequestHandler):
+    """Serves /poster.png with an ETag, a flaky endpoint and a redirect."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, dict(self.headers)))
+            server.client_ports.add(self.client_address[1])
+
+        if self.path == '/flaky.png':
+            with server.lock:
+                server.flaky_calls += 1
+                fail = server.flaky_calls <= 2
+            if fail:
+                self._send(503, b'busy')
+                return
+        if self.path == '/old-location.png':
+            self.send_response(301)
+            self.send_header('Location', '/poster.png')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path == '/missing.png':
+            self._send(404, b'nope')
+            return
+
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self._send(200, POSTER_BYTES, {'ETag': '"v1"', 'Last-Modified': 'Sat, 14 Feb 2026 10:00:00 GMT'})
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def poster_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakePosterHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.client_ports = set()
+    server.flaky_calls = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+class TestPosterDownloader:
+    """Tests for concurrent conditional downloads against a local server"""
+
+    def test_download_then_not_modified(self, poster_server, tmp_path):
+        """Test that a second run sends If-None-Match and skips the write"""
+        server, base = poster_server
+        manifest = str(tmp_path / 'manifest.json')
+        dest = str(tmp_path / 'poster.png')
+
+        first = PosterDownloader(manifest).download_all([(f'{base}/poster.png', dest)])
+        second = PosterDownloader(manifest).download_all([(f'{base}/poster.png', dest)])
+
+        assert first[0].status == 'downloaded'
+        assert first[0].bytes == len(POSTER_BYTES)
+        assert second[0].status == 'not_modified'
+        assert server.requests[-1][1].get('If-None-Match') == '"v1"'
+        assert open(dest, 'rb').read() == POSTER_BYTES
+        assert json.load(open(manifest))[f'{base}/poster.png']['etag'] == '"v1"'
+
+    def test_missing_file_downloads_unconditionally(self, poster_server, tmp_path):
+        """Test that validators are not sent when the local file is gone"""
+        server, base = poster_server
+        manifest = str(tmp_path / 'manifest.json')
+        dest = tmp_path / 'poster.png'
+        PosterDownloader(manifest).download_all([(f'{base}/poster.png', str(dest))])
+        dest.unlink()
+
+        result = PosterDownloader(manifest).download_all([(f'{base}/poster.png', str(dest))])
+
+        assert result[0].status == 'downloaded'
+        assert 'If-None-Match' not in server.requests[-1][1]
+
+    def test_retries_transient_errors(self, poster_server, tmp_path):
+        """Test that 503s are retried with backoff until success"""
+        server, base = poster_server
+        downloader = PosterDownloader(retries=3, backoff=0.01)
+
+        result = downloader.download_all([(f'{base}/flaky.png', str(tmp_path / 'flaky.png'))])
+
+        assert result[0].status == 'downloaded'
+        assert server.flaky_calls == 3
+
+    def test_permanent_error_fails_without_writing(self, poster_server, tmp_path):
+        """Test that a 404 fails immediately and leaves no file behind"""
+        server, base = poster_server
+        dest = tmp_path / 'missing.png'
+
+        result = PosterDownloader(backoff=0.01).download_all([(f'{base}/missing.png', str(dest))])
+
+        assert result[0].status == 'failed'
+        assert 'HTTP 404' in result[0].error
+        assert not dest.exists()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_follows_redirects(self, poster_server, tmp_path):
+        """Test that a moved poster is followed to its new location"""
+        _, base = poster_server
+        dest = tmp_path / 'moved.png'
+
+        result = PosterDownloader().download_all([(f'{base}/old-location.png', str(dest))])
+
+        assert result[0].status == 'downloaded'
+        assert dest.read_bytes() == POSTER_BYTES
+
+    def test_connections_are_reused(self, poster_server, tmp_path):
+        """Test that one worker fetches many posters over a single connection"""
+        server, base = poster_server
+        jobs = [(f'{base}/poster.png', str(tmp_path / f'p{i}.png')) for i in range(5)]
+
+        results = PosterDownloader(workers=1).download_all(jobs)
+
+        assert all(r.status == 'downloaded' for r in results)
+        assert len(server.client_ports) == 1
+
+
+class TestProcessPosters:
+    """Tests for the extract/download/update stages"""
+
+    def test_extract_download_and_update(self, poster_server, tmp_path):
+        """Test the full flow from cached film page to updated JSON"""
+        _, base = poster_server
+        html_dir = tmp_path / 'pages'
+        html_dir.mkdir()
+        (html_dir / 'taxi.html').write_text(
+            f'<link rel="canonical" href="https://filmforum.org/film/taxi" />'
+            f'<meta property="og:image" content="{base}/poster.png" />',
+            encoding='utf-8',
+        )
+        json_file = tmp_path / 'movies.json'
+        json_file.write_text(json.dumps([{'Movie': 'TAXI!', 'film_url': 'https://filmforum.org/film/taxi'}]))
+
+        film_to_poster = extract_poster_urls(str(html_dir))
+        counts = download_posters(film_to_poster, str(tmp_path / 'posters'), PosterDownloader())
+        updated = update_json_posters(str(json_file), film_to_poster)
+
+        assert counts['downloaded'] == 1
+        assert updated == 1
+        assert json.loads(json_file.read_text())[0]['poster_url'] == '/posters/taxi.png'
+
+    def test_failed_download_keeps_existing_poster(self, poster_server, tmp_path):
+        """Test that a failed fetch of a poster already on disk keeps it as stale"""
+        _, base = poster_server
+        posters = tmp_path / 'posters'
+        posters.mkdir()
+        (posters / 'taxi.png').write_bytes(b'earlier artwork')
+        film_to_poster = {
+            'https://filmforum.org/film/taxi': {'poster_url': f'{base}/missing.png', 'slug': 'taxi'},
+            'https://filmforum.org/film/dead-end': {'poster_url': f'{base}/missing.png', 'slug': 'dead-end'},
+        }
+
+        counts = download_posters(film_to_poster, str(posters), PosterDownloader(backoff=0.01))
+
+        assert (counts['stale'], counts['failed']) == (1, 1)
+        assert film_to_poster['https://filmforum.org/film/taxi']['local_path'] == '/posters/taxi.png'
+        assert 'local_path' not in film_to_poster['https://filmforum.org/film/dead-end']
+        assert (posters / 'taxi.png').read_bytes() == b'earlier artwork'
+
+    @pytest.mark.parametrize("url", [
+        'https://evil.example.com/x.png',
+        '//evil.example.com/x.png',
+        '/posters/../secrets.png',
+        '/images/x.png',
+        '/posters/"onload.png',
+    ])
+    def test_validate_poster_url_rejects_unsafe(self, url):
+        """Test that unsafe poster paths are rejected"""
+        with pytest.raises(ValueError):
+            validate_poster_url(url, 'Movie')
+
+    def test_validate_poster_url_accepts_local_path(self):
+        """Test that a plain /posters/ path passes"""
+        validate_poster_url('/posters/taxi.png', 'TAXI!')
+
+    def test_metrics_out(self, poster_server, tmp_path, monkeypatch):
+        """Test that main records stage timings and download volume"""
+        _, base = poster_server
+        html_dir = tmp_path / 'pages'
+        html_dir.mkdir()
+        (html_dir / 'taxi.html').write_text(
+            f'<link rel="canonical" href="https://filmforum.org/film/taxi" />'
+            f'<meta property="og:image" content="{base}/poster.png" />',
+            encoding='utf-8',
+        )
+        json_file = tmp_path / 'movies.json'
+        json_file.write_text(json.dumps([{'Movie': 'TAXI!', 'film_url': 'https://filmforum.org/film/taxi'}]))
+        monkeypatch.setattr(process_posters, 'HTML_DIR', str(html_dir))
+        monkeypatch.setattr(process_posters, 'POSTERS_DIR', str(tmp_path / 'posters'))
+        monkeypatch.setattr(process_posters, 'JSON_FILE', str(json_file))
+        monkeypatch.setattr(process_posters, 'DOWNLOAD_MANIFEST', str(tmp_path / 'downloads.json'))
+        metrics_path = tmp_path / 'metrics.json'
+        monkeypatch.setattr(sys, 'argv', ['process_posters.py', '--no-variants', '--metrics-out', str(metrics_path)])
+
+        process_posters.main()
+
+        record = json.loads(metrics_path.read_text())
+        assert set(record['stages']) == {'extract', 'download', 'update_json'}
+        assert record['counters']['downloaded'] == 1
+        assert record['counters']['bytes_downloaded'] == len(POSTER_BYTES)
+        assert record['counters']['json_entries_updated'] == 1
+
+
+    def test_missing_posters_fail_before_writing(self, poster_server, tmp_path, monkeypatch):
+        """Test that posters with no download and no local copy exit 1 and leave the map unwritten"""
+        _, base = poster_server
+        html_dir = tmp_path / 'pages'
+        html_dir.mkdir()
+        (html_dir / 'taxi.html').write_text(
+            f'<link rel="canonical" href="https://filmforum.org/film/taxi" />'
+            f'<meta property="og:image" content="{base}/missing.png" />',
+            encoding='utf-8',
+        )
+        monkeypatch.setattr(process_posters, 'HTML_DIR', str(html_dir))
+        monkeypatch.setattr(process_posters, 'POSTERS_DIR', str(tmp_path / 'posters'))
+        monkeypatch.setattr(process_posters, 'DOWNLOAD_MANIFEST', str(tmp_path / 'downloads.json'))
+        map_path = tmp_path / 'poster-map.json'
+        argv = ['process_posters.py', '--no-variants', '--no-json-update', '--map-out', str(map_path)]
+        monkeypatch.setattr(sys, 'argv', argv)
+
+        with pytest.raises(SystemExit) as excinfo:
+            process_posters.main()
+        assert excinfo.value.code == 1
+        assert not map_path.exists()
+
+        monkeypatch.setattr(sys, 'argv', argv + ['--max-missing', '1'])
+        process_posters.main()
+        assert json.loads(map_path.read_text())['https://filmforum.org/film/taxi']['slug'] == 'taxi'
+
+
+class TestPosterVariants:
+    """Tests for responsive WebP variants and placeholders"""
+
+    @pytest.fixture
+    def poster_file(self, tmp_path):
+        Image = pytest.importorskip('PIL.Image')
+        path = tmp_path / 'taxi.png'
+        Image.new('RGB', (800, 600), (200, 30, 40)).save(path)
+        return path
+
+    def test_variants_written_without_upscaling(self, poster_file):
+        """Test that widths above the original collapse to the original width"""
+        result = generate_variants(str(poster_file))
+
+        assert [v['width'] for v in result['variants']] == [320, 640, 800]
+        assert result['variants'][0] == {'url': '/posters/taxi-320w.webp', 'width': 320, 'height': 240}
+        for variant in result['variants']:
+            assert (poster_file.parent / variant['url'].split('/')[-1]).exists()
+
+    def test_placeholder_and_color(self, poster_file):
+        """Test that the LQIP is a small data URI and the color matches the fill"""
+        result = generate_variants(str(poster_file))
+
+        assert result['lqip'].startswith('data:image/webp;base64,')
+        assert len(result['lqip']) < 1000
+        assert result['color'] == '#c81e28'
+
+    def test_up_to_date_variants_are_not_rewritten(self, poster_file):
+        """Test that a second run leaves existing variants untouched"""
+        generate_variants(str(poster_file))
+        variant = poster_file.parent / 'taxi-320w.webp'
+        before = variant.stat().st_mtime_ns
+
+        generate_variants(str(poster_file))
+
+        assert variant.stat().st_mtime_ns == before
+
+    def test_unreadable_poster_reports_error(self, tmp_path):
+        """Test that a corrupt download is reported, not raised"""
+        pytest.importorskip('PIL')
+        bad = tmp_path / 'bad.png'
+        bad.write_bytes(b'not an image')
+
+        [(result, error)] = generate_all_variants([str(bad)], workers=1)
+
+        assert result is None
+        assert error
+
+    def test_variants_recorded_in_json(self, poster_file, tmp_path):
+        """Test that variant metadata lands next to poster_url"""
+        film_url = 'https://filmforum.org/film/taxi'
+        film_to_poster = {film_url: {'slug': 'taxi', 'filename': 'taxi.png', 'local_path': '/posters/taxi.png'}}
+        json_file = tmp_path / 'movies.json'
+        json_file.write_text(json.dumps([{'Movie': 'TAXI!', 'film_url': film_url}]))
+
+        assert add_poster_variants(film_to_poster, str(poster_file.parent), workers=1) == 1
+        update_json_posters(str(json_file), film_to_poster)
+
+        movie = json.loads(json_file.read_text())[0]
+        assert movie['poster_url'] == '/posters/taxi.png'
+        assert [v['width'] for v in movie['poster_variants']] == [320, 640, 800]
+        assert movie['poster_color'] == '#c81e28'
+        assert movie['poster_lqip'].startswith('data:image/webp')
+
+
+class TestPosterStore:
+    """Tests for content-addressed poster storage"""
+
+    def _stage(self, directory, name, data):
+        directory.mkdir(exist_ok=True)
+        path = directory / name
+        path.write_bytes(data)
+        return str(path)
+
+    def test_identical_posters_stored_once(self, tmp_path):
+        """Test that byte-identical artwork for two films shares one file"""
+        staging = tmp_path / 'staging'
+        store = PosterStore(str(tmp_path / 'posters'))
+
+        a = store.put('taxi', self._stage(staging, 'taxi.png', POSTER_BYTES))
+        b = store.put('taxi-driver', self._stage(staging, 'taxi-driver.png', POSTER_BYTES))
+
+        assert a == b == f"{content_hash(str(staging / 'taxi.png'))}.png"
+        assert [p.name for p in (tmp_path / 'posters').iterdir()] == [a]
+
+    def test_existing_hash_is_not_rewritten(self, tmp_path):
+        """Test that re-runs only write new bytes"""
+        staging = tmp_path / 'staging'
+        store = PosterStore(str(tmp_path / 'posters'))
+        filename = store.put('taxi', self._stage(staging, 'taxi.png', POSTER_BYTES))
+        stored = tmp_path / 'posters' / filename
+        before = stored.stat().st_mtime_ns
+
+        store.put('taxi', self._stage(staging, 'taxi.png', POSTER_BYTES))
+
+        assert stored.stat().st_mtime_ns == before
+
+    def test_gc_removes_unreferenced_files_and_variants(self, tmp_path):
+        """Test that replaced posters and their variants are collected"""
+        staging = tmp_path / 'staging'
+        posters = tmp_path / 'posters'
+        store = PosterStore(str(posters))
+        old = store.put('taxi', self._stage(staging, 'taxi.png', b'old artwork'))
+        (posters / old.replace('.png', '-320w.webp')).write_bytes(b'variant')
+        (posters / 'legacy-slug.png').write_bytes(b'legacy')
+        new = store.put('taxi', self._stage(staging, 'taxi.png', b'new artwork'))
+        store.save()
+
+        removed = store.gc()
+
+        assert sorted(removed) == sorted([old, old.replace('.png', '-320w.webp')])
+        assert sorted(p.name for p in posters.iterdir()) == sorted(['legacy-slug.png', 'manifest.json', new])
+
+    def test_removed_film_is_pruned_and_collected(self, tmp_path):
+        """Test that a film that left the schedule loses its manifest entry, poster and variants"""
+        staging = tmp_path / 'staging'
+        posters = tmp_path / 'posters'
+        self._stage(staging, 'taxi.png', POSTER_BYTES)
+        self._stage(staging, 'dead-end.png', b'dead end artwork')
+
+        def poster_map(*slugs):
+            return {f'https://filmforum.org/film/{slug}': {
+                'slug': slug, 'filename': f'{slug}.png', 'local_path': f'/posters/{slug}.png'} for slug in slugs}
+
+        store = PosterStore(str(posters))
+        store_posters(poster_map('taxi', 'dead-end'), str(staging), store)
+        dead_end = store.manifest['dead-end']
+        (posters / dead_end.replace('.png', '-320w.webp')).write_bytes(b'variant')
+
+        store = PosterStore(str(posters))
+        store_posters(poster_map('taxi'), str(staging), store)
+        removed = store.gc()
+
+        assert PosterStore(str(posters)).manifest == {'taxi': store.manifest['taxi']}
+        assert sorted(removed) == sorted([dead_end, dead_end.replace('.png', '-320w.webp')])
+        assert sorted(p.name for p in posters.iterdir()) == sorted(['manifest.json', store.manifest['taxi']])
+
+    def test_manifest_persists(self, tmp_path):
+        """Test that the slug manifest survives a reload"""
+        store = PosterStore(str(tmp_path / 'posters'))
+        filename = store.put('taxi', self._stage(tmp_path / 'staging', 'taxi.png', POSTER_BYTES))
+        store.save()
+
+        assert PosterStore(str(tmp_path / 'posters')).manifest == {'taxi': filename}
+
+    def test_store_posters_rewrites_local_paths(self, tmp_path):
+        """Test that films point at hash-named, validated paths"""
+        staging = tmp_path / 'staging'
+        self._stage(staging, 'taxi.png', POSTER_BYTES)
+        film_to_poster = {'https://filmforum.org/film/taxi': {
+            'slug': 'taxi', 'filename': 'taxi.png', 'local_path': '/posters/taxi.png'}}
+        store = PosterStore(str(tmp_path / 'posters'))
+
+        assert store_posters(film_to_poster, str(staging), store) == 1
+
+        data = film_to_poster['https://filmforum.org/film/taxi']
+        assert data['local_path'] == f"/posters/{store.manifest['taxi']}"
+        assert (tmp_path / 'posters' / 'manifest.json').exists()
+
+    def test_store_posters_rejects_bad_manifest_entry(self, tmp_path):
+        """Test that a tampered manifest fails validation"""
+        store = PosterStore(str(tmp_path / 'posters'))
+        store.manifest['evil'] = '../../etc/passwd'
+
+        with pytest.raises(ValueError):
+            store_posters({'https://filmforum.org/film/evil': {'slug': 'evil'}}, str(tmp_path), store)
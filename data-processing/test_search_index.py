@@ -0,0 +1,127 @@
+"""Unit tests for search_index.py"""
+
+import json
+
+from search_index import (
+    build_search_index, normalize_text, search, tokenize, trigrams, write_search_index,
+)
+
+LONESOME = {
+    'Movie': 'LONESOME', 'Datetime': '2026-03-07T12:30:00', 'film_slug': 'lonesome',
+    'film_url': 'https://filmforum.org/film/lonesome', 'director': 'Paul Fejos',
+    'actors': 'Barbara Kent, Glenn Tryon', 'description': 'Two lonely workers meet at Coney Island.',
+}
+DEAD_END = {
+    'Movie': 'DEAD END', 'Datetime': '2026-03-08T20:00:00', 'film_slug': 'dead-end',
+    'film_url': 'https://filmforum.org/film/dead-end', 'director': 'William Wyler',
+    'actors': 'Sylvia Sidney, Joel McCrea, Humphrey Bogart',
+    'description': 'A slum street at the end of a Manhattan block, ending at the river.',
+}
+MOVIES = [LONESOME, dict(LONESOME, Datetime='2026-03-08T14:10:00'), DEAD_END]
+FILM_IDS = {LONESOME['film_url']: 7, DEAD_END['film_url']: 3}
+
+
+def build(movies=MOVIES, cache=None):
+    """Build an index over the sample films"""
+    return build_search_index(movies, FILM_IDS, 'test', cache)[0]
+
+
+class TestTokenize:
+    """Tests for normalization and tokens"""
+
+    def test_normalize_text(self):
+        """Test accent, case, apostrophe and punctuation folding"""
+        assert normalize_text("Hell's Kitchen — Ñandú") == 'hells kitchen nandu'
+
+    def test_tokenize_drops_stopwords_and_single_letters(self):
+        """Test that stopwords and one-character tokens are not indexed"""
+        assert tokenize('A Tree Grows in Brooklyn, Part 2') == ['tree', 'grows', 'brooklyn', 'part']
+
+    def test_trigrams_padded(self):
+        """Test that trigrams include the word boundaries"""
+        assert trigrams('end') == ['$en', 'end', 'nd$']
+
+
+class TestBuild:
+    """Tests for the index artifact"""
+
+    def test_postings_use_film_ids_and_field_weights(self):
+        """Test that postings list (film_id, score) pairs with title above description"""
+        index = build()
+        postings = dict(zip(index['terms'], index['postings']))
+
+        assert index['films'] == {
+            '3': {'title': 'DEAD END', 'film_slug': 'dead-end'},
+            '7': {'title': 'LONESOME', 'film_slug': 'lonesome'},
+        }
+        assert postings['end'] == [3, 11]
+        assert postings['bogart'] == [3, 3]
+        assert postings['fejos'] == [7, 5]
+        assert index['terms'] == sorted(index['terms'])
+        assert 'the' not in postings
+
+    def test_trigrams_index_title_words(self):
+        """Test that trigram postings point at title words only"""
+        index = build()
+
+        assert index['title_words'] == ['dead', 'end', 'lonesome']
+        assert index['trigrams']['$en'] == [1]
+
+    def test_incremental_rebuild(self):
+        """Test that only films whose fields changed are tokenized again"""
+        cache = {}
+        build_search_index(MOVIES, FILM_IDS, 'test', cache)
+        changed = [LONESOME, dict(DEAD_END, director='W. Wyler')]
+        index, stats = build_search_index(changed, FILM_IDS, 'test', cache)
+
+        assert stats == {'films': 2, 'tokenized': 1, 'cached': 1}
+        assert index == build(changed)
+
+    def test_cache_drops_removed_films(self):
+        """Test that films no longer listed leave the cache"""
+        cache = {}
+        build_search_index(MOVIES, FILM_IDS, 'test', cache)
+        build_search_index([DEAD_END], FILM_IDS, 'test', cache)
+
+        assert set(cache) == {'3'}
+
+
+class TestSearch:
+    """Tests for queries against the index"""
+
+    def test_exact_and_prefix(self):
+        """Test that a title hit ranks first and prefix hits count at a reduced score"""
+        assert search(build(), 'end') == [(3, 11)]
+        assert search(build(), 'lone') == [(7, 5.0)]
+
+    def test_all_words_must_match(self):
+        """Test AND semantics across query words"""
+        assert search(build(), 'Wyler bogart') == [(3, 8)]
+        assert search(build(), 'wyler fejos') == []
+
+    def test_typo_in_title(self):
+        """Test that a misspelled title word matches by trigram similarity"""
+        [(film_id, score)] = search(build(), 'lonsome')
+
+        assert film_id == 7
+        assert score == 5.0
+
+    def test_stopword_query(self):
+        """Test that a query of stopwords matches nothing"""
+        assert search(build(), 'the of') == []
+
+
+class TestWrite:
+    """Tests for write_search_index"""
+
+    def test_write_unchanged(self, tmp_path):
+        """Test that an identical rebuild leaves the file alone and uses the cache"""
+        output = tmp_path / 'search.json'
+        cache_path = str(tmp_path / 'cache.json')
+
+        first = write_search_index(MOVIES, str(output), 'test', FILM_IDS, cache_path)
+        second = write_search_index(MOVIES, str(output), 'test', FILM_IDS, cache_path)
+
+        assert first['written'] and not second['written']
+        assert second['cached'] == 2
+        assert json.loads(output.read_text(encoding='utf-8')) == build()
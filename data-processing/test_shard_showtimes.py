@@ -0,0 +1,106 @@
+"""Unit tests for shard_showtimes.py"""
+
+import json
+from datetime import date
+
+import pytest
+
+from shard_showtimes import shard_range, shard_movies, write_shards
+
+
+def make_movie(datetime_str, slug='street-scene'):
+    return {
+        'Movie': slug.upper(),
+        'Datetime': datetime_str,
+        'Time': datetime_str[11:16],
+        'film_url': f'https://filmforum.org/film/{slug}',
+        'film_slug': slug,
+    }
+
+
+MOVIES = [
+    make_movie('2026-02-06T18:10:00'),
+    make_movie('2026-02-08T20:00:00', 'dead-end'),
+    make_movie('2026-02-09T13:00:00'),
+]
+
+
+class TestShardRanges:
+    """Tests for grouping dates into shards"""
+
+    def test_iso_week(self):
+        """Test that weeks run Monday to Sunday and use ISO week numbers"""
+        assert shard_range(date(2026, 2, 8), 'week') == ('2026-W06', date(2026, 2, 2), date(2026, 2, 8))
+        assert shard_range(date(2026, 2, 9), 'week')[0] == '2026-W07'
+
+    def test_iso_week_across_new_year(self):
+        """Test that early-January dates can belong to the previous ISO year"""
+        assert shard_range(date(2027, 1, 1), 'week')[0] == '2026-W53'
+
+    def test_day(self):
+        """Test daily shards"""
+        assert shard_range(date(2026, 2, 6), 'day') == ('2026-02-06', date(2026, 2, 6), date(2026, 2, 6))
+
+    def test_unknown_granularity_raises(self):
+        """Test that unknown granularities raise ValueError"""
+        with pytest.raises(ValueError):
+            shard_range(date(2026, 2, 6), 'month')
+
+    def test_shard_movies_groups_and_sorts(self):
+        """Test that rows land in their week, sorted by Datetime"""
+        shards = shard_movies(list(reversed(MOVIES)))
+
+        assert list(shards) == ['2026-W06', '2026-W07']
+        assert [m['Datetime'] for m in shards['2026-W06']['movies']] == ['2026-02-06T18:10:00', '2026-02-08T20:00:00']
+
+
+class TestWriteShards:
+    """Tests for shard files and the manifest"""
+
+    def test_manifest_and_files(self, tmp_path):
+        """Test that shards round-trip and the manifest describes them"""
+        manifest, written, removed = write_shards(MOVIES, str(tmp_path), series='tenement-stories')
+
+        assert written == ['2026-W06.json', '2026-W07.json']
+        assert removed == []
+        assert manifest['showtimes'] == 3
+        assert manifest['films'] == 2
+        assert (manifest['start'], manifest['end']) == ('2026-02-02', '2026-02-15')
+        assert [s['showtimes'] for s in manifest['shards']] == [2, 1]
+        assert json.loads((tmp_path / 'manifest.json').read_text()) == manifest
+
+        restored = []
+        for entry in manifest['shards']:
+            restored += json.loads((tmp_path / entry['file']).read_text(encoding='utf-8'))
+        assert restored == MOVIES
+
+    def test_only_changed_shards_are_rewritten(self, tmp_path):
+        """Test that a change in one week rewrites only that week's shard"""
+        first, _, _ = write_shards(MOVIES, str(tmp_path))
+        unchanged_mtime = (tmp_path / '2026-W06.json').stat().st_mtime_ns
+
+        changed = MOVIES[:2] + [make_movie('2026-02-10T13:00:00')]
+        second, written, _ = write_shards(changed, str(tmp_path))
+
+        assert written == ['2026-W07.json']
+        assert (tmp_path / '2026-W06.json').stat().st_mtime_ns == unchanged_mtime
+        assert first['shards'][0]['hash'] == second['shards'][0]['hash']
+        assert first['shards'][1]['hash'] != second['shards'][1]['hash']
+
+    def test_stale_shards_are_removed(self, tmp_path):
+        """Test that shards for dates no longer listed are deleted, other files kept"""
+        write_shards(MOVIES, str(tmp_path))
+        (tmp_path / 'notes.txt').write_text('keep me')
+
+        _, _, removed = write_shards(MOVIES[:1], str(tmp_path))
+
+        assert removed == ['2026-W07.json']
+        assert (tmp_path / 'notes.txt').exists()
+
+    def test_switching_granularity_replaces_shards(self, tmp_path):
+        """Test that daily shards replace weekly ones"""
+        write_shards(MOVIES, str(tmp_path))
+        manifest, _, removed = write_shards(MOVIES, str(tmp_path), 'day')
+
+        assert sorted(removed) == ['2026-W06.json', '2026-W07.json']
+        assert [s['key'] for s in manifest['shards']] == ['2026-02-06', '2026-02-08', '2026-02-09']
@@ -0,0 +1,152 @@
+"""Unit tests for showtime_history.py"""
+
+import sys
+from unittest.mock import patch
+
+import pytest
+
+import parse_showtimes
+from showtime_history import ShowtimeHistory
+
+TAXI = 'https://filmforum.org/film/taxi-driver-tenement-stories'
+GODFATHER = 'https://filmforum.org/film/godfather-tenement-stories'
+
+
+def row(title, film_url, date, time, scraped_at, **extra):
+    return {
+        'Movie': title,
+        'Date': date,
+        'Time': time,
+        'ticket_url': f'https://tickets.example.com/{title}',
+        'film_url': film_url,
+        'film_slug': film_url.rsplit('/', 1)[-1],
+        'ScrapedAt': scraped_at,
+        **extra,
+    }
+
+
+FIRST = '2026-02-10T09:00:00'
+SECOND = '2026-02-11T09:00:00'
+FIRST_ROWS = [
+    row('Taxi Driver', TAXI, 'Friday, February 13', '7:00', FIRST),
+    row('Taxi Driver', TAXI, 'Saturday, February 14', '7:00', FIRST),
+    row('The Godfather', GODFATHER, 'Friday, February 13', '9:30', FIRST),
+]
+SECOND_ROWS = [
+    row('Taxi Driver', TAXI, 'Friday, February 13', '7:00', SECOND),
+    row('The Godfather', GODFATHER, 'Friday, February 13', '9:30', SECOND),
+    row('The Godfather', GODFATHER, 'Sunday, February 15', '2:00', SECOND),
+]
+
+
+@pytest.fixture
+def history(tmp_path):
+    with ShowtimeHistory(str(tmp_path / 'history.db')) as store:
+        yield store
+
+
+class TestRecordScrape:
+    """Tests for upserting scrapes"""
+
+    def test_first_scrape(self, history):
+        """Test that the first scrape counts everything as added"""
+        summary, warnings = history.record_scrape(FIRST_ROWS, 'tenement-stories', FIRST)
+
+        assert warnings == []
+        assert summary['showtimes'] == 3
+        assert (summary['added'], summary['removed']) == (3, 0)
+
+    def test_upsert_keeps_one_row_per_showtime(self, history):
+        """Test that a showtime listed again is updated, not duplicated"""
+        history.record_scrape(FIRST_ROWS, 'tenement-stories', FIRST)
+        changed = [dict(FIRST_ROWS[0], ticket_url='https://tickets.example.com/new')]
+        history.record_scrape(changed, 'tenement-stories', SECOND)
+
+        rows = history.conn.execute(
+            'SELECT date, time, datetime, ticket_url, first_seen, last_seen FROM showtimes WHERE film_url = ?',
+            (TAXI,),
+        ).fetchall()
+        assert len(rows) == 2
+        updated = [dict(r) for r in rows if r['date'] == '2026-02-13'][0]
+        assert updated['datetime'] == '2026-02-13T19:00:00'
+        assert updated['ticket_url'] == 'https://tickets.example.com/new'
+        assert (updated['first_seen'], updated['last_seen']) == (FIRST, SECOND)
+
+    def test_reingest_is_noop(self, history):
+        """Test that recording the same scrape twice changes nothing"""
+        history.record_scrape(FIRST_ROWS, 'tenement-stories', FIRST)
+        summary, _ = history.record_scrape(FIRST_ROWS, 'tenement-stories', FIRST)
+
+        assert summary is None
+        assert len(history.scrapes()) == 1
+
+    def test_rows_without_film_url_are_skipped(self, history):
+        """Test that legacy rows without film_url produce a warning"""
+        legacy = [{'Movie': 'LONESOME', 'Date': 'Friday, February 13', 'Time': '12:30'}]
+        summary, warnings = history.record_scrape(legacy, 'tenement-stories', FIRST)
+
+        assert summary['showtimes'] == 0
+        assert 'no film_url' in warnings[0]
+
+    def test_indexes_exist(self, history):
+        """Test that film_slug, datetime and series lookups are indexed"""
+        plan = history.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM showtimes WHERE series = 'x' AND datetime > '2026'"
+        ).fetchall()
+        assert 'idx_showtimes_series' in str([tuple(p) for p in plan])
+        names = {r['name'] for r in history.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {'idx_films_slug', 'idx_showtimes_datetime'} <= names
+
+
+class TestDiff:
+    """Tests for comparing scrapes"""
+
+    def test_added_and_removed(self, history):
+        """Test that diff reports showtimes that appeared and disappeared"""
+        first, _ = history.record_scrape(FIRST_ROWS, 'tenement-stories', FIRST)
+        second, _ = history.record_scrape(SECOND_ROWS, 'tenement-stories', SECOND)
+
+        changes = history.diff(first['scrape_id'], second['scrape_id'])
+        assert [(c['title'], c['datetime']) for c in changes['added']] == [('The Godfather', '2026-02-15T14:00:00')]
+        assert [(c['title'], c['datetime']) for c in changes['removed']] == [('Taxi Driver', '2026-02-14T19:00:00')]
+        assert (second['added'], second['removed']) == (1, 1)
+
+    def test_latest_scrape_as_of_date(self, history):
+        """Test picking the scrape to compare against by date"""
+        first, _ = history.record_scrape(FIRST_ROWS, 'tenement-stories', FIRST)
+        second, _ = history.record_scrape(SECOND_ROWS, 'tenement-stories', SECOND)
+
+        assert history.latest_scrape('tenement-stories', '2026-02-10') == first['scrape_id']
+        assert history.latest_scrape('tenement-stories') == second['scrape_id']
+        assert history.latest_scrape('tenement-stories', '2026-02-09') is None
+
+    def test_series_are_separate(self, history):
+        """Test that batch CSV rows are split into per-series scrapes"""
+        rows = FIRST_ROWS + [row('Stray Dog', 'https://filmforum.org/film/stray-dog', 'Friday, February 13',
+                                 '4:00', FIRST, Series='kurosawa')]
+        summaries, _ = history.ingest(rows, 'tenement-stories')
+
+        assert sorted((s['series'], s['showtimes']) for s in summaries) == [('kurosawa', 1), ('tenement-stories', 3)]
+
+
+class TestParseShowtimesHistory:
+    """Tests for parse_showtimes --history-db"""
+
+    def test_history_db_records_scrape(self, tmp_path):
+        """Test that a parse run is recorded in the history database"""
+        page = tmp_path / 'page.html'
+        page.write_text(
+            f'<h3 class="title style-c"><a class="blue-type" href="{TAXI}">Taxi Driver</a></h3>'
+            '<div class="details"><p>Friday, February 13<br />7:00</p></div>'
+            '<a class="button small blue" href="https://tickets.example.com/taxi">Buy Tickets</a>',
+            encoding='utf-8',
+        )
+        db_path = tmp_path / 'history.db'
+        argv = ['parse_showtimes.py', '--input', str(page), '--output', str(tmp_path / 'out.csv'),
+                '--no-cache', '--history-db', str(db_path)]
+
+        with patch.object(sys, 'argv', argv):
+            parse_showtimes.main()
+
+        with ShowtimeHistory(str(db_path)) as history:
+            assert [s['showtimes'] for s in history.scrapes('tenement-stories')] == [1]
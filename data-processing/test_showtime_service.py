@@ -0,0 +1,165 @@
+"""Unit tests for showtime_service.py and load_test_service.py"""
+
+import http.client
+import json
+import os
+import threading
+
+import pytest
+
+from load_test_service import percentile, run_load
+from showtime_service import QueryError, ShowtimeIndex, ShowtimeServer
+
+MOVIES = [
+    {'Movie': 'DEAD END', 'Time': '8:00', 'Datetime': '2026-02-17T20:00:00', 'runtime': '93 min',
+     'film_slug': 'dead-end'},
+    {'Movie': 'LONESOME', 'Time': '6:10', 'Datetime': '2026-02-17T18:10:00', 'runtime': '70 min',
+     'film_slug': 'lonesome'},
+    {'Movie': 'LONESOME', 'Time': '1:00', 'Datetime': '2026-02-18T13:00:00', 'runtime': '70 min',
+     'film_slug': 'lonesome'},
+    {'Movie': 'EL SUPER', 'Time': '7:30', 'Datetime': '2026-02-18T19:30:00', 'film_slug': 'el-super'},
+]
+
+
+def write_json(path, movies):
+    """Replace a JSON file atomically, as the pipeline does"""
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(json.dumps(movies), encoding='utf-8')
+    os.replace(tmp, path)
+
+
+@pytest.fixture
+def server(tmp_path):
+    """A running service on a free port, without the reload watcher"""
+    source = tmp_path / 'full.json'
+    write_json(source, MOVIES)
+    server = ShowtimeServer(('127.0.0.1', 0), str(source), reload_interval=0)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get(server, path, headers=None):
+    """GET a path; returns (status, headers, parsed body or None)"""
+    connection = http.client.HTTPConnection(*server.server_address[:2], timeout=5)
+    try:
+        connection.request('GET', path, headers=headers or {})
+        response = connection.getresponse()
+        body = response.read()
+        return response.status, response, json.loads(body) if body else None
+    finally:
+        connection.close()
+
+
+class TestShowtimeIndex:
+    """Tests for the in-memory index"""
+
+    def setup_method(self):
+        self.index = ShowtimeIndex(MOVIES, 'v1')
+
+    def times(self, rows):
+        return [row['Datetime'][5:16] for row in rows]
+
+    def test_rows_sorted_and_maps_built(self):
+        """Test the sorted datetime array and the film/date maps"""
+        assert self.index.datetimes == sorted(m['Datetime'] for m in MOVIES)
+        assert self.index.by_date == {'2026-02-17': (0, 2), '2026-02-18': (2, 4)}
+        assert self.index.by_slug['lonesome'] == [0, 2]
+
+    def test_playing_uses_runtime_and_default(self):
+        """Test that 'now' covers screenings until start + runtime (90 min when unknown)"""
+        assert self.times(self.index.playing('2026-02-17T19:15:00')) == ['02-17T18:10']
+        assert self.times(self.index.playing('2026-02-17T19:20:00')) == []
+        assert self.times(self.index.playing('2026-02-18T20:59:00')) == ['02-18T19:30']
+
+    def test_upcoming_and_range(self):
+        """Test next-N and half-open range lookups"""
+        assert self.times(self.index.upcoming('2026-02-17T18:10:00', 2)) == ['02-17T20:00', '02-18T13:00']
+        assert self.times(self.index.between('2026-02-17T20:00:00', '2026-02-18T19:30:00')) == [
+            '02-17T20:00', '02-18T13:00',
+        ]
+
+    def test_query_errors(self):
+        """Test bad parameters and unknown resources"""
+        with pytest.raises(QueryError):
+            self.index.query('/range', {'from': 'yesterday', 'to': '2026-02-18'})
+        with pytest.raises(QueryError):
+            self.index.query('/now', {'limit': '-1'})
+        assert self.index.query('/films/nope', {})[0] == 404
+        assert self.index.query('/nope', {})[0] == 404
+
+
+class TestServer:
+    """Tests for the HTTP layer"""
+
+    def test_film_and_date_queries(self, server):
+        """Test by-film and by-date endpoints"""
+        status, _, body = get(server, '/films/lonesome')
+        assert status == 200
+        assert [s['Time'] for s in body['showtimes']] == ['6:10', '1:00']
+
+        _, _, body = get(server, '/dates/2026-02-18')
+        assert [s['Movie'] for s in body['showtimes']] == ['LONESOME', 'EL SUPER']
+
+    def test_now_next(self, server):
+        """Test the now/next endpoint at a fixed time"""
+        _, _, body = get(server, '/now?at=2026-02-17T20:30&limit=1')
+
+        assert [s['Movie'] for s in body['now']] == ['DEAD END']
+        assert [s['Datetime'] for s in body['next']] == ['2026-02-18T13:00:00']
+
+    def test_etag_revalidation(self, server):
+        """Test that If-None-Match with the current ETag returns 304 with no body"""
+        status, response, _ = get(server, '/range?from=2026-02-17&to=2026-02-19')
+        etag = response.getheader('ETag')
+        assert status == 200 and etag
+
+        status, response, body = get(server, '/range?from=2026-02-17&to=2026-02-19', {'If-None-Match': etag})
+        assert status == 304
+        assert body is None
+
+    def test_bad_request(self, server):
+        """Test that invalid parameters answer 400"""
+        status, _, body = get(server, '/range?from=2026-02-17')
+
+        assert status == 400
+        assert 'from and to' in body['error']
+
+    def test_hot_reload_swaps_snapshot(self, server, tmp_path):
+        """Test that a replaced file is picked up, changes the ETag, and a broken file is ignored"""
+        _, response, _ = get(server, '/films/lonesome')
+        old_etag = response.getheader('ETag')
+
+        write_json(tmp_path / 'full.json', MOVIES[:2])
+        assert server.check_reload() is True
+        status, response, body = get(server, '/films/lonesome', {'If-None-Match': old_etag})
+        assert status == 200
+        assert len(body['showtimes']) == 1
+
+        (tmp_path / 'full.json').write_text('{broken', encoding='utf-8')
+        assert server.check_reload() is False
+        assert get(server, '/health')[2]['showtimes'] == 2
+
+
+class TestLoadTest:
+    """Tests for load_test_service.py"""
+
+    def test_percentile_nearest_rank(self):
+        """Test nearest-rank percentiles"""
+        values = list(range(1, 101))
+
+        assert percentile(values, 0.99) == 99
+        assert percentile(values, 0.50) == 50
+        assert percentile([], 0.99) == 0.0
+
+    def test_short_run(self, server):
+        """Test that a short run reports throughput and latency without errors"""
+        result = run_load(*server.server_address[:2], ['/films/lonesome', '/health'], duration=0.3,
+                          concurrency=2, use_etag=True)
+
+        assert result['errors'] == 0
+        assert result['requests'] > 0
+        assert set(result['statuses']) <= {200, 304}
+        assert result['latency_ms']['p99'] >= result['latency_ms']['p50']
@@ -0,0 +1,297 @@
+"""Unit tests for ticket_poller.py, against a local fake ticketing server"""
+
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ics_feeds import THEATER_TZ
+from ticket_poller import (
+    MAX_INTERVAL, MIN_INTERVAL, RateLimiter, TicketFetcher, TicketPoller, apply_ticket_status,
+    load_state, load_statuses, next_check, parse_ticket_page, poll_interval, save_state, save_statuses,
+    showtime_timestamp,
+)
+
+HOUR = 3600.0
+
+ROWS = [
+    {'Movie': 'LONESOME', 'Date': 'Friday, February 6', 'Time': '12:30', 'Datetime': '2026-02-06T12:30:00'},
+    {'Movie': 'LONESOME', 'Date': 'Friday, February 6', 'Time': '7:40', 'Datetime': '2026-02-06T19:40:00'},
+    {'Movie': 'LONESOME', 'Date': 'Saturday, February 7', 'Time': '3:10', 'Datetime': '2026-02-07T15:10:00'},
+]
+
+LONESOME_PAGE = '''<html><head><style>.sold-out { color: red }</style></head><body>
+<h1>Lonesome</h1>
+<h2>Friday, February 6</h2>
+<ul><li><span>12:30 PM</span> <button>Buy Tickets</button></li>
+<li><span>7:40 PM</span> <span class="badge">Sold Out</span></li></ul>
+<h2>Saturday, Feb. 7</h2>
+<ul><li>3:10 PM <a href="/cart">Select Seats</a></li></ul>
+<p>Shows may sell out. Refunds are available up to 24 hours before the show.</p>
+</body></html>'''
+
+
+def ticket_rows(base_url, now):
+    """Two films with showtimes 1 hour and 3 days after now, plus one that has started"""
+    def at(offset):
+        return datetime.fromtimestamp(now + offset, THEATER_TZ).strftime('%Y-%m-%dT%H:%M:00')
+    return [
+        {'Movie': 'TAXI', 'Datetime': at(HOUR), 'ticket_url': f'{base_url}/events/taxi'},
+        {'Movie': 'TAXI', 'Datetime': at(3 * 24 * HOUR), 'ticket_url': f'{base_url}/events/taxi'},
+        {'Movie': 'DEAD END', 'Datetime': at(3 * 24 * HOUR), 'ticket_url': f'{base_url}/events/dead-end'},
+        {'Movie': 'EL SUPER', 'Datetime': at(-HOUR), 'ticket_url': f'{base_url}/events/el-super'},
+    ]
+
+
+class FakeTicketHandler(BaseHTTPRequestHandler):
+    """Serves server.pages by path with an ETag, answering If-None-Match with 304"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((time.monotonic(), self.path, self.headers.get('If-None-Match')))
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            page = server.pages.get(self.path)
+        try:
+            time.sleep(server.delay)
+            if page is None:
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            if isinstance(page, int):
+                self.send_response(page)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            body = page.encode('utf-8')
+            etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('ETag', etag)
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+
+@pytest.fixture
+def ticket_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeTicketHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.pages = {}
+    server.active = 0
+    server.max_active = 0
+    server.delay = 0.0
+    server.base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_poller(rows, state=None, statuses=None, rate=0, workers=4):
+    fetcher = TicketFetcher(RateLimiter(rate), timeout=5, retries=1, backoff=0.01)
+    return TicketPoller(rows, state if state is not None else load_state('/nonexistent'),
+                        statuses if statuses is not None else {}, fetcher, workers)
+
+
+class TestSchedule:
+    """Tests for the polling interval and next-check time"""
+
+    def test_interval_shrinks_as_showtime_approaches(self):
+        """Closer showtimes are polled more often, within the clamps"""
+        intervals = [poll_interval(s) for s in (7 * 24 * HOUR, 24 * HOUR, 6 * HOUR, HOUR, 60)]
+        assert intervals == sorted(intervals, reverse=True)
+        assert intervals[0] == MAX_INTERVAL
+        assert intervals[1] == HOUR
+        assert intervals[-1] == MIN_INTERVAL
+
+    def test_failures_back_off(self):
+        """Each consecutive failure doubles the interval, up to MAX_INTERVAL"""
+        now = 1_000_000.0
+        start = now + 24 * HOUR
+        assert next_check(start, now) == now + HOUR
+        assert next_check(start, now, failures=2) == now + 4 * HOUR
+        assert next_check(start, now, failures=10) == now + MAX_INTERVAL
+
+    def test_restart_resumes_schedule_and_drops_started_pages(self):
+        """Pages checked recently are not due yet, and pages with no upcoming showtime are not queued"""
+        now = time.time()
+        rows = ticket_rows('http://example.invalid', now)
+        state = load_state('/nonexistent')
+        state['pages']['http://example.invalid/events/taxi'] = {'checked': now}
+        poller = make_poller(rows, state)
+        poller.schedule_all()
+        due = dict((url, when) for when, url in poller.heap)
+        assert set(due) == {'http://example.invalid/events/taxi', 'http://example.invalid/events/dead-end'}
+        # Datetimes are whole minutes, so the taxi showtime is up to a minute less than an hour away
+        assert now + MIN_INTERVAL <= due['http://example.invalid/events/taxi'] <= now + poll_interval(HOUR)
+        assert due['http://example.invalid/events/dead-end'] <= time.time()
+
+
+class TestParseTicketPage:
+    """Tests for per-showtime status parsing"""
+
+    def test_per_showtime_blocks(self):
+        """Dates in headings and 12-hour times pick out each showtime's own status"""
+        statuses = parse_ticket_page(LONESOME_PAGE, ROWS)
+        assert statuses == {
+            '2026-02-06T12:30:00': 'available',
+            '2026-02-06T19:40:00': 'sold_out',
+            '2026-02-07T15:10:00': 'available',
+        }
+
+    def test_page_level_status_and_unknown(self):
+        """Showtimes the page does not list take the page's status, or unknown"""
+        cancelled = '<h1>Lonesome</h1><p>This event has been cancelled.</p>'
+        assert set(parse_ticket_page(cancelled, ROWS).values()) == {'cancelled'}
+        assert set(parse_ticket_page('<p>Loading&hellip;</p>', ROWS).values()) == {'unknown'}
+
+    def test_no_tickets_available_is_sold_out(self):
+        """Status wording is checked in priority order"""
+        page = '<div>Friday, February 6 &middot; 12:30</div><div>No tickets available</div>'
+        assert parse_ticket_page(page, ROWS[:1]) == {'2026-02-06T12:30:00': 'sold_out'}
+
+
+class TestRateLimiter:
+    """Tests for the global rate limiter"""
+
+    def test_spaces_calls_across_threads(self):
+        """Calls from several threads are spaced 1/rate apart"""
+        times = []
+        lock = threading.Lock()
+        limiter = RateLimiter(50)
+
+        def call():
+            limiter.acquire()
+            with lock:
+                times.append(time.monotonic())
+
+        threads = [threading.Thread(target=call) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        times.sort()
+        assert times[-1] - times[0] >= 9 / 50 - 0.01
+
+
+class TestTicketPoller:
+    """Tests for polling the fake ticketing server"""
+
+    def test_records_statuses_and_revalidates(self, ticket_server, tmp_path):
+        """First check records every status, the second gets 304s, and a change is logged"""
+        now = time.time()
+        rows = ticket_rows(ticket_server.base_url, now)
+        published = json.dumps(rows)
+        soon = datetime.fromisoformat(rows[0]['Datetime'])
+        taxi = f"<p>Buy tickets</p><h2>{soon:%B} {soon.day}</h2><p>{soon:%H:%M} Sold out</p>"
+        ticket_server.pages = {'/events/taxi': taxi, '/events/dead-end': '<p>Buy tickets</p>'}
+
+        state = load_state(str(tmp_path / 'state.json'))
+        statuses = load_statuses(str(tmp_path / 'status.json'))
+        changes = make_poller(rows, state, statuses).run(once=True)
+        assert {(c['Movie'], c['new']) for c in changes} == {
+            ('TAXI', 'sold_out'), ('TAXI', 'available'), ('DEAD END', 'available')}
+        assert apply_ticket_status(rows, statuses) == 3
+        assert [row.get('ticket_status') for row in rows] == ['sold_out', 'available', 'available', None]
+        assert not any(path == '/events/el-super' for _, path, _ in ticket_server.requests)
+
+        save_state(state, str(tmp_path / 'state.json'))
+        save_statuses(statuses, str(tmp_path / 'status.json'))
+        state = load_state(str(tmp_path / 'state.json'))
+        statuses = load_statuses(str(tmp_path / 'status.json'))
+        ticket_server.requests.clear()
+        ticket_server.pages['/events/dead-end'] = '<p>This screening is cancelled</p>'
+        rows = json.loads(published)
+        poller = make_poller(rows, state, statuses)
+        changes = poller.run(once=True)
+
+        etags = {path: etag for _, path, etag in ticket_server.requests}
+        assert etags['/events/taxi'] and etags['/events/dead-end']
+        assert state['pages'][f'{ticket_server.base_url}/events/taxi']['http_status'] == 304
+        assert [(c['Movie'], c['old'], c['new']) for c in changes] == [('DEAD END', 'available', 'cancelled')]
+        assert statuses[rows[2]['ticket_url']][rows[2]['Datetime']]['status'] == 'cancelled'
+        assert len(state['changes']) == 4
+        # The poller only reads the published rows
+        assert json.dumps(rows) == published
+
+    def test_rate_limit_with_concurrent_workers(self, ticket_server):
+        """Checks run in parallel but never faster than the global rate"""
+        now = time.time()
+        ticket_server.delay = 0.1
+        rows = []
+        for i in range(8):
+            path = f'/events/film-{i}'
+            ticket_server.pages[path] = '<p>Buy tickets</p>'
+            rows += ticket_rows(ticket_server.base_url, now)[:1]
+            rows[-1] = dict(rows[-1], ticket_url=ticket_server.base_url + path)
+
+        make_poller(rows, rate=40, workers=4).run(once=True)
+        starts = sorted(start for start, _, _ in ticket_server.requests)
+        assert len(starts) == 8
+        assert starts[-1] - starts[0] >= 7 / 40 - 0.01
+        assert ticket_server.max_active > 1
+
+    def test_failures_and_gone_pages(self, ticket_server):
+        """A 503 counts as a failure for backoff; a 404 marks the showtimes off sale"""
+        now = time.time()
+        rows = ticket_rows(ticket_server.base_url, now)[:3]
+        ticket_server.pages = {'/events/taxi': 503}
+        poller = make_poller(rows)
+        poller.run(once=True)
+
+        taxi = poller.state['pages'][f'{ticket_server.base_url}/events/taxi']
+        assert taxi['failures'] == 1 and taxi['error'] == 'HTTP 503'
+        assert f'{ticket_server.base_url}/events/taxi' not in poller.statuses
+        assert poller.statuses[rows[2]['ticket_url']][rows[2]['Datetime']]['status'] == 'off_sale'
+        assert sum(path == '/events/taxi' for _, path, _ in ticket_server.requests) == 2
+
+    def test_continuous_run_stops_at_duration(self, ticket_server):
+        """Without --once the poller keeps its queue and returns at the deadline"""
+        now = time.time()
+        rows = ticket_rows(ticket_server.base_url, now)[:1]
+        ticket_server.pages = {'/events/taxi': '<p>Buy tickets</p>'}
+        poller = make_poller(rows)
+        started = time.monotonic()
+        poller.run(duration=0.3)
+        assert 0.25 <= time.monotonic() - started < 2
+        assert len(ticket_server.requests) == 1
+        assert [url for _, url in poller.heap] == [rows[0]['ticket_url']]
+
+
+class TestApplyTicketStatus:
+    """Tests for carrying statuses into re-published rows"""
+
+    def test_applies_last_seen_status(self, tmp_path):
+        """Rows matching a polled page and Datetime get its status"""
+        statuses = load_statuses(str(tmp_path / 'missing.json'))
+        statuses['https://my.filmforum.org/events/lonesome'] = {
+            '2026-02-06T19:40:00': {'status': 'sold_out', 'at': '2026-02-06T20:00:00+00:00'}}
+        rows = [dict(row, ticket_url='https://my.filmforum.org/events/lonesome') for row in ROWS]
+        rows.append({'Movie': 'TAXI', 'Datetime': '2026-02-06T19:40:00'})
+        assert apply_ticket_status(rows, statuses) == 1
+        assert rows[1]['ticket_status'] == 'sold_out'
+        assert 'ticket_status' not in rows[0]
+        assert json.loads(json.dumps(rows))[1]['ticket_status_at'].startswith('2026-02-06')
+        assert showtime_timestamp(rows[0]) < showtime_timestamp(rows[1])
@@ -0,0 +1,663 @@
+#!/usr/bin/env python3
+"""
+Poll ticket pages for sold-out and cancelled showtimes between scrapes.
+
+Every published showtime carries a ticket_url, and one ticket page lists
+all the showtimes of a film. A full re-scrape is the only other way to learn
+that a show sold out or was cancelled, so this poller keeps checking the
+ticket pages:
+
+- A min-heap orders the pages by when they are due. A page is checked more
+  often as its next showtime approaches (a fixed fraction of the time left,
+  clamped to MIN_INTERVAL..MAX_INTERVAL) and is dropped once every showtime
+  on it has started. Failed checks back off exponentially.
+- Checks run concurrently on a thread pool, but every request (retries
+  included) first takes a slot from one global rate limiter.
+- Requests are conditional (If-None-Match / If-Modified-Since), so an
+  unchanged page comes back as 304 without a body.
+- Each page is split into per-showtime blocks by the dates and times on it,
+  and each block is classified as available, sold_out or cancelled.
+
+The last status of every showtime is kept in the status file, which is
+rewritten only when a status changes. The poller never edits the published
+files: the publish stage of pipeline.py lists the status file as an input,
+so the next pipeline run copies the statuses into every artifact (full
+JSON, shards, day views, feeds, search) and recompresses them. A separate
+state file keeps the validators and last check of every page, so a
+restarted poller picks up its schedule where it stopped, and a log of the
+latest changes.
+"""
+
+import argparse
+import heapq
+import html
+import http.client
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from atomic_write import atomic_write_bytes
+from ics_feeds import THEATER_TZ
+from poster_downloader import DEFAULT_RETRIES, DEFAULT_TIMEOUT, RETRY_STATUSES, PosterDownloader
+
+# Get script directory for relative paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+
+STATE_FILE = os.environ.get('TICKET_STATE_FILE', str(SCRIPT_DIR / '.ticket-poller.json'))
+STATUS_FILE = os.environ.get('TICKET_STATUS_FILE', str(SCRIPT_DIR / '.ticket-status.json'))
+
+DEFAULT_RATE = 2.0
+DEFAULT_WORKERS = 4
+# A page is checked again after this fraction of the time left before its next showtime
+POLL_FRACTION = 1 / 24
+MIN_INTERVAL = 120.0
+MAX_INTERVAL = 6 * 3600.0
+# Change log entries kept in the state file
+MAX_CHANGES = 1000
+# Lines after a showtime's date/time line that still describe that showtime
+BLOCK_LINES = 3
+
+AVAILABLE = 'available'
+SOLD_OUT = 'sold_out'
+CANCELLED = 'cancelled'
+OFF_SALE = 'off_sale'
+UNKNOWN = 'unknown'
+
+# Checked in order, so "no tickets available" is sold out rather than available
+STATUS_PATTERNS = [
+    (CANCELLED, re.compile(r'\bcancell?ed\b|\bpostponed\b')),
+    (SOLD_OUT, re.compile(r'\bsold[\s-]*out\b|\bno (?:tickets|seats) (?:left|available|remaining)\b')),
+    (AVAILABLE, re.compile(r'\bbuy tickets?\b|\bselect seats?\b|\badd to cart\b|\bbook now\b'
+                           r'|\bon sale\b|\btickets? available\b')),
+]
+# Pages that are gone no longer sell tickets for any of their showtimes
+GONE_STATUSES = {404, 410}
+
+DROP_PATTERN = re.compile(r'<(script|style|noscript)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+BLOCK_TAG_PATTERN = re.compile(
+    r'<\s*/?\s*(?:br|p|div|li|ul|ol|tr|table|h[1-6]|section|article|header|footer|option|button)\b[^>]*>',
+    re.IGNORECASE)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+MONTHS = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+DATE_PATTERN = re.compile(r'\b(?:(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+(\d{1,2})\b'
+                          r'|\d{4}-(\d{2})-(\d{2})\b)')
+TIME_PATTERN = re.compile(r'(?<![\d:])(\d{1,2}):(\d{2})(?![\d:])')
+
+
+class CheckResult(NamedTuple):
+    """Outcome of checking one ticket page."""
+    url: str
+    http_status: int = 0
+    body: Optional[str] = None
+    etag: str = ''
+    last_modified: str = ''
+    error: Optional[str] = None
+
+
+class RateLimiter:
+    """Spaces calls evenly, at most `rate` per second across all threads."""
+
+    def __init__(self, rate: float, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep) -> None:
+        """
+        Args:
+            rate: Maximum calls per second (0 or less: unlimited)
+            clock: Monotonic clock
+            sleep: Sleep function
+        """
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until this caller's slot comes up."""
+        with self._lock:
+            now = self.clock()
+            start = max(now, self._next_slot)
+            self._next_slot = start + self.interval
+        if start > now:
+            self.sleep(start - now)
+
+
+class TicketFetcher(PosterDownloader):
+    """Rate-limited conditional GETs of ticket pages on pooled keep-alive connections."""
+
+    def __init__(self, limiter: RateLimiter, timeout: float = DEFAULT_TIMEOUT,
+                 retries: int = DEFAULT_RETRIES, backoff: float = 1.0) -> None:
+        """
+        Args:
+            limiter: Shared rate limiter, taken before every request
+            timeout: Socket timeout in seconds
+            retries: Extra attempts after a transient failure
+            backoff: Base delay in seconds, doubled after each failed attempt
+        """
+        super().__init__(manifest_path=None, timeout=timeout, retries=retries, backoff=backoff)
+        self.limiter = limiter
+
+    def check(self, url: str, etag: str = '', last_modified: str = '') -> CheckResult:
+        """
+        GET a ticket page, conditionally and with retries.
+
+        Args:
+            url: Ticket page URL
+            etag: ETag from the previous check
+            last_modified: Last-Modified from the previous check
+
+        Returns:
+            CheckResult with the HTTP status and, for a 200, the decoded body
+            and its validators
+        """
+        headers = {'User-Agent': 'Mozilla/5.0 (compatible; filmforum-calendar ticket poller)',
+                   'Accept-Encoding': 'identity'}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        last_error = 'unknown error'
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * (2 ** (attempt - 1)))
+            self.limiter.acquire()
+            try:
+                response, _ = self._request(url, headers)
+                body = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                last_error = f'{type(e).__name__}: {e}'
+                continue
+
+            if response.status in RETRY_STATUSES:
+                last_error = f'HTTP {response.status}'
+                continue
+            if response.status == 304 or response.status in GONE_STATUSES:
+                return CheckResult(url, response.status, etag=etag, last_modified=last_modified)
+            if response.status != 200:
+                return CheckResult(url, response.status, error=f'HTTP {response.status}')
+
+            charset = response.headers.get_content_charset() or 'utf-8'
+            return CheckResult(url, 200, body.decode(charset, errors='replace'),
+                               response.getheader('ETag') or '', response.getheader('Last-Modified') or '')
+
+        return CheckResult(url, error=last_error)
+
+
+def showtime_timestamp(movie: Dict[str, Any]) -> float:
+    """Epoch seconds of a showtime's start (Datetime is New York wall-clock time)."""
+    return datetime.fromisoformat(movie['Datetime']).replace(tzinfo=THEATER_TZ).timestamp()
+
+
+def poll_interval(seconds_until: float) -> float:
+    """
+    Seconds to wait before checking a page again.
+
+    Args:
+        seconds_until: Time left before the page's next showtime
+
+    Returns:
+        POLL_FRACTION of the time left, clamped to MIN_INTERVAL..MAX_INTERVAL
+    """
+    return min(MAX_INTERVAL, max(MIN_INTERVAL, seconds_until * POLL_FRACTION))
+
+
+def next_check(next_start: float, now: float, failures: int = 0) -> float:
+    """
+    When a page is due next.
+
+    Args:
+        next_start: Epoch seconds of the page's next showtime
+        now: Current epoch seconds
+        failures: Consecutive failed checks; each doubles the interval
+
+    Returns:
+        Epoch seconds of the next check
+    """
+    interval = poll_interval(next_start - now)
+    if failures:
+        interval = min(MAX_INTERVAL, interval * 2 ** failures)
+    return now + interval
+
+
+def group_by_ticket_url(movies: Sequence[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Rows by ticket_url, skipping rows without one."""
+    pages: Dict[str, List[Dict[str, Any]]] = {}
+    for movie in movies:
+        if movie.get('ticket_url') and movie.get('Datetime'):
+            pages.setdefault(movie['ticket_url'], []).append(movie)
+    return pages
+
+
+def next_showtime(rows: Sequence[Dict[str, Any]], now: float) -> Optional[float]:
+    """Start of the earliest showtime after now, or None if all have started."""
+    upcoming = [start for start in map(showtime_timestamp, rows) if start > now]
+    return min(upcoming) if upcoming else None
+
+
+def page_lines(page: str) -> List[str]:
+    """
+    Visible text of an HTML page, one lowercased line per block element.
+
+    Args:
+        page: HTML
+
+    Returns:
+        Non-empty lines with whitespace collapsed
+    """
+    text = DROP_PATTERN.sub(' ', page)
+    text = BLOCK_TAG_PATTERN.sub('\n', text)
+    text = html.unescape(TAG_PATTERN.sub(' ', text))
+    lines = (' '.join(line.split()).lower() for line in text.split('\n'))
+    return [line for line in lines if line]
+
+
+def classify(text: str) -> Optional[str]:
+    """First status whose wording appears in text, or None."""
+    for status, pattern in STATUS_PATTERNS:
+        if pattern.search(text):
+            return status
+    return None
+
+
+def _line_dates(line: str) -> List[Tuple[int, int]]:
+    dates = []
+    for match in DATE_PATTERN.finditer(line):
+        month_name, day, iso_month, iso_day = match.groups()
+        if month_name:
+            dates.append((MONTHS.index(month_name) + 1, int(day)))
+        else:
+            dates.append((int(iso_month), int(iso_day)))
+    return dates
+
+
+def parse_ticket_page(page: str, rows: Sequence[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Work out the status of each showtime a ticket page lists.
+
+    The page is read as lines. A date sets the current day (on its own line,
+    as a heading, or next to the times) and a time on that day starts the
+    block of a showtime, which runs for BLOCK_LINES more lines. A showtime's
+    status is the wording in its block, or available if the block has none.
+    Showtimes the page does not list get the status of the rest of the page
+    (unknown if that has no status wording either). Times are compared on a
+    12-hour clock, since Film Forum prints them without AM/PM.
+
+    Args:
+        page: Ticket page HTML
+        rows: Showtime rows sharing this ticket page
+
+    Returns:
+        Datetime -> status for every row
+    """
+    wanted: Dict[Tuple[int, int, int, int], List[str]] = {}
+    for row in rows:
+        when = datetime.fromisoformat(row['Datetime'])
+        wanted.setdefault((when.month, when.day, when.hour % 12, when.minute), []).append(row['Datetime'])
+
+    blocks: List[Tuple[List[str], List[str]]] = []
+    general: List[str] = []
+    current_day: Optional[Tuple[int, int]] = None
+    block: Optional[Tuple[List[str], List[str]]] = None
+    for line in page_lines(page):
+        dates = _line_dates(line)
+        if dates:
+            current_day = dates[-1]
+        matched = []
+        if current_day:
+            for hour, minute in TIME_PATTERN.findall(line):
+                matched += wanted.get((*current_day, int(hour) % 12, int(minute)), [])
+        if matched:
+            block = (matched, [line])
+            blocks.append(block)
+        elif dates or block is None or len(block[1]) > BLOCK_LINES:
+            block = None
+            general.append(line)
+        else:
+            block[1].append(line)
+
+    page_status = classify(' '.join(general)) or UNKNOWN
+    statuses = {row['Datetime']: page_status for row in rows}
+    for datetimes, lines in blocks:
+        status = classify(' '.join(lines)) or AVAILABLE
+        for key in datetimes:
+            statuses[key] = status
+    return statuses
+
+
+def load_state(path: str) -> Dict[str, Any]:
+    """Load the poller state; empty if the file is missing or unreadable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        state = {}
+    state.setdefault('pages', {})
+    state.setdefault('changes', [])
+    return state
+
+
+def save_state(state: Dict[str, Any], path: str) -> None:
+    """Write the poller state atomically, keeping the newest MAX_CHANGES changes."""
+    state['changes'] = state['changes'][-MAX_CHANGES:]
+    atomic_write_bytes(path, (json.dumps(state, indent=2, sort_keys=True) + '\n').encode('utf-8'))
+
+
+def load_statuses(path: str) -> Dict[str, Dict[str, Dict[str, str]]]:
+    """Load ticket_url -> Datetime -> {status, at}; empty if the file is missing or unreadable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_statuses(statuses: Dict[str, Dict[str, Dict[str, str]]], path: str) -> None:
+    """Write the ticket statuses atomically."""
+    atomic_write_bytes(path, (json.dumps(statuses, indent=2, sort_keys=True) + '\n').encode('utf-8'))
+
+
+def apply_ticket_status(movies: Sequence[Dict[str, Any]], statuses: Dict[str, Dict[str, Dict[str, str]]]) -> int:
+    """
+    Copy the last known ticket status into rows.
+
+    Used by the publish stage, so every published artifact carries what the
+    poller has seen since the scrape.
+
+    Args:
+        movies: Showtime rows (modified in place)
+        statuses: Ticket statuses from load_statuses()
+
+    Returns:
+        Number of rows given a status
+    """
+    applied = 0
+    for movie in movies:
+        seen = statuses.get(movie.get('ticket_url') or '', {}).get(movie.get('Datetime'))
+        if seen:
+            movie['ticket_status'] = seen['status']
+            movie['ticket_status_at'] = seen['at']
+            applied += 1
+    return applied
+
+
+def _timestamp_text(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat(timespec='seconds')
+
+
+class TicketPoller:
+    """Schedules ticket page checks and records status changes."""
+
+    def __init__(self, movies: List[Dict[str, Any]], state: Dict[str, Any],
+                 statuses: Dict[str, Dict[str, Dict[str, str]]], fetcher: TicketFetcher,
+                 workers: int = DEFAULT_WORKERS, clock: Callable[[], float] = time.time) -> None:
+        """
+        Args:
+            movies: Published showtime rows (read only)
+            state: Poller state from load_state(), updated in place
+            statuses: Ticket statuses from load_statuses(), updated in place
+            fetcher: TicketFetcher (carries the global rate limiter)
+            workers: Maximum concurrent checks
+            clock: Wall clock in epoch seconds
+        """
+        self.movies = movies
+        self.state = state
+        self.statuses = statuses
+        self.fetcher = fetcher
+        self.workers = workers
+        self.clock = clock
+        self.pages = group_by_ticket_url(movies)
+        self.heap: List[Tuple[float, str]] = []
+        self.checks = 0
+        self.failures = 0
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        """Ask run() to return after the checks in flight."""
+        self._stop.set()
+
+    def schedule_all(self, immediately: bool = False) -> None:
+        """
+        Queue every page that still has an upcoming showtime.
+
+        Args:
+            immediately: Make every page due now, ignoring when it was last checked
+        """
+        now = self.clock()
+        self.heap = []
+        for url, rows in self.pages.items():
+            next_start = next_showtime(rows, now)
+            if next_start is None:
+                continue
+            page = self.state['pages'].get(url, {})
+            due = now
+            if not immediately and 'checked' in page:
+                due = next_check(next_start, page['checked'], page.get('failures', 0))
+            self.heap.append((due, url))
+        heapq.heapify(self.heap)
+
+    def check(self, url: str) -> CheckResult:
+        """Fetch one page with the validators of its previous check."""
+        page = self.state['pages'].get(url, {})
+        return self.fetcher.check(url, page.get('etag', ''), page.get('last_modified', ''))
+
+    def record(self, result: CheckResult) -> List[Dict[str, Any]]:
+        """
+        Apply one check to the state and the statuses of its page.
+
+        Only showtimes that have not started are updated. A 304 leaves every
+        status as it was, and a page that is gone marks its showtimes
+        off_sale. An unknown status never replaces a known one.
+
+        Args:
+            result: Outcome of check()
+
+        Returns:
+            Change log entries added by this check
+        """
+        now = self.clock()
+        page = self.state['pages'].setdefault(result.url, {})
+        page['checked'] = now
+        page['checked_at'] = _timestamp_text(now)
+        self.checks += 1
+        if result.error:
+            page['failures'] = page.get('failures', 0) + 1
+            page['error'] = result.error
+            self.failures += 1
+            return []
+        page['failures'] = 0
+        page.pop('error', None)
+        page['http_status'] = result.http_status
+        if result.http_status == 304:
+            return []
+
+        # Showtimes that have started keep the status they had
+        rows = [row for row in self.pages[result.url] if showtime_timestamp(row) > now]
+        if result.http_status in GONE_STATUSES:
+            statuses = {row['Datetime']: OFF_SALE for row in rows}
+            page.pop('etag', None)
+            page.pop('last_modified', None)
+        else:
+            statuses = parse_ticket_page(result.body or '', rows)
+            page['etag'] = result.etag
+            page['last_modified'] = result.last_modified
+
+        seen = self.statuses.setdefault(result.url, {})
+        changes = []
+        for row in rows:
+            old = seen.get(row['Datetime'], {}).get('status')
+            new = statuses[row['Datetime']]
+            if new == old or (new == UNKNOWN and old is not None):
+                continue
+            at = _timestamp_text(now)
+            seen[row['Datetime']] = {'status': new, 'at': at}
+            changes.append({'at': at, 'ticket_url': result.url, 'Movie': row.get('Movie'),
+                            'Datetime': row['Datetime'], 'old': old, 'new': new})
+        self.state['changes'].extend(changes)
+        return changes
+
+    def reschedule(self, url: str) -> None:
+        """Queue a page's next check, or drop it once all its showtimes have started."""
+        now = self.clock()
+        next_start = next_showtime(self.pages[url], now)
+        if next_start is not None:
+            failures = self.state['pages'].get(url, {}).get('failures', 0)
+            heapq.heappush(self.heap, (next_check(next_start, now, failures), url))
+
+    def run(self, duration: Optional[float] = None, once: bool = False,
+            on_batch: Optional[Callable[[List[Dict[str, Any]]], None]] = None) -> List[Dict[str, Any]]:
+        """
+        Check pages as they come due until the queue empties, the duration
+        ends or stop() is called.
+
+        Args:
+            duration: Seconds to run (None: until no page has an upcoming showtime)
+            once: Check every page once, now, then return
+            on_batch: Called with the changes (possibly none) after each batch
+                of finished checks, e.g. to save the state and statuses
+
+        Returns:
+            Every change recorded during the run
+        """
+        self.schedule_all(immediately=once)
+        deadline = self.clock() + duration if duration is not None else None
+        changes: List[Dict[str, Any]] = []
+        in_flight: Dict[Any, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            try:
+                while True:
+                    now = self.clock()
+                    accepting = not self._stop.is_set() and (deadline is None or now < deadline)
+                    while accepting and self.heap and self.heap[0][0] <= now and len(in_flight) < self.workers:
+                        _, url = heapq.heappop(self.heap)
+                        in_flight[executor.submit(self.check, url)] = url
+                    if not in_flight and (not accepting or not self.heap):
+                        break
+
+                    timeout = None
+                    if accepting and self.heap and len(in_flight) < self.workers:
+                        timeout = max(0.0, self.heap[0][0] - now)
+                        if deadline is not None:
+                            timeout = min(timeout, max(0.0, deadline - now))
+                    if not in_flight:
+                        self._stop.wait(timeout)
+                        continue
+
+                    done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                    batch: List[Dict[str, Any]] = []
+                    for future in done:
+                        url = in_flight.pop(future)
+                        batch += self.record(future.result())
+                        if not once:
+                            self.reschedule(url)
+                    changes += batch
+                    if done and on_batch:
+                        on_batch(batch)
+            finally:
+                for future in in_flight:
+                    future.cancel()
+                self.fetcher.close()
+        return changes
+
+
+def format_change(change: Dict[str, Any]) -> str:
+    """One console line for a status change."""
+    old = change['old'] or 'new'
+    return f"{change['Datetime'][:16].replace('T', ' ')}  {change['Movie']}: {old} -> {change['new']}"
+
+
+def main():
+    """Main entry point for command-line execution."""
+    parser = argparse.ArgumentParser(
+        description='Poll ticket pages and record sold-out and cancelled showtimes',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # Check every upcoming showtime's ticket page once
+  %(prog)s --once
+
+  # Keep polling for an hour, at most 1 request/s
+  %(prog)s --duration 3600 --rate 1
+
+  # Custom data and state files
+  %(prog)s --input merged.json --state /tmp/ticket-poller.json --statuses /tmp/ticket-status.json
+
+  # Publish the statuses found so far
+  python pipeline.py
+'''
+    )
+    parser.add_argument(
+        '--series',
+        default='tenement-stories',
+        help='Series name (default: tenement-stories). Used to determine the default input file.'
+    )
+    parser.add_argument('--input', help='Published showtime JSON to poll (default: public/{series}-full.json)')
+    parser.add_argument('--state', default=STATE_FILE,
+                        help='Validators, schedule and change log (default: data-processing/.ticket-poller.json)')
+    parser.add_argument('--statuses', default=STATUS_FILE,
+                        help='Last status of every showtime, read by the publish stage '
+                             '(default: data-processing/.ticket-status.json)')
+    parser.add_argument('--once', action='store_true', help='Check every page once and exit')
+    parser.add_argument('--duration', type=float, help='Seconds to run (default: until every showtime has started)')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help=f'Requests per second across all workers (default: {DEFAULT_RATE:g})')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Concurrent checks (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f'Socket timeout in seconds (default: {DEFAULT_TIMEOUT:g})')
+    args = parser.parse_args()
+
+    input_json = args.input or str(PROJECT_ROOT / 'public' / f'{args.series}-full.json')
+    try:
+        with open(input_json, 'r', encoding='utf-8') as f:
+            movies = json.load(f)
+    except FileNotFoundError:
+        print(f"Error: Input file not found: {input_json}")
+        sys.exit(1)
+
+    state = load_state(args.state)
+    statuses = load_statuses(args.statuses)
+    fetcher = TicketFetcher(RateLimiter(args.rate), timeout=args.timeout)
+    poller = TicketPoller(movies, state, statuses, fetcher, max(1, args.workers))
+    if not poller.pages:
+        print(f"⚠ No showtimes with a ticket_url in {input_json}")
+        return
+
+    def save(batch: List[Dict[str, Any]]) -> None:
+        for change in batch:
+            print(f"  {format_change(change)}")
+        if batch:
+            save_statuses(statuses, args.statuses)
+        save_state(state, args.state)
+
+    now = time.time()
+    if not any(next_showtime(rows, now) for rows in poller.pages.values()):
+        print(f"⚠ Every showtime in {input_json} has started, nothing to poll")
+        return
+
+    print(f"Polling {len(poller.pages)} ticket pages at up to {args.rate:g} requests/s...")
+    try:
+        changes = poller.run(args.duration, args.once, on_batch=save)
+    except KeyboardInterrupt:
+        poller.stop()
+        save_state(state, args.state)
+        print("\n⚠ Interrupted, state saved")
+        sys.exit(130)
+
+    print(f"✓ {poller.checks} checks, {len(changes)} status changes")
+    if changes:
+        print("  Run python pipeline.py to publish them")
+    if poller.failures:
+        print(f"⚠ {poller.failures} checks failed (retried later with backoff)")
+
+
+if __name__ == '__main__':
+    main()
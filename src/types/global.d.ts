@@ -1,4 +1,5 @@
 import type { Movie } from './movie';
+import type { DayViews } from '../utils/dayViews';
 
 declare global {
   interface Window {
@@ -9,6 +10,8 @@ declare global {
     __movieData: Movie[];
     /** Series/session ID, set by define:vars on calendar page. */
     __sessionId: string;
+    /** Precomputed day layouts, set by define:vars on calendar page (null if not built). */
+    __dayViews: DayViews | null;
   }
 }
 
@@ -21,10 +21,22 @@ export interface Movie {
   country?: string;
   film_url?: string;
   poster_url?: string;
+  poster_variants?: PosterVariant[];
+  poster_lqip?: string;
+  poster_color?: string;
   _col?: number;
   _hasOverlap?: boolean;
 }
 
+/**
+ * Resized WebP copy of a poster, generated by data-processing/poster_variants.py
+ */
+export interface PosterVariant {
+  url: string;
+  width: number;
+  height: number;
+}
+
 /**
  * A single showtime with time and ticket link
  */
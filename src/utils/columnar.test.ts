@@ -0,0 +1,40 @@
+/**
+ * Test suite for the columnar showtime decoder.
+ */
+
+import { describe, it, expect } from 'vitest';
+import { decodeColumnar } from './columnar';
+import type { ColumnarShowtimes } from './columnar';
+
+const data: ColumnarShowtimes = {
+  version: 1,
+  series: 'test',
+  count: 3,
+  fields: ['Movie', 'Time', 'Datetime', 'poster_url'],
+  datetime: { base: '2026-03-07T23:30', deltas: [90, 1440] },
+  columns: {
+    Movie: { values: ['LONESOME', 'DEAD END'], codes: [0, 1, 0] },
+    Time: { values: ['11:30', '1:00'], codes: [0, 1, 1] },
+    poster_url: { values: ['/posters/lonesome.png'], codes: [0, -1, 0] },
+  },
+};
+
+describe('columnar', () => {
+  describe('decodeColumnar', () => {
+    it('should rebuild rows with datetimes, dictionary values and absent fields', () => {
+      expect(decodeColumnar(data)).toEqual([
+        { Movie: 'LONESOME', Time: '11:30', Datetime: '2026-03-07T23:30:00', poster_url: '/posters/lonesome.png' },
+        { Movie: 'DEAD END', Time: '1:00', Datetime: '2026-03-08T01:00:00' },
+        { Movie: 'LONESOME', Time: '1:00', Datetime: '2026-03-09T01:00:00', poster_url: '/posters/lonesome.png' },
+      ]);
+    });
+
+    it('should keep the original key order', () => {
+      expect(Object.keys(decodeColumnar(data)[0])).toEqual(['Movie', 'Time', 'Datetime', 'poster_url']);
+    });
+
+    it('should reject unknown versions', () => {
+      expect(() => decodeColumnar({ ...data, version: 2 })).toThrow('Unsupported columnar version');
+    });
+  });
+});
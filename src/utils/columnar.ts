@@ -0,0 +1,68 @@
+import type { Movie } from '../types/movie';
+
+/**
+ * Dictionary-encoded column: distinct values plus one code per row (-1 = field absent)
+ */
+export interface DictColumn {
+  values: unknown[];
+  codes: number[];
+}
+
+/**
+ * Columnar showtime artifact (public/{series}-columnar.json).
+ * Written by data-processing/columnar_showtimes.py
+ */
+export interface ColumnarShowtimes {
+  version: number;
+  series: string;
+  count: number;
+  fields: string[];
+  datetime: { base: string | null; deltas: number[] }; // base is YYYY-MM-DDTHH:MM, deltas in minutes
+  columns: Record<string, DictColumn>;
+}
+
+const pad = (n: number) => String(n).padStart(2, '0');
+
+/**
+ * Decode a columnar artifact back into showtime rows.
+ * Datetimes are rebuilt with UTC arithmetic on the naive local time, so DST
+ * transitions in the browser's time zone never shift them.
+ * Not used by any page yet; the calendar still inlines -full.json at build time.
+ * @param data - Parsed columnar JSON
+ * @returns Showtimes sorted by Datetime, keys in the original order
+ */
+export function decodeColumnar(data: ColumnarShowtimes): Movie[] {
+  if (data.version !== 1) {
+    throw new Error(`Unsupported columnar version: ${data.version}`);
+  }
+
+  const datetimes: string[] = [];
+  if (data.count > 0 && data.datetime.base) {
+    let ms = Date.parse(`${data.datetime.base}:00Z`);
+    const push = () => {
+      const d = new Date(ms);
+      datetimes.push(
+        `${d.getUTCFullYear()}-${pad(d.getUTCMonth() + 1)}-${pad(d.getUTCDate())}` +
+          `T${pad(d.getUTCHours())}:${pad(d.getUTCMinutes())}:00`
+      );
+    };
+    push();
+    for (const delta of data.datetime.deltas) {
+      ms += delta * 60000;
+      push();
+    }
+  }
+
+  const rows: Record<string, unknown>[] = Array.from({ length: data.count }, () => ({}));
+  for (const field of data.fields) {
+    if (field === 'Datetime') {
+      rows.forEach((row, i) => (row[field] = datetimes[i]));
+      continue;
+    }
+    const { values, codes } = data.columns[field];
+    rows.forEach((row, i) => {
+      if (codes[i] !== -1) row[field] = values[codes[i]];
+    });
+  }
+  return rows as unknown as Movie[];
+}
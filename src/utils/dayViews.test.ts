@@ -0,0 +1,40 @@
+/**
+ * Test suite for precomputed day layouts.
+ */
+
+import { describe, it, expect } from 'vitest';
+import { applyDayView } from './dayViews';
+import type { DayView } from './dayViews';
+import type { Movie } from '../types/movie';
+
+const movies: Movie[] = [
+  { Movie: 'B', Time: '7:00', Datetime: '2026-02-13T19:00:00', film_slug: 'b', ticket_url: 't/b' },
+  { Movie: 'A', Time: '6:30', Datetime: '2026-02-13T18:30:00', film_slug: 'a', ticket_url: 't/a' },
+];
+
+const view: DayView = {
+  start: 1110,
+  end: 1230,
+  range: 120,
+  columns: 2,
+  screenings: [
+    { film_slug: 'a', Movie: 'A', Time: '6:30', Datetime: '2026-02-13T18:30:00', ticket_url: 't/a', start: 1110, end: 1200, col: 0, overlap: true },
+    { film_slug: 'b', Movie: 'B', Time: '7:00', Datetime: '2026-02-13T19:00:00', ticket_url: 't/b', start: 1140, end: 1230, col: 1, overlap: true },
+  ],
+  films: [],
+};
+
+describe('dayViews', () => {
+  describe('applyDayView', () => {
+    it('should return movies in layout order with precomputed columns', () => {
+      const laidOut = applyDayView(view, movies);
+      expect(laidOut?.map(m => [m.Movie, m._col, m._hasOverlap])).toEqual([['A', 0, true], ['B', 1, true]]);
+    });
+
+    it('should return null when the shown movies differ from the layout', () => {
+      expect(applyDayView(view, movies.slice(0, 1))).toBeNull();
+      expect(applyDayView(undefined, movies)).toBeNull();
+      expect(applyDayView(view, [movies[0], { ...movies[1], film_slug: 'c' }])).toBeNull();
+    });
+  });
+});
@@ -0,0 +1,66 @@
+import type { Movie } from '../types/movie';
+
+/**
+ * One screening in a precomputed day layout.
+ * Written by data-processing/day_views.py
+ */
+export interface DayScreening {
+  film_slug: string;
+  Movie: string;
+  Time: string;
+  Datetime: string;
+  ticket_url: string;
+  start: number; // minutes since midnight
+  end: number; // start + runtime (default_runtime when unknown)
+  col: number;
+  overlap: boolean;
+}
+
+/**
+ * Layout of one calendar day: time range, column count, screenings and grouped films
+ */
+export interface DayView {
+  start: number;
+  end: number;
+  range: number;
+  columns: number;
+  screenings: DayScreening[];
+  films: { film_slug: string; Movie: string; showtimes: { time: string; tickets: string }[] }[];
+}
+
+/**
+ * Per-day layouts of one series (public/{series}-days.json)
+ */
+export interface DayViews {
+  version: number;
+  series: string;
+  default_runtime: number;
+  start: string | null;
+  end: string | null;
+  days: Record<string, DayView>;
+}
+
+/**
+ * Apply a precomputed day layout to that day's movies.
+ * The layout covers every screening of the day, so it only applies when the
+ * movies shown are exactly those screenings; with a filter active (hidden
+ * films, work hours) the caller falls back to assignOverlapColumns.
+ * @param view - Day layout from DayViews.days
+ * @param movies - Movies to render for the day
+ * @returns Movies sorted by start with _col/_hasOverlap set, or null if the layout does not match
+ */
+export function applyDayView(
+  view: DayView | undefined,
+  movies: Movie[]
+): (Movie & { _col: number; _hasOverlap: boolean })[] | null {
+  if (!view || view.screenings.length !== movies.length) return null;
+
+  const byKey = new Map(movies.map(m => [`${m.film_slug}|${m.Datetime}`, m]));
+  const laidOut: (Movie & { _col: number; _hasOverlap: boolean })[] = [];
+  for (const screening of view.screenings) {
+    const movie = byKey.get(`${screening.film_slug}|${screening.Datetime}`);
+    if (!movie) return null;
+    laidOut.push({ ...movie, _col: screening.col, _hasOverlap: screening.overlap });
+  }
+  return laidOut;
+}
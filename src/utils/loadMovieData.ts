@@ -1,6 +1,7 @@
 import fs from 'node:fs';
 import path from 'node:path';
 import type { Movie } from '../types/movie';
+import type { DayViews } from './dayViews';
 
 /**
  * Load movie data at build time from a JSON file in the public directory.
@@ -16,3 +17,15 @@ export function loadMovieData(dataFile: string) {
 
   return { movieData, movieDataJson };
 }
+
+/**
+ * Load the precomputed day layouts that sit next to a series' data file at build time.
+ * @param dataFile - Path of the series' -full.json file, as passed to loadMovieData
+ * @returns Parsed layouts, or null if {series}-days.json has not been built
+ */
+export function loadDayViews(dataFile: string): DayViews | null {
+  const normalizedPath = dataFile.startsWith('/') ? dataFile.slice(1) : dataFile;
+  const daysPath = path.join(process.cwd(), 'public', normalizedPath.replace(/-full\.json$/, '-days.json'));
+  if (daysPath.endsWith('-full.json') || !fs.existsSync(daysPath)) return null;
+  return JSON.parse(fs.readFileSync(daysPath, 'utf-8'));
+}
@@ -0,0 +1,49 @@
+/**
+ * Test suite for date shard loading.
+ */
+
+import { describe, it, expect } from 'vitest';
+import { shardsInRange, loadShardsInRange } from './loadShards';
+import type { ShardManifest } from './loadShards';
+
+const manifest: ShardManifest = {
+  version: 1,
+  series: 'test',
+  granularity: 'week',
+  start: '2026-02-02',
+  end: '2026-02-15',
+  showtimes: 2,
+  films: 2,
+  shards: [
+    { key: '2026-W06', file: '2026-W06.json', start: '2026-02-02', end: '2026-02-08', hash: 'aaa', bytes: 10, showtimes: 1, films: 1 },
+    { key: '2026-W07', file: '2026-W07.json', start: '2026-02-09', end: '2026-02-15', hash: 'bbb', bytes: 10, showtimes: 1, films: 1 },
+  ],
+};
+
+describe('loadShards', () => {
+  describe('shardsInRange', () => {
+    it('should select only shards overlapping the range', () => {
+      expect(shardsInRange(manifest, '2026-02-03', '2026-02-04').map(s => s.key)).toEqual(['2026-W06']);
+      expect(shardsInRange(manifest, '2026-02-08', '2026-02-09').map(s => s.key)).toEqual(['2026-W06', '2026-W07']);
+      expect(shardsInRange(manifest, '2026-03-01', '2026-03-07')).toEqual([]);
+    });
+  });
+
+  describe('loadShardsInRange', () => {
+    it('should fetch hash-versioned shard URLs and merge rows by Datetime', async () => {
+      const requested: string[] = [];
+      const fakeFetch = (async (url: string) => {
+        requested.push(url);
+        const rows = url.includes('W06')
+          ? [{ Movie: 'B', Datetime: '2026-02-08T18:00:00' }]
+          : [{ Movie: 'A', Datetime: '2026-02-09T12:00:00' }];
+        return new Response(JSON.stringify(rows));
+      }) as typeof fetch;
+
+      const movies = await loadShardsInRange('/test-shards/', manifest, '2026-02-01', '2026-02-28', fakeFetch);
+
+      expect(requested).toEqual(['/test-shards/2026-W06.json?v=aaa', '/test-shards/2026-W07.json?v=bbb']);
+      expect(movies.map(m => m.Movie)).toEqual(['B', 'A']);
+    });
+  });
+});
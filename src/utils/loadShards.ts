@@ -0,0 +1,75 @@
+import type { Movie } from '../types/movie';
+
+/**
+ * One date shard listed in a shard manifest.
+ * Written by data-processing/shard_showtimes.py
+ */
+export interface ShardEntry {
+  key: string;
+  file: string;
+  start: string; // YYYY-MM-DD, inclusive
+  end: string; // YYYY-MM-DD, inclusive
+  hash: string;
+  bytes: number;
+  showtimes: number;
+  films: number;
+}
+
+/**
+ * Manifest describing the date shards of one series (public/{series}-shards/manifest.json)
+ */
+export interface ShardManifest {
+  version: number;
+  series: string;
+  granularity: 'day' | 'week';
+  start: string | null;
+  end: string | null;
+  showtimes: number;
+  films: number;
+  shards: ShardEntry[];
+}
+
+/**
+ * Select the shards overlapping an inclusive date range.
+ * @param manifest - Shard manifest
+ * @param startDate - First date in view (YYYY-MM-DD)
+ * @param endDate - Last date in view (YYYY-MM-DD)
+ * @returns Shards whose [start, end] range intersects the view
+ */
+export function shardsInRange(manifest: ShardManifest, startDate: string, endDate: string): ShardEntry[] {
+  // ISO dates compare correctly as strings
+  return manifest.shards.filter(shard => shard.start <= endDate && shard.end >= startDate);
+}
+
+/**
+ * Fetch only the shards covering a date range and return their showtimes.
+ * Shard URLs carry the content hash as a query string, so unchanged shards
+ * stay cached by the browser across deploys.
+ * Not used by any page yet: the calendar renders every week at once from the
+ * build-time -full.json, so this is waiting on a paged calendar view.
+ * @param baseUrl - Shard directory URL (e.g., '/tenement-stories-shards')
+ * @param manifest - Shard manifest loaded from `${baseUrl}/manifest.json`
+ * @param startDate - First date in view (YYYY-MM-DD)
+ * @param endDate - Last date in view (YYYY-MM-DD)
+ * @param fetchFn - fetch implementation (injectable for tests)
+ * @returns Showtimes in the shards, sorted by Datetime
+ */
+export async function loadShardsInRange(
+  baseUrl: string,
+  manifest: ShardManifest,
+  startDate: string,
+  endDate: string,
+  fetchFn: typeof fetch = fetch
+): Promise<Movie[]> {
+  const base = baseUrl.endsWith('/') ? baseUrl.slice(0, -1) : baseUrl;
+  const shards = await Promise.all(
+    shardsInRange(manifest, startDate, endDate).map(async shard => {
+      const response = await fetchFn(`${base}/${shard.file}?v=${shard.hash}`);
+      if (!response.ok) {
+        throw new Error(`Failed to load shard ${shard.file}: HTTP ${response.status}`);
+      }
+      return (await response.json()) as Movie[];
+    })
+  );
+  return shards.flat().sort((a, b) => a.Datetime.localeCompare(b.Datetime));
+}
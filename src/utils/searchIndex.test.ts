@@ -0,0 +1,61 @@
+/**
+ * Test suite for search index queries.
+ */
+
+import { describe, it, expect } from 'vitest';
+import { normalizeText, searchFilms, trigrams } from './searchIndex';
+import type { SearchIndex } from './searchIndex';
+
+function trigramPostings(words: string[]): Record<string, number[]> {
+  const postings: Record<string, number[]> = {};
+  words.forEach((word, i) => trigrams(word).forEach(gram => (postings[gram] ??= []).push(i)));
+  return postings;
+}
+
+// Two films: 0 LONESOME (dir. Paul Fejos), 1 DEAD END (dir. William Wyler, with Humphrey Bogart)
+const index: SearchIndex = {
+  version: 1,
+  series: 'test',
+  weights: { title: 10, director: 5, actors: 3, description: 1 },
+  stopwords: ['the'],
+  films: {
+    '0': { title: 'LONESOME', film_slug: 'lonesome' },
+    '1': { title: 'DEAD END', film_slug: 'dead-end' },
+  },
+  terms: ['bogart', 'dead', 'end', 'ending', 'fejos', 'lonesome', 'paul', 'wyler'],
+  postings: [[1, 3], [1, 10], [1, 10], [0, 1], [0, 5], [0, 10], [0, 5], [1, 5]],
+  title_words: ['dead', 'end', 'lonesome'],
+  trigrams: trigramPostings(['dead', 'end', 'lonesome']),
+};
+
+describe('searchIndex', () => {
+  describe('normalizeText', () => {
+    it('should fold accents, case, apostrophes and punctuation', () => {
+      expect(normalizeText("Hell's Kitchen — Ñandú")).toBe('hells kitchen nandu');
+    });
+  });
+
+  describe('searchFilms', () => {
+    it('should rank a title hit above a description prefix hit', () => {
+      expect(searchFilms(index, 'end').map(r => [r.film_slug, r.score])).toEqual([
+        ['dead-end', 10],
+        ['lonesome', 0.5],
+      ]);
+    });
+
+    it('should require every query word to match', () => {
+      expect(searchFilms(index, 'the wyler bogart').map(r => r.id)).toEqual([1]);
+      expect(searchFilms(index, 'wyler fejos')).toEqual([]);
+    });
+
+    it('should match misspelled title words by trigrams', () => {
+      const [result] = searchFilms(index, 'lonsome');
+      expect(result.title).toBe('LONESOME');
+      expect(result.score).toBeCloseTo(5);
+    });
+
+    it('should return nothing for stopword-only queries', () => {
+      expect(searchFilms(index, 'the')).toEqual([]);
+    });
+  });
+});
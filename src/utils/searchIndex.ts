@@ -0,0 +1,141 @@
+/**
+ * Film search against the prebuilt index (public/{series}-search.json).
+ * Written by data-processing/search_index.py; queries only look terms up,
+ * they never scan showtime rows. No page has a search box using it yet.
+ */
+
+/**
+ * Search index artifact
+ */
+export interface SearchIndex {
+  version: number;
+  series: string;
+  weights: Record<string, number>; // title, director, actors, description
+  stopwords: string[];
+  films: Record<string, { title: string; film_slug: string }>;
+  terms: string[]; // sorted
+  postings: number[][]; // parallel to terms: [filmId, score, filmId, score, ...]
+  title_words: string[]; // sorted distinct title tokens
+  trigrams: Record<string, number[]>; // trigram -> indices into title_words
+}
+
+export interface SearchResult {
+  id: number;
+  score: number;
+  title: string;
+  film_slug: string;
+}
+
+// Keep in sync with data-processing/search_index.py
+const MIN_TOKEN_LENGTH = 2;
+const PREFIX_FACTOR = 0.5;
+const FUZZY_THRESHOLD = 0.4;
+const FUZZY_MIN_LENGTH = 3;
+
+/**
+ * Fold accents and case and collapse punctuation to single spaces.
+ */
+export function normalizeText(text: string): string {
+  return text
+    .normalize('NFKD')
+    .replace(/\p{M}/gu, '')
+    .toLowerCase()
+    .replace(/['’]/g, '')
+    .replace(/[^\p{L}\p{N}]+/gu, ' ')
+    .trim();
+}
+
+/**
+ * Split a query into index tokens (stopwords and one-character tokens dropped).
+ */
+export function tokenize(text: string, stopwords: ReadonlySet<string>): string[] {
+  return normalizeText(text)
+    .split(' ')
+    .filter(token => token.length >= MIN_TOKEN_LENGTH && !stopwords.has(token));
+}
+
+/**
+ * Distinct trigrams of a word padded with '$' on both sides.
+ */
+export function trigrams(word: string): string[] {
+  const padded = `$${word}$`;
+  const grams = new Set<string>();
+  for (let i = 0; i + 3 <= padded.length; i++) grams.add(padded.slice(i, i + 3));
+  return [...grams].sort();
+}
+
+function lowerBound(terms: string[], token: string): number {
+  let lo = 0;
+  let hi = terms.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (terms[mid] < token) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+function addPostings(index: SearchIndex, position: number, factor: number, scores: Map<number, number>) {
+  const flat = index.postings[position];
+  for (let i = 0; i < flat.length; i += 2) {
+    const score = flat[i + 1] * factor;
+    if (score > (scores.get(flat[i]) ?? 0)) scores.set(flat[i], score);
+  }
+}
+
+/**
+ * Score films for one normalized query token: exact and prefix term hits,
+ * or, when there are none, title words with enough trigram overlap.
+ */
+export function matchToken(index: SearchIndex, token: string): Map<number, number> {
+  const { terms } = index;
+  const scores = new Map<number, number>();
+  for (let p = lowerBound(terms, token); p < terms.length && terms[p].startsWith(token); p++) {
+    addPostings(index, p, terms[p] === token ? 1 : PREFIX_FACTOR, scores);
+  }
+  if (scores.size > 0 || token.length < FUZZY_MIN_LENGTH) return scores;
+
+  const queryGrams = trigrams(token);
+  const shared = new Map<number, number>();
+  for (const gram of queryGrams) {
+    for (const word of index.trigrams[gram] ?? []) shared.set(word, (shared.get(word) ?? 0) + 1);
+  }
+  for (const [wordIndex, count] of shared) {
+    const word = index.title_words[wordIndex];
+    const similarity = count / (queryGrams.length + trigrams(word).length - count);
+    if (similarity < FUZZY_THRESHOLD) continue;
+    const flat = index.postings[lowerBound(terms, word)];
+    const score = index.weights.title * similarity;
+    for (let i = 0; i < flat.length; i += 2) {
+      if (score > (scores.get(flat[i]) ?? 0)) scores.set(flat[i], score);
+    }
+  }
+  return scores;
+}
+
+/**
+ * Find the films matching every word of a query, best first.
+ * @param index - Parsed search index
+ * @param query - Free text as typed
+ */
+export function searchFilms(index: SearchIndex, query: string): SearchResult[] {
+  const stopwords = new Set(index.stopwords);
+  let totals: Map<number, number> | null = null;
+  for (const token of tokenize(query, stopwords)) {
+    const scores = matchToken(index, token);
+    if (totals === null) {
+      totals = scores;
+    } else {
+      const next = new Map<number, number>();
+      for (const [id, score] of scores) {
+        const total = totals.get(id);
+        if (total !== undefined) next.set(id, total + score);
+      }
+      totals = next;
+    }
+    if (totals.size === 0) return [];
+  }
+  return [...(totals ?? new Map<number, number>())]
+    .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+    .map(([id, score]) => ({ id, score, ...index.films[String(id)] }));
+}